@@ -8,35 +8,29 @@ This package contains specialized AI agents for generating various DoD procureme
 - Quality assurance and refinement agents
 """
 
-# Main orchestrators
-from backend.agents.orchestrator import Orchestrator
-from backend.agents.pre_solicitation_orchestrator import PreSolicitationOrchestrator
-from backend.agents.solicitation_package_orchestrator import SolicitationPackageOrchestrator
-from backend.agents.post_solicitation_orchestrator import PostSolicitationOrchestrator
-from backend.agents.pws_orchestrator import PWSOrchestrator
-from backend.agents.soo_orchestrator import SOOOrchestrator
-from backend.agents.sow_orchestrator import SOWOrchestrator
-from backend.agents.rfp_orchestrator import RFPOrchestrator
+from backend.utils.lazy_exports import install_lazy_exports
 
-# Quality and management agents
-from backend.agents.quality_agent import QualityAgent
-from backend.agents.qa_manager_agent import QAManagerAgent
-from backend.agents.refinement_agent import RefinementAgent
+# Exported names are imported on first attribute access (PEP 562), so
+# importing one agent module (e.g. backend.agents.base_agent) does not pull
+# in every orchestrator and the agents they depend on.
+_EXPORTS = {
+    # Main orchestrators
+    'Orchestrator': 'backend.agents.orchestrator',
+    'PreSolicitationOrchestrator': 'backend.agents.pre_solicitation_orchestrator',
+    'SolicitationPackageOrchestrator': 'backend.agents.solicitation_package_orchestrator',
+    'PostSolicitationOrchestrator': 'backend.agents.post_solicitation_orchestrator',
+    'PWSOrchestrator': 'backend.agents.pws_orchestrator',
+    'SOOOrchestrator': 'backend.agents.soo_orchestrator',
+    'SOWOrchestrator': 'backend.agents.sow_orchestrator',
+    'RFPOrchestrator': 'backend.agents.rfp_orchestrator',
 
-# Base agent
-from backend.agents.base_agent import BaseAgent
+    # Quality and management agents
+    'QualityAgent': 'backend.agents.quality_agent',
+    'QAManagerAgent': 'backend.agents.qa_manager_agent',
+    'RefinementAgent': 'backend.agents.refinement_agent',
 
-__all__ = [
-    'Orchestrator',
-    'PreSolicitationOrchestrator',
-    'SolicitationPackageOrchestrator',
-    'PostSolicitationOrchestrator',
-    'PWSOrchestrator',
-    'SOOOrchestrator',
-    'SOWOrchestrator',
-    'RFPOrchestrator',
-    'QualityAgent',
-    'QAManagerAgent',
-    'RefinementAgent',
-    'BaseAgent',
-]
+    # Base agent
+    'BaseAgent': 'backend.agents.base_agent',
+}
+
+__all__ = install_lazy_exports(globals(), _EXPORTS)
@@ -13,9 +13,11 @@ import re
 sys.path.append(str(Path(__file__).parent.parent))
 
 from backend.agents.base_agent import BaseAgent
+from backend.agents.prompt_batch import PromptBatch
 from backend.rag.retriever import Retriever
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class AcquisitionPlanGeneratorAgent(BaseAgent):
@@ -41,7 +43,8 @@ class AcquisitionPlanGeneratorAgent(BaseAgent):
         self,
         api_key: str,
         retriever: Optional[Retriever] = None,
-        model: str = "claude-sonnet-4-20250514"
+        model: str = "claude-sonnet-4-20250514",
+        max_llm_concurrency: Optional[int] = None
     ):
         """
         Initialize Acquisition Plan Generator Agent
@@ -50,6 +53,7 @@ class AcquisitionPlanGeneratorAgent(BaseAgent):
             api_key: Anthropic API key
             retriever: Optional RAG retriever for acquisition strategies
             model: Claude model to use
+            max_llm_concurrency: Cap on concurrent narrative prompts (default LLM_PROMPT_CONCURRENCY env)
         """
         super().__init__(
             name="Acquisition Plan Generator Agent",
@@ -59,11 +63,11 @@ class AcquisitionPlanGeneratorAgent(BaseAgent):
         )
         
         self.retriever = retriever
+        self.max_llm_concurrency = max_llm_concurrency
         self.template_path = Path(__file__).parent.parent / "templates" / "acquisition_plan_template.md"
         
         # Load template
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("ACQUISITION PLAN GENERATOR AGENT INITIALIZED")
@@ -176,44 +180,43 @@ class AcquisitionPlanGeneratorAgent(BaseAgent):
         print(f"  ✓ Set-aside: {small_business['set_aside_type']}")
 
         # Step 7: Generate narrative sections with LLM
+        # Each section registers its independent prompts on one batch, which
+        # runs them concurrently instead of one round trip at a time.
         print("\nSTEP 7: Generating narrative sections with LLM...")
         llm_generated = {}
+        batch = PromptBatch(self, max_concurrency=self.max_llm_concurrency)
 
-        # Generate Section 1: Background
-        background_data = self._generate_background_from_rag(
+        # Section 1: Background
+        self._register_background_prompts(
+            batch,
             rag_strategies,
             requirements_analysis.get('capability_gap', ''),
             project_info
         )
-        llm_generated.update(background_data)
 
-        # Generate Section 2: Applicable Conditions
-        conditions_data = self._generate_applicable_conditions_from_rag(project_info, rag_extracted)
-        llm_generated.update(conditions_data)
+        # Section 2: Applicable Conditions
+        llm_generated.update(self._generate_applicable_conditions_from_rag(batch, project_info, rag_extracted))
 
-        # Generate Section 6: Trade-offs
-        tradeoffs_data = self._generate_tradeoffs_from_strategy(strategy, project_info)
-        llm_generated.update(tradeoffs_data)
+        # Section 6: Trade-offs
+        self._register_tradeoff_prompts(batch, strategy, project_info)
+
+        # Section 7: Streamlining
+        self._register_streamlining_prompts(batch, strategy, project_info)
 
-        # Generate Section 7: Streamlining
-        streamlining_data = self._generate_streamlining_from_contract(strategy, project_info)
-        llm_generated.update(streamlining_data)
+        # Section 10: Acquisition Considerations
+        self._register_acquisition_considerations_prompts(batch, strategy, project_info, market_research)
 
-        # Generate Section 10: Acquisition Considerations
-        considerations_data = self._generate_acquisition_considerations(strategy, project_info, market_research)
-        llm_generated.update(considerations_data)
+        # Section 11: Market Research
+        llm_generated.update(self._generate_market_research_summary(batch, market_research, rag_strategies))
 
-        # Generate Section 11: Market Research
-        market_data = self._generate_market_research_summary(market_research, rag_strategies)
-        llm_generated.update(market_data)
+        # Section 17: Sustainment
+        self._register_sustainment_prompts(batch, project_info, contract_type)
 
-        # Generate Section 17: Sustainment
-        sustainment_data = self._generate_sustainment_content(project_info, contract_type)
-        llm_generated.update(sustainment_data)
+        # Section 18: Test & Evaluation
+        self._register_test_evaluation_prompts(batch, project_info, requirements_analysis)
 
-        # Generate Section 18: Test & Evaluation
-        test_eval_data = self._generate_test_evaluation_content(project_info, requirements_analysis)
-        llm_generated.update(test_eval_data)
+        print(f"  ✓ Running {len(batch)} prompts (up to {batch.max_concurrency} concurrently)")
+        llm_generated.update(batch.run())
 
         print(f"  ✓ Generated {len(llm_generated)} narrative sections")
 
@@ -776,23 +779,20 @@ JSON:"""
     # ==================== LLM GENERATION METHODS ====================
     # These methods use RAG context + LLM to generate narrative sections
 
-    def _generate_background_from_rag(self, rag_strategies: List[Dict], capability_gap: str, project_info: Dict) -> Dict:
+    def _register_background_prompts(self, batch: PromptBatch, rag_strategies: List[Dict], capability_gap: str, project_info: Dict) -> None:
         """
-        Generate Section 1 (Background) content from RAG
+        Register Section 1 (Background) prompts
 
         Generates: current_situation, strategic_alignment, program_history
         """
-        generated = {}
-
         if not rag_strategies:
-            return generated
+            return
 
         # Combine RAG content
         rag_text = "\n\n".join([s.get('content', '')[:500] for s in rag_strategies[:3]])
 
         # Generate current situation
-        try:
-            prompt = f"""Based on this program information, generate a 2-3 sentence description of the current situation that led to this acquisition need.
+        batch.add('current_situation', f"""Based on this program information, generate a 2-3 sentence description of the current situation that led to this acquisition need.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Capability Gap: {capability_gap}
@@ -800,45 +800,26 @@ Capability Gap: {capability_gap}
 Context from similar programs:
 {rag_text[:800]}
 
-Generate current situation:"""
-            current_situation = self.call_llm(prompt, max_tokens=300).strip()
-            generated['current_situation'] = current_situation
-            self.log("Generated current_situation from RAG")
-        except Exception as e:
-            self.log(f"Failed to generate current_situation: {e}", level="WARNING")
+Generate current situation:""", max_tokens=300)
 
         # Generate strategic alignment
-        try:
-            prompt = f"""Based on this program information, generate a 2-3 sentence description of how this acquisition aligns with DoD strategic objectives.
+        batch.add('strategic_alignment', f"""Based on this program information, generate a 2-3 sentence description of how this acquisition aligns with DoD strategic objectives.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Estimated Value: {project_info.get('estimated_value', 'TBD')}
 
-Generate strategic alignment:"""
-            strategic_alignment = self.call_llm(prompt, max_tokens=300).strip()
-            generated['strategic_alignment'] = strategic_alignment
-            self.log("Generated strategic_alignment from RAG")
-        except Exception as e:
-            self.log(f"Failed to generate strategic_alignment: {e}", level="WARNING")
+Generate strategic alignment:""", max_tokens=300)
 
         # Generate program history
-        try:
-            prompt = f"""Generate a brief 1-2 sentence program history for this new acquisition program.
+        batch.add('program_history', f"""Generate a brief 1-2 sentence program history for this new acquisition program.
 
 Program: {project_info.get('program_name', 'Unknown')}
 
 Context: This is a new program acquisition. Mention if market research was conducted and when planning began.
 
-Generate program history:"""
-            program_history = self.call_llm(prompt, max_tokens=250).strip()
-            generated['program_history'] = program_history
-            self.log("Generated program_history from RAG")
-        except Exception as e:
-            self.log(f"Failed to generate program_history: {e}", level="WARNING")
-
-        return generated
+Generate program history:""", max_tokens=250)
 
-    def _generate_applicable_conditions_from_rag(self, project_info: Dict, rag_extracted: Dict) -> Dict:
+    def _generate_applicable_conditions_from_rag(self, batch: PromptBatch, project_info: Dict, rag_extracted: Dict) -> Dict:
         """
         Generate Section 2 (Applicable Conditions) content
 
@@ -864,19 +845,13 @@ Generate program history:"""
             generated['acat_rationale'] = f"Major Defense Acquisition Program estimated at {estimated_value_str}."
 
         # Generate applicable regulations
-        try:
-            prompt = f"""List the key DoD and FAR regulations applicable to this acquisition in 2-3 sentences.
+        batch.add('applicable_regulations', f"""List the key DoD and FAR regulations applicable to this acquisition in 2-3 sentences.
 
 Program: {project_info.get('program_name', 'Unknown')}
 ACAT Level: {generated.get('acat_level', 'ACAT III')}
 Contract Type: {project_info.get('contract_type', 'services')}
 
-Generate applicable regulations:"""
-            applicable_regs = self.call_llm(prompt, max_tokens=300).strip()
-            generated['applicable_regulations'] = applicable_regs
-            self.log("Generated applicable_regulations")
-        except Exception as e:
-            self.log(f"Failed to generate applicable_regulations: {e}", level="WARNING")
+Generate applicable regulations:""", max_tokens=300)
 
         # Acquisition pathway from RAG or generate
         acquisition_pathway = rag_extracted.get('acquisition_approach', '')
@@ -887,68 +862,43 @@ Generate applicable regulations:"""
 
         return generated
 
-    def _generate_tradeoffs_from_strategy(self, strategy: Dict, project_info: Dict) -> Dict:
+    def _register_tradeoff_prompts(self, batch: PromptBatch, strategy: Dict, project_info: Dict) -> None:
         """
-        Generate Section 6 (Trade-offs) content from strategy
+        Register Section 6 (Trade-offs) prompts
 
         Generates: cost_performance_tradeoffs, schedule_performance_tradeoffs, risk_tradeoffs
         """
-        generated = {}
-
-        try:
-            prompt = f"""Generate a 2-3 sentence description of cost vs. performance trade-offs for this acquisition.
+        batch.add('cost_performance_tradeoffs', f"""Generate a 2-3 sentence description of cost vs. performance trade-offs for this acquisition.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Contract Type: {strategy.get('contract_type_recommendation', 'FFP')}
 Estimated Value: {project_info.get('estimated_value', 'TBD')}
 
-Generate cost vs. performance trade-offs:"""
-            cost_perf = self.call_llm(prompt, max_tokens=300).strip()
-            generated['cost_performance_tradeoffs'] = cost_perf
-            self.log("Generated cost_performance_tradeoffs")
-        except Exception as e:
-            self.log(f"Failed to generate cost_performance_tradeoffs: {e}", level="WARNING")
+Generate cost vs. performance trade-offs:""", max_tokens=300)
 
-        try:
-            prompt = f"""Generate a 2-3 sentence description of schedule vs. performance trade-offs for this acquisition.
+        batch.add('schedule_performance_tradeoffs', f"""Generate a 2-3 sentence description of schedule vs. performance trade-offs for this acquisition.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Period of Performance: {project_info.get('period_of_performance', '12 months base + 4 option years')}
 
-Generate schedule vs. performance trade-offs:"""
-            schedule_perf = self.call_llm(prompt, max_tokens=300).strip()
-            generated['schedule_performance_tradeoffs'] = schedule_perf
-            self.log("Generated schedule_performance_tradeoffs")
-        except Exception as e:
-            self.log(f"Failed to generate schedule_performance_tradeoffs: {e}", level="WARNING")
+Generate schedule vs. performance trade-offs:""", max_tokens=300)
 
-        try:
-            prompt = f"""Generate a 2-3 sentence description of risk considerations for this acquisition trade-off analysis.
+        batch.add('risk_tradeoffs', f"""Generate a 2-3 sentence description of risk considerations for this acquisition trade-off analysis.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Source Selection: {strategy.get('source_selection_method', 'Best Value')}
 
-Generate risk trade-off considerations:"""
-            risk_trade = self.call_llm(prompt, max_tokens=300).strip()
-            generated['risk_tradeoffs'] = risk_trade
-            self.log("Generated risk_tradeoffs")
-        except Exception as e:
-            self.log(f"Failed to generate risk_tradeoffs: {e}", level="WARNING")
-
-        return generated
+Generate risk trade-off considerations:""", max_tokens=300)
 
-    def _generate_streamlining_from_contract(self, strategy: Dict, project_info: Dict) -> Dict:
+    def _register_streamlining_prompts(self, batch: PromptBatch, strategy: Dict, project_info: Dict) -> None:
         """
-        Generate Section 7 (Streamlining) content from contract type
+        Register Section 7 (Streamlining) prompts
 
         Generates: streamlining_opportunities, commercial_item_determination
         """
-        generated = {}
-
         contract_type = strategy.get('contract_type_recommendation', 'FFP')
 
-        try:
-            prompt = f"""Generate 2-3 sentences describing acquisition streamlining opportunities for this program.
+        batch.add('streamlining_opportunities', f"""Generate 2-3 sentences describing acquisition streamlining opportunities for this program.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Contract Type: {contract_type}
@@ -956,40 +906,24 @@ Contract Vehicle: {strategy.get('contract_vehicle', 'GSA Schedule')}
 
 Focus on: use of existing contract vehicles, commercial practices, simplified procedures.
 
-Generate streamlining opportunities:"""
-            streamlining = self.call_llm(prompt, max_tokens=350).strip()
-            generated['streamlining_opportunities'] = streamlining
-            self.log("Generated streamlining_opportunities")
-        except Exception as e:
-            self.log(f"Failed to generate streamlining_opportunities: {e}", level="WARNING")
+Generate streamlining opportunities:""", max_tokens=350)
 
-        try:
-            prompt = f"""Generate 1-2 sentences on commercial item determination for this program.
+        batch.add('commercial_item_determination', f"""Generate 1-2 sentences on commercial item determination for this program.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Type: {project_info.get('contract_type', 'services')}
 
 Is this a commercial item or service per FAR Part 2? Explain briefly.
 
-Generate commercial item determination:"""
-            commercial = self.call_llm(prompt, max_tokens=250).strip()
-            generated['commercial_item_determination'] = commercial
-            self.log("Generated commercial_item_determination")
-        except Exception as e:
-            self.log(f"Failed to generate commercial_item_determination: {e}", level="WARNING")
-
-        return generated
+Generate commercial item determination:""", max_tokens=250)
 
-    def _generate_acquisition_considerations(self, strategy: Dict, project_info: Dict, market_research: Dict) -> Dict:
+    def _register_acquisition_considerations_prompts(self, batch: PromptBatch, strategy: Dict, project_info: Dict, market_research: Dict) -> None:
         """
-        Generate Section 10 (Acquisition Considerations) content
+        Register Section 10 (Acquisition Considerations) prompts
 
         Generates: budgeting_funding, competition_requirements, security_requirements
         """
-        generated = {}
-
-        try:
-            prompt = f"""Generate 2-3 sentences on budgeting and funding strategy for this acquisition.
+        batch.add('budgeting_funding', f"""Generate 2-3 sentences on budgeting and funding strategy for this acquisition.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Estimated Value: {project_info.get('estimated_value', 'TBD')}
@@ -997,46 +931,27 @@ Period: {project_info.get('period_of_performance', '12 months base + 4 option ye
 
 Include: funding source, appropriation type, funding profile considerations.
 
-Generate budgeting and funding:"""
-            budgeting = self.call_llm(prompt, max_tokens=350).strip()
-            generated['budgeting_funding'] = budgeting
-            self.log("Generated budgeting_funding")
-        except Exception as e:
-            self.log(f"Failed to generate budgeting_funding: {e}", level="WARNING")
+Generate budgeting and funding:""", max_tokens=350)
 
-        try:
-            prompt = f"""Generate 2-3 sentences on competition requirements for this acquisition.
+        batch.add('competition_requirements', f"""Generate 2-3 sentences on competition requirements for this acquisition.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Source Selection: {strategy.get('source_selection_method', 'Best Value')}
 
 Include: full and open competition, exceptions if any, competitive procedures.
 
-Generate competition requirements:"""
-            competition = self.call_llm(prompt, max_tokens=300).strip()
-            generated['competition_requirements'] = competition
-            self.log("Generated competition_requirements")
-        except Exception as e:
-            self.log(f"Failed to generate competition_requirements: {e}", level="WARNING")
+Generate competition requirements:""", max_tokens=300)
 
-        try:
-            prompt = f"""Generate 2-3 sentences on security requirements for this acquisition.
+        batch.add('security_requirements', f"""Generate 2-3 sentences on security requirements for this acquisition.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Type: {project_info.get('contract_type', 'services')}
 
 Include: NIST 800-171 compliance, FedRAMP requirements, data protection.
 
-Generate security requirements:"""
-            security = self.call_llm(prompt, max_tokens=300).strip()
-            generated['security_requirements'] = security
-            self.log("Generated security_requirements")
-        except Exception as e:
-            self.log(f"Failed to generate security_requirements: {e}", level="WARNING")
+Generate security requirements:""", max_tokens=300)
 
-        return generated
-
-    def _generate_market_research_summary(self, market_research: Dict, rag_strategies: List[Dict]) -> Dict:
+    def _generate_market_research_summary(self, batch: PromptBatch, market_research: Dict, rag_strategies: List[Dict]) -> Dict:
         """
         Generate Section 11 (Market Research) content
 
@@ -1046,57 +961,45 @@ Generate security requirements:"""
 
         # Use provided market research or generate from RAG
         market_summary = market_research.get('competitive_landscape', '')
+        industry_depends_on = []
 
         if not market_summary and rag_strategies:
             rag_text = "\n".join([s.get('content', '')[:400] for s in rag_strategies[:2]])
-            try:
-                prompt = f"""Generate a 2-3 sentence market research summary for this acquisition.
+            batch.add('market_research_summary', f"""Generate a 2-3 sentence market research summary for this acquisition.
 
 Context from similar programs:
 {rag_text[:600]}
 
 Include: market research methods used, number of vendors identified, competition assessment.
 
-Generate market research summary:"""
-                market_summary = self.call_llm(prompt, max_tokens=350).strip()
-                generated['market_research_summary'] = market_summary
-                self.log("Generated market_research_summary")
-            except Exception as e:
-                self.log(f"Failed to generate market_research_summary: {e}", level="WARNING")
+Generate market research summary:""", max_tokens=350)
+            # Industry capabilities builds on the generated summary
+            industry_depends_on = ['market_research_summary']
         else:
             generated['market_research_summary'] = market_summary
 
-        try:
-            prompt = f"""Generate 2-3 sentences on industry capabilities for this type of acquisition.
+        def industry_capabilities_prompt(results: Dict[str, str]) -> str:
+            summary = results.get('market_research_summary', market_summary)
+            return f"""Generate 2-3 sentences on industry capabilities for this type of acquisition.
 
 Type: Cloud-based IT services / Software as a Service
-Market Research: {market_summary[:200] if market_summary else 'Multiple qualified vendors expected'}
+Market Research: {summary[:200] if summary else 'Multiple qualified vendors expected'}
 
 Generate industry capabilities:"""
-            industry_cap = self.call_llm(prompt, max_tokens=300).strip()
-            generated['industry_capabilities'] = industry_cap
-            self.log("Generated industry_capabilities")
-        except Exception as e:
-            self.log(f"Failed to generate industry_capabilities: {e}", level="WARNING")
 
-        try:
-            competitive_landscape = market_research.get('competitive_landscape', 'Competitive market with multiple qualified vendors expected.')
-            generated['competitive_landscape'] = competitive_landscape
-        except Exception as e:
-            self.log(f"Failed to set competitive_landscape: {e}", level="WARNING")
+        batch.add('industry_capabilities', industry_capabilities_prompt, max_tokens=300, depends_on=industry_depends_on)
+
+        generated['competitive_landscape'] = market_research.get('competitive_landscape', 'Competitive market with multiple qualified vendors expected.')
 
         return generated
 
-    def _generate_sustainment_content(self, project_info: Dict, contract_type: str) -> Dict:
+    def _register_sustainment_prompts(self, batch: PromptBatch, project_info: Dict, contract_type: str) -> None:
         """
-        Generate Section 17 (Life Cycle Sustainment) content
+        Register Section 17 (Life Cycle Sustainment) prompts
 
         Generates: sustainment_strategy, maintenance_approach, training_requirements
         """
-        generated = {}
-
-        try:
-            prompt = f"""Generate 2-3 sentences on sustainment strategy for this system.
+        batch.add('sustainment_strategy', f"""Generate 2-3 sentences on sustainment strategy for this system.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Type: Cloud-based system
@@ -1104,100 +1007,59 @@ Period: {project_info.get('period_of_performance', '5 years')}
 
 Include: sustainment approach, contractor support, lifecycle management.
 
-Generate sustainment strategy:"""
-            sustainment = self.call_llm(prompt, max_tokens=350).strip()
-            generated['sustainment_strategy'] = sustainment
-            self.log("Generated sustainment_strategy")
-        except Exception as e:
-            self.log(f"Failed to generate sustainment_strategy: {e}", level="WARNING")
+Generate sustainment strategy:""", max_tokens=350)
 
-        try:
-            prompt = f"""Generate 2-3 sentences on maintenance approach for this cloud-based system.
+        batch.add('maintenance_approach', f"""Generate 2-3 sentences on maintenance approach for this cloud-based system.
 
 Program: {project_info.get('program_name', 'Unknown')}
 
 Include: maintenance responsibilities, SLA requirements, update procedures.
 
-Generate maintenance approach:"""
-            maintenance = self.call_llm(prompt, max_tokens=300).strip()
-            generated['maintenance_approach'] = maintenance
-            self.log("Generated maintenance_approach")
-        except Exception as e:
-            self.log(f"Failed to generate maintenance_approach: {e}", level="WARNING")
+Generate maintenance approach:""", max_tokens=300)
 
-        try:
-            prompt = f"""Generate 2-3 sentences on training requirements for this system.
+        batch.add('training_requirements', f"""Generate 2-3 sentences on training requirements for this system.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Users: Government personnel and administrators
 
 Include: user training, admin training, training materials.
 
-Generate training requirements:"""
-            training = self.call_llm(prompt, max_tokens=300).strip()
-            generated['training_requirements'] = training
-            self.log("Generated training_requirements")
-        except Exception as e:
-            self.log(f"Failed to generate training_requirements: {e}", level="WARNING")
-
-        return generated
+Generate training requirements:""", max_tokens=300)
 
-    def _generate_test_evaluation_content(self, project_info: Dict, requirements_analysis: Dict) -> Dict:
+    def _register_test_evaluation_prompts(self, batch: PromptBatch, project_info: Dict, requirements_analysis: Dict) -> None:
         """
-        Generate Section 18 (Test & Evaluation) content
+        Register Section 18 (Test & Evaluation) prompts
 
         Generates: te_strategy, dte_approach, acceptance_criteria
         """
-        generated = {}
-
-        try:
-            prompt = f"""Generate 2-3 sentences on the Test & Evaluation strategy for this system.
+        batch.add('te_strategy', f"""Generate 2-3 sentences on the Test & Evaluation strategy for this system.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Type: Cloud-based software system
 
 Include: T&E phases, test environment, evaluation approach.
 
-Generate T&E strategy:"""
-            te_strategy = self.call_llm(prompt, max_tokens=350).strip()
-            generated['te_strategy'] = te_strategy
-            self.log("Generated te_strategy")
-        except Exception as e:
-            self.log(f"Failed to generate te_strategy: {e}", level="WARNING")
+Generate T&E strategy:""", max_tokens=350)
 
-        try:
-            prompt = f"""Generate 2-3 sentences on Development Test & Evaluation approach.
+        batch.add('dte_approach', f"""Generate 2-3 sentences on Development Test & Evaluation approach.
 
 Program: {project_info.get('program_name', 'Unknown')}
 
 Include: DT&E objectives, test cases, functional testing.
 
-Generate DT&E approach:"""
-            dte = self.call_llm(prompt, max_tokens=300).strip()
-            generated['dte_approach'] = dte
-            self.log("Generated dte_approach")
-        except Exception as e:
-            self.log(f"Failed to generate dte_approach: {e}", level="WARNING")
+Generate DT&E approach:""", max_tokens=300)
 
-        try:
-            kpps = requirements_analysis.get('kpps', [])
-            kpp_desc = ", ".join([k.get('name', '') for k in kpps[:2]]) if kpps else "System availability, performance"
+        kpps = requirements_analysis.get('kpps', [])
+        kpp_desc = ", ".join([k.get('name', '') for k in kpps[:2]]) if kpps else "System availability, performance"
 
-            prompt = f"""Generate 2-3 sentences on acceptance criteria for this system.
+        batch.add('acceptance_criteria', f"""Generate 2-3 sentences on acceptance criteria for this system.
 
 Program: {project_info.get('program_name', 'Unknown')}
 Key Performance Parameters: {kpp_desc}
 
 Include: what must be demonstrated, acceptance testing, criteria for acceptance.
 
-Generate acceptance criteria:"""
-            acceptance = self.call_llm(prompt, max_tokens=300).strip()
-            generated['acceptance_criteria'] = acceptance
-            self.log("Generated acceptance_criteria")
-        except Exception as e:
-            self.log(f"Failed to generate acceptance_criteria: {e}", level="WARNING")
-
-        return generated
+Generate acceptance criteria:""", max_tokens=300)
 
     #  ==================== SMART DEFAULTS ====================
     # Generate intelligent defaults for common fields
@@ -1780,7 +1642,7 @@ Generate acceptance criteria:"""
         config: Dict
     ) -> str:
         """Populate acquisition plan template with RAG-enhanced, LLM-generated, and smart default content"""
-        content = self.template
+        values = {}
 
         # Priority-based value selection helper
         def get_value(config_key=None, rag_key=None, generated_key=None, smart_default_key=None, default='TBD'):
@@ -1852,19 +1714,19 @@ Generate acceptance criteria:"""
                     break
         
         # Basic information
-        content = content.replace('{{program_name}}', project_info.get('program_name', 'TBD'))
-        content = content.replace('{{organization}}', project_info.get('organization', 'Department of Defense'))
-        content = content.replace('{{prepared_by}}', config.get('prepared_by', 'Program Manager'))
-        content = content.replace('{{date}}', datetime.now().strftime('%B %d, %Y'))
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['program_name'] = project_info.get('program_name', 'TBD')
+        values['organization'] = project_info.get('organization', 'Department of Defense')
+        values['prepared_by'] = config.get('prepared_by', 'Program Manager')
+        values['date'] = datetime.now().strftime('%B %d, %Y')
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
         
         # Use RAG-derived or config content for executive summary
-        content = content.replace('{{program_overview}}', program_overview or 'TBD')
-        content = content.replace('{{acquisition_strategy_summary}}', acquisition_strategy_summary or 'TBD')
+        values['program_overview'] = program_overview or 'TBD'
+        values['acquisition_strategy_summary'] = acquisition_strategy_summary or 'TBD'
         
         # Requirements from RAG analysis
-        content = content.replace('{{capability_gap}}', requirements_analysis.get('capability_gap', 'TBD'))
-        content = content.replace('{{mission_need}}', config.get('mission_need', requirements_analysis.get('capability_gap', 'TBD')))
+        values['capability_gap'] = requirements_analysis.get('capability_gap', 'TBD')
+        values['mission_need'] = config.get('mission_need', requirements_analysis.get('capability_gap', 'TBD'))
         
         # Executive summary - use RAG extracted costs if available
         total_cost = get_value(
@@ -1872,36 +1734,36 @@ Generate acceptance criteria:"""
             rag_key='development_cost',
             default=project_info.get('estimated_value', project_info.get('igce_total_cost', 'TBD'))
         )
-        content = content.replace('{{total_cost}}', total_cost)
-        content = content.replace('{{grand_total}}', total_cost)
+        values['total_cost'] = total_cost
+        values['grand_total'] = total_cost
 
         # Additional cost fields from RAG
         lifecycle_cost = get_value(rag_key='lifecycle_cost', default='TBD')
-        content = content.replace('{{lifecycle_cost}}', lifecycle_cost)
-        content = content.replace('{{development_cost}}', get_value(rag_key='development_cost', default='TBD'))
+        values['lifecycle_cost'] = lifecycle_cost
+        values['development_cost'] = get_value(rag_key='development_cost', default='TBD')
 
         # NEW: IGCE Summary - use cross-referenced IGCE if available
         igce_summary = project_info.get('igce_summary', 'TBD - IGCE not yet generated')
-        content = content.replace('{{igce_summary}}', igce_summary)
+        values['igce_summary'] = igce_summary
 
         # IOC/FOC dates from RAG
         ioc_date = get_value(config_key='ioc_date', rag_key='ioc_date', default='TBD')
         foc_date = get_value(config_key='foc_date', rag_key='foc_date', default='TBD')
-        content = content.replace('{{ioc_date}}', ioc_date)
-        content = content.replace('{{foc_date}}', foc_date)
-        content = content.replace('{{ioc}}', ioc_date)
-        content = content.replace('{{foc}}', foc_date)
+        values['ioc_date'] = ioc_date
+        values['foc_date'] = foc_date
+        values['ioc'] = ioc_date
+        values['foc'] = foc_date
 
         # Milestones table
         milestones_table = '\n'.join([
             f"| {m['event']} | {m['date'].strftime('%B %Y')} |"
             for m in schedule
         ])
-        content = content.replace('{{key_milestones_table}}', milestones_table)
-        content = content.replace('{{master_schedule_table}}', '\n'.join([
+        values['key_milestones_table'] = milestones_table
+        values['master_schedule_table'] = '\n'.join([
             f"| {m['event']} | {m['date'].strftime('%B %d, %Y')} | | {m['status']} |"
             for m in schedule
-        ]))
+        ])
 
         # Strategy - use RAG extracted data with priority
         contract_type_value = get_value(
@@ -1909,9 +1771,9 @@ Generate acceptance criteria:"""
             rag_key='contract_type',
             default=strategy['contract_type_recommendation']
         )
-        content = content.replace('{{contract_type}}', contract_type_value)
-        content = content.replace('{{contract_type_rationale}}', strategy['rationale'])
-        content = content.replace('{{contract_vehicle}}', strategy['contract_vehicle'])
+        values['contract_type'] = contract_type_value
+        values['contract_type_rationale'] = strategy['rationale']
+        values['contract_vehicle'] = strategy['contract_vehicle']
 
         # Source selection method from RAG
         source_selection_value = get_value(
@@ -1919,9 +1781,9 @@ Generate acceptance criteria:"""
             rag_key='evaluation_method',
             default=strategy['source_selection_method']
         )
-        content = content.replace('{{source_selection_method}}', source_selection_value)
-        content = content.replace('{{evaluation_method}}', source_selection_value)
-        content = content.replace('{{source_selection_rationale}}', strategy['rationale'])
+        values['source_selection_method'] = source_selection_value
+        values['evaluation_method'] = source_selection_value
+        values['source_selection_rationale'] = strategy['rationale']
 
         # Acquisition approach from RAG
         acquisition_approach = get_value(
@@ -1929,188 +1791,160 @@ Generate acceptance criteria:"""
             rag_key='acquisition_approach',
             default='TBD'
         )
-        content = content.replace('{{acquisition_approach}}', acquisition_approach)
+        values['acquisition_approach'] = acquisition_approach
 
         # ========== LLM-Generated Content (Phase 1) ==========
 
         # Section 1: Background
-        content = content.replace('{{current_situation}}',
-            get_value(config_key='current_situation', generated_key='current_situation', default='TBD'))
-        content = content.replace('{{strategic_alignment}}',
-            get_value(config_key='strategic_alignment', generated_key='strategic_alignment', default='TBD'))
-        content = content.replace('{{program_history}}',
-            get_value(config_key='program_history', generated_key='program_history', default='TBD'))
+        values['current_situation'] = get_value(config_key='current_situation', generated_key='current_situation', default='TBD')
+        values['strategic_alignment'] = get_value(config_key='strategic_alignment', generated_key='strategic_alignment', default='TBD')
+        values['program_history'] = get_value(config_key='program_history', generated_key='program_history', default='TBD')
 
         # Section 2: Applicable Conditions
-        content = content.replace('{{acat_level}}',
-            get_value(config_key='acat_level', generated_key='acat_level', default='TBD'))
-        content = content.replace('{{acat_rationale}}',
-            get_value(config_key='acat_rationale', generated_key='acat_rationale', default='TBD'))
-        content = content.replace('{{applicable_regulations}}',
-            get_value(config_key='applicable_regulations', generated_key='applicable_regulations', default='TBD'))
-        content = content.replace('{{acquisition_pathway}}',
-            get_value(config_key='acquisition_pathway', generated_key='acquisition_pathway', default='TBD'))
+        values['acat_level'] = get_value(config_key='acat_level', generated_key='acat_level', default='TBD')
+        values['acat_rationale'] = get_value(config_key='acat_rationale', generated_key='acat_rationale', default='TBD')
+        values['applicable_regulations'] = get_value(config_key='applicable_regulations', generated_key='applicable_regulations', default='TBD')
+        values['acquisition_pathway'] = get_value(config_key='acquisition_pathway', generated_key='acquisition_pathway', default='TBD')
 
         # Section 6: Trade-offs
-        content = content.replace('{{cost_performance_tradeoffs}}',
-            get_value(config_key='cost_performance_tradeoffs', generated_key='cost_performance_tradeoffs', default='TBD'))
-        content = content.replace('{{schedule_performance_tradeoffs}}',
-            get_value(config_key='schedule_performance_tradeoffs', generated_key='schedule_performance_tradeoffs', default='TBD'))
-        content = content.replace('{{risk_tradeoffs}}',
-            get_value(config_key='risk_tradeoffs', generated_key='risk_tradeoffs', default='TBD'))
+        values['cost_performance_tradeoffs'] = get_value(config_key='cost_performance_tradeoffs', generated_key='cost_performance_tradeoffs', default='TBD')
+        values['schedule_performance_tradeoffs'] = get_value(config_key='schedule_performance_tradeoffs', generated_key='schedule_performance_tradeoffs', default='TBD')
+        values['risk_tradeoffs'] = get_value(config_key='risk_tradeoffs', generated_key='risk_tradeoffs', default='TBD')
 
         # Section 7: Streamlining
-        content = content.replace('{{streamlining_opportunities}}',
-            get_value(config_key='streamlining_opportunities', generated_key='streamlining_opportunities', default='TBD'))
-        content = content.replace('{{commercial_item_determination}}',
-            get_value(config_key='commercial_item_determination', generated_key='commercial_item_determination', default='TBD'))
+        values['streamlining_opportunities'] = get_value(config_key='streamlining_opportunities', generated_key='streamlining_opportunities', default='TBD')
+        values['commercial_item_determination'] = get_value(config_key='commercial_item_determination', generated_key='commercial_item_determination', default='TBD')
 
         # Section 10: Acquisition Considerations
-        content = content.replace('{{budgeting_funding}}',
-            get_value(config_key='budgeting_funding', generated_key='budgeting_funding', default='TBD'))
-        content = content.replace('{{competition_requirements}}',
-            get_value(config_key='competition_requirements', generated_key='competition_requirements', default='TBD'))
-        content = content.replace('{{security_requirements}}',
-            get_value(config_key='security_requirements', generated_key='security_requirements', default='TBD'))
+        values['budgeting_funding'] = get_value(config_key='budgeting_funding', generated_key='budgeting_funding', default='TBD')
+        values['competition_requirements'] = get_value(config_key='competition_requirements', generated_key='competition_requirements', default='TBD')
+        values['security_requirements'] = get_value(config_key='security_requirements', generated_key='security_requirements', default='TBD')
 
         # Section 11: Market Research
-        content = content.replace('{{market_research_summary}}',
-            get_value(config_key='market_research_summary', generated_key='market_research_summary', default='TBD'))
-        content = content.replace('{{industry_capabilities}}',
-            get_value(config_key='industry_capabilities', generated_key='industry_capabilities', default='TBD'))
-        content = content.replace('{{competitive_landscape}}',
-            get_value(config_key='competitive_landscape', generated_key='competitive_landscape', default='TBD'))
+        values['market_research_summary'] = get_value(config_key='market_research_summary', generated_key='market_research_summary', default='TBD')
+        values['industry_capabilities'] = get_value(config_key='industry_capabilities', generated_key='industry_capabilities', default='TBD')
+        values['competitive_landscape'] = get_value(config_key='competitive_landscape', generated_key='competitive_landscape', default='TBD')
 
         # Section 17: Life Cycle Sustainment
-        content = content.replace('{{sustainment_strategy}}',
-            get_value(config_key='sustainment_strategy', generated_key='sustainment_strategy', default='TBD'))
-        content = content.replace('{{maintenance_approach}}',
-            get_value(config_key='maintenance_approach', generated_key='maintenance_approach', default='TBD'))
-        content = content.replace('{{training_requirements}}',
-            get_value(config_key='training_requirements', generated_key='training_requirements', default='TBD'))
+        values['sustainment_strategy'] = get_value(config_key='sustainment_strategy', generated_key='sustainment_strategy', default='TBD')
+        values['maintenance_approach'] = get_value(config_key='maintenance_approach', generated_key='maintenance_approach', default='TBD')
+        values['training_requirements'] = get_value(config_key='training_requirements', generated_key='training_requirements', default='TBD')
 
         # Section 18: Test & Evaluation
-        content = content.replace('{{te_strategy}}',
-            get_value(config_key='te_strategy', generated_key='te_strategy', default='TBD'))
-        content = content.replace('{{dte_approach}}',
-            get_value(config_key='dte_approach', generated_key='dte_approach', default='TBD'))
-        content = content.replace('{{acceptance_criteria}}',
-            get_value(config_key='acceptance_criteria', generated_key='acceptance_criteria', default='TBD'))
+        values['te_strategy'] = get_value(config_key='te_strategy', generated_key='te_strategy', default='TBD')
+        values['dte_approach'] = get_value(config_key='dte_approach', generated_key='dte_approach', default='TBD')
+        values['acceptance_criteria'] = get_value(config_key='acceptance_criteria', generated_key='acceptance_criteria', default='TBD')
 
         # ========== Smart Defaults (Phase 2) ==========
 
         # Personnel
-        content = content.replace('{{pm_name}}', get_value(smart_default_key='pm_name', default='TBD'))
-        content = content.replace('{{co_name}}', get_value(smart_default_key='co_name', default='TBD'))
-        content = content.replace('{{cor_name}}', get_value(smart_default_key='cor_name', default='TBD'))
-        content = content.replace('{{legal_name}}', get_value(smart_default_key='legal_name', default='TBD'))
-        content = content.replace('{{sbs_name}}', get_value(smart_default_key='sbs_name', default='TBD'))
-        content = content.replace('{{cost_analyst_name}}', get_value(smart_default_key='cost_analyst_name', default='TBD'))
+        values['pm_name'] = get_value(smart_default_key='pm_name', default='TBD')
+        values['co_name'] = get_value(smart_default_key='co_name', default='TBD')
+        values['cor_name'] = get_value(smart_default_key='cor_name', default='TBD')
+        values['legal_name'] = get_value(smart_default_key='legal_name', default='TBD')
+        values['sbs_name'] = get_value(smart_default_key='sbs_name', default='TBD')
+        values['cost_analyst_name'] = get_value(smart_default_key='cost_analyst_name', default='TBD')
 
         # Organizations
-        content = content.replace('{{pm_org}}', get_value(smart_default_key='pm_org', default='TBD'))
-        content = content.replace('{{co_org}}', get_value(smart_default_key='co_org', default='TBD'))
-        content = content.replace('{{cor_org}}', get_value(smart_default_key='cor_org', default='TBD'))
-        content = content.replace('{{legal_org}}', get_value(smart_default_key='legal_org', default='TBD'))
-        content = content.replace('{{sbs_org}}', get_value(smart_default_key='sbs_org', default='TBD'))
-        content = content.replace('{{cost_analyst_org}}', get_value(smart_default_key='cost_analyst_org', default='TBD'))
+        values['pm_org'] = get_value(smart_default_key='pm_org', default='TBD')
+        values['co_org'] = get_value(smart_default_key='co_org', default='TBD')
+        values['cor_org'] = get_value(smart_default_key='cor_org', default='TBD')
+        values['legal_org'] = get_value(smart_default_key='legal_org', default='TBD')
+        values['sbs_org'] = get_value(smart_default_key='sbs_org', default='TBD')
+        values['cost_analyst_org'] = get_value(smart_default_key='cost_analyst_org', default='TBD')
 
         # Contacts & Titles
-        content = content.replace('{{pm_contact}}', get_value(smart_default_key='pm_contact', default='TBD'))
-        content = content.replace('{{co_contact}}', get_value(smart_default_key='co_contact', default='TBD'))
-        content = content.replace('{{pm_title}}', get_value(smart_default_key='pm_title', default='TBD'))
-        content = content.replace('{{co_title}}', get_value(smart_default_key='co_title', default='TBD'))
-        content = content.replace('{{legal_title}}', get_value(smart_default_key='legal_title', default='TBD'))
-        content = content.replace('{{sbs_title}}', get_value(smart_default_key='sbs_title', default='TBD'))
+        values['pm_contact'] = get_value(smart_default_key='pm_contact', default='TBD')
+        values['co_contact'] = get_value(smart_default_key='co_contact', default='TBD')
+        values['pm_title'] = get_value(smart_default_key='pm_title', default='TBD')
+        values['co_title'] = get_value(smart_default_key='co_title', default='TBD')
+        values['legal_title'] = get_value(smart_default_key='legal_title', default='TBD')
+        values['sbs_title'] = get_value(smart_default_key='sbs_title', default='TBD')
 
         # Dates
-        content = content.replace('{{co_date}}', get_value(smart_default_key='co_date', default='TBD'))
-        content = content.replace('{{pm_date}}', get_value(smart_default_key='pm_date', default='TBD'))
-        content = content.replace('{{legal_date}}', get_value(smart_default_key='legal_date', default='TBD'))
-        content = content.replace('{{sbs_date}}', get_value(smart_default_key='sbs_date', default='TBD'))
+        values['co_date'] = get_value(smart_default_key='co_date', default='TBD')
+        values['pm_date'] = get_value(smart_default_key='pm_date', default='TBD')
+        values['legal_date'] = get_value(smart_default_key='legal_date', default='TBD')
+        values['sbs_date'] = get_value(smart_default_key='sbs_date', default='TBD')
 
         # Fiscal Years
-        content = content.replace('{{fy_base}}', get_value(smart_default_key='fy_base', default='TBD'))
-        content = content.replace('{{fy_opt1}}', get_value(smart_default_key='fy_opt1', default='TBD'))
-        content = content.replace('{{fy_opt2}}', get_value(smart_default_key='fy_opt2', default='TBD'))
-        content = content.replace('{{fy_opt3}}', get_value(smart_default_key='fy_opt3', default='TBD'))
-        content = content.replace('{{fy_opt4}}', get_value(smart_default_key='fy_opt4', default='TBD'))
+        values['fy_base'] = get_value(smart_default_key='fy_base', default='TBD')
+        values['fy_opt1'] = get_value(smart_default_key='fy_opt1', default='TBD')
+        values['fy_opt2'] = get_value(smart_default_key='fy_opt2', default='TBD')
+        values['fy_opt3'] = get_value(smart_default_key='fy_opt3', default='TBD')
+        values['fy_opt4'] = get_value(smart_default_key='fy_opt4', default='TBD')
 
         # Cost Breakdown
-        content = content.replace('{{dev_base}}', get_value(smart_default_key='dev_base', default='TBD'))
-        content = content.replace('{{dev_opt1}}', get_value(smart_default_key='dev_opt1', default='TBD'))
-        content = content.replace('{{dev_opt2}}', get_value(smart_default_key='dev_opt2', default='TBD'))
-        content = content.replace('{{dev_opt3}}', get_value(smart_default_key='dev_opt3', default='TBD'))
-        content = content.replace('{{dev_opt4}}', get_value(smart_default_key='dev_opt4', default='TBD'))
-        content = content.replace('{{dev_total}}', get_value(smart_default_key='dev_total', default='TBD'))
-
-        content = content.replace('{{prod_base}}', get_value(smart_default_key='prod_base', default='TBD'))
-        content = content.replace('{{prod_opt1}}', get_value(smart_default_key='prod_opt1', default='TBD'))
-        content = content.replace('{{prod_opt2}}', get_value(smart_default_key='prod_opt2', default='TBD'))
-        content = content.replace('{{prod_opt3}}', get_value(smart_default_key='prod_opt3', default='TBD'))
-        content = content.replace('{{prod_opt4}}', get_value(smart_default_key='prod_opt4', default='TBD'))
-        content = content.replace('{{prod_total}}', get_value(smart_default_key='prod_total', default='TBD'))
-
-        content = content.replace('{{om_base}}', get_value(smart_default_key='om_base', default='TBD'))
-        content = content.replace('{{om_opt1}}', get_value(smart_default_key='om_opt1', default='TBD'))
-        content = content.replace('{{om_opt2}}', get_value(smart_default_key='om_opt2', default='TBD'))
-        content = content.replace('{{om_opt3}}', get_value(smart_default_key='om_opt3', default='TBD'))
-        content = content.replace('{{om_opt4}}', get_value(smart_default_key='om_opt4', default='TBD'))
-        content = content.replace('{{om_total}}', get_value(smart_default_key='om_total', default='TBD'))
-
-        content = content.replace('{{total_base}}', get_value(smart_default_key='total_base', default='TBD'))
-        content = content.replace('{{total_opt1}}', get_value(smart_default_key='total_opt1', default='TBD'))
-        content = content.replace('{{total_opt2}}', get_value(smart_default_key='total_opt2', default='TBD'))
-        content = content.replace('{{total_opt3}}', get_value(smart_default_key='total_opt3', default='TBD'))
-        content = content.replace('{{total_opt4}}', get_value(smart_default_key='total_opt4', default='TBD'))
+        values['dev_base'] = get_value(smart_default_key='dev_base', default='TBD')
+        values['dev_opt1'] = get_value(smart_default_key='dev_opt1', default='TBD')
+        values['dev_opt2'] = get_value(smart_default_key='dev_opt2', default='TBD')
+        values['dev_opt3'] = get_value(smart_default_key='dev_opt3', default='TBD')
+        values['dev_opt4'] = get_value(smart_default_key='dev_opt4', default='TBD')
+        values['dev_total'] = get_value(smart_default_key='dev_total', default='TBD')
+
+        values['prod_base'] = get_value(smart_default_key='prod_base', default='TBD')
+        values['prod_opt1'] = get_value(smart_default_key='prod_opt1', default='TBD')
+        values['prod_opt2'] = get_value(smart_default_key='prod_opt2', default='TBD')
+        values['prod_opt3'] = get_value(smart_default_key='prod_opt3', default='TBD')
+        values['prod_opt4'] = get_value(smart_default_key='prod_opt4', default='TBD')
+        values['prod_total'] = get_value(smart_default_key='prod_total', default='TBD')
+
+        values['om_base'] = get_value(smart_default_key='om_base', default='TBD')
+        values['om_opt1'] = get_value(smart_default_key='om_opt1', default='TBD')
+        values['om_opt2'] = get_value(smart_default_key='om_opt2', default='TBD')
+        values['om_opt3'] = get_value(smart_default_key='om_opt3', default='TBD')
+        values['om_opt4'] = get_value(smart_default_key='om_opt4', default='TBD')
+        values['om_total'] = get_value(smart_default_key='om_total', default='TBD')
+
+        values['total_base'] = get_value(smart_default_key='total_base', default='TBD')
+        values['total_opt1'] = get_value(smart_default_key='total_opt1', default='TBD')
+        values['total_opt2'] = get_value(smart_default_key='total_opt2', default='TBD')
+        values['total_opt3'] = get_value(smart_default_key='total_opt3', default='TBD')
+        values['total_opt4'] = get_value(smart_default_key='total_opt4', default='TBD')
 
         # Contract Structure
-        content = content.replace('{{contract_structure}}', get_value(smart_default_key='contract_structure', default='TBD'))
-        content = content.replace('{{option_periods}}', get_value(smart_default_key='option_periods', default='TBD'))
-        content = content.replace('{{clin_structure}}', get_value(smart_default_key='clin_structure', default='TBD'))
-        content = content.replace('{{incentive_structure}}', get_value(smart_default_key='incentive_structure', default='TBD'))
+        values['contract_structure'] = get_value(smart_default_key='contract_structure', default='TBD')
+        values['option_periods'] = get_value(smart_default_key='option_periods', default='TBD')
+        values['clin_structure'] = get_value(smart_default_key='clin_structure', default='TBD')
+        values['incentive_structure'] = get_value(smart_default_key='incentive_structure', default='TBD')
 
         # Requirements
-        content = content.replace('{{requirements_documents}}', get_value(smart_default_key='requirements_documents', default='TBD'))
+        values['requirements_documents'] = get_value(smart_default_key='requirements_documents', default='TBD')
 
         # Other
-        content = content.replace('{{mda_info}}', get_value(smart_default_key='mda_info', default='TBD'))
-        content = content.replace('{{special_designations}}', get_value(smart_default_key='special_designations', default='TBD'))
-        content = content.replace('{{version}}', get_value(smart_default_key='version', default='TBD'))
-        content = content.replace('{{last_updated}}', get_value(smart_default_key='last_updated', default='TBD'))
-        content = content.replace('{{distribution}}', get_value(smart_default_key='distribution', default='TBD'))
+        values['mda_info'] = get_value(smart_default_key='mda_info', default='TBD')
+        values['special_designations'] = get_value(smart_default_key='special_designations', default='TBD')
+        values['version'] = get_value(smart_default_key='version', default='TBD')
+        values['last_updated'] = get_value(smart_default_key='last_updated', default='TBD')
+        values['distribution'] = get_value(smart_default_key='distribution', default='TBD')
 
         # Additional smart defaults from Phase 3
-        content = content.replace('{{phase_in_out_plan}}', get_value(smart_default_key='phase_in_out_plan', default='TBD'))
-        content = content.replace('{{performance_milestones}}', get_value(smart_default_key='performance_milestones', default='TBD'))
-        content = content.replace('{{evaluation_factors}}', get_value(smart_default_key='evaluation_factors', default='TBD'))
-        content = content.replace('{{evaluation_weights}}', get_value(smart_default_key='evaluation_weights', default='TBD'))
-        content = content.replace('{{overall_strategy}}', get_value(smart_default_key='overall_strategy', default='TBD'))
-        content = content.replace('{{acquisition_phases}}', get_value(smart_default_key='acquisition_phases', default='TBD'))
-        content = content.replace('{{alternative_vehicles}}', get_value(smart_default_key='alternative_vehicles', default='TBD'))
-        content = content.replace('{{logistics_support}}', get_value(smart_default_key='logistics_support', default='TBD'))
-        content = content.replace('{{ote_approach}}', get_value(smart_default_key='ote_approach', default='TBD'))
-        content = content.replace('{{small_business_goal}}', get_value(smart_default_key='small_business_goal', default='TBD'))
+        values['phase_in_out_plan'] = get_value(smart_default_key='phase_in_out_plan', default='TBD')
+        values['performance_milestones'] = get_value(smart_default_key='performance_milestones', default='TBD')
+        values['evaluation_factors'] = get_value(smart_default_key='evaluation_factors', default='TBD')
+        values['evaluation_weights'] = get_value(smart_default_key='evaluation_weights', default='TBD')
+        values['overall_strategy'] = get_value(smart_default_key='overall_strategy', default='TBD')
+        values['acquisition_phases'] = get_value(smart_default_key='acquisition_phases', default='TBD')
+        values['alternative_vehicles'] = get_value(smart_default_key='alternative_vehicles', default='TBD')
+        values['logistics_support'] = get_value(smart_default_key='logistics_support', default='TBD')
+        values['ote_approach'] = get_value(smart_default_key='ote_approach', default='TBD')
+        values['small_business_goal'] = get_value(smart_default_key='small_business_goal', default='TBD')
 
         # Risk register
         risk_table = '\n'.join([
             f"| {r['id']} | {r['description']} | {r['probability']} | {r['impact']} | {r['mitigation']} | {r['owner']} |"
             for r in risk_assessment['risks']
         ])
-        content = content.replace('{{risk_register_table}}', risk_table)
+        values['risk_register_table'] = risk_table
         
         # Small business
-        content = content.replace('{{set_aside_type}}', small_business['set_aside_type'])
-        content = content.replace('{{set_aside_rationale}}', small_business['set_aside_rationale'])
-        content = content.replace('{{naics_code}}', small_business['naics_code'])
-        content = content.replace('{{size_standard}}', small_business['size_standard'])
+        values['set_aside_type'] = small_business['set_aside_type']
+        values['set_aside_rationale'] = small_business['set_aside_rationale']
+        values['naics_code'] = small_business['naics_code']
+        values['size_standard'] = small_business['size_standard']
         
         # Period of performance
-        content = content.replace('{{period_of_performance}}', project_info.get('period_of_performance', '12 months base + 4 option years'))
-        
-        # POC information
-        content = content.replace('{{pm_name}}', config.get('pm_name', 'TBD'))
-        content = content.replace('{{co_name}}', config.get('co_name', project_info.get('contracting_officer', 'TBD')))
+        values['period_of_performance'] = project_info.get('period_of_performance', '12 months base + 4 option years')
         
         # ========== HYBRID REQUIREMENTS EXTRACTION (Phase 2 Enhancement) ==========
         # Extract and format requirements using hybrid method if retriever is available
@@ -2130,22 +1964,22 @@ Generate acceptance criteria:"""
                     formatted_reqs = self._format_requirements_for_template(hybrid_req_data)
                     
                     # Replace template placeholders with formatted requirements
-                    content = content.replace('{{functional_requirements}}', formatted_reqs.get('functional_requirements_list', 'TBD'))
-                    content = content.replace('{{functional_requirements_list}}', formatted_reqs.get('functional_requirements_list', 'TBD'))
-                    content = content.replace('{{functional_req_count}}', formatted_reqs.get('functional_req_count', 'TBD'))
+                    values['functional_requirements'] = formatted_reqs.get('functional_requirements_list', 'TBD')
+                    values['functional_requirements_list'] = formatted_reqs.get('functional_requirements_list', 'TBD')
+                    values['functional_req_count'] = formatted_reqs.get('functional_req_count', 'TBD')
                     
-                    content = content.replace('{{performance_requirements}}', formatted_reqs.get('performance_requirements_list', 'TBD'))
-                    content = content.replace('{{performance_requirements_list}}', formatted_reqs.get('performance_requirements_list', 'TBD'))
-                    content = content.replace('{{performance_req_count}}', formatted_reqs.get('performance_req_count', 'TBD'))
+                    values['performance_requirements'] = formatted_reqs.get('performance_requirements_list', 'TBD')
+                    values['performance_requirements_list'] = formatted_reqs.get('performance_requirements_list', 'TBD')
+                    values['performance_req_count'] = formatted_reqs.get('performance_req_count', 'TBD')
                     
-                    content = content.replace('{{kpp_table}}', formatted_reqs.get('kpp_table', 'TBD'))
-                    content = content.replace('{{kpp_count}}', formatted_reqs.get('kpp_count', 'TBD'))
+                    values['kpp_table'] = formatted_reqs.get('kpp_table', 'TBD')
+                    values['kpp_count'] = formatted_reqs.get('kpp_count', 'TBD')
                     
-                    content = content.replace('{{technical_requirements}}', formatted_reqs.get('technical_requirements_list', 'TBD'))
-                    content = content.replace('{{technical_requirements_list}}', formatted_reqs.get('technical_requirements_list', 'TBD'))
+                    values['technical_requirements'] = formatted_reqs.get('technical_requirements_list', 'TBD')
+                    values['technical_requirements_list'] = formatted_reqs.get('technical_requirements_list', 'TBD')
                     
-                    content = content.replace('{{total_requirements}}', formatted_reqs.get('total_requirements', 'TBD'))
-                    content = content.replace('{{user_count}}', formatted_reqs.get('user_count', 'TBD'))
+                    values['total_requirements'] = formatted_reqs.get('total_requirements', 'TBD')
+                    values['user_count'] = formatted_reqs.get('user_count', 'TBD')
                     
                     # Log what we extracted
                     extracted_count = int(formatted_reqs.get('total_requirements', '0')) if formatted_reqs.get('total_requirements', 'TBD') != 'TBD' else 0
@@ -2157,10 +1991,7 @@ Generate acceptance criteria:"""
                 self.log(f"Hybrid requirements extraction failed: {e}", level="WARNING")
                 print(f"    ⚠ Hybrid extraction failed, using defaults")
         
-        # Fill remaining placeholders
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD', content)
-        
-        return content
+        return self.render_template(self.template, values, missing='TBD')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save Acquisition Plan to file"""
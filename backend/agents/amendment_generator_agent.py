@@ -7,7 +7,6 @@ from typing import Dict, List, Optional
 from pathlib import Path
 import sys
 from datetime import datetime, timedelta
-import re
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -15,6 +14,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class AmendmentGeneratorAgent(BaseAgent):
@@ -57,8 +57,7 @@ class AmendmentGeneratorAgent(BaseAgent):
         self.template_path = Path(__file__).parent.parent / "templates" / "amendment_template.md"
         
         # Load template
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         # Amendment tracking
         self.amendment_history = []
@@ -383,59 +382,56 @@ class AmendmentGeneratorAgent(BaseAgent):
         config: Dict
     ) -> str:
         """Populate amendment template"""
-        content = self.template
+        values = {}
         
         # Basic information
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{amendment_number}}', amendment_number)
-        content = content.replace('{{issue_date}}', datetime.now().strftime('%B %d, %Y'))
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['amendment_number'] = amendment_number
+        values['issue_date'] = datetime.now().strftime('%B %d, %Y')
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
         
         # Office information
-        content = content.replace('{{issuing_office}}', solicitation_info.get('office', 'Contracting Office'))
-        content = content.replace('{{contracting_officer}}', solicitation_info.get('contracting_officer', 'John Doe'))
-        content = content.replace('{{co_email}}', solicitation_info.get('co_email', 'contracting@agency.mil'))
-        content = content.replace('{{co_phone}}', solicitation_info.get('co_phone', '(703) 555-0000'))
+        values['issuing_office'] = solicitation_info.get('office', 'Contracting Office')
+        values['contracting_officer'] = solicitation_info.get('contracting_officer', 'John Doe')
+        values['co_email'] = solicitation_info.get('co_email', 'contracting@agency.mil')
+        values['co_phone'] = solicitation_info.get('co_phone', '(703) 555-0000')
         
         # Dates
-        content = content.replace('{{original_issue_date}}', solicitation_info.get('issue_date', 'TBD'))
-        content = content.replace('{{original_due_date}}', deadline_info['original_due_date'])
-        content = content.replace('{{revised_due_date}}', deadline_info['revised_due_date'])
-        content = content.replace('{{extension_days}}', str(deadline_info['extension_days']))
-        content = content.replace('{{extension_rationale}}', deadline_info['extension_rationale'])
+        values['original_issue_date'] = solicitation_info.get('issue_date', 'TBD')
+        values['original_due_date'] = deadline_info['original_due_date']
+        values['revised_due_date'] = deadline_info['revised_due_date']
+        values['extension_days'] = str(deadline_info['extension_days'])
+        values['extension_rationale'] = deadline_info['extension_rationale']
         
         # Amendment details
-        content = content.replace('{{amendment_type}}', change_analysis['impact_level'])
-        content = content.replace('{{amendment_reason}}', config.get('reason', 'Incorporate Q&A responses and clarify requirements'))
+        values['amendment_type'] = change_analysis['impact_level']
+        values['amendment_reason'] = config.get('reason', 'Incorporate Q&A responses and clarify requirements')
         
         # Changes summary table
         changes_table = '\n'.join([
             f"| {c['item']} | {c['section']} | {c['change_type'].title()} | {c['description'][:100]} |"
             for c in change_descriptions
         ])
-        content = content.replace('{{changes_summary_table}}', changes_table)
+        values['changes_summary_table'] = changes_table
         
         # Detailed changes
         detailed_changes = '\n\n'.join([
             f"**Change {c['item']}:** {c['section']}\n\n*Type:* {c['change_type'].title()}\n\n*Description:* {c['description']}\n\n*Impact:* {c['impact'].title()}"
             for c in change_descriptions
         ])
-        content = content.replace('{{detailed_changes}}', detailed_changes)
+        values['detailed_changes'] = detailed_changes
         
         # Q&A information
-        content = content.replace('{{questions_count}}', str(qa_summary['questions_count']))
-        content = content.replace('{{qa_attachment_number}}', qa_summary['qa_attachment'])
-        content = content.replace('{{key_clarifications}}', qa_summary['qa_summary'])
+        values['questions_count'] = str(qa_summary['questions_count'])
+        values['qa_attachment_number'] = qa_summary['qa_attachment']
+        values['key_clarifications'] = qa_summary['qa_summary']
         
         # Acknowledgment
         acknowledgment_deadline = datetime.now() + timedelta(days=deadline_info['extension_days'])
-        content = content.replace('{{acknowledgment_deadline}}', acknowledgment_deadline.strftime('%B %d, %Y at 2:00 PM EST'))
-        content = content.replace('{{acknowledgment_submission_method}}', f"Email to {solicitation_info.get('co_email', 'contracting@agency.mil')}")
+        values['acknowledgment_deadline'] = acknowledgment_deadline.strftime('%B %d, %Y at 2:00 PM EST')
+        values['acknowledgment_submission_method'] = f"Email to {solicitation_info.get('co_email', 'contracting@agency.mil')}"
         
-        # Fill remaining placeholders
-        content = re.sub(r'\{\{[^}]+\}\}', 'None', content)
-        
-        return content
+        return self.render_template(self.template, values, missing='None')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save amendment to file"""
@@ -7,13 +7,13 @@ from typing import Dict
 from pathlib import Path
 import sys
 from datetime import datetime
-import re
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class AwardNotificationGeneratorAgent(BaseAgent):
@@ -31,8 +31,7 @@ class AwardNotificationGeneratorAgent(BaseAgent):
         super().__init__(name="Award Notification Generator Agent", api_key=api_key, model=model, temperature=0.4)
         
         self.template_path = Path(__file__).parent.parent / "templates" / "award_notification_template.md"
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("AWARD NOTIFICATION GENERATOR INITIALIZED")
@@ -143,32 +142,31 @@ class AwardNotificationGeneratorAgent(BaseAgent):
     
     def _populate_template(self, solicitation_info: Dict, winner: Dict, award: Dict, config: Dict) -> str:
         """Populate award notification template"""
-        content = self.template
+        values = {}
         
-        content = content.replace('{{contract_number}}', award.get('contract_number', 'TBD'))
-        content = content.replace('{{program_name}}', solicitation_info.get('program_name', 'TBD'))
-        content = content.replace('{{award_date}}', datetime.now().strftime('%B %d, %Y'))
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['contract_number'] = award.get('contract_number', 'TBD')
+        values['program_name'] = solicitation_info.get('program_name', 'TBD')
+        values['award_date'] = datetime.now().strftime('%B %d, %Y')
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
         
         # Contractor information
-        content = content.replace('{{contractor_name}}', winner.get('name', 'TBD'))
-        content = content.replace('{{contractor_address}}', winner.get('address', 'TBD'))
-        content = content.replace('{{contractor_poc_name}}', winner.get('poc_name', 'TBD'))
-        content = content.replace('{{contractor_duns}}', winner.get('duns', 'TBD'))
+        values['contractor_name'] = winner.get('name', 'TBD')
+        values['contractor_address'] = winner.get('address', 'TBD')
+        values['contractor_poc_name'] = winner.get('poc_name', 'TBD')
+        values['contractor_duns'] = winner.get('duns', 'TBD')
         
         # Award details
-        content = content.replace('{{contract_value}}', award.get('total_value', 'TBD'))
-        content = content.replace('{{total_contract_value}}', award.get('total_value', 'TBD'))
-        content = content.replace('{{contract_type}}', award.get('contract_type', 'FFP'))
-        content = content.replace('{{period_of_performance}}', award.get('period', '12 months base + 4 option years'))
+        values['contract_value'] = award.get('total_value', 'TBD')
+        values['total_contract_value'] = award.get('total_value', 'TBD')
+        values['contract_type'] = award.get('contract_type', 'FFP')
+        values['period_of_performance'] = award.get('period', '12 months base + 4 option years')
         
         # CO information
-        content = content.replace('{{co_name}}', solicitation_info.get('contracting_officer', 'TBD'))
-        content = content.replace('{{co_email}}', solicitation_info.get('co_email', 'TBD'))
-        content = content.replace('{{co_phone}}', solicitation_info.get('co_phone', 'TBD'))
+        values['co_name'] = solicitation_info.get('contracting_officer', 'TBD')
+        values['co_email'] = solicitation_info.get('co_email', 'TBD')
+        values['co_phone'] = solicitation_info.get('co_phone', 'TBD')
         
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD', content)
-        return content
+        return self.render_template(self.template, values, missing='TBD')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save award notification to file"""
@@ -5,10 +5,16 @@ Provides common functionality like LLM interaction, memory, and logging
 Phase 4: Enhanced with collaboration methods for cross-referencing
 """
 
-from typing import Dict, List, Optional
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
 import anthropic
 from datetime import datetime
 
+from backend.agents.llm_client import get_async_client
+from backend.agents.llm_cache import LLMResponseCache, get_llm_cache
+from backend.agents.llm_stream import TokenStream, get_token_stream
+from backend.utils.template_engine import CompiledTemplate, Missing
+
 
 class BaseAgent:
     """
@@ -47,6 +53,7 @@ class BaseAgent:
             context_manager: Optional context manager for collaboration (Phase 4)
         """
         self.name = name
+        self.api_key = api_key
         self.client = anthropic.Anthropic(api_key=api_key)
         self.model = model
         self.temperature = temperature
@@ -57,12 +64,20 @@ class BaseAgent:
         # Phase 4: Context manager for collaboration
         self.context_manager = context_manager
 
+        # Optional LLM response cache (opt-in via enable_response_cache)
+        self.response_cache: Optional[LLMResponseCache] = None
+        self.response_cache_ttl: Optional[int] = None
+        self.response_cache_force = False
+
         # Memory: stores conversation history and important findings
         self.memory = []
         self.findings = {}
 
         # Logging
         self.logs = []
+
+        # Template fields left unfilled by the last render_template() call
+        self.unfilled_fields: List[str] = []
     
     def log(self, message: str, level: str = "INFO") -> None:
         """
@@ -85,6 +100,10 @@ class BaseAgent:
     ) -> str:
         """
         Call Claude LLM
+
+        Served from the response cache when enabled (see enable_response_cache).
+        Inside stream_llm_tokens(), the response is streamed and each text
+        delta is forwarded to the active TokenStream.
         
         Args:
             prompt: User prompt
@@ -94,6 +113,137 @@ class BaseAgent:
         Returns:
             LLM response text
         """
+        kwargs = self._build_llm_kwargs(prompt, max_tokens, system_prompt)
+        token_stream = get_token_stream()
+
+        cache_key = self._response_cache_key(kwargs)
+        cached = self._lookup_cached_response(cache_key)
+        if cached is not None:
+            if token_stream:
+                token_stream.emit_text(cached)
+            return cached
+
+        try:
+            if token_stream:
+                text = self._stream_to(token_stream, kwargs)
+            else:
+                response = self.client.messages.create(**kwargs)
+                text = response.content[0].text
+            self._store_cached_response(cache_key, text)
+            return text
+        
+        except Exception as e:
+            self.log(f"LLM call failed: {e}", "ERROR")
+            raise
+
+    async def call_llm_async(
+        self,
+        prompt: str,
+        max_tokens: int = 4000,
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """
+        Call Claude LLM without blocking the event loop
+
+        Uses the process-wide AsyncAnthropic client (see llm_client.py)
+        so concurrent generations share one pooled HTTP transport. Streams to
+        the active TokenStream like call_llm().
+
+        Args:
+            prompt: User prompt
+            max_tokens: Maximum tokens in response
+            system_prompt: Optional system prompt
+
+        Returns:
+            LLM response text
+        """
+        token_stream = get_token_stream()
+        if token_stream:
+            parts = []
+            with token_stream.section() as section:
+                async for delta in self.stream_llm(prompt, max_tokens, system_prompt):
+                    parts.append(delta)
+                    token_stream.write(section, delta)
+            return "".join(parts)
+
+        kwargs = self._build_llm_kwargs(prompt, max_tokens, system_prompt)
+
+        cache_key = self._response_cache_key(kwargs)
+        cached = await self._lookup_cached_response_async(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            client = get_async_client(self.api_key)
+            response = await client.messages.create(**kwargs)
+            text = response.content[0].text
+            await self._store_cached_response_async(cache_key, text)
+            return text
+
+        except Exception as e:
+            self.log(f"LLM call failed: {e}", "ERROR")
+            raise
+
+    async def stream_llm(
+        self,
+        prompt: str,
+        max_tokens: int = 4000,
+        system_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a Claude response as text deltas
+
+        A cached response (see enable_response_cache) is yielded whole; a
+        fully streamed response is added to the cache.
+
+        Args:
+            prompt: User prompt
+            max_tokens: Maximum tokens in response
+            system_prompt: Optional system prompt
+
+        Yields:
+            Response text deltas, in order
+        """
+        kwargs = self._build_llm_kwargs(prompt, max_tokens, system_prompt)
+
+        cache_key = self._response_cache_key(kwargs)
+        cached = await self._lookup_cached_response_async(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        try:
+            client = get_async_client(self.api_key)
+            async with client.messages.stream(**kwargs) as stream:
+                async for delta in stream.text_stream:
+                    parts.append(delta)
+                    yield delta
+
+        except Exception as e:
+            self.log(f"LLM call failed: {e}", "ERROR")
+            raise
+
+        await self._store_cached_response_async(cache_key, "".join(parts))
+
+    def _stream_to(self, token_stream: TokenStream, kwargs: Dict) -> str:
+        """Make a blocking streaming call, forwarding deltas as one section"""
+        parts = []
+
+        with token_stream.section() as section, self.client.messages.stream(**kwargs) as stream:
+            for delta in stream.text_stream:
+                parts.append(delta)
+                token_stream.write(section, delta)
+
+        return "".join(parts)
+
+    def _build_llm_kwargs(
+        self,
+        prompt: str,
+        max_tokens: int,
+        system_prompt: Optional[str]
+    ) -> Dict:
+        """Build messages.create() keyword arguments shared by sync and async calls"""
         messages = [{"role": "user", "content": prompt}]
         
         kwargs = {
@@ -105,15 +255,116 @@ class BaseAgent:
         
         if system_prompt:
             kwargs["system"] = system_prompt
-        
+
+        return kwargs
+
+    def enable_response_cache(
+        self,
+        ttl_seconds: Optional[int] = None,
+        force: bool = False,
+        cache: Optional[LLMResponseCache] = None
+    ) -> None:
+        """
+        Opt this agent in to LLM response caching
+
+        Identical requests (model, system prompt, prompt, temperature,
+        max_tokens) are answered from the cache instead of the API. Caching is
+        skipped when temperature is non-zero, since responses are meant to
+        vary, unless force=True.
+
+        Args:
+            ttl_seconds: Entry lifetime (defaults to the cache's TTL)
+            force: Cache even at non-zero temperature
+            cache: Cache instance (defaults to the process-wide cache)
+        """
+        self.response_cache = cache or get_llm_cache()
+        self.response_cache_ttl = ttl_seconds
+        self.response_cache_force = force
+
+    def _response_cache_key(self, kwargs: Dict) -> Optional[str]:
+        """Return the cache key for a request, or None if caching does not apply"""
+        if self.response_cache is None:
+            return None
+        if kwargs["temperature"] != 0 and not self.response_cache_force:
+            return None
+
+        return LLMResponseCache.make_key(
+            model=kwargs["model"],
+            system_prompt=kwargs.get("system"),
+            prompt=kwargs["messages"][0]["content"],
+            temperature=kwargs["temperature"],
+            max_tokens=kwargs["max_tokens"]
+        )
+
+    def _lookup_cached_response(self, cache_key: Optional[str]) -> Optional[str]:
+        """Return a cached response, or None on miss (cache failures count as misses)"""
+        if not cache_key:
+            return None
+
         try:
-            response = self.client.messages.create(**kwargs)
-            return response.content[0].text
-        
+            return self.response_cache.get(cache_key)
         except Exception as e:
-            self.log(f"LLM call failed: {e}", "ERROR")
-            raise
+            self.log(f"LLM cache lookup failed: {e}", "WARNING")
+            return None
+
+    async def _lookup_cached_response_async(self, cache_key: Optional[str]) -> Optional[str]:
+        """_lookup_cached_response for async callers: memory hits inline, SQLite in a thread"""
+        if not cache_key:
+            return None
+
+        try:
+            cached = self.response_cache.get_from_memory(cache_key)
+        except Exception as e:
+            self.log(f"LLM cache lookup failed: {e}", "WARNING")
+            return None
+        if cached is not None:
+            return cached
+
+        return await asyncio.to_thread(self._lookup_cached_response, cache_key)
+
+    async def _store_cached_response_async(self, cache_key: Optional[str], text: str) -> None:
+        """_store_cached_response for async callers (the SQLite write runs in a thread)"""
+        if not cache_key:
+            return
+
+        await asyncio.to_thread(self._store_cached_response, cache_key, text)
+
+    def _store_cached_response(self, cache_key: Optional[str], text: str) -> None:
+        """Store a response if caching applies (cache failures never fail the call)"""
+        if not cache_key:
+            return
+
+        try:
+            self.response_cache.set(cache_key, text, ttl_seconds=self.response_cache_ttl, model=self.model)
+        except Exception as e:
+            self.log(f"Failed to cache LLM response: {e}", "WARNING")
     
+    def render_template(
+        self,
+        template: CompiledTemplate,
+        values: Dict,
+        *fallbacks: Dict,
+        missing: Missing = 'TBD'
+    ) -> str:
+        """
+        Fill a compiled template in one pass and record unfilled fields
+
+        Args:
+            template: Template from load_template()
+            values: Calculated values (highest priority)
+            *fallbacks: Further mappings in priority order (e.g. RAG values, then defaults)
+            missing: Value for fields nothing provides (string, function of the
+                field name, or None to leave the placeholder)
+
+        Returns:
+            Rendered content
+        """
+        result = template.render(values, *fallbacks, missing=missing)
+        self.unfilled_fields = result.unfilled
+        if result.unfilled:
+            self.log(f"{template.name}: {len(result.unfilled)} field(s) unfilled: {', '.join(result.unfilled)}")
+        return result.content
+
     def add_to_memory(self, key: str, value: any) -> None:
         """
         Add item to agent memory
@@ -7,13 +7,13 @@ from typing import Dict
 from pathlib import Path
 import sys
 from datetime import datetime, timedelta
-import re
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class DebriefingGeneratorAgent(BaseAgent):
@@ -33,8 +33,7 @@ class DebriefingGeneratorAgent(BaseAgent):
         super().__init__(name="Debriefing Generator Agent", api_key=api_key, model=model, temperature=0.4)
         
         self.template_path = Path(__file__).parent.parent / "templates" / "debriefing_template.md"
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("DEBRIEFING GENERATOR INITIALIZED")
@@ -140,33 +139,32 @@ class DebriefingGeneratorAgent(BaseAgent):
     
     def _populate_template(self, solicitation_info: Dict, offeror_eval: Dict, winner: Dict, config: Dict) -> str:
         """Populate debriefing template"""
-        content = self.template
+        values = {}
         
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{program_name}}', solicitation_info.get('program_name', 'TBD'))
-        content = content.replace('{{offeror_name}}', offeror_eval.get('name', 'TBD'))
-        content = content.replace('{{debriefing_date}}', datetime.now().strftime('%B %d, %Y'))
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['program_name'] = solicitation_info.get('program_name', 'TBD')
+        values['offeror_name'] = offeror_eval.get('name', 'TBD')
+        values['debriefing_date'] = datetime.now().strftime('%B %d, %Y')
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
         
         # Award information
-        content = content.replace('{{awardee_name}}', winner.get('name', 'TBD'))
-        content = content.replace('{{award_amount}}', winner.get('amount', 'TBD'))
-        content = content.replace('{{award_date}}', winner.get('date', datetime.now().strftime('%B %d, %Y')))
+        values['awardee_name'] = winner.get('name', 'TBD')
+        values['award_amount'] = winner.get('amount', 'TBD')
+        values['award_date'] = winner.get('date', datetime.now().strftime('%B %d, %Y'))
         
         # Evaluation results
-        content = content.replace('{{offeror_overall_rating}}', offeror_eval.get('overall_rating', 'TBD'))
-        content = content.replace('{{offeror_overall_risk}}', offeror_eval.get('overall_risk', 'Moderate'))
-        content = content.replace('{{your_technical_rating}}', offeror_eval.get('technical_rating', 'TBD'))
-        content = content.replace('{{your_management_rating}}', offeror_eval.get('management_rating', 'TBD'))
-        content = content.replace('{{your_proposed_cost}}', offeror_eval.get('cost', 'TBD'))
-        content = content.replace('{{your_ranking}}', str(offeror_eval.get('ranking', 'TBD')))
+        values['offeror_overall_rating'] = offeror_eval.get('overall_rating', 'TBD')
+        values['offeror_overall_risk'] = offeror_eval.get('overall_risk', 'Moderate')
+        values['your_technical_rating'] = offeror_eval.get('technical_rating', 'TBD')
+        values['your_management_rating'] = offeror_eval.get('management_rating', 'TBD')
+        values['your_proposed_cost'] = offeror_eval.get('cost', 'TBD')
+        values['your_ranking'] = str(offeror_eval.get('ranking', 'TBD'))
         
         # Protest deadline (10 days after debriefing)
         protest_deadline = datetime.now() + timedelta(days=10)
-        content = content.replace('{{protest_deadline}}', protest_deadline.strftime('%B %d, %Y'))
+        values['protest_deadline'] = protest_deadline.strftime('%B %d, %Y')
         
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD', content)
-        return content
+        return self.render_template(self.template, values, missing='TBD')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save debriefing to file"""
@@ -16,6 +16,7 @@ from backend.agents.base_agent import BaseAgent
 from backend.rag.retriever import Retriever
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class EvaluationScorecardGeneratorAgent(BaseAgent):
@@ -35,7 +36,15 @@ class EvaluationScorecardGeneratorAgent(BaseAgent):
     Dependencies:
     - BaseAgent: LLM interaction and common utilities
     """
-    
+
+    # Standard evaluation factors scored by generate_full_scorecard_set()
+    EVALUATION_FACTORS = [
+        'Technical Approach',
+        'Management Approach',
+        'Past Performance',
+        'Cost/Price'
+    ]
+
     def __init__(
         self,
         api_key: str,
@@ -61,8 +70,7 @@ class EvaluationScorecardGeneratorAgent(BaseAgent):
         self.template_path = Path(__file__).parent.parent / "templates" / "evaluation_scorecard_template.md"
         
         # Load template
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         # Rating scales
         self.rating_scales = {
@@ -572,7 +580,7 @@ class EvaluationScorecardGeneratorAgent(BaseAgent):
         2. RAG-retrieved values (from documents)
         3. Descriptive TBDs with context
         """
-        content = self.template
+        values = {}
 
         # Helper function for priority-based value selection
         def get_value(config_key=None, rag_key=None, default='TBD'):
@@ -583,19 +591,19 @@ class EvaluationScorecardGeneratorAgent(BaseAgent):
             return default
 
         # Basic information
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{program_name}}', solicitation_info.get('program_name', 'TBD'))
-        content = content.replace('{{offeror_name}}', config.get('offeror_name', '[Offeror Name]'))
-        content = content.replace('{{evaluation_factor}}', evaluation_factor)
-        content = content.replace('{{evaluator_name}}', config.get('evaluator_name', '[Evaluator Name]'))
-        content = content.replace('{{evaluation_date}}', datetime.now().strftime('%B %d, %Y'))
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['program_name'] = solicitation_info.get('program_name', 'TBD')
+        values['offeror_name'] = config.get('offeror_name', '[Offeror Name]')
+        values['evaluation_factor'] = evaluation_factor
+        values['evaluator_name'] = config.get('evaluator_name', '[Evaluator Name]')
+        values['evaluation_date'] = datetime.now().strftime('%B %d, %Y')
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
 
         # Source selection method
-        content = content.replace('{{source_selection_method}}', config.get('source_selection_method', 'Best Value Trade-Off'))
+        values['source_selection_method'] = config.get('source_selection_method', 'Best Value Trade-Off')
 
         # Rating scale
-        content = content.replace('{{rating_scale}}', rating_scale)
+        values['rating_scale'] = rating_scale
 
         # Factor details with RAG enhancement
         factor_description = criteria['description']
@@ -604,29 +612,29 @@ class EvaluationScorecardGeneratorAgent(BaseAgent):
             examples = rag_context['factor_criteria_examples'][:2]  # Top 2
             factor_description += f"\n\n**Key Criteria:** {'; '.join(examples[:100] for examples in examples)}"
 
-        content = content.replace('{{factor_description}}', factor_description)
-        content = content.replace('{{factor_weight}}', get_value('factor_weight', 'weighting_guidance', 'TBD - Weight specified in Section M'))
+        values['factor_description'] = factor_description
+        values['factor_weight'] = get_value('factor_weight', 'weighting_guidance', 'TBD - Weight specified in Section M')
 
         # Evaluation criteria with RAG enhancement
         eval_criteria = 'Per Section M of the solicitation'
         if 'evaluation_guidance' in rag_context:
             eval_criteria += f"\n\n**Evaluation Guidance:** {rag_context['evaluation_guidance']}"
-        content = content.replace('{{evaluation_criteria}}', eval_criteria)
+        values['evaluation_criteria'] = eval_criteria
 
         # Subfactor evaluations
-        content = content.replace('{{subfactor_evaluations}}', subfactor_sections)
+        values['subfactor_evaluations'] = subfactor_sections
 
         # Evaluator information
-        content = content.replace('{{evaluator_title}}', config.get('evaluator_title', 'Technical Evaluator'))
-        content = content.replace('{{evaluator_org}}', config.get('evaluator_org', 'Evaluation Team'))
+        values['evaluator_title'] = config.get('evaluator_title', 'Technical Evaluator')
+        values['evaluator_org'] = config.get('evaluator_org', 'Evaluation Team')
 
         # Offeror information with descriptive TBDs
-        content = content.replace('{{offeror_duns}}', get_value('offeror_duns', default='TBD - Offeror DUNS to be provided'))
-        content = content.replace('{{business_size}}', get_value('business_size', default='TBD - Business size per SAM.gov'))
-        content = content.replace('{{socioeconomic_status}}', get_value('socioeconomic_status', default='TBD - Socioeconomic status per SAM.gov'))
-        content = content.replace('{{volume_name}}', f"{evaluation_factor} Volume")
-        content = content.replace('{{page_count}}', get_value('page_count', default='TBD - Page count from proposal'))
-        content = content.replace('{{proposal_date}}', get_value('proposal_date', default='TBD - Date from proposal submission'))
+        values['offeror_duns'] = get_value('offeror_duns', default='TBD - Offeror DUNS to be provided')
+        values['business_size'] = get_value('business_size', default='TBD - Business size per SAM.gov')
+        values['socioeconomic_status'] = get_value('socioeconomic_status', default='TBD - Socioeconomic status per SAM.gov')
+        values['volume_name'] = f"{evaluation_factor} Volume"
+        values['page_count'] = get_value('page_count', default='TBD - Page count from proposal')
+        values['proposal_date'] = get_value('proposal_date', default='TBD - Date from proposal submission')
 
         # Rating definitions - enhance with RAG if available
         rating_defs = """
@@ -645,7 +653,30 @@ class EvaluationScorecardGeneratorAgent(BaseAgent):
         if 'risk_guidance' in rag_context:
             rating_defs += f"\n**Risk Assessment Guidance:** {rag_context['risk_guidance']}"
 
-        content = content.replace('{{rating_definitions}}', rating_defs)
+        values['rating_definitions'] = rating_defs
+
+        # Fill remaining placeholders with contextual instructions
+        def evaluator_instruction(placeholder: str) -> str:
+            placeholder_lower = placeholder.lower()
+            if 'criteria' in placeholder_lower:
+                return '[Evaluator: Insert specific evaluation criteria from Section M]'
+            elif 'approach' in placeholder_lower:
+                return '[Evaluator: Summarize offeror\'s proposed approach]'
+            elif 'assessment' in placeholder_lower:
+                return '[Evaluator: Provide detailed technical assessment]'
+            elif 'strength' in placeholder_lower:
+                return '[Evaluator: Document specific strengths with rationale]'
+            elif 'weakness' in placeholder_lower:
+                return '[Evaluator: Document specific weaknesses with impact analysis]'
+            elif 'deficiency' in placeholder_lower:
+                return '[Evaluator: Document any deficiencies requiring correction]'
+            elif 'rating' in placeholder_lower:
+                return '[Evaluator: Assign rating: Outstanding/Good/Acceptable/Marginal/Unacceptable]'
+            elif 'risk' in placeholder_lower:
+                return '[Evaluator: Assess risk level: Low/Moderate/High]'
+            return '[Evaluator: Complete this section per evaluation guidelines]'
+
+        content = self.render_template(self.template, values, missing=evaluator_instruction)
 
         # Add evaluation examples section if available
         if 'strength_examples' in rag_context or 'weakness_examples' in rag_context:
@@ -665,31 +696,6 @@ class EvaluationScorecardGeneratorAgent(BaseAgent):
             # Insert before final sections
             content = content.replace('---\n\n## Evaluator Certification', examples_section + '\n---\n\n## Evaluator Certification')
 
-        # Fill remaining placeholders with contextual instructions
-        remaining_placeholders = re.findall(r'\{\{([^}]+)\}\}', content)
-        for placeholder in remaining_placeholders:
-            placeholder_lower = placeholder.lower()
-            if 'criteria' in placeholder_lower:
-                replacement = '[Evaluator: Insert specific evaluation criteria from Section M]'
-            elif 'approach' in placeholder_lower:
-                replacement = '[Evaluator: Summarize offeror\'s proposed approach]'
-            elif 'assessment' in placeholder_lower:
-                replacement = '[Evaluator: Provide detailed technical assessment]'
-            elif 'strength' in placeholder_lower:
-                replacement = '[Evaluator: Document specific strengths with rationale]'
-            elif 'weakness' in placeholder_lower:
-                replacement = '[Evaluator: Document specific weaknesses with impact analysis]'
-            elif 'deficiency' in placeholder_lower:
-                replacement = '[Evaluator: Document any deficiencies requiring correction]'
-            elif 'rating' in placeholder_lower:
-                replacement = '[Evaluator: Assign rating: Outstanding/Good/Acceptable/Marginal/Unacceptable]'
-            elif 'risk' in placeholder_lower:
-                replacement = '[Evaluator: Assess risk level: Low/Moderate/High]'
-            else:
-                replacement = '[Evaluator: Complete this section per evaluation guidelines]'
-
-            content = content.replace(f'{{{{{placeholder}}}}}', replacement)
-
         return content
     
     def generate_full_scorecard_set(
@@ -713,40 +719,66 @@ class EvaluationScorecardGeneratorAgent(BaseAgent):
         print("GENERATING COMPLETE EVALUATION SCORECARD SET")
         print("="*70)
         
-        # Standard evaluation factors
-        factors = [
-            'Technical Approach',
-            'Management Approach',
-            'Past Performance',
-            'Cost/Price'
-        ]
-        
         scorecards = {}
         
-        for factor in factors:
-            print(f"\nGenerating scorecard for: {factor}")
-            
-            task = {
-                'solicitation_info': solicitation_info,
-                'section_m_content': section_m_content,
-                'evaluation_factor': factor,
-                'config': config
-            }
-            
-            result = self.execute(task)
-            scorecards[factor] = result
-            
-            print(f"  ✓ {factor} scorecard complete")
+        for factor in self.EVALUATION_FACTORS:
+            scorecards[factor] = self.generate_factor_scorecard(
+                solicitation_info, section_m_content, factor, config
+            )
         
         print("\n" + "="*70)
         print(f"✅ GENERATED {len(scorecards)} SCORECARDS")
         print("="*70)
         
+        return self.build_scorecard_set(scorecards, solicitation_info)
+    
+    def generate_factor_scorecard(
+        self,
+        solicitation_info: Dict,
+        section_m_content: str,
+        factor: str,
+        config: Dict
+    ) -> Dict:
+        """
+        Generate the scorecard for a single evaluation factor
+        
+        Args:
+            solicitation_info: Solicitation details
+            section_m_content: Section M content
+            factor: Evaluation factor (e.g. 'Technical Approach')
+            config: Configuration
+        
+        Returns:
+            Scorecard result from execute()
+        """
+        print(f"\nGenerating scorecard for: {factor}")
+        
+        result = self.execute({
+            'solicitation_info': solicitation_info,
+            'section_m_content': section_m_content,
+            'evaluation_factor': factor,
+            'config': config
+        })
+        
+        print(f"  ✓ {factor} scorecard complete")
+        return result
+    
+    def build_scorecard_set(self, scorecards: Dict, solicitation_info: Dict) -> Dict:
+        """
+        Package per-factor scorecards as generate_full_scorecard_set() returns them
+        
+        Args:
+            scorecards: Factor -> scorecard result
+            solicitation_info: Solicitation details
+        
+        Returns:
+            Dictionary with scorecards for each factor
+        """
         return {
             'status': 'success',
             'scorecards': scorecards,
             'metadata': {
-                'factors_count': len(factors),
+                'factors_count': len(scorecards),
                 'solicitation_number': solicitation_info.get('solicitation_number', 'TBD')
             }
         }
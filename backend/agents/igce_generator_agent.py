@@ -17,6 +17,7 @@ from backend.agents.base_agent import BaseAgent
 from backend.rag.retriever import Retriever
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class IGCEGeneratorAgent(BaseAgent):
@@ -63,8 +64,7 @@ class IGCEGeneratorAgent(BaseAgent):
         self.template_path = Path(__file__).parent.parent / "templates" / "igce_template.md"
         
         # Load template
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("IGCE GENERATOR AGENT INITIALIZED")
@@ -331,7 +331,7 @@ Format as JSON with keys: labor_categories, wbs_elements, cost_drivers"""
         """
         Build comprehensive context from RAG with targeted queries
 
-        This method queries RAG 5 times with specific queries to extract:
+        This method runs 5 targeted RAG queries as one batched search to extract:
         1. Budget and development costs
         2. Annual sustainment costs
         3. Schedule and milestones
@@ -352,53 +352,39 @@ Format as JSON with keys: labor_categories, wbs_elements, cost_drivers"""
         rag_context = {}
 
         try:
-            # Query 1: Budget and development costs
-            print("    - Querying RAG for budget and development costs...")
-            results = self.retriever.retrieve(
+            # All five queries are embedded and searched in one batch
+            print("    - Querying RAG for costs, sustainment, schedule, personnel and contract structure...")
+            (cost_results, sustainment_results, schedule_results,
+             personnel_results, contract_results) = self.retriever.retrieve_many([
                 f"Total budget development cost lifecycle cost for {program_name} ALMS",
-                k=5
-            )
-            costs = self._extract_costs_from_rag(results)
+                f"Annual sustainment costs software licenses training cloud hosting for {program_name}",
+                f"IOC FOC dates deployment schedule milestones timeline for {program_name}",
+                f"Team size personnel labor categories users training for {program_name}",
+                f"Contract type structure CLIN pricing model approach for {program_name}",
+            ], k=5)
+
+            # Query 1: Budget and development costs
+            costs = self._extract_costs_from_rag(cost_results)
             rag_context.update(costs)
             print(f"      ✓ Extracted {len(costs)} cost data points")
 
             # Query 2: Annual sustainment costs
-            print("    - Querying RAG for sustainment costs...")
-            results = self.retriever.retrieve(
-                f"Annual sustainment costs software licenses training cloud hosting for {program_name}",
-                k=5
-            )
-            sustainment = self._extract_sustainment_from_rag(results)
+            sustainment = self._extract_sustainment_from_rag(sustainment_results)
             rag_context.update(sustainment)
             print(f"      ✓ Extracted {len(sustainment)} sustainment data points")
 
             # Query 3: Schedule and milestones
-            print("    - Querying RAG for schedule milestones...")
-            results = self.retriever.retrieve(
-                f"IOC FOC dates deployment schedule milestones timeline for {program_name}",
-                k=5
-            )
-            schedule = self._extract_schedule_from_rag(results)
+            schedule = self._extract_schedule_from_rag(schedule_results)
             rag_context.update(schedule)
             print(f"      ✓ Extracted {len(schedule)} schedule data points")
 
             # Query 4: Personnel and labor
-            print("    - Querying RAG for personnel information...")
-            results = self.retriever.retrieve(
-                f"Team size personnel labor categories users training for {program_name}",
-                k=5
-            )
-            personnel = self._extract_personnel_from_rag(results)
+            personnel = self._extract_personnel_from_rag(personnel_results)
             rag_context.update(personnel)
             print(f"      ✓ Extracted {len(personnel)} personnel data points")
 
             # Query 5: Contract details
-            print("    - Querying RAG for contract structure...")
-            results = self.retriever.retrieve(
-                f"Contract type structure CLIN pricing model approach for {program_name}",
-                k=5
-            )
-            contract_info = self._extract_contract_info_from_rag(results)
+            contract_info = self._extract_contract_info_from_rag(contract_results)
             rag_context.update(contract_info)
             print(f"      ✓ Extracted {len(contract_info)} contract data points")
 
@@ -1202,8 +1188,11 @@ JSON:"""
         2. RAG-retrieved values
         3. Smart defaults
         4. TBD (only when truly unknown)
+
+        Values are collected into a mapping and the template is rendered in
+        a single pass at the end.
         """
-        content = self.template
+        values = {}
 
         # Helper function to get value with priority
         def get_value(key, calculated=None, rag_key=None, default='TBD'):
@@ -1215,22 +1204,22 @@ JSON:"""
             return default
 
         # Project information
-        content = content.replace('{{program_name}}', project_info.get('program_name', 'TBD'))
-        content = content.replace('{{organization}}', project_info.get('organization', 'Department of Defense'))
-        content = content.replace('{{prepared_by}}', config.get('prepared_by', 'Cost Analyst'))
-        content = content.replace('{{date}}', datetime.now().strftime('%B %d, %Y'))
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['program_name'] = project_info.get('program_name', 'TBD')
+        values['organization'] = project_info.get('organization', 'Department of Defense')
+        values['prepared_by'] = config.get('prepared_by', 'Cost Analyst')
+        values['date'] = datetime.now().strftime('%B %d, %Y')
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
 
         # Program overview - use RAG if available
         program_overview = project_info.get('background', '')
         if not program_overview and 'total_users' in rag_context:
             program_overview = f"Program to deploy logistics management system for {rag_context.get('total_users', '')} users."
-        content = content.replace('{{program_overview}}', program_overview or 'TBD')
+        values['program_overview'] = program_overview or 'TBD'
 
         # Costs - Priority: calculated > RAG > TBD
-        content = content.replace('{{total_labor}}', str(labor_costs['total']))
-        content = content.replace('{{total_materials}}', str(materials_costs['total']))
-        content = content.replace('{{contingency_percent}}', str(risk_analysis['contingency_percent']))
+        values['total_labor'] = str(labor_costs['total'])
+        values['total_materials'] = str(materials_costs['total'])
+        values['contingency_percent'] = str(risk_analysis['contingency_percent'])
 
         # Calculate year-by-year breakdowns for cost tables
         # Parse numeric values from cost strings
@@ -1300,7 +1289,7 @@ JSON:"""
 
         # Generate labor categories table
         labor_cat_table = self._generate_labor_categories_table(cost_elements['labor_categories'])
-        content = content.replace('{{labor_categories_table}}', labor_cat_table)
+        values['labor_categories_table'] = labor_cat_table
 
         # Generate WBS labor tables for each year
         base_wbs_table, base_year_hours = self._generate_wbs_labor_table(
@@ -1308,16 +1297,16 @@ JSON:"""
             cost_elements['labor_categories'],
             year=0
         )
-        content = content.replace('{{base_year_labor_wbs}}', base_wbs_table)
-        content = content.replace('{{base_year_total_hours}}', str(base_year_hours))
+        values['base_year_labor_wbs'] = base_wbs_table
+        values['base_year_total_hours'] = str(base_year_hours)
 
         opt1_wbs_table, opt1_hours = self._generate_wbs_labor_table(
             cost_elements['wbs_elements'],
             cost_elements['labor_categories'],
             year=1
         )
-        content = content.replace('{{option_year_1_labor_wbs}}', opt1_wbs_table)
-        content = content.replace('{{opt1_total_hours}}', str(opt1_hours))
+        values['option_year_1_labor_wbs'] = opt1_wbs_table
+        values['opt1_total_hours'] = str(opt1_hours)
 
         # Additional option years (combine for brevity)
         additional_years = []
@@ -1333,39 +1322,39 @@ JSON:"""
             additional_years.append(opt_wbs_table + "\n")
             additional_years.append(f"| | | | **Total Option Year {year_num} Labor Hours:** | **{opt_hours}** | **{locals()[f'labor_opt{year_num}']}** |\n")
 
-        content = content.replace('{{additional_option_years_labor}}', ''.join(additional_years))
+        values['additional_option_years_labor'] = ''.join(additional_years)
 
         # Generate hardware/equipment table
         hardware_table, hardware_total = self._generate_hardware_equipment_table(project_info, rag_context)
-        content = content.replace('{{hardware_equipment_table}}', hardware_table)
-        content = content.replace('{{total_hardware}}', hardware_total)
+        values['hardware_equipment_table'] = hardware_table
+        values['total_hardware'] = hardware_total
 
         # Generate software licenses table
         software_table, software_total = self._generate_software_licenses_table(project_info, rag_context)
-        content = content.replace('{{software_licenses_table}}', software_table)
-        content = content.replace('{{total_software}}', software_total)
+        values['software_licenses_table'] = software_table
+        values['total_software'] = software_total
 
         # Generate cloud infrastructure table
         cloud_table, cloud_total = self._generate_cloud_infrastructure_table(project_info, rag_context)
-        content = content.replace('{{cloud_infrastructure_table}}', cloud_table)
-        content = content.replace('{{total_cloud}}', cloud_total)
+        values['cloud_infrastructure_table'] = cloud_table
+        values['total_cloud'] = cloud_total
 
         # Generate travel table
         travel_table = self._generate_travel_table(project_info)
-        content = content.replace('{{travel_table}}', travel_table)
+        values['travel_table'] = travel_table
 
         # Travel assumptions
         travel_assumptions = f"Travel estimates based on {4} trips per year. Per diem rates use GSA CONUS rates ($180/day). Airfare estimated at $600 per trip based on historical data for CONUS travel."
-        content = content.replace('{{travel_assumptions}}', travel_assumptions)
+        values['travel_assumptions'] = travel_assumptions
 
         # Generate training table
         training_table, training_total = self._generate_training_table(project_info, rag_context)
-        content = content.replace('{{training_table}}', training_table)
-        content = content.replace('{{total_training}}', training_total)
+        values['training_table'] = training_table
+        values['total_training'] = training_total
 
         # Generate risk assessment table
         risk_table = self._generate_risk_assessment_table(project_info, risk_analysis)
-        content = content.replace('{{risk_assessment_table}}', risk_table)
+        values['risk_assessment_table'] = risk_table
 
         # ====================================================================
         # PHASE 2: Generate narrative sections
@@ -1373,41 +1362,41 @@ JSON:"""
 
         # Materials cost assumptions
         materials_assumptions = f"Materials costs include hardware procurement ({hardware_total}), software licensing ({software_total}), and cloud infrastructure ({cloud_total}). Estimates based on GSA pricing, vendor quotes, and cloud service calculators. Annual escalation of 3% applied to option years per historical inflation trends."
-        content = content.replace('{{materials_cost_assumptions}}', materials_assumptions)
+        values['materials_cost_assumptions'] = materials_assumptions
 
         # Contingency rationale
         contingency_rationale = f"Contingency of {risk_analysis['contingency_percent']}% reflects medium technical risk with established technology stack and moderate integration complexity. Based on historical performance data from similar government IT service contracts and risk assessment identifying 5 primary risk categories."
-        content = content.replace('{{contingency_rationale}}', contingency_rationale)
+        values['contingency_rationale'] = contingency_rationale
 
         # Materials and equipment BOE
         materials_equipment_boe = f"Materials and equipment costs based on GSA Advantage pricing ({hardware_total}), commercial software pricing with government discounts ({software_total}), and cloud service provider pricing ({cloud_total}). Hardware estimates use current GSA Schedule 70 pricing. Software licenses reflect enterprise pricing with volume discounts. Cloud costs calculated using AWS/Azure pricing calculators for production workloads."
-        content = content.replace('{{materials_equipment_boe}}', materials_equipment_boe)
+        values['materials_equipment_boe'] = materials_equipment_boe
 
         # Travel and ODC BOE
         travel_odc_boe = f"Travel costs based on GSA per diem rates ($180/day CONUS average) and historical airfare data ($600 average per trip). Travel estimates include requirements gathering (2 trips), design reviews (3 trips), user acceptance testing (2 trips), and training delivery (4 trips). Training costs ({training_total}) based on commercial training provider rates with government discounts."
-        content = content.replace('{{travel_odc_boe}}', travel_odc_boe)
+        values['travel_odc_boe'] = travel_odc_boe
 
         # Other direct costs table and total
         odc_table = "| Shipping and Handling | Materials and equipment delivery | **$5,000** | GSA freight rates |\n"
         odc_table += "| Subcontractor Management | Oversight and coordination | **$10,000** | Industry standards |\n"
         odc_table += "| Documentation and Reports | Technical documentation | **$8,000** | Technical writing rates |"
-        content = content.replace('{{other_direct_costs_table}}', odc_table)
-        content = content.replace('{{total_other_odc}}', "$23,000")
+        values['other_direct_costs_table'] = odc_table
+        values['total_other_odc'] = "$23,000"
 
         # ====================================================================
 
         # Replace yearly cost placeholders in template
-        content = content.replace('{{base_labor}}', labor_base)
-        content = content.replace('{{opt1_labor}}', labor_opt1)
-        content = content.replace('{{opt2_labor}}', labor_opt2)
-        content = content.replace('{{opt3_labor}}', labor_opt3)
-        content = content.replace('{{opt4_labor}}', labor_opt4)
-
-        content = content.replace('{{base_materials}}', materials_base)
-        content = content.replace('{{opt1_materials}}', materials_opt1)
-        content = content.replace('{{opt2_materials}}', materials_opt2)
-        content = content.replace('{{opt3_materials}}', materials_opt3)
-        content = content.replace('{{opt4_materials}}', materials_opt4)
+        values['base_labor'] = labor_base
+        values['opt1_labor'] = labor_opt1
+        values['opt2_labor'] = labor_opt2
+        values['opt3_labor'] = labor_opt3
+        values['opt4_labor'] = labor_opt4
+
+        values['base_materials'] = materials_base
+        values['opt1_materials'] = materials_opt1
+        values['opt2_materials'] = materials_opt2
+        values['opt3_materials'] = materials_opt3
+        values['opt4_materials'] = materials_opt4
 
         # Add travel costs (typically 5-10% of labor for services contracts)
         travel_percentage = 0.05  # 5% of labor
@@ -1419,12 +1408,12 @@ JSON:"""
         travel_opt4 = f"${travel_yearly.get('option_year_4', 0):,.2f}"
         travel_total = f"${labor_total_value * travel_percentage:,.2f}"
 
-        content = content.replace('{{base_travel}}', travel_base)
-        content = content.replace('{{opt1_travel}}', travel_opt1)
-        content = content.replace('{{opt2_travel}}', travel_opt2)
-        content = content.replace('{{opt3_travel}}', travel_opt3)
-        content = content.replace('{{opt4_travel}}', travel_opt4)
-        content = content.replace('{{total_travel}}', travel_total)
+        values['base_travel'] = travel_base
+        values['opt1_travel'] = travel_opt1
+        values['opt2_travel'] = travel_opt2
+        values['opt3_travel'] = travel_opt3
+        values['opt4_travel'] = travel_opt4
+        values['total_travel'] = travel_total
 
         # Add other direct costs (typically 3-5% of labor+materials)
         odc_percentage = 0.03  # 3%
@@ -1437,12 +1426,12 @@ JSON:"""
         odc_opt4 = f"${odc_yearly.get('option_year_4', 0):,.2f}"
         odc_total = f"${odc_base_cost:,.2f}"
 
-        content = content.replace('{{base_odc}}', odc_base)
-        content = content.replace('{{opt1_odc}}', odc_opt1)
-        content = content.replace('{{opt2_odc}}', odc_opt2)
-        content = content.replace('{{opt3_odc}}', odc_opt3)
-        content = content.replace('{{opt4_odc}}', odc_opt4)
-        content = content.replace('{{total_odc}}', odc_total)
+        values['base_odc'] = odc_base
+        values['opt1_odc'] = odc_opt1
+        values['opt2_odc'] = odc_opt2
+        values['opt3_odc'] = odc_opt3
+        values['opt4_odc'] = odc_opt4
+        values['total_odc'] = odc_total
 
         # Recalculate subtotals including travel and ODC
         total_base = labor_yearly['base_year'] + materials_yearly['base_year'] + travel_yearly['base_year'] + odc_yearly['base_year']
@@ -1462,12 +1451,12 @@ JSON:"""
         subtotal_opt4 = f"${total_opt4:,.2f}"
         subtotal_total = f"${total_base + total_opt1 + total_opt2 + total_opt3 + total_opt4:,.2f}"
 
-        content = content.replace('{{base_subtotal}}', subtotal_base)
-        content = content.replace('{{opt1_subtotal}}', subtotal_opt1)
-        content = content.replace('{{opt2_subtotal}}', subtotal_opt2)
-        content = content.replace('{{opt3_subtotal}}', subtotal_opt3)
-        content = content.replace('{{opt4_subtotal}}', subtotal_opt4)
-        content = content.replace('{{total_subtotal}}', subtotal_total)
+        values['base_subtotal'] = subtotal_base
+        values['opt1_subtotal'] = subtotal_opt1
+        values['opt2_subtotal'] = subtotal_opt2
+        values['opt3_subtotal'] = subtotal_opt3
+        values['opt4_subtotal'] = subtotal_opt4
+        values['total_subtotal'] = subtotal_total
 
         # Calculate and populate contingency costs (based on subtotals)
         contingency_rate = risk_analysis['contingency_percent'] / 100
@@ -1478,12 +1467,12 @@ JSON:"""
         contingency_opt4 = f"${total_opt4 * contingency_rate:,.2f}"
         contingency_total = f"${(total_base + total_opt1 + total_opt2 + total_opt3 + total_opt4) * contingency_rate:,.2f}"
 
-        content = content.replace('{{base_contingency}}', contingency_base)
-        content = content.replace('{{opt1_contingency}}', contingency_opt1)
-        content = content.replace('{{opt2_contingency}}', contingency_opt2)
-        content = content.replace('{{opt3_contingency}}', contingency_opt3)
-        content = content.replace('{{opt4_contingency}}', contingency_opt4)
-        content = content.replace('{{total_contingency}}', contingency_total)
+        values['base_contingency'] = contingency_base
+        values['opt1_contingency'] = contingency_opt1
+        values['opt2_contingency'] = contingency_opt2
+        values['opt3_contingency'] = contingency_opt3
+        values['opt4_contingency'] = contingency_opt4
+        values['total_contingency'] = contingency_total
 
         # Calculate and populate total costs (subtotal + contingency)
         final_base = f"${total_base * (1 + contingency_rate):,.2f}"
@@ -1492,11 +1481,11 @@ JSON:"""
         final_opt3 = f"${total_opt3 * (1 + contingency_rate):,.2f}"
         final_opt4 = f"${total_opt4 * (1 + contingency_rate):,.2f}"
 
-        content = content.replace('{{base_total}}', final_base)
-        content = content.replace('{{opt1_total}}', final_opt1)
-        content = content.replace('{{opt2_total}}', final_opt2)
-        content = content.replace('{{opt3_total}}', final_opt3)
-        content = content.replace('{{opt4_total}}', final_opt4)
+        values['base_total'] = final_base
+        values['opt1_total'] = final_opt1
+        values['opt2_total'] = final_opt2
+        values['opt3_total'] = final_opt3
+        values['opt4_total'] = final_opt4
 
         # Grand total - use RAG if available
         grand_total = project_info.get('estimated_value', '')
@@ -1504,19 +1493,19 @@ JSON:"""
             grand_total = f"{rag_context['development_cost']} development, {rag_context['lifecycle_cost']} lifecycle"
         elif not grand_total and 'total_budget' in rag_context:
             grand_total = rag_context['total_budget']
-        content = content.replace('{{grand_total}}', grand_total or 'TBD')
+        values['grand_total'] = grand_total or 'TBD'
 
         # Contract information - use RAG if available
         contract_type = config.get('contract_type', '')
         if not contract_type and 'contract_type_detail' in rag_context:
             contract_type = rag_context['contract_type_detail']
-        content = content.replace('{{contract_type}}', contract_type or 'services')
+        values['contract_type'] = contract_type or 'services'
 
         # Period of performance - enhanced with RAG
         period = project_info.get('period_of_performance', '')
         if not period and 'ioc_date' in rag_context and 'foc_date' in rag_context:
             period = f"Through {rag_context['foc_date']} (IOC: {rag_context['ioc_date']}, FOC: {rag_context['foc_date']})"
-        content = content.replace('{{period_of_performance}}', period or '12 months base + 4 option years')
+        values['period_of_performance'] = period or '12 months base + 4 option years'
 
         # Contract structure - use RAG
         contract_structure = get_value(
@@ -1524,7 +1513,7 @@ JSON:"""
             rag_key='acquisition_approach',
             default='Base year plus options'
         )
-        content = content.replace('{{contract_structure}}', contract_structure)
+        values['contract_structure'] = contract_structure
 
         # Estimate basis - enhanced with RAG data
         estimate_basis_parts = [
@@ -1536,7 +1525,7 @@ JSON:"""
             estimate_basis_parts.append(f"- {len(cost_benchmarks)} comparable program benchmarks")
         if 'total_budget' in rag_context:
             estimate_basis_parts.append(f"- Program baseline budget: {rag_context['total_budget']}")
-        content = content.replace('{{estimate_basis}}', '\n'.join(estimate_basis_parts))
+        values['estimate_basis'] = '\n'.join(estimate_basis_parts)
 
         # Contract type rationale - enhanced
         rationale_parts = []
@@ -1545,12 +1534,12 @@ JSON:"""
         if 'pricing_model' in rag_context:
             rationale_parts.append(f"{rag_context['pricing_model']} licensing model")
         rationale_parts.append("Provides cost certainty and performance incentives")
-        content = content.replace('{{contract_type_rationale}}', '. '.join(rationale_parts))
+        values['contract_type_rationale'] = '. '.join(rationale_parts)
 
         # BOE sections
-        content = content.replace('{{labor_rate_boe}}', boe['labor_rate_boe'])
-        content = content.replace('{{labor_hour_boe}}', boe['labor_hour_boe'])
-        content = content.replace('{{labor_rate_basis}}', "Based on GSA CALC and industry benchmarks")
+        values['labor_rate_boe'] = boe['labor_rate_boe']
+        values['labor_hour_boe'] = boe['labor_hour_boe']
+        values['labor_rate_basis'] = "Based on GSA CALC and industry benchmarks"
 
         # Key assumptions - build from RAG data
         assumptions = []
@@ -1565,7 +1554,7 @@ JSON:"""
             "Government provides program management oversight",
             f"Contingency: {risk_analysis['contingency_percent']}% for technical and schedule risks"
         ])
-        content = content.replace('{{key_assumptions}}', '\n'.join(f"- {a}" for a in assumptions))
+        values['key_assumptions'] = '\n'.join(f"- {a}" for a in assumptions)
 
         # Confidence level - enhanced with data availability
         data_points = len(rag_context) + len(cost_benchmarks)
@@ -1581,8 +1570,8 @@ JSON:"""
         else:
             confidence = "MEDIUM"
             confidence_rationale = "Based on requirements analysis and industry cost factors"
-        content = content.replace('{{confidence_level}}', confidence)
-        content = content.replace('{{confidence_rationale}}', confidence_rationale)
+        values['confidence_level'] = confidence
+        values['confidence_rationale'] = confidence_rationale
 
         # Labor cost assumptions - enhanced
         labor_assumptions = [
@@ -1593,36 +1582,32 @@ JSON:"""
         ]
         if 'team_size' in rag_context:
             labor_assumptions.append(f"Core team size: {rag_context['team_size']} personnel")
-        content = content.replace('{{labor_cost_assumptions}}', '\n'.join(f"- {a}" for a in labor_assumptions))
+        values['labor_cost_assumptions'] = '\n'.join(f"- {a}" for a in labor_assumptions)
 
         # Escalation factors
-        content = content.replace('{{escalation_factors}}',
-            "- Base Year: 0%\n- Option Year 1-4: 3.0% annually (historical average)")
-
-        # Annual sustainment data from RAG
-        if 'license_cost_annual' in rag_context:
-            content = content.replace('{{annual_license_cost}}', rag_context['license_cost_annual'])
-        if 'training_cost_annual' in rag_context:
-            content = content.replace('{{annual_training_cost}}', rag_context['training_cost_annual'])
-        if 'cloud_cost_annual' in rag_context:
-            content = content.replace('{{annual_cloud_cost}}', rag_context['cloud_cost_annual'])
-        if 'annual_sustainment_total' in rag_context:
-            content = content.replace('{{annual_sustainment}}', rag_context['annual_sustainment_total'])
+        values['escalation_factors'] = "- Base Year: 0%\n- Option Year 1-4: 3.0% annually (historical average)"
+
+        # Annual sustainment data: RAG only, no calculated values
+        rag_values = {
+            'annual_license_cost': rag_context.get('license_cost_annual'),
+            'annual_training_cost': rag_context.get('training_cost_annual'),
+            'annual_cloud_cost': rag_context.get('cloud_cost_annual'),
+            'annual_sustainment': rag_context.get('annual_sustainment_total'),
+        }
 
         # Fill remaining placeholders with descriptive TBD (not lazy!)
-        remaining_placeholders = re.findall(r'\{\{([^}]+)\}\}', content)
-        for placeholder in remaining_placeholders:
+        def descriptive_tbd(placeholder: str) -> str:
             # Replace with TBD but keep the field name for clarity
             if 'cost' in placeholder.lower() or 'budget' in placeholder.lower():
-                content = content.replace(f'{{{{{placeholder}}}}}', 'TBD - Detailed cost breakdown pending')
+                return 'TBD - Detailed cost breakdown pending'
             elif 'date' in placeholder.lower() or 'schedule' in placeholder.lower():
-                content = content.replace(f'{{{{{placeholder}}}}}', 'TBD - Schedule to be determined')
+                return 'TBD - Schedule to be determined'
             elif 'table' in placeholder.lower() or 'wbs' in placeholder.lower():
-                content = content.replace(f'{{{{{placeholder}}}}}', 'TBD - Detailed breakdown in development')
-            else:
-                content = content.replace(f'{{{{{placeholder}}}}}', 'TBD')
+                return 'TBD - Detailed breakdown in development'
+            return 'TBD'
 
-        return content
+        # Priority: calculated > RAG > descriptive TBD
+        return self.render_template(self.template, values, rag_values, missing=descriptive_tbd)
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """
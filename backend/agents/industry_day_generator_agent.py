@@ -7,7 +7,6 @@ from typing import Dict, Optional, List
 from pathlib import Path
 import sys
 from datetime import datetime, timedelta
-import re
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -15,6 +14,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class IndustryDayGeneratorAgent(BaseAgent):
@@ -57,8 +57,7 @@ class IndustryDayGeneratorAgent(BaseAgent):
         self.template_path = Path(__file__).parent.parent / "templates" / "industry_day_template.md"
         
         # Load template
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("INDUSTRY DAY GENERATOR AGENT INITIALIZED")
@@ -400,67 +399,67 @@ class IndustryDayGeneratorAgent(BaseAgent):
         config: Dict
     ) -> str:
         """Populate Industry Day template"""
-        content = self.template
+        values = {}
         
         # Calculate Industry Day date (typically 7-10 days after RFP release)
         industry_day_date = datetime.now() + timedelta(days=28)
         
         # Basic information
-        content = content.replace('{{program_name}}', project_info.get('program_name', 'TBD'))
-        content = content.replace('{{industry_day_date}}', industry_day_date.strftime('%B %d, %Y'))
-        content = content.replace('{{industry_day_time}}', '9:00 AM - 2:30 PM')
-        content = content.replace('{{start_time}}', '9:00 AM')
-        content = content.replace('{{end_time}}', '2:30 PM')
-        content = content.replace('{{timezone}}', 'Eastern Time')
-        content = content.replace('{{location}}', config.get('venue_name', 'Federal Building Conference Center'))
-        content = content.replace('{{venue_name}}', config.get('venue_name', 'Federal Building Conference Center'))
-        content = content.replace('{{venue_address}}', config.get('venue_address', 'Washington, DC 20001'))
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['program_name'] = project_info.get('program_name', 'TBD')
+        values['industry_day_date'] = industry_day_date.strftime('%B %d, %Y')
+        values['industry_day_time'] = '9:00 AM - 2:30 PM'
+        values['start_time'] = '9:00 AM'
+        values['end_time'] = '2:30 PM'
+        values['timezone'] = 'Eastern Time'
+        values['location'] = config.get('venue_name', 'Federal Building Conference Center')
+        values['venue_name'] = config.get('venue_name', 'Federal Building Conference Center')
+        values['venue_address'] = config.get('venue_address', 'Washington, DC 20001')
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
         
         # Registration information
         registration_deadline = industry_day_date - timedelta(days=7)
-        content = content.replace('{{registration_deadline}}', registration_deadline.strftime('%B %d, %Y'))
-        content = content.replace('{{registration_email}}', config.get('registration_email', project_info.get('ko_email', 'events@agency.mil')))
-        content = content.replace('{{registration_link}}', config.get('registration_link', 'TBD'))
-        content = content.replace('{{attendance_type}}', config.get('attendance_type', 'In-person and Virtual (WebEx)'))
+        values['registration_deadline'] = registration_deadline.strftime('%B %d, %Y')
+        values['registration_email'] = config.get('registration_email', project_info.get('ko_email', 'events@agency.mil'))
+        values['registration_link'] = config.get('registration_link', 'TBD')
+        values['attendance_type'] = config.get('attendance_type', 'In-person and Virtual (WebEx)')
         
         # Agenda table
         agenda_table = '\n'.join([
             f"| {item['time']} | {item['duration']} | {item['activity']} | {item['presenter']} | {item['location']} |"
             for item in agenda
         ])
-        content = content.replace('{{agenda_table}}', agenda_table)
+        values['agenda_table'] = agenda_table
         
         # FAQs
         faq_section = ''
         for i, faq in enumerate(faqs, 1):
             faq_section += f"\n\n#### Q{i}: {faq['question']}\n**A:** {faq['answer']}"
             # Also fill individual FAQ placeholders
-            content = content.replace(f'{{{{faq_{i}_question}}}}', faq['question'])
-            content = content.replace(f'{{{{faq_{i}_answer}}}}', faq['answer'])
-        content = content.replace('{{additional_faqs}}', faq_section)
+            values[f'faq_{i}_question'] = faq['question']
+            values[f'faq_{i}_answer'] = faq['answer']
+        values['additional_faqs'] = faq_section
         
         # Q&A process
-        content = content.replace('{{qa_format}}', qa_process['format'])
-        content = content.replace('{{question_submission}}', qa_process['submission'])
-        content = content.replace('{{response_method}}', qa_process['response_method'])
-        content = content.replace('{{questions_email}}', config.get('questions_email', project_info.get('ko_email', 'contracting@agency.mil')))
+        values['qa_format'] = qa_process['format']
+        values['question_submission'] = qa_process['submission']
+        values['response_method'] = qa_process['response_method']
+        values['questions_email'] = config.get('questions_email', project_info.get('ko_email', 'contracting@agency.mil'))
         questions_deadline = industry_day_date + timedelta(days=7)
-        content = content.replace('{{questions_deadline}}', questions_deadline.strftime('%B %d, %Y'))
+        values['questions_deadline'] = questions_deadline.strftime('%B %d, %Y')
         
         # POC information
-        content = content.replace('{{poc_name}}', config.get('poc_name', project_info.get('contracting_officer', 'John Doe')))
-        content = content.replace('{{poc_email}}', config.get('poc_email', project_info.get('ko_email', 'contracting@agency.mil')))
-        content = content.replace('{{poc_phone}}', config.get('poc_phone', project_info.get('ko_phone', '(703) 555-0000')))
-        content = content.replace('{{event_contact_name}}', config.get('poc_name', project_info.get('contracting_officer', 'John Doe')))
-        content = content.replace('{{event_contact_email}}', config.get('poc_email', project_info.get('ko_email', 'events@agency.mil')))
-        content = content.replace('{{event_contact_phone}}', config.get('poc_phone', '(703) 555-0000'))
+        values['poc_name'] = config.get('poc_name', project_info.get('contracting_officer', 'John Doe'))
+        values['poc_email'] = config.get('poc_email', project_info.get('ko_email', 'contracting@agency.mil'))
+        values['poc_phone'] = config.get('poc_phone', project_info.get('ko_phone', '(703) 555-0000'))
+        values['event_contact_name'] = config.get('poc_name', project_info.get('contracting_officer', 'John Doe'))
+        values['event_contact_email'] = config.get('poc_email', project_info.get('ko_email', 'events@agency.mil'))
+        values['event_contact_phone'] = config.get('poc_phone', '(703) 555-0000')
         
         # Program information for slides
-        content = content.replace('{{agency}}', project_info.get('organization', 'Department of Defense'))
-        content = content.replace('{{date}}', industry_day_date.strftime('%B %d, %Y'))
-        content = content.replace('{{estimated_value}}', project_info.get('estimated_value', 'TBD'))
-        content = content.replace('{{period_of_performance}}', project_info.get('period_of_performance', '12 months base + 4 option years'))
+        values['agency'] = project_info.get('organization', 'Department of Defense')
+        values['date'] = industry_day_date.strftime('%B %d, %Y')
+        values['estimated_value'] = project_info.get('estimated_value', 'TBD')
+        values['period_of_performance'] = project_info.get('period_of_performance', '12 months base + 4 option years')
         
         # Contract type specific content
         contract_type = config.get('contract_type', 'services')
@@ -476,19 +475,16 @@ class IndustryDayGeneratorAgent(BaseAgent):
 - Intellectual property considerations
 - Technology transition strategy
 """
-            content = content.replace('{{contract_type_technical_slides}}', rd_slides)
-            content = content.replace('{{contract_type_technical_deep_dive}}', '### Technology Innovation\nDiscussion of technology maturation approach, TRL advancement, and innovation opportunities.')
+            values['contract_type_technical_slides'] = rd_slides
+            values['contract_type_technical_deep_dive'] = '### Technology Innovation\nDiscussion of technology maturation approach, TRL advancement, and innovation opportunities.'
         else:
-            content = content.replace('{{contract_type_technical_slides}}', '')
-            content = content.replace('{{contract_type_technical_deep_dive}}', '')
+            values['contract_type_technical_slides'] = ''
+            values['contract_type_technical_deep_dive'] = ''
         
         # Max attendees
-        content = content.replace('{{max_attendees_per_company}}', '4')
+        values['max_attendees_per_company'] = '4'
         
-        # Fill remaining placeholders
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD', content)
-        
-        return content
+        return self.render_template(self.template, values, missing='TBD')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save Industry Day materials to file"""
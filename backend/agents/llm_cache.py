@@ -0,0 +1,276 @@
+"""
+LLM Cache: Content-addressed cache for Claude responses
+
+Caches responses keyed by a hash of (model, system prompt, prompt,
+temperature, max_tokens) so repeated identical requests - e.g. re-scoring
+unchanged content in QualityAgent - skip the API round trip.
+
+Two tiers:
+- In-memory LRU (fast, per process)
+- On-disk SQLite (shared across processes and restarts)
+
+Every entry carries its own expiry. Caching is opt-in per agent via
+BaseAgent.enable_response_cache().
+
+Configuration (environment variables):
+- LLM_CACHE_PATH: SQLite file (default backend/data/llm_cache.db)
+- LLM_CACHE_MAX_ENTRIES: In-memory LRU size (default 1000)
+- LLM_CACHE_TTL_SECONDS: Default entry lifetime (default 86400)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "data" / "llm_cache.db"
+
+
+class LLMResponseCache:
+    """
+    Two-tier (memory LRU + SQLite) cache for LLM responses
+
+    Thread-safe; agents running in worker threads share one instance.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: int = 1000,
+        default_ttl_seconds: int = 86400
+    ):
+        """
+        Initialize response cache
+
+        Args:
+            db_path: SQLite file path, or None to disable the disk tier
+            max_entries: Maximum entries held in the in-memory LRU
+            default_ttl_seconds: Lifetime for entries stored without an explicit TTL
+        """
+        self.max_entries = max_entries
+        self.default_ttl_seconds = default_ttl_seconds
+
+        # key -> (response, expires_at)
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'writes': 0
+        }
+
+        self.db_path = Path(db_path) if db_path else None
+        self._conn = None
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    model TEXT,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache (expires_at)")
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: Optional[str],
+        prompt: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """
+        Build the content-addressed cache key for a request
+
+        Returns:
+            SHA-256 hex digest of the request parameters
+        """
+        payload = json.dumps(
+            [model, system_prompt or "", prompt, float(temperature), int(max_tokens)],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_from_memory(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response in the in-memory tier only
+
+        Never touches SQLite, so it is safe to call on an event loop; on None,
+        fall back to get() (off the loop).
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text, or None if not in memory
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > now:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return entry[0]
+            return None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text, or None on miss/expiry
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return response
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT response, expires_at FROM llm_cache WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row is not None:
+                    response, expires_at = row
+                    if expires_at > now:
+                        self._remember(key, response, expires_at)
+                        self.stats['disk_hits'] += 1
+                        return response
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+
+            self.stats['misses'] += 1
+            return None
+
+    def set(
+        self,
+        key: str,
+        response: str,
+        ttl_seconds: Optional[int] = None,
+        model: Optional[str] = None
+    ) -> None:
+        """
+        Store a response
+
+        Args:
+            key: Cache key from make_key()
+            response: Response text
+            ttl_seconds: Entry lifetime (defaults to default_ttl_seconds)
+            model: Model name, stored for inspection only
+        """
+        now = time.time()
+        expires_at = now + (ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds)
+
+        with self._lock:
+            self._remember(key, response, expires_at)
+
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, response, model, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, response, model, now, expires_at)
+                )
+                self._conn.commit()
+
+            self.stats['writes'] += 1
+
+    def _remember(self, key: str, response: str, expires_at: float) -> None:
+        """Insert into the memory tier, evicting least recently used entries (lock held)"""
+        self._memory[key] = (response, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """
+        Remove expired entries from both tiers
+
+        Returns:
+            Number of disk entries removed
+        """
+        now = time.time()
+
+        with self._lock:
+            for key in [k for k, (_, expires_at) in self._memory.items() if expires_at <= now]:
+                del self._memory[key]
+
+            if self._conn is None:
+                return 0
+
+            cursor = self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+
+    def get_statistics(self) -> Dict:
+        """
+        Get hit/miss counters
+
+        Returns:
+            Dictionary with hit, miss and size statistics
+        """
+        with self._lock:
+            hits = self.stats['memory_hits'] + self.stats['disk_hits']
+            lookups = hits + self.stats['misses']
+            return {
+                **self.stats,
+                'hits': hits,
+                'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries
+            }
+
+
+# Singleton instance
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Get the process-wide LLM response cache
+
+    Returns:
+        LLMResponseCache instance
+    """
+    global _llm_cache
+
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache(
+            db_path=os.getenv("LLM_CACHE_PATH", str(DEFAULT_CACHE_PATH)),
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 1000)),
+            default_ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", 86400))
+        )
+
+    return _llm_cache
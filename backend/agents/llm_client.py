@@ -0,0 +1,119 @@
+"""
+LLM Client: Process-wide async Claude client
+
+Provides a single AsyncAnthropic client per API key, backed by a pooled
+httpx transport. Async code paths (GenerationCoordinator, FastAPI handlers)
+await Claude through this client instead of blocking the event loop with the
+synchronous SDK.
+
+Pool sizing is configurable via environment variables:
+- LLM_MAX_CONNECTIONS: Maximum concurrent HTTP connections (default 20)
+- LLM_MAX_KEEPALIVE_CONNECTIONS: Idle connections kept open (default 10)
+- LLM_TIMEOUT_SECONDS: Per-request timeout (default 600)
+
+is_transient_llm_error tells callers such as the job queue which failures are
+worth retrying later.
+"""
+
+import asyncio
+import os
+from typing import Dict, Optional, Tuple
+
+import anthropic
+import httpx
+
+
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 20))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", 10))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", 600))
+
+# api_key -> (owning event loop, client)
+# httpx connection pools are bound to the loop that created them, so a new
+# client is built if the key is first used from a different loop (e.g. scripts
+# that call asyncio.run() more than once).
+_async_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, anthropic.AsyncAnthropic]] = {}
+
+
+def _build_async_client(api_key: Optional[str]) -> anthropic.AsyncAnthropic:
+    """Create an AsyncAnthropic client with a pooled HTTP transport"""
+    # Build the pool from the SDK's own httpx flavour so this works across
+    # anthropic releases (older SDKs lack DefaultAsyncHttpxClient).
+    limits_cls = type(anthropic.DEFAULT_CONNECTION_LIMITS)
+    http_client_cls = getattr(anthropic, "DefaultAsyncHttpxClient", httpx.AsyncClient)
+
+    http_client = http_client_cls(
+        limits=limits_cls(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS
+        )
+    )
+    return anthropic.AsyncAnthropic(
+        api_key=api_key,
+        http_client=http_client,
+        timeout=LLM_TIMEOUT_SECONDS
+    )
+
+
+def get_async_client(api_key: Optional[str] = None) -> anthropic.AsyncAnthropic:
+    """
+    Get the shared AsyncAnthropic client for an API key
+
+    Must be called from within a running event loop.
+
+    Args:
+        api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var)
+
+    Returns:
+        Shared AsyncAnthropic client
+    """
+    api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+    loop = asyncio.get_running_loop()
+
+    cached = _async_clients.get(api_key)
+    if cached is not None:
+        owner_loop, client = cached
+        if owner_loop is loop:
+            return client
+
+    client = _build_async_client(api_key)
+    _async_clients[api_key] = (loop, client)
+    return client
+
+
+async def close_async_clients() -> None:
+    """
+    Close shared clients owned by the running event loop
+
+    Called from the FastAPI lifespan shutdown hook.
+    """
+    loop = asyncio.get_running_loop()
+
+    for api_key, (owner_loop, client) in list(_async_clients.items()):
+        if owner_loop is loop:
+            await client.close()
+            del _async_clients[api_key]
+
+
+def is_transient_llm_error(error: BaseException) -> bool:
+    """
+    Whether an error came from a Claude failure that may succeed on retry
+
+    Rate limits, timeouts, connection errors and 5xx responses (including 529
+    Overloaded) are transient. Callers often wrap SDK errors in a plain
+    Exception, so the __cause__/__context__ chain is checked too.
+
+    Args:
+        error: Raised exception
+
+    Returns:
+        True if retrying later may succeed
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (anthropic.APIConnectionError, anthropic.RateLimitError)):
+            return True
+        if isinstance(error, anthropic.APIStatusError) and error.status_code >= 500:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
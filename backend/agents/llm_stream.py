@@ -0,0 +1,130 @@
+"""
+LLM Stream: Token-level streaming of agent output
+
+When a TokenStream is active (see stream_llm_tokens), BaseAgent.call_llm and
+call_llm_async use the streaming messages API and forward each text delta to
+it instead of waiting for the whole response. Each LLM call is one section
+of the stream; a call that fails mid-response ends its section as aborted,
+so the receiver can discard the partial text.
+
+The active stream is held in a context variable, so it follows the
+generation into asyncio tasks and asyncio.to_thread() worker threads
+without agents having to pass it around, and concurrent generations never
+see each other's streams. Agents that fan out on their own thread pools
+submit through contextvars.copy_context().run, as asyncio.to_thread does.
+"""
+
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+
+class TokenStream:
+    """
+    Receiver for the streamed text of one document
+
+    Callbacks may be invoked from worker threads.
+    """
+
+    def __init__(
+        self,
+        on_delta: Callable[[int, str], None],
+        on_section_end: Optional[Callable[[int], None]] = None,
+        on_section_abort: Optional[Callable[[int], None]] = None
+    ):
+        """
+        Initialize token stream
+
+        Args:
+            on_delta: Called with (section, text_delta) for each delta
+            on_section_end: Called with (section) when an LLM call finishes
+            on_section_abort: Called with (section) when an LLM call fails
+                after streaming started (default: on_section_end)
+        """
+        self.on_delta = on_delta
+        self.on_section_end = on_section_end
+        self.on_section_abort = on_section_abort
+        self._sections = itertools.count()
+        self._lock = threading.Lock()
+
+    def open_section(self) -> int:
+        """Start a new section (one LLM call) and return its number"""
+        with self._lock:
+            return next(self._sections)
+
+    def write(self, section: int, delta: str) -> None:
+        """Forward a text delta (errors are swallowed so streaming never fails generation)"""
+        if not delta:
+            return
+        try:
+            self.on_delta(section, delta)
+        except Exception as e:
+            print(f"⚠️  Token stream callback failed: {e}")
+
+    def close_section(self, section: int, aborted: bool = False) -> None:
+        """Mark a section complete, or abandoned part way when aborted"""
+        callback = self.on_section_end
+        if aborted and self.on_section_abort is not None:
+            callback = self.on_section_abort
+        if callback is None:
+            return
+        try:
+            callback(section)
+        except Exception as e:
+            print(f"⚠️  Token stream callback failed: {e}")
+
+    @contextmanager
+    def section(self) -> Iterator[int]:
+        """
+        Open a section for the block and always close it
+
+        The section is closed as aborted if the block raises.
+
+        Yields:
+            Section number
+        """
+        section = self.open_section()
+        try:
+            yield section
+        except BaseException:
+            self.close_section(section, aborted=True)
+            raise
+        self.close_section(section)
+
+    def emit_text(self, text: str) -> None:
+        """Send a complete text (e.g. a cached response) as one section"""
+        with self.section() as section:
+            self.write(section, text)
+
+
+_current_stream: ContextVar[Optional[TokenStream]] = ContextVar("llm_token_stream", default=None)
+
+
+def get_token_stream() -> Optional[TokenStream]:
+    """
+    Get the token stream active in the current context
+
+    Returns:
+        TokenStream, or None when not streaming
+    """
+    return _current_stream.get()
+
+
+@contextmanager
+def stream_llm_tokens(stream: Optional[TokenStream]) -> Iterator[Optional[TokenStream]]:
+    """
+    Stream LLM calls made within the block to a TokenStream
+
+    Args:
+        stream: Receiver for the deltas (None disables streaming in the block)
+
+    Yields:
+        The stream
+    """
+    token = _current_stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _current_stream.reset(token)
@@ -125,12 +125,12 @@ class MarketResearchReportGeneratorAgent(BaseAgent):
                 metadata_store = DocumentMetadataStore()
 
                 # Look for any existing documents (unlikely for first doc, but check anyway)
-                all_program_docs = [doc for doc in metadata_store.metadata['documents'].values()
-                                   if doc['program'] == program_name]
+                all_program_docs = metadata_store.list_documents(program=program_name)
 
                 if all_program_docs:
                     print(f"✅ Found {len(all_program_docs)} existing documents for cross-reference")
-                    for doc in all_program_docs[:5]:  # Limit to 5
+                    # Limit to the 5 most recent; oldest first so the newest of a type wins
+                    for doc in reversed(all_program_docs[:5]):
                         doc_type = doc['type']
                         self._referenced_documents[doc_type] = doc
                 else:
@@ -1,9 +1,20 @@
 """
 Post-Solicitation Orchestrator: Coordinates complete post-solicitation workflow
 Manages all 9 post-solicitation tools from Q&A through award
+
+Per-offeror documents (PPQs, one scorecard per offeror per evaluation factor,
+debriefings) don't depend on each other, so they are generated concurrently
+on a thread pool; the SSDD and award documents wait for all of them.
+
+Environment Variables:
+- POST_SOLICITATION_WORKERS: Per-offeror generations in flight (default 4; 1 runs serially)
 """
 
-from typing import Dict, List, Optional
+import contextvars
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional
 from pathlib import Path
 import sys
 from datetime import datetime
@@ -21,6 +32,8 @@ from backend.agents.sf26_generator_agent import SF26GeneratorAgent
 from backend.agents.award_notification_generator_agent import AwardNotificationGeneratorAgent
 from backend.rag.retriever import Retriever
 
+POST_SOLICITATION_WORKERS = int(os.getenv("POST_SOLICITATION_WORKERS", 4))
+
 
 class PostSolicitationOrchestrator:
     """
@@ -43,6 +56,7 @@ class PostSolicitationOrchestrator:
     - Phase dependencies management
     - Comprehensive workflow state tracking
     - RAG integration for Q&A answers
+    - Concurrent per-offeror and per-factor generation
     
     Dependencies:
     - 9 Post-Solicitation Agents
@@ -53,9 +67,18 @@ class PostSolicitationOrchestrator:
         self,
         api_key: str,
         retriever: Optional[Retriever] = None,
-        model: str = "claude-sonnet-4-20250514"
+        model: str = "claude-sonnet-4-20250514",
+        max_workers: Optional[int] = None
     ):
-        """Initialize Post-Solicitation Orchestrator"""
+        """
+        Initialize Post-Solicitation Orchestrator
+
+        Args:
+            api_key: Anthropic API key
+            retriever: Optional RAG retriever for Q&A answers
+            model: Claude model to use
+            max_workers: Per-offeror generations in flight (default POST_SOLICITATION_WORKERS env, 4)
+        """
         # Initialize all agents
         self.qa_manager = QAManagerAgent(api_key, retriever, model)
         self.amendment_gen = AmendmentGeneratorAgent(api_key, model)
@@ -68,6 +91,7 @@ class PostSolicitationOrchestrator:
         self.award_notification_gen = AwardNotificationGeneratorAgent(api_key, model)
         
         self.retriever = retriever
+        self.max_workers = max(1, max_workers or POST_SOLICITATION_WORKERS)
         
         # Workflow state
         self.workflow_state = {
@@ -97,6 +121,7 @@ class PostSolicitationOrchestrator:
         print(f"  ✓ Award Notification Generator ready")
         if self.retriever:
             print(f"  ✓ RAG retriever available (Q&A answering enabled)")
+        print(f"  ✓ Per-offeror workers: {self.max_workers}")
         print("="*70 + "\n")
     
     def execute_complete_workflow(
@@ -145,39 +170,56 @@ class PostSolicitationOrchestrator:
         results['phases_completed'].append('ssp')
         print(f"✓ SSP: {ssp_files['markdown']}\n")
         
-        # Phase 2: Past Performance Questionnaires
-        print("PHASE 2: PAST PERFORMANCE QUESTIONNAIRES")
+        winner = next((o for o in offerors if o.get('name') == recommended_awardee), offerors[0])
+        source_selection_method = config.get('source_selection_method', 'Best Value Trade-Off')
+        
+        # Phases 2, 3 and 7 only need the offeror list, so all of their
+        # documents are generated in one fan-out; SSDD and award wait for it
+        print("PHASES 2, 3, 7: PPQs, EVALUATION SCORECARDS, DEBRIEFINGS")
         print("-" * 80)
-        ppqs = []
-        for offeror in offerors:
-            ppq_result = self.ppq_gen.execute({
-                'solicitation_info': solicitation_info,
-                'reference_info': {
-                    'offeror_name': offeror.get('name', 'TBD'),
-                    'contract_number': offeror.get('reference_contract', 'TBD')
-                },
-                'config': {}
-            })
-            ppq_file = self.ppq_gen.save_to_file(ppq_result['content'], f"{output_dir}/ppq/ppq_{offeror.get('name', 'offeror').lower().replace(' ', '_')}.md")
-            ppqs.append(ppq_file)
+        tasks = {}
+        for index, offeror in enumerate(offerors):
+            tasks[('ppq', index)] = lambda offeror=offeror: self._generate_ppq(
+                offeror, solicitation_info, output_dir
+            )
+            for factor in self.eval_scorecard_gen.EVALUATION_FACTORS:
+                tasks[('scorecard', index, factor)] = lambda offeror=offeror, factor=factor: self._fork(
+                    self.eval_scorecard_gen
+                ).generate_factor_scorecard(
+                    solicitation_info, section_m_content, factor,
+                    {'offeror_name': offeror.get('name', 'TBD'), 'source_selection_method': source_selection_method}
+                )
+            if offeror.get('name') != recommended_awardee:
+                tasks[('debriefing', index)] = lambda offeror=offeror, ranking=index + 1: self._generate_debriefing(
+                    offeror, ranking, recommended_awardee, winner, solicitation_info, output_dir
+                )
+        
+        print(f"Generating {len(tasks)} documents with up to {self.max_workers} workers")
+        generated = self._fan_out(tasks)
+        
+        ppqs = [generated[('ppq', index)] for index in range(len(offerors))]
         results['ppqs'] = ppqs
         results['phases_completed'].append('ppq')
-        print(f"✓ Generated {len(ppqs)} PPQs\n")
+        print(f"✓ Generated {len(ppqs)} PPQs")
         
-        # Phase 3: Evaluation Scorecards
-        print("PHASE 3: EVALUATION SCORECARDS")
-        print("-" * 80)
         all_scorecards = {}
-        for offeror in offerors:
-            scorecards = self.eval_scorecard_gen.generate_full_scorecard_set(
-                solicitation_info,
-                section_m_content,
-                {'offeror_name': offeror.get('name', 'TBD'), 'source_selection_method': config.get('source_selection_method', 'Best Value Trade-Off')}
+        for index, offeror in enumerate(offerors):
+            scorecards = {
+                factor: generated[('scorecard', index, factor)]
+                for factor in self.eval_scorecard_gen.EVALUATION_FACTORS
+            }
+            all_scorecards[offeror.get('name', 'Unknown')] = self.eval_scorecard_gen.build_scorecard_set(
+                scorecards, solicitation_info
             )
-            all_scorecards[offeror.get('name', 'Unknown')] = scorecards
         results['scorecards'] = all_scorecards
         results['phases_completed'].append('evaluation')
-        print(f"✓ Generated scorecards for {len(offerors)} offerors\n")
+        print(f"✓ Generated scorecards for {len(offerors)} offerors")
+        
+        debriefings = [
+            generated[('debriefing', index)]
+            for index in range(len(offerors)) if ('debriefing', index) in generated
+        ]
+        print(f"✓ Generated {len(debriefings)} debriefings\n")
         
         # Phase 4: Source Selection Decision Document
         print("PHASE 4: SOURCE SELECTION DECISION")
@@ -206,7 +248,6 @@ class PostSolicitationOrchestrator:
         # Phase 5: SF-26 Contract Award
         print("PHASE 5: CONTRACT AWARD (SF-26)")
         print("-" * 80)
-        winner = next((o for o in offerors if o.get('name') == recommended_awardee), offerors[0])
         sf26_result = self.sf26_gen.execute({
             'solicitation_info': solicitation_info,
             'contractor_info': winner,
@@ -239,31 +280,9 @@ class PostSolicitationOrchestrator:
         results['phases_completed'].append('notifications')
         print(f"✓ Notifications: {notification_files['markdown']}\n")
         
-        # Phase 7: Debriefings
-        print("PHASE 7: DEBRIEFING MATERIALS")
-        print("-" * 80)
-        debriefings = []
-        for offeror in offerors:
-            if offeror.get('name') != recommended_awardee:
-                debriefing_result = self.debriefing_gen.execute({
-                    'solicitation_info': solicitation_info,
-                    'offeror_evaluation': {
-                        'name': offeror.get('name', 'TBD'),
-                        'overall_rating': 'Good',
-                        'cost': offeror.get('cost', '$5M'),
-                        'ranking': offerors.index(offeror) + 1
-                    },
-                    'winner_info': {
-                        'name': recommended_awardee,
-                        'amount': winner.get('cost', '$5M')
-                    },
-                    'config': {}
-                })
-                debriefing_file = self.debriefing_gen.save_to_file(debriefing_result['content'], f"{output_dir}/debriefing/debriefing_{offeror.get('name', 'offeror').lower().replace(' ', '_')}.md")
-                debriefings.append(debriefing_file)
+        # Phase 7: Debriefings (generated with the other per-offeror documents)
         results['debriefings'] = debriefings
         results['phases_completed'].append('debriefing')
-        print(f"✓ Generated {len(debriefings)} debriefings\n")
         
         results['workflow_status'] = 'completed'
         
@@ -274,4 +293,79 @@ class PostSolicitationOrchestrator:
         print("="*80 + "\n")
         
         return results
-
+    
+    def _generate_ppq(self, offeror: Dict, solicitation_info: Dict, output_dir: str) -> Dict:
+        """Generate and save the PPQ for one offeror"""
+        ppq_gen = self._fork(self.ppq_gen)
+        ppq_result = ppq_gen.execute({
+            'solicitation_info': solicitation_info,
+            'reference_info': {
+                'offeror_name': offeror.get('name', 'TBD'),
+                'contract_number': offeror.get('reference_contract', 'TBD')
+            },
+            'config': {}
+        })
+        return ppq_gen.save_to_file(ppq_result['content'], f"{output_dir}/ppq/ppq_{offeror.get('name', 'offeror').lower().replace(' ', '_')}.md")
+    
+    def _generate_debriefing(
+        self,
+        offeror: Dict,
+        ranking: int,
+        recommended_awardee: str,
+        winner: Dict,
+        solicitation_info: Dict,
+        output_dir: str
+    ) -> Dict:
+        """Generate and save the debriefing for one unsuccessful offeror"""
+        debriefing_gen = self._fork(self.debriefing_gen)
+        debriefing_result = debriefing_gen.execute({
+            'solicitation_info': solicitation_info,
+            'offeror_evaluation': {
+                'name': offeror.get('name', 'TBD'),
+                'overall_rating': 'Good',
+                'cost': offeror.get('cost', '$5M'),
+                'ranking': ranking
+            },
+            'winner_info': {
+                'name': recommended_awardee,
+                'amount': winner.get('cost', '$5M')
+            },
+            'config': {}
+        })
+        return debriefing_gen.save_to_file(debriefing_result['content'], f"{output_dir}/debriefing/debriefing_{offeror.get('name', 'offeror').lower().replace(' ', '_')}.md")
+    
+    def _fork(self, agent):
+        """
+        Shallow copy of an agent for one concurrent task
+        
+        Agents keep per-call state on the instance (cross-reference IDs,
+        unfilled fields), so concurrent tasks each use their own copy. The
+        Anthropic client, template and configuration are shared.
+        """
+        return copy.copy(agent)
+    
+    def _fan_out(self, tasks: Dict[Hashable, Callable[[], Dict]]) -> Dict[Hashable, Dict]:
+        """
+        Run independent generation tasks on a thread pool
+        
+        Args:
+            tasks: Key -> zero-argument callable
+        
+        Returns:
+            Key -> result, in task order
+        
+        Raises:
+            The first task exception (by task order); tasks not yet started are cancelled
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Each task runs in a copy of this context so an active TokenStream follows
+            futures = {
+                key: pool.submit(contextvars.copy_context().run, task)
+                for key, task in tasks.items()
+            }
+            try:
+                return {key: future.result() for key, future in futures.items()}
+            except Exception:
+                for future in futures.values():
+                    future.cancel()
+                raise
@@ -7,13 +7,13 @@ from typing import Dict
 from pathlib import Path
 import sys
 from datetime import datetime, timedelta
-import re
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class PPQGeneratorAgent(BaseAgent):
@@ -23,8 +23,7 @@ class PPQGeneratorAgent(BaseAgent):
         super().__init__(name="PPQ Generator Agent", api_key=api_key, model=model, temperature=0.3)
         
         self.template_path = Path(__file__).parent.parent / "templates" / "ppq_template.md"
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("PPQ GENERATOR INITIALIZED")
@@ -127,19 +126,18 @@ class PPQGeneratorAgent(BaseAgent):
     
     def _populate_template(self, solicitation_info: Dict, reference_info: Dict, config: Dict) -> str:
         """Populate PPQ template"""
-        content = self.template
+        values = {}
         
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{program_name}}', solicitation_info.get('program_name', 'TBD'))
-        content = content.replace('{{offeror_name}}', reference_info.get('offeror_name', 'TBD'))
-        content = content.replace('{{reference_contract}}', reference_info.get('contract_number', 'TBD'))
-        content = content.replace('{{issue_date}}', datetime.now().strftime('%B %d, %Y'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['program_name'] = solicitation_info.get('program_name', 'TBD')
+        values['offeror_name'] = reference_info.get('offeror_name', 'TBD')
+        values['reference_contract'] = reference_info.get('contract_number', 'TBD')
+        values['issue_date'] = datetime.now().strftime('%B %d, %Y')
         
         return_deadline = datetime.now() + timedelta(days=10)
-        content = content.replace('{{return_deadline}}', return_deadline.strftime('%B %d, %Y'))
+        values['return_deadline'] = return_deadline.strftime('%B %d, %Y')
         
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD', content)
-        return content
+        return self.render_template(self.template, values, missing='TBD')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save PPQ to file"""
@@ -15,6 +15,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class PreSolicitationNoticeGeneratorAgent(BaseAgent):
@@ -56,8 +57,7 @@ class PreSolicitationNoticeGeneratorAgent(BaseAgent):
         self.template_path = Path(__file__).parent.parent / "templates" / "pre_solicitation_notice_template.md"
         
         # Load template
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("PRE-SOLICITATION NOTICE GENERATOR AGENT INITIALIZED")
@@ -322,63 +322,60 @@ Write a clear, concise summary suitable for a public notice."""
         config: Dict
     ) -> str:
         """Populate pre-solicitation notice template"""
-        content = self.template
+        values = {}
         
         # Generate solicitation number
         sol_number = config.get('solicitation_number', f"W911XX-25-R-{datetime.now().strftime('%m%d')}")
         
         # Basic information
-        content = content.replace('{{solicitation_number}}', sol_number)
-        content = content.replace('{{posted_date}}', dates['notice_posted_date'])
-        content = content.replace('{{response_date}}', dates['proposal_due_date'])
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['solicitation_number'] = sol_number
+        values['posted_date'] = dates['notice_posted_date']
+        values['response_date'] = dates['proposal_due_date']
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
         
         # Agency information
-        content = content.replace('{{agency}}', project_info.get('organization', 'Department of Defense'))
-        content = content.replace('{{office}}', config.get('office', 'Contracting Office'))
-        content = content.replace('{{location}}', config.get('location', 'Washington, DC'))
+        values['agency'] = project_info.get('organization', 'Department of Defense')
+        values['office'] = config.get('office', 'Contracting Office')
+        values['location'] = config.get('location', 'Washington, DC')
         
         # Program information
-        content = content.replace('{{program_name}}', project_info.get('program_name', 'TBD'))
-        content = content.replace('{{program_description}}', summary)
-        content = content.replace('{{scope_of_work}}', summary)
-        content = content.replace('{{estimated_value}}', project_info.get('estimated_value', 'TBD'))
-        content = content.replace('{{period_of_performance}}', project_info.get('period_of_performance', '12 months base + 4 option years'))
+        values['program_name'] = project_info.get('program_name', 'TBD')
+        values['program_description'] = summary
+        values['scope_of_work'] = summary
+        values['estimated_value'] = project_info.get('estimated_value', 'TBD')
+        values['period_of_performance'] = project_info.get('period_of_performance', '12 months base + 4 option years')
         
         # Dates
         for key, value in dates.items():
-            content = content.replace('{{' + key + '}}', str(value))
-        content = content.replace('{{anticipated_release_date}}', dates['rfp_release_date'])
-        content = content.replace('{{anticipated_due_date}}', dates['proposal_due_date'])
+            values[key] = str(value)
+        values['anticipated_release_date'] = dates['rfp_release_date']
+        values['anticipated_due_date'] = dates['proposal_due_date']
         
         # Small business
-        content = content.replace('{{set_aside_type}}', small_business['set_aside_type'])
-        content = content.replace('{{set_aside_rationale}}', small_business['set_aside_rationale'])
-        content = content.replace('{{eligible_categories}}', small_business['eligible_categories'])
-        content = content.replace('{{naics_code}}', small_business['naics_code'])
-        content = content.replace('{{size_standard}}', small_business['size_standard'])
-        content = content.replace('{{socioeconomic_applicability}}', small_business['socioeconomic_applicability'])
+        values['set_aside_type'] = small_business['set_aside_type']
+        values['set_aside_rationale'] = small_business['set_aside_rationale']
+        values['eligible_categories'] = small_business['eligible_categories']
+        values['naics_code'] = small_business['naics_code']
+        values['size_standard'] = small_business['size_standard']
+        values['socioeconomic_applicability'] = small_business['socioeconomic_applicability']
         
         # Contract information
         contract_type = config.get('contract_type', 'Firm-Fixed-Price (FFP)')
-        content = content.replace('{{contract_type}}', contract_type)
-        content = content.replace('{{contract_structure}}', '12 month base period + 4 one-year option periods')
-        content = content.replace('{{solicitation_type}}', 'Request for Proposal (RFP)')
-        content = content.replace('{{source_selection_method}}', 'Best Value Trade-Off')
+        values['contract_type'] = contract_type
+        values['contract_structure'] = '12 month base period + 4 one-year option periods'
+        values['solicitation_type'] = 'Request for Proposal (RFP)'
+        values['source_selection_method'] = 'Best Value Trade-Off'
         
         # POC information
-        content = content.replace('{{poc_name}}', config.get('poc_name', project_info.get('contracting_officer', 'John Doe')))
-        content = content.replace('{{poc_title}}', config.get('poc_title', 'Contracting Officer'))
-        content = content.replace('{{poc_email}}', config.get('poc_email', project_info.get('ko_email', 'contracting@agency.mil')))
-        content = content.replace('{{poc_phone}}', config.get('poc_phone', project_info.get('ko_phone', '(703) 555-0000')))
+        values['poc_name'] = config.get('poc_name', project_info.get('contracting_officer', 'John Doe'))
+        values['poc_title'] = config.get('poc_title', 'Contracting Officer')
+        values['poc_email'] = config.get('poc_email', project_info.get('ko_email', 'contracting@agency.mil'))
+        values['poc_phone'] = config.get('poc_phone', project_info.get('ko_phone', '(703) 555-0000'))
         
         # Notice ID
-        content = content.replace('{{notice_id}}', f"PSN-{datetime.now().strftime('%Y%m%d')}-{sol_number}")
+        values['notice_id'] = f"PSN-{datetime.now().strftime('%Y%m%d')}-{sol_number}"
         
-        # Fill remaining placeholders
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD', content)
-        
-        return content
+        return self.render_template(self.template, values, missing='TBD')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save Pre-Solicitation Notice to file"""
@@ -0,0 +1,202 @@
+"""
+Prompt Batch: Concurrent execution of independent LLM sub-prompts
+
+Agents that assemble a document from many small LLM calls register those
+prompts on a PromptBatch instead of calling call_llm() one after another.
+The batch runs them concurrently under a concurrency cap, so wall-clock
+time approaches the slowest prompt rather than the sum of all of them.
+
+A prompt may declare depends_on=[...] and pass a callable instead of a
+string; it then waits only for those prompts and builds its text from their
+results.
+
+Usage:
+    batch = PromptBatch(agent)
+    batch.add('market_research_summary', prompt, max_tokens=350)
+    batch.add(
+        'industry_capabilities',
+        lambda results: f"... {results.get('market_research_summary', '')} ...",
+        depends_on=['market_research_summary']
+    )
+    generated = batch.run()  # or: await batch.run_async()
+"""
+
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Union
+
+
+DEFAULT_PROMPT_CONCURRENCY = int(os.getenv("LLM_PROMPT_CONCURRENCY", 5))
+
+PromptSource = Union[str, Callable[[Dict[str, str]], str]]
+
+
+@dataclass
+class PromptSpec:
+    """A single registered prompt"""
+    key: str
+    prompt: PromptSource
+    max_tokens: int = 4000
+    system_prompt: Optional[str] = None
+    depends_on: List[str] = field(default_factory=list)
+
+
+class PromptBatch:
+    """
+    Runs an agent's independent LLM prompts concurrently
+
+    Results are keyed by prompt key and stripped of surrounding whitespace.
+    A failed prompt is logged as a WARNING on the agent and left out of the
+    results, matching the per-call try/except the agents used before.
+    Dependents of a failed prompt still run and see it missing from results.
+    """
+
+    def __init__(self, agent, max_concurrency: Optional[int] = None):
+        """
+        Initialize prompt batch
+
+        Args:
+            agent: BaseAgent whose call_llm/call_llm_async/log are used
+            max_concurrency: Maximum prompts in flight (default LLM_PROMPT_CONCURRENCY env, 5)
+        """
+        self.agent = agent
+        self.max_concurrency = max(1, max_concurrency or DEFAULT_PROMPT_CONCURRENCY)
+        self._specs: Dict[str, PromptSpec] = {}
+
+    def add(
+        self,
+        key: str,
+        prompt: PromptSource,
+        max_tokens: int = 4000,
+        system_prompt: Optional[str] = None,
+        depends_on: Optional[List[str]] = None
+    ) -> None:
+        """
+        Register a prompt
+
+        Args:
+            key: Result key (e.g. template field name)
+            prompt: Prompt text, or callable(results) -> text for dependent prompts
+            max_tokens: Maximum tokens in response
+            system_prompt: Optional system prompt
+            depends_on: Keys of previously registered prompts this one waits on
+
+        Raises:
+            ValueError: If key is already registered or a dependency is unknown
+        """
+        if key in self._specs:
+            raise ValueError(f"Prompt '{key}' is already registered")
+
+        depends_on = list(depends_on or [])
+        unknown = [dep for dep in depends_on if dep not in self._specs]
+        if unknown:
+            raise ValueError(f"Prompt '{key}' depends on unregistered prompts: {unknown}")
+
+        self._specs[key] = PromptSpec(
+            key=key,
+            prompt=prompt,
+            max_tokens=max_tokens,
+            system_prompt=system_prompt,
+            depends_on=depends_on
+        )
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def run(self) -> Dict[str, str]:
+        """
+        Run all prompts using a thread pool (for synchronous agent code)
+
+        Returns:
+            Dictionary mapping prompt key -> response text
+        """
+        results: Dict[str, str] = {}
+        finished_keys = set()
+        pending = list(self._specs.values())
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            while pending or running:
+                ready = [s for s in pending if all(d in finished_keys for d in s.depends_on)]
+                for spec in ready:
+                    pending.remove(spec)
+                    prompt = self._render(spec, results)
+                    if prompt is None:
+                        finished_keys.add(spec.key)
+                        continue
+                    # Run in a copy of this context so the active TokenStream follows
+                    future = pool.submit(
+                        contextvars.copy_context().run,
+                        self.agent.call_llm, prompt, spec.max_tokens, spec.system_prompt
+                    )
+                    running[future] = spec
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    spec = running.pop(future)
+                    try:
+                        self._record(spec, future.result(), results)
+                    except Exception as e:
+                        self.agent.log(f"Failed to generate {spec.key}: {e}", level="WARNING")
+                    finished_keys.add(spec.key)
+
+        return self._ordered(results)
+
+    async def run_async(self) -> Dict[str, str]:
+        """
+        Run all prompts on the event loop via call_llm_async
+
+        Returns:
+            Dictionary mapping prompt key -> response text
+        """
+        results: Dict[str, str] = {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_one(spec: PromptSpec) -> None:
+            if spec.depends_on:
+                await asyncio.gather(*(tasks[dep] for dep in spec.depends_on))
+
+            prompt = self._render(spec, results)
+            if prompt is None:
+                return
+
+            async with semaphore:
+                try:
+                    text = await self.agent.call_llm_async(prompt, spec.max_tokens, spec.system_prompt)
+                    self._record(spec, text, results)
+                except Exception as e:
+                    self.agent.log(f"Failed to generate {spec.key}: {e}", level="WARNING")
+
+        # Specs are registered dependency-first, so every dependency task exists already
+        for spec in self._specs.values():
+            tasks[spec.key] = asyncio.ensure_future(run_one(spec))
+
+        await asyncio.gather(*tasks.values())
+        return self._ordered(results)
+
+    def _render(self, spec: PromptSpec, results: Dict[str, str]) -> Optional[str]:
+        """Resolve a prompt to text, returning None if a prompt builder fails"""
+        if not callable(spec.prompt):
+            return spec.prompt
+
+        try:
+            return spec.prompt(dict(results))
+        except Exception as e:
+            self.agent.log(f"Failed to build prompt for {spec.key}: {e}", level="WARNING")
+            return None
+
+    def _record(self, spec: PromptSpec, text: str, results: Dict[str, str]) -> None:
+        """Store a successful response"""
+        results[spec.key] = text.strip()
+        self.agent.log(f"Generated {spec.key}")
+
+    def _ordered(self, results: Dict[str, str]) -> Dict[str, str]:
+        """Return results in registration order"""
+        return {key: results[key] for key in self._specs if key in results}
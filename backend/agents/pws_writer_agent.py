@@ -9,6 +9,7 @@ from .base_agent import BaseAgent
 from backend.rag.retriever import Retriever
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class PWSWriterAgent(BaseAgent):
@@ -1070,10 +1071,8 @@ Use realistic Government/DoD systems relevant to this type of acquisition."""
         """
         import os
 
-        # Load template
-        template_path = Path(__file__).parent.parent / "templates" / "performance_work_statement_template.md"
-        with open(template_path, 'r') as f:
-            content = f.read()
+        # Load template (parsed once per process)
+        template = load_template(Path(__file__).parent.parent / "templates" / "performance_work_statement_template.md")
 
         def get_value(config_key=None, rag_key=None, llm_key=None, default_key=None, fallback='TBD'):
             """Priority: config > RAG > LLM > smart defaults > fallback"""
@@ -1092,41 +1091,20 @@ Use realistic Government/DoD systems relevant to this type of acquisition."""
             return fallback
 
         # Populate template variables (10 total)
-        content = content.replace('{{program_name}}',
-            get_value(config_key='program_name', default_key='program_name', fallback='TBD'))
-
-        content = content.replace('{{organization}}',
-            get_value(config_key='organization', default_key='organization', fallback='TBD'))
-
-        content = content.replace('{{date}}',
-            get_value(config_key='date', default_key='date', fallback='TBD'))
-
-        content = content.replace('{{author}}',
-            get_value(config_key='author', default_key='author', fallback='TBD'))
-
-        content = content.replace('{{service_type}}',
-            get_value(config_key='service_type', rag_key='service_type',
-                     default_key='service_type', fallback='professional services'))
-
-        content = content.replace('{{performance_metrics}}',
-            get_value(rag_key='performance_metrics', fallback='TBD - Define specific performance metrics'))
-
-        content = content.replace('{{deliverables}}',
-            get_value(rag_key='deliverables', llm_key='deliverables', fallback='TBD - Define specific deliverables'))
-
-        content = content.replace('{{quality_standards}}',
-            get_value(rag_key='quality_standards', fallback='TBD - Define quality standards'))
-
-        content = content.replace('{{acceptance_criteria}}',
-            get_value(rag_key='acceptance_criteria', fallback='TBD - Define acceptance criteria'))
-
-        content = content.replace('{{surveillance_methods}}',
-            get_value(rag_key='surveillance_methods', fallback='TBD - Define surveillance methods'))
-
-        content = content.replace('{{reporting_requirements}}',
-            get_value(rag_key='reporting_requirements', fallback='TBD - Define reporting requirements'))
-
-        content = content.replace('{{approved_by}}',
-            get_value(config_key='approved_by', default_key='approved_by', fallback='TBD'))
-
-        return content
+        values = {}
+        values['program_name'] = get_value(config_key='program_name', default_key='program_name', fallback='TBD')
+        values['organization'] = get_value(config_key='organization', default_key='organization', fallback='TBD')
+        values['date'] = get_value(config_key='date', default_key='date', fallback='TBD')
+        values['author'] = get_value(config_key='author', default_key='author', fallback='TBD')
+        values['service_type'] = get_value(config_key='service_type', rag_key='service_type',
+                                           default_key='service_type', fallback='professional services')
+        values['performance_metrics'] = get_value(rag_key='performance_metrics', fallback='TBD - Define specific performance metrics')
+        values['deliverables'] = get_value(rag_key='deliverables', llm_key='deliverables', fallback='TBD - Define specific deliverables')
+        values['quality_standards'] = get_value(rag_key='quality_standards', fallback='TBD - Define quality standards')
+        values['acceptance_criteria'] = get_value(rag_key='acceptance_criteria', fallback='TBD - Define acceptance criteria')
+        values['surveillance_methods'] = get_value(rag_key='surveillance_methods', fallback='TBD - Define surveillance methods')
+        values['reporting_requirements'] = get_value(rag_key='reporting_requirements', fallback='TBD - Define reporting requirements')
+        values['approved_by'] = get_value(config_key='approved_by', default_key='approved_by', fallback='TBD')
+
+        # Placeholders without a value are left for the reviewer
+        return self.render_template(template, values, missing=None)
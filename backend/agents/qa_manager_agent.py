@@ -7,7 +7,6 @@ from typing import Dict, List, Optional
 from pathlib import Path
 import sys
 from datetime import datetime
-import re
 import json
 
 # Add parent directory to path
@@ -17,6 +16,7 @@ from backend.agents.base_agent import BaseAgent
 from backend.rag.retriever import Retriever
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class QAManagerAgent(BaseAgent):
@@ -63,8 +63,7 @@ class QAManagerAgent(BaseAgent):
         self.template_path = Path(__file__).parent.parent / "templates" / "qa_response_template.md"
         
         # Load template
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         # Q&A database (in-memory, could be JSON/SQLite in production)
         self.qa_database = []
@@ -394,49 +393,46 @@ Answer:"""
         config: Dict
     ) -> str:
         """Populate Q&A template"""
-        content = self.template
+        values = {}
         
         # Basic information
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{program_name}}', solicitation_info.get('program_name', 'TBD'))
-        content = content.replace('{{qa_document_number}}', f"QA-{datetime.now().strftime('%Y%m%d')}")
-        content = content.replace('{{issue_date}}', datetime.now().strftime('%B %d, %Y'))
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['program_name'] = solicitation_info.get('program_name', 'TBD')
+        values['qa_document_number'] = f"QA-{datetime.now().strftime('%Y%m%d')}"
+        values['issue_date'] = datetime.now().strftime('%B %d, %Y')
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
         
         # POC information
-        content = content.replace('{{issuing_office}}', solicitation_info.get('office', 'Contracting Office'))
-        content = content.replace('{{poc_name}}', solicitation_info.get('contracting_officer', 'John Doe'))
-        content = content.replace('{{poc_title}}', 'Contracting Officer')
-        content = content.replace('{{poc_email}}', solicitation_info.get('co_email', 'contracting@agency.mil'))
-        content = content.replace('{{poc_phone}}', solicitation_info.get('co_phone', '(703) 555-0000'))
+        values['issuing_office'] = solicitation_info.get('office', 'Contracting Office')
+        values['poc_name'] = solicitation_info.get('contracting_officer', 'John Doe')
+        values['poc_title'] = 'Contracting Officer'
+        values['poc_email'] = solicitation_info.get('co_email', 'contracting@agency.mil')
+        values['poc_phone'] = solicitation_info.get('co_phone', '(703) 555-0000')
         
         # Dates
-        content = content.replace('{{original_issue_date}}', solicitation_info.get('issue_date', 'TBD'))
-        content = content.replace('{{proposal_due_date}}', solicitation_info.get('proposal_due_date', 'TBD'))
-        content = content.replace('{{questions_deadline}}', solicitation_info.get('questions_deadline', 'TBD'))
+        values['original_issue_date'] = solicitation_info.get('issue_date', 'TBD')
+        values['proposal_due_date'] = solicitation_info.get('proposal_due_date', 'TBD')
+        values['questions_deadline'] = solicitation_info.get('questions_deadline', 'TBD')
         
         # Statistics
-        content = content.replace('{{total_questions}}', str(len(self.qa_database)))
+        values['total_questions'] = str(len(self.qa_database))
         
         # Category sections
         for key, value in category_sections.items():
-            content = content.replace('{{' + key + '}}', value)
+            values[key] = value
         
         # Topic areas list
         topic_list = '\n'.join([f"- {cat}" for cat in questions_by_category.keys()])
-        content = content.replace('{{topic_areas_list}}', topic_list)
+        values['topic_areas_list'] = topic_list
         
         # Statistics table
         stats_table = '\n'.join([
             f"| {cat} | {len(qs)} | {len(qs)/len(self.qa_database)*100:.1f}% |"
             for cat, qs in questions_by_category.items()
         ])
-        content = content.replace('{{question_statistics_table}}', stats_table)
+        values['question_statistics_table'] = stats_table
         
-        # Fill remaining placeholders
-        content = re.sub(r'\{\{[^}]+\}\}', 'None', content)
-        
-        return content
+        return self.render_template(self.template, values, missing='None')
     
     def save_qa_database(self, filepath: str):
         """Save Q&A database to JSON file"""
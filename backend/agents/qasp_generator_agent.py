@@ -13,6 +13,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from backend.utils.qasp_field_extractor import QASPFieldExtractor
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class QASPGeneratorAgent:
@@ -310,8 +311,7 @@ class QASPGeneratorAgent:
         """
         # Load template
         template_path = Path(__file__).parent.parent / "templates" / "qasp_template.md"
-        with open(template_path, 'r') as f:
-            template = f.read()
+        template = load_template(template_path)
 
         # Build performance requirements table
         perf_table = self._format_performance_table(perf_matrix)
@@ -343,11 +343,8 @@ class QASPGeneratorAgent:
             'performance_requirements_table': perf_table
         }
 
-        # Replace all variables
-        for key, value in variables.items():
-            template = template.replace(f"{{{{{key}}}}}", str(value))
-
-        return template
+        # Fill all variables; unknown placeholders are left as-is
+        return template.render(variables, missing=None).content
 
     def _format_performance_table(self, perf_matrix: list) -> str:
         """Format performance requirements as markdown table"""
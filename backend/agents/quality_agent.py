@@ -7,8 +7,11 @@ Dependencies:
 - utils.dod_citation_validator: DoD citation standards validation
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 from .base_agent import BaseAgent
+from .prompt_batch import PromptBatch
 import re
 import sys
 from pathlib import Path
@@ -19,6 +22,17 @@ sys.path.append(str(Path(__file__).parent.parent))
 from backend.utils.dod_citation_validator import DoDCitationValidator, CitationType
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.vague_language_scanner import VagueLanguageScanner
+
+
+# Compiled once and shared by every QualityAgent
+VAGUE_WORD_SCANNER = VagueLanguageScanner(terms=[
+    'several', 'many', 'some', 'various', 'numerous',
+    'significant', 'substantial', 'considerable',
+    'appropriate', 'adequate', 'sufficient',
+    'relevant', 'important', 'critical',
+    'may', 'might', 'could', 'possibly', 'potentially'
+])
 
 
 class QualityAgent(BaseAgent):
@@ -41,7 +55,8 @@ class QualityAgent(BaseAgent):
     def __init__(
         self,
         api_key: str,
-        model: str = "claude-sonnet-4-20250514"
+        model: str = "claude-sonnet-4-20250514",
+        max_llm_concurrency: Optional[int] = None
     ):
         """
         Initialize quality agent with DoD citation validation
@@ -49,6 +64,7 @@ class QualityAgent(BaseAgent):
         Args:
             api_key: Anthropic API key
             model: Claude model to use
+            max_llm_concurrency: Cap on concurrent chunk assessments (default LLM_PROMPT_CONCURRENCY env)
             
         Dependencies:
             - BaseAgent: Core agent functionality
@@ -60,6 +76,10 @@ class QualityAgent(BaseAgent):
             model=model,
             temperature=0.1  # Very low temperature for consistent evaluation
         )
+        self.max_llm_concurrency = max_llm_concurrency
+        # Re-scoring unchanged content is common (e.g. repeated /api/quality/analyze
+        # clicks); temperature is near-zero so cached assessments are reused
+        self.enable_response_cache(force=True)
         # Initialize DoD citation validator for comprehensive checking
         self.dod_validator = DoDCitationValidator()
         self.log("Initialized with DoD citation validation")
@@ -103,8 +123,7 @@ class QualityAgent(BaseAgent):
                 metadata_store = DocumentMetadataStore()
 
                 # Get all documents for consistency checking
-                all_program_docs = [doc for doc in metadata_store.metadata['documents'].values()
-                                   if doc['program'] == program_name]
+                all_program_docs = metadata_store.list_documents(program=program_name)
 
                 if all_program_docs:
                     print(f"✅ Found {len(all_program_docs)} documents for validation")
@@ -122,13 +141,21 @@ class QualityAgent(BaseAgent):
                 print(f"⚠️  Cross-reference lookup failed: {str(e)}")
         
         # Run multiple evaluation checks (now with DoD citation validation)
-        checks = {
-            'hallucination': self._check_hallucinations(content, project_info, research_findings),
-            'vague_language': self._check_vague_language(content),
-            'citations': self._check_citations(content),  # Now uses DoD validator
-            'compliance': self._check_compliance(content, section_name),
-            'completeness': self._check_completeness(content, section_name)
-        }
+        # The compliance LLM call is independent of the chunked hallucination
+        # pass, so it runs in the background while the chunks are assessed.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # Run in a copy of this context so the active TokenStream follows
+            compliance_future = pool.submit(
+                contextvars.copy_context().run, self._check_compliance, content, section_name
+            )
+
+            checks = {
+                'hallucination': self._check_hallucinations(content, project_info, research_findings),
+                'vague_language': self._check_vague_language(content),
+                'citations': self._check_citations(content),  # Now uses DoD validator
+                'compliance': compliance_future.result(),
+                'completeness': self._check_completeness(content, section_name)
+            }
         
         # Calculate overall score
         overall_score = self._calculate_score(checks)
@@ -209,6 +236,8 @@ class QualityAgent(BaseAgent):
         Comments:
             Enhanced to analyze full document using chunked analysis
             Chunks document into 3000-char segments with 500-char overlap
+            Chunk assessments run concurrently (bounded by max_llm_concurrency)
+            and are aggregated in chunk order
         """
         self.log("Checking for hallucinations (full document analysis)...")
         
@@ -274,7 +303,7 @@ class QualityAgent(BaseAgent):
         total_chunks = len(chunks)
         self.log(f"  Analyzing {total_chunks} chunks ({len(content)} total chars)")
         
-        # STEP 4: Analyze each chunk with LLM
+        # STEP 4: Analyze chunks with LLM (concurrently)
         chunk_assessments = []
         high_risk_chunks = 0
         medium_risk_chunks = 0
@@ -284,6 +313,9 @@ class QualityAgent(BaseAgent):
         if has_good_citations:
             citation_note = f"\n\nNOTE: This document contains {citation_count} inline citations (Ref: Source, Date). Consider this when assessing hallucination risk - cited claims are less likely to be fabricated."
 
+        batch = PromptBatch(self, max_concurrency=self.max_llm_concurrency)
+        analyzed_chunks = {}
+
         for i, chunk in enumerate(chunks, 1):
             # Only analyze chunks with substantial content
             if len(chunk.strip()) < 200:
@@ -312,26 +344,27 @@ ONLY flag as potential hallucinations:
 
 Return a brief assessment (2-3 sentences): LOW (standard procurement language), MEDIUM (some unverified claims), or HIGH (likely fabricated content)."""
 
-            try:
-                response = self.call_llm(prompt, max_tokens=300)
-                assessment = response.strip()
-                chunk_assessments.append({
-                    'chunk_num': i,
-                    'assessment': assessment,
-                    'preview': chunk[:100] + "..."
-                })
-                
-                # Count risk levels
-                if 'HIGH' in assessment.upper():
-                    high_risk_chunks += 1
-                elif 'MEDIUM' in assessment.upper():
-                    medium_risk_chunks += 1
-                else:
-                    low_risk_chunks += 1
-                    
-            except Exception as e:
-                self.log(f"  ⚠️  Error analyzing chunk {i}: {str(e)}")
-                continue
+            batch.add(f"chunk_{i}", prompt, max_tokens=300)
+            analyzed_chunks[f"chunk_{i}"] = (i, chunk)
+
+        # Results come back in chunk order; failed chunks are logged and omitted
+        assessments = batch.run()
+
+        for key, assessment in assessments.items():
+            i, chunk = analyzed_chunks[key]
+            chunk_assessments.append({
+                'chunk_num': i,
+                'assessment': assessment,
+                'preview': chunk[:100] + "..."
+            })
+            
+            # Count risk levels
+            if 'HIGH' in assessment.upper():
+                high_risk_chunks += 1
+            elif 'MEDIUM' in assessment.upper():
+                medium_risk_chunks += 1
+            else:
+                low_risk_chunks += 1
         
         # STEP 5: Aggregate risk assessment
         total_analyzed = high_risk_chunks + medium_risk_chunks + low_risk_chunks
@@ -425,26 +458,15 @@ Return a brief assessment (2-3 sentences): LOW (standard procurement language),
         """
         self.log("Checking for vague language...")
         
-        vague_words = [
-            'several', 'many', 'some', 'various', 'numerous',
-            'significant', 'substantial', 'considerable',
-            'appropriate', 'adequate', 'sufficient',
-            'relevant', 'important', 'critical',
-            'may', 'might', 'could', 'possibly', 'potentially'
-        ]
-        
         findings = []
         issues = []
         suggestions = []
         
-        for word in vague_words:
-            pattern = rf'\b{word}\b'
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                start = max(0, match.start() - 30)
-                end = min(len(content), match.end() + 30)
-                context = content[start:end].replace('\n', ' ')
-                findings.append(f"...{context}...")
+        for match in VAGUE_WORD_SCANNER.iter_matches(content):
+            start = max(0, match.start - 30)
+            end = min(len(content), match.end + 30)
+            context = content[start:end].replace('\n', ' ')
+            findings.append(f"...{context}...")
         
         if len(findings) > 10:
             issues.append(f"High use of vague language: {len(findings)} instances")
@@ -7,6 +7,12 @@ from typing import Dict, List, Optional
 from .base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.vague_language_scanner import VagueLanguageScanner
+
+
+VAGUE_WORD_SCANNER = VagueLanguageScanner(
+    terms=['several', 'many', 'some', 'various', 'approximately', 'around', 'significant']
+)
 
 
 class RefinementAgent(BaseAgent):
@@ -425,9 +431,8 @@ You never add information not in sources. You always cite claims. You eliminate
             changes.append(f"Added {new_citations - orig_citations} citation(s)")
 
         # Check for removed vague words
-        vague_words = ['several', 'many', 'some', 'various', 'approximately', 'around', 'significant']
-        orig_vague = sum(len(re.findall(rf'\b{word}\b', original, re.IGNORECASE)) for word in vague_words)
-        new_vague = sum(len(re.findall(rf'\b{word}\b', refined, re.IGNORECASE)) for word in vague_words)
+        orig_vague = VAGUE_WORD_SCANNER.count(original)
+        new_vague = VAGUE_WORD_SCANNER.count(refined)
 
         if new_vague < orig_vague:
             changes.append(f"Removed {orig_vague - new_vague} vague term(s)")
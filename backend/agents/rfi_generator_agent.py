@@ -7,7 +7,6 @@ from typing import Dict, List, Optional
 from pathlib import Path
 import sys
 from datetime import datetime, timedelta
-import re
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -16,6 +15,7 @@ from backend.agents.base_agent import BaseAgent
 from backend.rag.retriever import Retriever
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class RFIGeneratorAgent(BaseAgent):
@@ -62,8 +62,7 @@ class RFIGeneratorAgent(BaseAgent):
         self.template_path = Path(__file__).parent.parent / "templates" / "rfi_template.md"
         
         # Load template
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("RFI GENERATOR AGENT INITIALIZED")
@@ -382,51 +381,51 @@ class RFIGeneratorAgent(BaseAgent):
         config: Dict
     ) -> str:
         """Populate RFI template"""
-        content = self.template
+        values = {}
         
         # Basic information
-        content = content.replace('{{rfi_number}}', f"RFI-{datetime.now().strftime('%Y%m%d')}-{project_info.get('program_name', 'PRG')[:3].upper()}")
-        content = content.replace('{{program_name}}', project_info.get('program_name', 'TBD'))
-        content = content.replace('{{issue_date}}', deadlines['issue_date'])
-        content = content.replace('{{response_deadline}}', deadlines['response_deadline'])
-        content = content.replace('{{response_deadline_detailed}}', deadlines['response_deadline_detailed'])
-        content = content.replace('{{questions_deadline}}', deadlines['questions_deadline'])
-        content = content.replace('{{questions_response_date}}', deadlines['questions_response_date'])
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['rfi_number'] = f"RFI-{datetime.now().strftime('%Y%m%d')}-{project_info.get('program_name', 'PRG')[:3].upper()}"
+        values['program_name'] = project_info.get('program_name', 'TBD')
+        values['issue_date'] = deadlines['issue_date']
+        values['response_deadline'] = deadlines['response_deadline']
+        values['response_deadline_detailed'] = deadlines['response_deadline_detailed']
+        values['questions_deadline'] = deadlines['questions_deadline']
+        values['questions_response_date'] = deadlines['questions_response_date']
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
         
         # Agency and POC information
-        content = content.replace('{{agency}}', project_info.get('organization', 'Department of Defense'))
-        content = content.replace('{{office}}', config.get('office', 'Contracting Office'))
-        content = content.replace('{{poc_name}}', config.get('poc_name', project_info.get('contracting_officer', 'John Doe')))
-        content = content.replace('{{poc_title}}', config.get('poc_title', 'Contracting Officer'))
-        content = content.replace('{{poc_email}}', config.get('poc_email', project_info.get('ko_email', 'contracting@agency.mil')))
-        content = content.replace('{{poc_phone}}', config.get('poc_phone', project_info.get('ko_phone', '(703) 555-0000')))
-        content = content.replace('{{questions_email}}', config.get('poc_email', project_info.get('ko_email', 'contracting@agency.mil')))
+        values['agency'] = project_info.get('organization', 'Department of Defense')
+        values['office'] = config.get('office', 'Contracting Office')
+        values['poc_name'] = config.get('poc_name', project_info.get('contracting_officer', 'John Doe'))
+        values['poc_title'] = config.get('poc_title', 'Contracting Officer')
+        values['poc_email'] = config.get('poc_email', project_info.get('ko_email', 'contracting@agency.mil'))
+        values['poc_phone'] = config.get('poc_phone', project_info.get('ko_phone', '(703) 555-0000'))
+        values['questions_email'] = config.get('poc_email', project_info.get('ko_email', 'contracting@agency.mil'))
         
         # Program information
-        content = content.replace('{{program_description}}', project_info.get('description', 'Cloud-based system development'))
-        content = content.replace('{{estimated_funding}}', project_info.get('estimated_value', '$5M - $10M'))
-        content = content.replace('{{period_of_performance}}', project_info.get('period_of_performance', '12 months base + 4 option years'))
+        values['program_description'] = project_info.get('description', 'Cloud-based system development')
+        values['estimated_funding'] = project_info.get('estimated_value', '$5M - $10M')
+        values['period_of_performance'] = project_info.get('period_of_performance', '12 months base + 4 option years')
         
         # Technical questions - populate each section
         for category, questions in technical_questions.items():
             questions_text = '\n\n'.join([f"**Question:** {q}" for q in questions])
             # Use a placeholder that matches the category
             placeholder_key = category.lower().replace(' ', '_').replace('and', '')
-            content = content.replace(f'{{{{{placeholder_key}_questions}}}}', questions_text)
+            values[f'{placeholder_key}_questions'] = questions_text
         
         # Matrices
-        content = content.replace('{{technical_capability_matrix}}', matrices['technical_capability_matrix'])
-        content = content.replace('{{compliance_matrix}}', matrices['compliance_matrix'])
+        values['technical_capability_matrix'] = matrices['technical_capability_matrix']
+        values['compliance_matrix'] = matrices['compliance_matrix']
         
         # Page limits
-        content = content.replace('{{technical_page_limit}}', str(config.get('technical_page_limit', 25)))
-        content = content.replace('{{past_performance_page_limit}}', str(config.get('past_performance_page_limit', 15)))
-        content = content.replace('{{cost_page_limit}}', str(config.get('cost_page_limit', 10)))
+        values['technical_page_limit'] = str(config.get('technical_page_limit', 25))
+        values['past_performance_page_limit'] = str(config.get('past_performance_page_limit', 15))
+        values['cost_page_limit'] = str(config.get('cost_page_limit', 10))
         
         # Submission method
         submission_method = config.get('submission_method', f"Email to {config.get('poc_email', 'contracting@agency.mil')}")
-        content = content.replace('{{submission_method}}', submission_method)
+        values['submission_method'] = submission_method
         
         # Contract type specific questions
         contract_type = config.get('contract_type', 'services')
@@ -442,14 +441,11 @@ class RFIGeneratorAgent(BaseAgent):
 
 **Question:** How will you approach intellectual property development and data rights?
 """
-            content = content.replace('{{contract_type_specific_technical_questions}}', rd_questions)
+            values['contract_type_specific_technical_questions'] = rd_questions
         else:
-            content = content.replace('{{contract_type_specific_technical_questions}}', '')
+            values['contract_type_specific_technical_questions'] = ''
         
-        # Fill remaining placeholders
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD', content)
-        
-        return content
+        return self.render_template(self.template, values, missing='TBD')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save RFI to file"""
@@ -7,13 +7,13 @@ from typing import Dict, List, Optional
 from pathlib import Path
 import sys
 from datetime import datetime
-import re
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class SectionBGeneratorAgent(BaseAgent):
@@ -34,8 +34,7 @@ class SectionBGeneratorAgent(BaseAgent):
         super().__init__(name="Section B Generator Agent", api_key=api_key, model=model, temperature=0.3)
         
         self.template_path = Path(__file__).parent.parent / "templates" / "section_b_template.md"
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("SECTION B GENERATOR INITIALIZED")
@@ -194,12 +193,12 @@ class SectionBGeneratorAgent(BaseAgent):
         IMPORTANT: CLIN placeholder replacements must use proper table row format
         to maintain markdown table structure. Plain 'TBD' breaks table parsing.
         """
-        content = self.template
+        values = {}
         
         # Basic info replacements
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{program_name}}', solicitation_info.get('program_name', 'TBD'))
-        content = content.replace('{{date}}', datetime.now().strftime('%B %d, %Y'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['program_name'] = solicitation_info.get('program_name', 'TBD')
+        values['date'] = datetime.now().strftime('%B %d, %Y')
         
         # Get CLINs from structure (use defaults if not available)
         clins = clin_structure.get('clins', [])
@@ -213,9 +212,9 @@ class SectionBGeneratorAgent(BaseAgent):
             base_clins = '| 0001 | Base Period Services | 1 | LOT | $1,200,000 | $1,200,000 |'
             base_total = '$1,200,000'
         
-        content = content.replace('{{base_period_clins}}', base_clins)
-        content = content.replace('{{base_period_total}}', base_total)
-        content = content.replace('{{base_period}}', 'Year 1')
+        values['base_period_clins'] = base_clins
+        values['base_period_total'] = base_total
+        values['base_period'] = 'Year 1'
         
         # Option period CLIN table rows - MUST be proper table row format, not plain 'TBD'
         # This is critical for proper markdown table rendering
@@ -236,18 +235,16 @@ class SectionBGeneratorAgent(BaseAgent):
                 opt_row = '| TBD | TBD | TBD | TBD | TBD | TBD |'
                 opt_total = 'TBD'
             
-            content = content.replace('{{' + clin_key + '}}', opt_row)
-            content = content.replace('{{' + total_key + '}}', opt_total)
-            content = content.replace('{{' + period_key + '}}', f'Year {idx + 1}')
+            values[clin_key] = opt_row
+            values[total_key] = opt_total
+            values[period_key] = f'Year {idx + 1}'
         
         # Contract type and total value
-        content = content.replace('{{contract_type}}', config.get('contract_type', 'Firm-Fixed-Price'))
-        content = content.replace('{{total_contract_value}}', clin_structure['total_value'])
+        values['contract_type'] = config.get('contract_type', 'Firm-Fixed-Price')
+        values['total_contract_value'] = clin_structure['total_value']
         
         # Fill any remaining placeholders with TBD
-        # Note: At this point, no table row placeholders should remain
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD', content)
-        return content
+        return self.render_template(self.template, values, missing='TBD')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save Section B to file"""
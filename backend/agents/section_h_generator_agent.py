@@ -7,12 +7,13 @@ from typing import Dict
 from pathlib import Path
 import sys
 from datetime import datetime
-import re
+import asyncio
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
+from backend.utils.template_engine import load_template
 
 
 class SectionHGeneratorAgent(BaseAgent):
@@ -32,8 +33,7 @@ class SectionHGeneratorAgent(BaseAgent):
         super().__init__(name="Section H Generator Agent", api_key=api_key, model=model, temperature=0.4)
         
         self.template_path = Path(__file__).parent.parent / "templates" / "section_h_template.md"
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("SECTION H GENERATOR INITIALIZED")
@@ -86,7 +86,8 @@ class SectionHGeneratorAgent(BaseAgent):
             'dependencies': dependencies  # Pass through for reference
         }
 
-        result = self.execute(task)
+        # execute() is synchronous - run it off the event loop
+        result = await asyncio.to_thread(self.execute, task)
 
         # Add dependency references to content
         if dependencies:
@@ -187,20 +188,18 @@ class SectionHGeneratorAgent(BaseAgent):
     
     def _populate_template(self, solicitation_info: Dict, pws_content: str, config: Dict) -> str:
         """Populate Section H template"""
-        content = self.template
+        values = {}
         
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{program_name}}', solicitation_info.get('program_name', 'TBD'))
-        content = content.replace('{{date}}', datetime.now().strftime('%B %d, %Y'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['program_name'] = solicitation_info.get('program_name', 'TBD')
+        values['date'] = datetime.now().strftime('%B %d, %Y')
         
         # Cybersecurity
-        content = content.replace('{{cmmc_level}}', config.get('cmmc_level', 'Level 2'))
-        content = content.replace('{{cmmc_timeframe}}', config.get('cmmc_timeframe', '12 months'))
-        content = content.replace('{{incident_reporting_hours}}', config.get('incident_reporting', '72'))
+        values['cmmc_level'] = config.get('cmmc_level', 'Level 2')
+        values['cmmc_timeframe'] = config.get('cmmc_timeframe', '12 months')
+        values['incident_reporting_hours'] = config.get('incident_reporting', '72')
         
-        # Fill remaining
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD - To be specified based on contract requirements', content)
-        return content
+        return self.render_template(self.template, values, missing='TBD - To be specified based on contract requirements')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save Section H to file"""
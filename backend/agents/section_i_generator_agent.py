@@ -7,13 +7,13 @@ from typing import Dict, List
 from pathlib import Path
 import sys
 from datetime import datetime
-import re
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class SectionIGeneratorAgent(BaseAgent):
@@ -34,8 +34,7 @@ class SectionIGeneratorAgent(BaseAgent):
         super().__init__(name="Section I Generator Agent", api_key=api_key, model=model, temperature=0.2)
         
         self.template_path = Path(__file__).parent.parent / "templates" / "section_i_template.md"
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         # Clause database by contract type
         self.clause_sets = self._initialize_clause_sets()
@@ -167,23 +166,21 @@ class SectionIGeneratorAgent(BaseAgent):
     
     def _populate_template(self, solicitation_info: Dict, clauses: List[str], config: Dict) -> str:
         """Populate Section I template"""
-        content = self.template
+        values = {}
         
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{program_name}}', solicitation_info.get('program_name', 'TBD'))
-        content = content.replace('{{date}}', datetime.now().strftime('%B %d, %Y'))
-        content = content.replace('{{contract_type}}', config.get('contract_type', 'Firm-Fixed-Price'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['program_name'] = solicitation_info.get('program_name', 'TBD')
+        values['date'] = datetime.now().strftime('%B %d, %Y')
+        values['contract_type'] = config.get('contract_type', 'Firm-Fixed-Price')
         
         # Payment and termination clauses based on contract type
         contract_type_key = config.get('contract_type', 'ffp').lower().replace('firm-fixed-price', 'ffp').replace('cost-plus-fixed-fee', 'cpff')[:3]
         
         if contract_type_key in self.clause_sets:
-            content = content.replace('{{payment_clauses}}', self.clause_sets[contract_type_key]['payments'])
-            content = content.replace('{{termination_clauses}}', self.clause_sets[contract_type_key]['termination'])
+            values['payment_clauses'] = self.clause_sets[contract_type_key]['payments']
+            values['termination_clauses'] = self.clause_sets[contract_type_key]['termination']
         
-        # Fill remaining
-        content = re.sub(r'\{\{[^}]+\}\}', 'See FAR Part 52', content)
-        return content
+        return self.render_template(self.template, values, missing='See FAR Part 52')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save Section I to file"""
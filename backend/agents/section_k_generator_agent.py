@@ -14,6 +14,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class SectionKGeneratorAgent(BaseAgent):
@@ -33,8 +34,7 @@ class SectionKGeneratorAgent(BaseAgent):
         super().__init__(name="Section K Generator Agent", api_key=api_key, model=model, temperature=0.2)
         
         self.template_path = Path(__file__).parent.parent / "templates" / "section_k_template.md"
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("SECTION K GENERATOR INITIALIZED")
@@ -98,19 +98,17 @@ class SectionKGeneratorAgent(BaseAgent):
     
     def _populate_template(self, solicitation_info: Dict, config: Dict) -> str:
         """Populate Section K template"""
-        content = self.template
+        values = {}
         
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{program_name}}', solicitation_info.get('program_name', 'TBD'))
-        content = content.replace('{{date}}', datetime.now().strftime('%B %d, %Y'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['program_name'] = solicitation_info.get('program_name', 'TBD')
+        values['date'] = datetime.now().strftime('%B %d, %Y')
         
         # NAICS and size standard
-        content = content.replace('{{naics_code}}', config.get('naics_code', '541512'))
-        content = content.replace('{{size_standard}}', config.get('size_standard', '$34M'))
+        values['naics_code'] = config.get('naics_code', '541512')
+        values['size_standard'] = config.get('size_standard', '$34M')
         
-        # Fill remaining
-        content = re.sub(r'\{\{[^}]+\}\}', '', content)
-        return content
+        return self.render_template(self.template, values, missing='')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save Section K to file"""
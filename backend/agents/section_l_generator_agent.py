@@ -14,11 +14,12 @@ FAR Compliance:
 
 from typing import Dict, Optional, List
 from pathlib import Path
-import re
+import asyncio
 from datetime import datetime, timedelta
 from anthropic import Anthropic
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import CompiledTemplate, load_template
 
 
 class SectionLGeneratorAgent:
@@ -57,13 +58,12 @@ class SectionLGeneratorAgent:
 
         print("✓ Section L Generator Agent initialized")
 
-    def _load_template(self) -> str:
+    def _load_template(self) -> CompiledTemplate:
         """Load Section L template"""
         if not self.template_path.exists():
             raise FileNotFoundError(f"Section L template not found: {self.template_path}")
 
-        with open(self.template_path, 'r') as f:
-            return f.read()
+        return load_template(self.template_path)
 
     def has_collaboration_enabled(self) -> bool:
         """
@@ -122,7 +122,8 @@ class SectionLGeneratorAgent:
             'dependencies': dependencies  # Pass through for reference
         }
 
-        result = self.execute(task)
+        # execute() is synchronous - run it off the event loop
+        result = await asyncio.to_thread(self.execute, task)
 
         # Add dependency references to content
         if dependencies:
@@ -545,19 +546,8 @@ class SectionLGeneratorAgent:
         Returns:
             Populated Section L content
         """
-        content = self.template
-
-        # Replace all template variables
-        for key, value in project_info.items():
-            placeholder = f"{{{{{key}}}}}"
-            content = content.replace(placeholder, str(value))
-
-        # Handle any remaining placeholders with defaults
-        remaining_placeholders = re.findall(r'\{\{(\w+)\}\}', content)
-        for placeholder in remaining_placeholders:
-            content = content.replace(f"{{{{{placeholder}}}}}", "[TO BE DETERMINED]")
-
-        return content
+        # Placeholders without a project value default to [TO BE DETERMINED]
+        return self.template.render(project_info, missing="[TO BE DETERMINED]").content
 
     def _generate_solicitation_number(self, organization: str) -> str:
         """Generate DoD-style solicitation number"""
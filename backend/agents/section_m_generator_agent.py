@@ -15,11 +15,12 @@ FAR Compliance:
 
 from typing import Dict, Optional, List, Tuple
 from pathlib import Path
-import re
+import asyncio
 from datetime import datetime
 from anthropic import Anthropic
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import CompiledTemplate, load_template
 
 
 class SectionMGeneratorAgent:
@@ -59,13 +60,12 @@ class SectionMGeneratorAgent:
 
         print("✓ Section M Generator Agent initialized")
 
-    def _load_template(self) -> str:
+    def _load_template(self) -> CompiledTemplate:
         """Load Section M template"""
         if not self.template_path.exists():
             raise FileNotFoundError(f"Section M template not found: {self.template_path}")
 
-        with open(self.template_path, 'r') as f:
-            return f.read()
+        return load_template(self.template_path)
 
     def has_collaboration_enabled(self) -> bool:
         """
@@ -129,7 +129,8 @@ class SectionMGeneratorAgent:
             'dependencies': dependencies  # Pass through for reference
         }
 
-        result = self.execute(task)
+        # execute() is synchronous - run it off the event loop
+        result = await asyncio.to_thread(self.execute, task)
 
         # Add dependency references to content
         if dependencies:
@@ -793,19 +794,8 @@ class SectionMGeneratorAgent:
         Returns:
             Populated Section M content
         """
-        content = self.template
-
-        # Replace all template variables
-        for key, value in project_info.items():
-            placeholder = f"{{{{{key}}}}}"
-            content = content.replace(placeholder, str(value))
-
-        # Handle any remaining placeholders with defaults
-        remaining_placeholders = re.findall(r'\{\{(\w+)\}\}', content)
-        for placeholder in remaining_placeholders:
-            content = content.replace(f"{{{{{placeholder}}}}}", "[TO BE DETERMINED]")
-
-        return content
+        # Placeholders without a project value default to [TO BE DETERMINED]
+        return self.template.render(project_info, missing="[TO BE DETERMINED]").content
 
     def _generate_solicitation_number(self, organization: str) -> str:
         """Generate DoD-style solicitation number"""
@@ -7,7 +7,6 @@ from typing import Dict, Optional
 from pathlib import Path
 import sys
 from datetime import datetime
-import re
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -15,6 +14,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class SF26GeneratorAgent(BaseAgent):
@@ -49,8 +49,7 @@ class SF26GeneratorAgent(BaseAgent):
         
         self.template_path = Path(__file__).parent.parent / "templates" / "sf26_template.md"
         
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("SF-26 GENERATOR AGENT INITIALIZED")
@@ -196,44 +195,41 @@ class SF26GeneratorAgent(BaseAgent):
         config: Dict
     ) -> str:
         """Populate SF-26 template"""
-        content = self.template
+        values = {}
         
         # Contract number
-        content = content.replace('{{contract_number}}', award_info.get('contract_number', 'TBD'))
-        content = content.replace('{{effective_date}}', award_info.get('effective_date', datetime.now().strftime('%B %d, %Y')))
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{solicitation_issue_date}}', solicitation_info.get('issue_date', 'TBD'))
+        values['contract_number'] = award_info.get('contract_number', 'TBD')
+        values['effective_date'] = award_info.get('effective_date', datetime.now().strftime('%B %d, %Y'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['solicitation_issue_date'] = solicitation_info.get('issue_date', 'TBD')
         
         # Contractor information
-        content = content.replace('{{contractor_name}}', contractor_info.get('name', 'TBD'))
-        content = content.replace('{{contractor_duns}}', contractor_info.get('duns', 'TBD'))
-        content = content.replace('{{contractor_address}}', contractor_info.get('address', 'TBD'))
-        content = content.replace('{{business_size}}', contractor_info.get('size', 'Small Business'))
-        content = content.replace('{{socioeconomic_status}}', contractor_info.get('socioeconomic', 'N/A'))
+        values['contractor_name'] = contractor_info.get('name', 'TBD')
+        values['contractor_duns'] = contractor_info.get('duns', 'TBD')
+        values['contractor_address'] = contractor_info.get('address', 'TBD')
+        values['business_size'] = contractor_info.get('size', 'Small Business')
+        values['socioeconomic_status'] = contractor_info.get('socioeconomic', 'N/A')
         
         # Award amount
-        content = content.replace('{{total_contract_value}}', award_info.get('total_value', 'TBD'))
-        content = content.replace('{{contract_value}}', award_info.get('total_value', 'TBD'))
-        content = content.replace('{{base_period_value}}', award_info.get('base_value', 'TBD'))
+        values['total_contract_value'] = award_info.get('total_value', 'TBD')
+        values['contract_value'] = award_info.get('total_value', 'TBD')
+        values['base_period_value'] = award_info.get('base_value', 'TBD')
         
         # Period of performance
-        content = content.replace('{{period_of_performance}}', award_info.get('period', '12 months base + 4 option years'))
-        content = content.replace('{{total_period}}', award_info.get('period', '60 months'))
+        values['period_of_performance'] = award_info.get('period', '12 months base + 4 option years')
+        values['total_period'] = award_info.get('period', '60 months')
         
         # Contract type
-        content = content.replace('{{contract_type}}', award_info.get('contract_type', 'Firm-Fixed-Price'))
+        values['contract_type'] = award_info.get('contract_type', 'Firm-Fixed-Price')
         
         # Set-aside
-        content = content.replace('{{set_aside_type}}', contractor_info.get('set_aside', 'Small Business'))
-        content = content.replace('{{naics_code}}', contractor_info.get('naics', '541512'))
+        values['set_aside_type'] = contractor_info.get('set_aside', 'Small Business')
+        values['naics_code'] = contractor_info.get('naics', '541512')
         
         # Award date
-        content = content.replace('{{award_date}}', datetime.now().strftime('%B %d, %Y'))
+        values['award_date'] = datetime.now().strftime('%B %d, %Y')
         
-        # Fill remaining
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD', content)
-        
-        return content
+        return self.render_template(self.template, values, missing='TBD')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save SF-26 to file"""
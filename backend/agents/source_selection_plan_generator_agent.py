@@ -15,6 +15,7 @@ from backend.agents.base_agent import BaseAgent
 from backend.rag.retriever import Retriever
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class SourceSelectionPlanGeneratorAgent(BaseAgent):
@@ -48,8 +49,7 @@ class SourceSelectionPlanGeneratorAgent(BaseAgent):
 
         self.retriever = retriever
         self.template_path = Path(__file__).parent.parent / "templates" / "source_selection_plan_template.md"
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
 
         print("\n" + "="*70)
         print("SOURCE SELECTION PLAN GENERATOR INITIALIZED")
@@ -497,7 +497,7 @@ class SourceSelectionPlanGeneratorAgent(BaseAgent):
         2. RAG-retrieved values (from documents)
         3. Descriptive TBDs with context
         """
-        content = self.template
+        values = {}
 
         # Helper function for priority-based value selection
         def get_value(config_key=None, rag_key=None, default='TBD'):
@@ -508,97 +508,93 @@ class SourceSelectionPlanGeneratorAgent(BaseAgent):
             return default
 
         # Basic information
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{program_name}}', solicitation_info.get('program_name', 'TBD'))
-        content = content.replace('{{plan_date}}', datetime.now().strftime('%B %d, %Y'))
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['program_name'] = solicitation_info.get('program_name', 'TBD')
+        values['plan_date'] = datetime.now().strftime('%B %d, %Y')
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
 
         # SSA information with RAG enhancement
         ssa_name = get_value('ssa_name', default='TBD - SSA to be designated')
-        content = content.replace('{{ssa_name}}', ssa_name)
+        values['ssa_name'] = ssa_name
 
         ssa_title = get_value('ssa_title', 'ssa_title_found', 'Program Executive Officer')
-        content = content.replace('{{ssa_title}}', ssa_title)
+        values['ssa_title'] = ssa_title
 
         # Source selection method
-        content = content.replace('{{source_selection_method}}', config.get('source_selection_method', 'Best Value Trade-Off'))
+        values['source_selection_method'] = config.get('source_selection_method', 'Best Value Trade-Off')
 
         # SSA responsibilities with RAG enhancement
         if 'ssa_responsibilities' in rag_context:
             ssa_resp = f"The SSA is responsible for: {rag_context['ssa_responsibilities']}"
-            content = content.replace('{{ssa_responsibilities}}', ssa_resp)
+            values['ssa_responsibilities'] = ssa_resp
         else:
-            content = content.replace('{{ssa_responsibilities}}', 'TBD - SSA responsibilities per FAR 15.303')
+            values['ssa_responsibilities'] = 'TBD - SSA responsibilities per FAR 15.303'
 
         # Organizational structure with RAG enhancement
         if 'org_structure' in rag_context:
             org_text = f"**Organizational Structure:** {rag_context['org_structure']}"
-            content = content.replace('{{org_structure}}', org_text)
+            values['org_structure'] = org_text
         else:
-            content = content.replace('{{org_structure}}', 'TBD - Organizational structure to be documented')
+            values['org_structure'] = 'TBD - Organizational structure to be documented'
 
         # SSEB composition with RAG enhancement
         sseb_comp = get_value('sseb_composition', 'sseb_composition', 'TBD - SSEB composition to be determined')
         if 'sseb_size' in rag_context:
             sseb_comp += f" (approximately {rag_context['sseb_size']} members)"
-        content = content.replace('{{sseb_composition}}', sseb_comp)
+        values['sseb_composition'] = sseb_comp
 
         # SSEB Chair with RAG enhancement
         sseb_chair = get_value('sseb_chair', 'sseb_chair', 'TBD - SSEB Chair to be designated')
-        content = content.replace('{{sseb_chair}}', sseb_chair)
+        values['sseb_chair'] = sseb_chair
 
         # SSAC composition with RAG enhancement
         ssac_comp = get_value('ssac_composition', 'ssac_composition', 'TBD - SSAC composition to be determined')
         if 'ssac_size' in rag_context:
             ssac_comp += f" (approximately {rag_context['ssac_size']} members)"
-        content = content.replace('{{ssac_composition}}', ssac_comp)
+        values['ssac_composition'] = ssac_comp
 
         # Consensus methodology with RAG enhancement
         consensus = get_value('consensus_method', 'consensus_methodology', 'TBD - Consensus methodology per FAR 15.305')
-        content = content.replace('{{consensus_methodology}}', consensus)
+        values['consensus_methodology'] = consensus
 
         # Evaluation phases with RAG enhancement
         if 'evaluation_phases' in rag_context and rag_context['evaluation_phases']:
             phases_text = "**Evaluation Phases:**\n"
             for i, phase in enumerate(rag_context['evaluation_phases'], 1):
                 phases_text += f"{i}. {phase}\n"
-            content = content.replace('{{evaluation_phases}}', phases_text)
+            values['evaluation_phases'] = phases_text
         else:
-            content = content.replace('{{evaluation_phases}}', 'TBD - Evaluation phases to be defined')
+            values['evaluation_phases'] = 'TBD - Evaluation phases to be defined'
 
         # Documentation requirements with RAG enhancement
         doc_req = get_value('documentation_requirements', 'documentation_requirements', 'TBD - Documentation requirements per FAR')
-        content = content.replace('{{documentation_requirements}}', doc_req)
+        values['documentation_requirements'] = doc_req
 
         # Schedule table
         schedule_table = '\n'.join([
             f"| {item['event']} | {item['date'].strftime('%B %d, %Y')} | {item['duration']} | {item['responsible']} |"
             for item in schedule
         ])
-        content = content.replace('{{evaluation_schedule_table}}', schedule_table)
+        values['evaluation_schedule_table'] = schedule_table
 
         # Fill remaining placeholders with contextual TBDs
-        remaining_placeholders = re.findall(r'\{\{([^}]+)\}\}', content)
-        for placeholder in remaining_placeholders:
+        def contextual_tbd(placeholder: str) -> str:
             placeholder_lower = placeholder.lower()
             if 'sseb' in placeholder_lower:
-                replacement = 'TBD - SSEB details to be determined'
+                return 'TBD - SSEB details to be determined'
             elif 'ssac' in placeholder_lower:
-                replacement = 'TBD - SSAC details to be determined'
+                return 'TBD - SSAC details to be determined'
             elif 'ssa' in placeholder_lower:
-                replacement = 'TBD - SSA information to be provided'
+                return 'TBD - SSA information to be provided'
             elif 'evaluation' in placeholder_lower:
-                replacement = 'TBD - Evaluation details per Section M'
+                return 'TBD - Evaluation details per Section M'
             elif 'schedule' in placeholder_lower:
-                replacement = 'TBD - Schedule to be finalized'
+                return 'TBD - Schedule to be finalized'
             elif 'team' in placeholder_lower or 'member' in placeholder_lower:
-                replacement = 'TBD - Team member to be assigned'
-            else:
-                replacement = 'TBD - Information to be determined'
+                return 'TBD - Team member to be assigned'
+            return 'TBD - Information to be determined'
 
-            content = content.replace(f'{{{{{placeholder}}}}}', replacement)
-
-        return content
+        return self.render_template(self.template, values, missing=contextual_tbd)
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save SSP to file"""
@@ -16,6 +16,7 @@ from backend.agents.base_agent import BaseAgent
 from backend.rag.retriever import Retriever
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class SourcesSoughtGeneratorAgent(BaseAgent):
@@ -62,8 +63,7 @@ class SourcesSoughtGeneratorAgent(BaseAgent):
         self.template_path = Path(__file__).parent.parent / "templates" / "sources_sought_template.md"
         
         # Load template
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("SOURCES SOUGHT GENERATOR AGENT INITIALIZED")
@@ -411,49 +411,49 @@ List the key capabilities vendors should have to perform this work. Be specific
         config: Dict
     ) -> str:
         """Populate Sources Sought template"""
-        content = self.template
+        values = {}
         
         # Basic information
-        content = content.replace('{{notice_id}}', f"SS-{datetime.now().strftime('%Y%m%d')}-{project_info.get('program_name', 'PRG')[:3].upper()}")
-        content = content.replace('{{posted_date}}', deadlines['posted_date'])
-        content = content.replace('{{response_deadline}}', deadlines['response_deadline'])
-        content = content.replace('{{response_deadline_detailed}}', deadlines['response_deadline_detailed'])
-        content = content.replace('{{questions_deadline}}', deadlines['questions_deadline'])
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['notice_id'] = f"SS-{datetime.now().strftime('%Y%m%d')}-{project_info.get('program_name', 'PRG')[:3].upper()}"
+        values['posted_date'] = deadlines['posted_date']
+        values['response_deadline'] = deadlines['response_deadline']
+        values['response_deadline_detailed'] = deadlines['response_deadline_detailed']
+        values['questions_deadline'] = deadlines['questions_deadline']
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
         
         # Agency information
-        content = content.replace('{{agency}}', project_info.get('organization', 'Department of Defense'))
-        content = content.replace('{{office}}', config.get('office', 'Contracting Office'))
-        content = content.replace('{{location}}', config.get('location', 'Washington, DC'))
+        values['agency'] = project_info.get('organization', 'Department of Defense')
+        values['office'] = config.get('office', 'Contracting Office')
+        values['location'] = config.get('location', 'Washington, DC')
         
         # POC information
-        content = content.replace('{{poc_name}}', config.get('poc_name', project_info.get('contracting_officer', 'John Doe')))
-        content = content.replace('{{poc_title}}', config.get('poc_title', 'Contracting Officer'))
-        content = content.replace('{{poc_email}}', config.get('poc_email', project_info.get('ko_email', 'contracting@agency.mil')))
-        content = content.replace('{{poc_phone}}', config.get('poc_phone', project_info.get('ko_phone', '(703) 555-0000')))
+        values['poc_name'] = config.get('poc_name', project_info.get('contracting_officer', 'John Doe'))
+        values['poc_title'] = config.get('poc_title', 'Contracting Officer')
+        values['poc_email'] = config.get('poc_email', project_info.get('ko_email', 'contracting@agency.mil'))
+        values['poc_phone'] = config.get('poc_phone', project_info.get('ko_phone', '(703) 555-0000'))
         
         # Program information
-        content = content.replace('{{program_name}}', project_info.get('program_name', 'TBD'))
-        content = content.replace('{{program_description}}', project_info.get('description', 'Cloud-based system development and implementation'))
-        content = content.replace('{{estimated_value}}', project_info.get('estimated_value', '$5M - $10M'))
-        content = content.replace('{{period_of_performance}}', project_info.get('period_of_performance', '12 months base + 4 option years'))
+        values['program_name'] = project_info.get('program_name', 'TBD')
+        values['program_description'] = project_info.get('description', 'Cloud-based system development and implementation')
+        values['estimated_value'] = project_info.get('estimated_value', '$5M - $10M')
+        values['period_of_performance'] = project_info.get('period_of_performance', '12 months base + 4 option years')
         
         # Capabilities
         capabilities_text = '\n'.join([f"- {cap}" for cap in capabilities])
-        content = content.replace('{{key_requirements_summary}}', capabilities_text)
-        content = content.replace('{{technical_capabilities}}', capabilities_text)
+        values['key_requirements_summary'] = capabilities_text
+        values['technical_capabilities'] = capabilities_text
         
         # Questionnaire
         questionnaire_text = '\n\n'.join([
             f"**Question {q['number']}:** {q['question']}\n\n*Response Format:* {q['format']}"
             for q in questionnaire
         ])
-        content = content.replace('{{questionnaire}}', questionnaire_text)
+        values['questionnaire'] = questionnaire_text
         
         # Small business information
-        content = content.replace('{{small_business_set_aside}}', small_business_info['set_aside_type'])
-        content = content.replace('{{naics_code}}', small_business_info['naics_code'])
-        content = content.replace('{{size_standard}}', small_business_info['size_standard'])
+        values['small_business_set_aside'] = small_business_info['set_aside_type']
+        values['naics_code'] = small_business_info['naics_code']
+        values['size_standard'] = small_business_info['size_standard']
         
         # Contract type specific content
         contract_type = config.get('contract_type', 'services')
@@ -467,14 +467,11 @@ List the key capabilities vendors should have to perform this work. Be specific
 
 **Question 11:** Describe your approach to innovation and technology maturation.
 """
-            content = content.replace('{{contract_type_questions}}', contract_questions)
+            values['contract_type_questions'] = contract_questions
         else:
-            content = content.replace('{{contract_type_questions}}', '')
+            values['contract_type_questions'] = ''
         
-        # Fill remaining placeholders
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD', content)
-        
-        return content
+        return self.render_template(self.template, values, missing='TBD')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save Sources Sought notice to file"""
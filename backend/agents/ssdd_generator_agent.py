@@ -7,7 +7,6 @@ from typing import Dict, List, Optional
 from pathlib import Path
 import sys
 from datetime import datetime
-import re
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -15,6 +14,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from backend.agents.base_agent import BaseAgent
 from backend.utils.document_metadata_store import DocumentMetadataStore
 from backend.utils.document_extractor import DocumentDataExtractor
+from backend.utils.template_engine import load_template
 
 
 class SSDDGeneratorAgent(BaseAgent):
@@ -58,8 +58,7 @@ class SSDDGeneratorAgent(BaseAgent):
         self.template_path = Path(__file__).parent.parent / "templates" / "ssdd_template.md"
         
         # Load template
-        with open(self.template_path, 'r') as f:
-            self.template = f.read()
+        self.template = load_template(self.template_path)
         
         print("\n" + "="*70)
         print("SSDD GENERATOR AGENT INITIALIZED")
@@ -294,44 +293,41 @@ Write 2-3 paragraphs in government contract language."""
         config: Dict
     ) -> str:
         """Populate SSDD template"""
-        content = self.template
+        values = {}
         
         # Basic information
-        content = content.replace('{{solicitation_number}}', solicitation_info.get('solicitation_number', 'TBD'))
-        content = content.replace('{{program_name}}', solicitation_info.get('program_name', 'TBD'))
-        content = content.replace('{{decision_date}}', datetime.now().strftime('%B %d, %Y'))
-        content = content.replace('{{classification}}', config.get('classification', 'UNCLASSIFIED'))
+        values['solicitation_number'] = solicitation_info.get('solicitation_number', 'TBD')
+        values['program_name'] = solicitation_info.get('program_name', 'TBD')
+        values['decision_date'] = datetime.now().strftime('%B %d, %Y')
+        values['classification'] = config.get('classification', 'UNCLASSIFIED')
         
         # SSA information
-        content = content.replace('{{ssa_name}}', config.get('ssa_name', 'TBD'))
-        content = content.replace('{{ssa_title}}', config.get('ssa_title', 'Source Selection Authority'))
-        content = content.replace('{{ssa_organization}}', config.get('ssa_organization', 'TBD'))
+        values['ssa_name'] = config.get('ssa_name', 'TBD')
+        values['ssa_title'] = config.get('ssa_title', 'Source Selection Authority')
+        values['ssa_organization'] = config.get('ssa_organization', 'TBD')
         
         # Award details
-        content = content.replace('{{recommended_awardee}}', recommended_awardee)
-        content = content.replace('{{contract_value}}', config.get('contract_value', 'TBD'))
-        content = content.replace('{{contract_type}}', config.get('contract_type', 'FFP'))
-        content = content.replace('{{period_of_performance}}', config.get('period_of_performance', '12 months base + 4 option years'))
+        values['recommended_awardee'] = recommended_awardee
+        values['contract_value'] = config.get('contract_value', 'TBD')
+        values['contract_type'] = config.get('contract_type', 'FFP')
+        values['period_of_performance'] = config.get('period_of_performance', '12 months base + 4 option years')
         
         # Analysis
-        content = content.replace('{{basis_for_award}}', award_rationale)
-        content = content.replace('{{best_value_determination}}', best_value)
-        content = content.replace('{{best_value_determination_detailed}}', best_value)
-        content = content.replace('{{tradeoff_analysis}}', tradeoff_analysis)
-        content = content.replace('{{comparative_analysis}}', comparative_analysis['technical_comparison'])
+        values['basis_for_award'] = award_rationale
+        values['best_value_determination'] = best_value
+        values['best_value_determination_detailed'] = best_value
+        values['tradeoff_analysis'] = tradeoff_analysis
+        values['comparative_analysis'] = comparative_analysis['technical_comparison']
         
         # Evaluation results
-        content = content.replace('{{overall_results_table}}', comparative_analysis['overall_table'])
-        content = content.replace('{{proposals_received}}', str(len(evaluation_results)) if evaluation_results else '3')
-        content = content.replace('{{proposals_evaluated}}', str(len(evaluation_results)) if evaluation_results else '3')
+        values['overall_results_table'] = comparative_analysis['overall_table']
+        values['proposals_received'] = str(len(evaluation_results)) if evaluation_results else '3'
+        values['proposals_evaluated'] = str(len(evaluation_results)) if evaluation_results else '3'
         
         # Source selection method
-        content = content.replace('{{source_selection_method}}', config.get('source_selection_method', 'Best Value Trade-Off'))
+        values['source_selection_method'] = config.get('source_selection_method', 'Best Value Trade-Off')
         
-        # Fill remaining placeholders
-        content = re.sub(r'\{\{[^}]+\}\}', 'TBD', content)
-        
-        return content
+        return self.render_template(self.template, values, missing='TBD')
     
     def save_to_file(self, content: str, output_path: str, convert_to_pdf: bool = True) -> Dict:
         """Save SSDD to file"""
@@ -6,7 +6,21 @@ Checks for accuracy, hallucinations, vague language, citations, and legal risks
 import re
 import anthropic
 import os
+import sys
 from typing import Dict, List, Tuple
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.utils.vague_language_scanner import VagueLanguageScanner
+
+
+VAGUE_WORD_SCANNER = VagueLanguageScanner(terms=[
+    'several', 'many', 'some', 'a few', 'numerous', 'various', 'multiple',
+    'significant', 'substantial', 'considerable',
+    'approximately', 'around', 'roughly',
+])
 
 
 class ReportEvaluator:
@@ -157,35 +171,17 @@ If no hallucinations found, state: "No clear hallucinations detected."
     def detect_vague_language(self, report: str) -> Dict:
         """Detect vague, non-specific language"""
 
-        vague_patterns = [
-            r'\bseveral\b',
-            r'\bmany\b',
-            r'\bsome\b',
-            r'\ba few\b',
-            r'\bnumerous\b',
-            r'\bvarious\b',
-            r'\bmultiple\b',
-            r'\bsignificant\b',
-            r'\bsubstantial\b',
-            r'\bconsiderable\b',
-            r'\bapproximately\b',
-            r'\baround\b',
-            r'\broughly\b',
-        ]
-
         findings = []
 
-        for pattern in vague_patterns:
-            matches = re.finditer(pattern, report, re.IGNORECASE)
-            for match in matches:
-                # Get context (50 chars before and after)
-                start = max(0, match.start() - 50)
-                end = min(len(report), match.end() + 50)
-                context = report[start:end].replace('\n', ' ')
-                findings.append({
-                    'word': match.group(),
-                    'context': f"...{context}..."
-                })
+        for match in VAGUE_WORD_SCANNER.iter_matches(report):
+            # Get context (50 chars before and after)
+            start = max(0, match.start - 50)
+            end = min(len(report), match.end + 50)
+            context = report[start:end].replace('\n', ' ')
+            findings.append({
+                'word': match.text,
+                'context': f"...{context}..."
+            })
 
         print(f"  Found {len(findings)} instances of vague language")
         if findings:
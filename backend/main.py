@@ -1,10 +1,12 @@
 """
 Main FastAPI application - DoD Procurement Document Generation System
 """
-from fastapi import FastAPI, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query, UploadFile, File, Body, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query, UploadFile, File, Body
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Dict, Optional, Any
 from contextlib import asynccontextmanager  # For modern FastAPI lifespan events
@@ -13,20 +15,24 @@ import os
 import uvicorn
 from dotenv import load_dotenv
 
-from backend.database.base import get_db, init_db
-from backend.middleware.auth import get_current_user, authenticate_user, create_access_token, get_password_hash
+from backend.database.base import get_db, get_async_db, init_db, dispose_async_engine
+from backend.middleware.auth import get_current_user, get_current_user_async, authenticate_user, create_access_token, get_password_hash
 from backend.models.user import User, UserRole
 from backend.models.procurement import ProcurementProject, ProcurementPhase, ProcurementStep
 from backend.models.document import ProjectDocument, DocumentUpload
 from backend.models.notification import Notification
 from backend.services.websocket_manager import WebSocketManager
-from backend.services.rag_service import get_rag_service, initialize_rag_service
+from backend.services.rag_service import get_rag_service, initialize_rag_service, shutdown_rag_service
 from backend.services.generation_coordinator import get_generation_coordinator, GenerationTask
 from backend.services.phase_detector import get_phase_detector
 from backend.services.export_service import ExportService
+from backend.services import project_queries
 from backend.services.agent_comparison_service import get_comparison_service, AgentVariant
 from backend.services.document_initializer import get_document_initializer
 from backend.agents.quality_agent import QualityAgent
+from backend.agents.llm_client import close_async_clients
+from backend.services.job_queue import get_job_queue, job_handler, JobContext, JobFailed, JobWorker, RetryPolicy
+from backend.services.stream_bus import get_stream_bus
 
 load_dotenv()
 
@@ -41,8 +47,9 @@ async def lifespan(app: FastAPI):
     Lifespan context manager for startup/shutdown events.
     This is the modern replacement for @app.on_event("startup") and @app.on_event("shutdown").
     
-    Startup: Initialize database and RAG service
-    Shutdown: Optional cleanup (currently just logs)
+    Startup: Initialize database, RAG service, the WebSocket stream bus and the in-process job worker
+    Shutdown: Stop the job worker and the stream bus, flush pending RAG saves, stop the export render pool,
+    close the async database engine and the shared async LLM client pool
     """
     # === STARTUP ===
     print("🚀 Starting DoD Procurement API...")
@@ -64,6 +71,17 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️  Failed to initialize RAG system: {e}")
     
+    # Start a job worker in this process (disable for API-only processes
+    # when workers run separately via backend.scripts.run_job_worker)
+    job_worker = None
+    await ws_manager.start()
+    if os.getenv("JOB_WORKER_IN_PROCESS", "true").lower() == "true":
+        job_worker = JobWorker(get_job_queue())
+        job_worker.start()
+    elif ws_manager.bus is None:
+        print("⚠️  JOB_WORKER_IN_PROCESS is off and WS_STREAM_BUS_URL is not set - "
+              "jobs run elsewhere can't stream to this process's WebSockets")
+    
     print("🌐 API is ready at http://localhost:8000")
     print("📚 API docs available at http://localhost:8000/docs")
     
@@ -71,6 +89,13 @@ async def lifespan(app: FastAPI):
     
     # === SHUTDOWN ===
     print("🛑 Shutting down DoD Procurement API...")
+    if job_worker:
+        await job_worker.stop()
+    await ws_manager.stop()
+    shutdown_rag_service()
+    export_service.shutdown()
+    await dispose_async_engine()
+    await close_async_clients()
 
 
 # Create FastAPI app with lifespan handler
@@ -91,8 +116,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# WebSocket Manager
-ws_manager = WebSocketManager()
+# WebSocket Manager (room messages reach other processes through the stream bus)
+ws_manager = WebSocketManager(bus=get_stream_bus())
 
 # Serve static files (uploaded documents, generated PDFs, etc.)
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
@@ -794,25 +819,7 @@ def get_document_uploads(
     db: Session = Depends(get_db)
 ):
     """Get upload history for a document"""
-    from backend.models.document import DocumentUpload
-
-    uploads = db.query(DocumentUpload).filter(
-        DocumentUpload.project_document_id == document_id
-    ).order_by(DocumentUpload.version_number.desc()).all()
-
-    # Add uploader info
-    uploads_data = []
-    for upload in uploads:
-        upload_dict = upload.to_dict()
-        uploader = db.query(User).filter(User.id == upload.uploaded_by).first()
-        if uploader:
-            upload_dict["uploader"] = {
-                "name": uploader.name,
-                "email": uploader.email
-            }
-        uploads_data.append(upload_dict)
-
-    return {"uploads": uploads_data}
+    return {"uploads": project_queries.list_document_uploads(db, document_id)}
 
 
 @app.post("/api/documents/{document_id}/upload", tags=["Documents"])
@@ -821,29 +828,33 @@ async def upload_document_file(
     file: bytes = None,
     file_name: str = "",
     notes: str = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload a file for a document (simplified version - stores metadata only)"""
     from backend.models.document import DocumentUpload
 
     # Verify document exists
-    document = db.query(ProjectDocument).filter(ProjectDocument.id == document_id).first()
+    document = await db.scalar(select(ProjectDocument).where(ProjectDocument.id == document_id))
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
     # Get next version number
-    latest_upload = db.query(DocumentUpload).filter(
-        DocumentUpload.project_document_id == document_id
-    ).order_by(DocumentUpload.version_number.desc()).first()
+    latest_version = await db.scalar(
+        select(func.max(DocumentUpload.version_number)).where(
+            DocumentUpload.project_document_id == document_id
+        )
+    )
 
-    next_version = (latest_upload.version_number + 1) if latest_upload else 1
+    next_version = (latest_version + 1) if latest_version else 1
 
     # Mark previous versions as not current
-    db.query(DocumentUpload).filter(
-        DocumentUpload.project_document_id == document_id,
-        DocumentUpload.is_current_version == True
-    ).update({"is_current_version": False})
+    await db.execute(
+        update(DocumentUpload).where(
+            DocumentUpload.project_document_id == document_id,
+            DocumentUpload.is_current_version == True
+        ).values(is_current_version=False)
+    )
 
     # Create upload record (placeholder - real implementation would save file)
     file_path = f"/files/{document_id}_{next_version}_{file_name}" if file_name else f"/files/{document_id}_v{next_version}"
@@ -861,8 +872,8 @@ async def upload_document_file(
     )
 
     db.add(upload)
-    db.commit()
-    db.refresh(upload)
+    await db.commit()
+    await db.refresh(upload)
 
     return {"message": "Document uploaded successfully", "upload": upload.to_dict()}
 
@@ -905,29 +916,55 @@ def update_document(
 # AI DOCUMENT GENERATION ENDPOINTS
 # ============================================================================
 
-# Store for tracking generation tasks
-document_generation_tasks: Dict[str, Dict] = {}
+# Generation tasks run as durable jobs (see services/job_queue.py); the
+# task_id clients poll is the job ID and its status is the job's state.
 
 
 class DocumentGenerationRequest(BaseModel):
     """Request model for document generation"""
     assumptions: List[Dict[str, str]] = []
     additional_context: Optional[str] = None
+    # Stream generated text over /ws/{project_id} and the guided flow socket
+    stream_tokens: bool = False
 
 
 class BatchGenerationRequest(BaseModel):
     """Request model for batch document generation"""
     document_ids: List[str]
     assumptions: List[Dict[str, str]] = []
+    # Stream generated text over /ws/{project_id} and the guided flow sockets
+    # (across processes only with WS_STREAM_BUS_URL; see stream_bus.py)
+    stream_tokens: bool = False
+
+
+def websocket_token_streamer(rooms: List[str]):
+    """
+    Build a GenerationTask token_callback that streams to WebSocket rooms
+
+    The job may run in a different process from the one holding the
+    sockets; ws_manager's stream bus carries the deltas there.
+
+    Args:
+        rooms: Rooms to send token deltas to (see WebSocketManager)
+
+    Returns:
+        Callback taking (document_name, section, text_delta or None, aborted=False)
+    """
+    def on_token(document_name: str, section: int, delta: Optional[str], aborted: bool = False):
+        if delta is None:
+            ws_manager.send_token_stream_end(rooms, document_name, section, aborted=aborted)
+        else:
+            ws_manager.send_token_delta(rooms, document_name, section, delta)
+
+    return on_token
 
 
 @app.post("/api/documents/{document_id}/generate", tags=["Document Generation"])
 async def generate_document_content(
     document_id: str,
     request: DocumentGenerationRequest,
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Generate AI content for a single document.
@@ -944,7 +981,7 @@ async def generate_document_content(
     from backend.services.document_generator import get_document_generator
     
     # Get document
-    document = db.query(ProjectDocument).filter(ProjectDocument.id == document_id).first()
+    document = await db.scalar(select(ProjectDocument).where(ProjectDocument.id == document_id))
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
@@ -968,10 +1005,11 @@ async def generate_document_content(
             detail="Document is already being generated. Please wait or cancel the current generation."
         )
     
-    # Check dependencies
+    # Check dependencies (sync query API, run on the async session's connection)
     generator = get_document_generator()
-    deps_met, missing_deps, available_deps = generator.check_dependencies(
-        db, str(document.project_id), document.document_name
+    project_id, document_name = str(document.project_id), document.document_name
+    deps_met, missing_deps, available_deps = await db.run_sync(
+        lambda sync_db: generator.check_dependencies(sync_db, project_id, document_name)
     )
     
     if not deps_met:
@@ -984,32 +1022,42 @@ async def generate_document_content(
     from datetime import datetime
     task_id = f"gen_{document_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
-    # Initialize task tracking
-    document_generation_tasks[task_id] = {
-        "task_id": task_id,
-        "document_id": document_id,
-        "document_name": document.document_name,
-        "status": "pending",
-        "progress": 0,
-        "message": "Initializing generation...",
-        "created_at": datetime.now().isoformat(),
-        "result": None,
-        "error": None
-    }
-    
     # Update document status
+    previous_status, previous_task_id = document.generation_status, document.generation_task_id
     document.generation_status = GenerationStatus.GENERATING
     document.generation_task_id = task_id
-    db.commit()
+    await db.commit()
     
-    # Queue background task for single document generation
-    background_tasks.add_task(
-        run_single_doc_generation,
-        task_id,
-        document_id,
-        request.assumptions,
-        request.additional_context
-    )
+    # Queue job for single document generation
+    try:
+        await asyncio.to_thread(
+            get_job_queue().enqueue,
+            "single_document_generation",
+            payload={
+                "document_id": document_id,
+                "assumptions": request.assumptions,
+                "additional_context": request.additional_context,
+                "stream_tokens": request.stream_tokens
+            },
+            job_id=task_id,
+            state={
+                "task_id": task_id,
+                "document_id": document_id,
+                "document_name": document.document_name,
+                "status": "pending",
+                "progress": 0,
+                "message": "Initializing generation...",
+                "created_at": datetime.now().isoformat(),
+                "result": None,
+                "error": None
+            }
+        )
+    except Exception:
+        # Nothing will run: don't leave the document stuck as GENERATING
+        document.generation_status = previous_status
+        document.generation_task_id = previous_task_id
+        await db.commit()
+        raise
     
     return {
         "message": "Generation started",
@@ -1022,8 +1070,8 @@ async def generate_document_content(
 @app.get("/api/documents/{document_id}/generation-status", tags=["Document Generation"])
 async def get_document_generation_status(
     document_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get the generation status for a document.
@@ -1032,14 +1080,14 @@ async def get_document_generation_status(
     """
     from backend.models.document import ProjectDocument, GenerationStatus
     
-    document = db.query(ProjectDocument).filter(ProjectDocument.id == document_id).first()
+    document = await db.scalar(select(ProjectDocument).where(ProjectDocument.id == document_id))
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
     # Check if there's an active task
     task_info = None
-    if document.generation_task_id and document.generation_task_id in document_generation_tasks:
-        task_info = document_generation_tasks[document.generation_task_id]
+    if document.generation_task_id:
+        task_info = await asyncio.to_thread(get_job_queue().get_state, document.generation_task_id)
     
     return {
         "document_id": str(document.id),
@@ -1063,10 +1111,11 @@ async def get_generation_task_status(
     
     Use this for polling during generation.
     """
-    if task_id not in document_generation_tasks:
+    task_info = await asyncio.to_thread(get_job_queue().get_state, task_id)
+    if task_info is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return document_generation_tasks[task_id]
+    return task_info
 
 
 @app.post("/api/documents/{document_id}/save-generated", tags=["Document Generation"])
@@ -1124,9 +1173,8 @@ def save_generated_content(
 async def generate_batch_documents(
     project_id: str,
     request: BatchGenerationRequest,
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Generate AI content for multiple documents in dependency order.
@@ -1138,7 +1186,7 @@ async def generate_batch_documents(
     from backend.services.document_generator import get_document_generator
     
     # Verify project exists
-    project = db.query(ProcurementProject).filter(ProcurementProject.id == project_id).first()
+    project = await db.scalar(select(ProcurementProject).where(ProcurementProject.id == project_id))
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -1147,10 +1195,12 @@ async def generate_batch_documents(
         raise HTTPException(status_code=403, detail="Only CO, PM, or Admin can batch generate documents")
     
     # Get documents
-    documents = db.query(ProjectDocument).filter(
-        ProjectDocument.id.in_(request.document_ids),
-        ProjectDocument.project_id == project_id
-    ).all()
+    documents = (await db.scalars(
+        select(ProjectDocument).where(
+            ProjectDocument.id.in_(request.document_ids),
+            ProjectDocument.project_id == project_id
+        )
+    )).all()
     
     if not documents:
         raise HTTPException(status_code=400, detail="No valid documents found")
@@ -1159,35 +1209,46 @@ async def generate_batch_documents(
     from datetime import datetime
     batch_task_id = f"batch_{project_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
-    # Initialize batch task tracking
-    document_generation_tasks[batch_task_id] = {
-        "task_id": batch_task_id,
-        "project_id": project_id,
-        "document_ids": request.document_ids,
-        "document_names": [d.document_name for d in documents],
-        "status": "pending",
-        "progress": 0,
-        "message": "Initializing batch generation...",
-        "created_at": datetime.now().isoformat(),
-        "completed_documents": [],
-        "failed_documents": [],
-        "current_document": None
-    }
-    
     # Mark documents as generating
+    previous = {doc.id: (doc.generation_status, doc.generation_task_id) for doc in documents}
     for doc in documents:
         doc.generation_status = GenerationStatus.GENERATING
         doc.generation_task_id = batch_task_id
-    db.commit()
+    await db.commit()
     
-    # Queue background task for batch generation
-    background_tasks.add_task(
-        run_batch_generation,
-        batch_task_id,
-        project_id,
-        request.document_ids,
-        request.assumptions
-    )
+    # Queue job for batch generation
+    try:
+        await asyncio.to_thread(
+            get_job_queue().enqueue,
+            "batch_document_generation",
+            payload={
+                "project_id": project_id,
+                "document_ids": request.document_ids,
+                "assumptions": request.assumptions,
+                "stream_tokens": request.stream_tokens
+            },
+            job_id=batch_task_id,
+            state={
+                "task_id": batch_task_id,
+                "project_id": project_id,
+                "document_ids": request.document_ids,
+                "document_names": [d.document_name for d in documents],
+                "status": "pending",
+                "progress": 0,
+                "message": "Initializing batch generation...",
+                "created_at": datetime.now().isoformat(),
+                "completed_documents": [],
+                "failed_documents": [],
+                "current_document": None,
+                "current_documents": []
+            }
+        )
+    except Exception:
+        # Nothing will run: don't leave the documents stuck as GENERATING
+        for doc in documents:
+            doc.generation_status, doc.generation_task_id = previous[doc.id]
+        await db.commit()
+        raise
     
     return {
         "message": "Batch generation started",
@@ -1233,186 +1294,241 @@ def check_document_dependencies(
     }
 
 
-async def run_single_doc_generation(
-    task_id: str,
-    document_id: str,
-    assumptions: List[Dict[str, str]],
-    additional_context: Optional[str] = None
-):
-    """Background task to generate content for a single document from checklist."""
-    from backend.database.base import SessionLocal
-    from backend.models.document import ProjectDocument, GenerationStatus, DocumentStatus
-    from backend.services.document_generator import get_document_generator
-    from datetime import datetime
+def mark_generation_failed(payload: Dict, error: str):
+    """
+    on_exhausted hook for generation jobs: mark documents the job left
+    GENERATING as FAILED, so they can be generated again
+
+    Args:
+        payload: Job payload with document_id or document_ids
+        error: Final error
+    """
+    from backend.database.base import session_scope
+    from backend.models.document import ProjectDocument, GenerationStatus
+
+    document_ids = payload.get("document_ids") or [payload["document_id"]]
+    with session_scope() as db:
+        db.query(ProjectDocument).filter(
+            ProjectDocument.id.in_(document_ids),
+            ProjectDocument.generation_status == GenerationStatus.GENERATING
+        ).update({"generation_status": GenerationStatus.FAILED}, synchronize_session=False)
+
+
+@job_handler("single_document_generation", on_exhausted=mark_generation_failed)
+async def run_single_doc_generation(job: JobContext):
+    """
+    Job handler to generate content for a single document from checklist.
+    
+    Database sessions are only open around reads and writes, not while the
+    agents run (see DocumentGenerator.generate_and_save).
+    
+    Errors are re-raised so the job queue retries the attempt, including
+    transient Claude errors from the agents (rate limits, timeouts, 5xx);
+    the document stays GENERATING until the last attempt fails, when
+    mark_generation_failed marks it FAILED. A missing document or a
+    generation the agents report as unsuccessful raises JobFailed (no retry).
+    """
+    from backend.database.base import session_scope
+    from backend.models.document import ProjectDocument
+    from backend.services.document_generator import get_document_generator, extract_quality_score
+    
+    document_id = job.payload["document_id"]
+    assumptions = job.payload["assumptions"]
+    additional_context = job.payload.get("additional_context")
+    
+    def load_document():
+        with session_scope() as db:
+            document = db.query(ProjectDocument).filter(ProjectDocument.id == document_id).first()
+            return (document.document_name, str(document.project_id)) if document else None
     
-    db = SessionLocal()
     try:
-        document = db.query(ProjectDocument).filter(ProjectDocument.id == document_id).first()
-        if not document:
-            document_generation_tasks[task_id]["status"] = "failed"
-            document_generation_tasks[task_id]["error"] = "Document not found"
-            return
+        # Database work runs in threads so it doesn't block the event loop
+        found = await asyncio.to_thread(load_document)
+        if not found:
+            job.publish(status="failed", error="Document not found")
+            raise JobFailed("Document not found")
+        document_name, project_id = found
         
         # Update task status
-        document_generation_tasks[task_id]["status"] = "in_progress"
-        document_generation_tasks[task_id]["message"] = f"Generating {document.document_name}..."
-        document_generation_tasks[task_id]["progress"] = 10
+        job.publish(
+            status="in_progress",
+            message=f"Generating {document_name}...",
+            progress=10
+        )
         
         # Create progress callback
         def progress_callback(task):
-            document_generation_tasks[task_id]["progress"] = task.progress
-            document_generation_tasks[task_id]["message"] = task.message
+            job.publish(progress=task.progress, message=task.message)
+        
+        # Stream text to the project and guided flow sockets if requested
+        token_callback = None
+        if job.payload.get("stream_tokens"):
+            token_callback = websocket_token_streamer(
+                [project_id, f"guided-flow-{document_id}"]
+            )
         
-        # Generate content
+        # Generate content and save it to the document
         generator = get_document_generator()
-        success, content_or_error, metadata = await generator.generate_document(
-            db=db,
-            document=document,
+        success, content_or_error, metadata = await generator.generate_and_save(
+            document_id=document_id,
             assumptions=assumptions,
             additional_context=additional_context,
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            token_callback=token_callback
         )
         
         if success:
-            # Save generated content
-            document.generated_content = content_or_error
-            document.generated_at = datetime.utcnow()
-            document.generation_status = GenerationStatus.GENERATED
-            
-            # Update document status
-            if document.status == DocumentStatus.PENDING:
-                document.status = DocumentStatus.UPLOADED
-            
-            # Save quality score if available
-            if metadata and metadata.get("quality_analysis"):
-                doc_quality = metadata["quality_analysis"].get(document.document_name, {})
-                score = doc_quality.get("score", doc_quality.get("overall_score"))
-                if score:
-                    document.ai_quality_score = int(score)
-            
-            db.commit()
-            
-            # Update task
-            document_generation_tasks[task_id]["status"] = "completed"
-            document_generation_tasks[task_id]["progress"] = 100
-            document_generation_tasks[task_id]["message"] = "Generation complete"
-            document_generation_tasks[task_id]["result"] = {
-                "content": content_or_error,
-                "quality_score": document.ai_quality_score,
-                "metadata": metadata
-            }
+            job.publish(
+                status="completed",
+                progress=100,
+                message="Generation complete",
+                result={
+                    "content": content_or_error,
+                    "quality_score": extract_quality_score(document_name, metadata),
+                    "metadata": metadata
+                }
+            )
         else:
-            # Generation failed
-            document.generation_status = GenerationStatus.FAILED
-            db.commit()
-            
-            document_generation_tasks[task_id]["status"] = "failed"
-            document_generation_tasks[task_id]["error"] = content_or_error
-            document_generation_tasks[task_id]["message"] = f"Generation failed: {content_or_error}"
-            
+            job.publish(
+                status="failed",
+                error=content_or_error,
+                message=f"Generation failed: {content_or_error}"
+            )
+            raise JobFailed(content_or_error)
+    
+    except JobFailed:
+        raise
     except Exception as e:
-        document_generation_tasks[task_id]["status"] = "failed"
-        document_generation_tasks[task_id]["error"] = str(e)
-        document_generation_tasks[task_id]["message"] = f"Error: {str(e)}"
-        
-        # Update document status
-        try:
-            document = db.query(ProjectDocument).filter(ProjectDocument.id == document_id).first()
-            if document:
-                document.generation_status = GenerationStatus.FAILED
-                db.commit()
-        except:
-            pass
-    finally:
-        db.close()
+        # Earlier attempts are requeued as "retrying" by the queue
+        if job.final_attempt:
+            job.publish(status="failed", error=str(e), message=f"Error: {str(e)}")
+        raise
 
 
-async def run_batch_generation(
-    batch_task_id: str,
-    project_id: str,
-    document_ids: List[str],
-    assumptions: List[Dict[str, str]]
-):
-    """Background task to generate multiple documents in order."""
-    from backend.database.base import SessionLocal
-    from backend.models.document import ProjectDocument, GenerationStatus, DocumentStatus
-    from backend.services.document_generator import get_document_generator
-    from datetime import datetime
+@job_handler("batch_document_generation", on_exhausted=mark_generation_failed)
+async def run_batch_generation(job: JobContext):
+    """
+    Job handler to generate multiple documents in dependency order.
+    
+    Independent documents are generated concurrently (see
+    DocumentGenerator.run_in_dependency_order); each one reads and writes
+    in its own short sessions, run in threads, with no connection held
+    while agents run.
+    A failed document only blocks its dependents.
+    Errors are re-raised so the job queue retries the batch; a retried job
+    skips the documents an earlier attempt completed, and documents still
+    GENERATING when the last attempt fails are marked FAILED by
+    mark_generation_failed.
+    """
+    from backend.database.base import session_scope
+    from backend.models.document import ProjectDocument, GenerationStatus
+    from backend.services.document_generator import get_document_generator, extract_quality_score, BLOCKED_PREFIX
+    
+    document_ids = job.payload["document_ids"]
+    assumptions = job.payload["assumptions"]
+    batch_task = job.state
     
-    db = SessionLocal()
     try:
         generator = get_document_generator()
         
-        # Get documents and sort by dependencies
-        documents = db.query(ProjectDocument).filter(
-            ProjectDocument.id.in_(document_ids)
-        ).all()
+        # Get documents (detached copies are only used for planning)
+        def load_documents():
+            with session_scope() as db:
+                documents = db.query(ProjectDocument).filter(
+                    ProjectDocument.id.in_(document_ids)
+                ).all()
+                db.expunge_all()
+                return documents
+        
+        documents = await asyncio.to_thread(load_documents)
+        
+        total_docs = len(documents)
+        completed_ids = {doc["id"] for doc in batch_task["completed_documents"]}
+        documents = [doc for doc in documents if str(doc.id) not in completed_ids]
+        batch_task["status"] = "in_progress"
+        batch_task["failed_documents"] = []
+        batch_task["current_documents"] = []
         
-        sorted_docs = generator._sort_by_dependencies(documents)
-        total_docs = len(sorted_docs)
+        def update_progress():
+            done = len(batch_task["completed_documents"]) + len(batch_task["failed_documents"])
+            running = batch_task["current_documents"]
+            batch_task["progress"] = int((done / total_docs) * 100) if total_docs else 100
+            batch_task["current_document"] = running[0] if running else None
+            if running:
+                batch_task["message"] = f"Generating {', '.join(running)} ({done}/{total_docs} done)..."
+            job.publish()
         
-        for i, document in enumerate(sorted_docs):
-            # Update task status
-            document_generation_tasks[batch_task_id]["current_document"] = document.document_name
-            document_generation_tasks[batch_task_id]["message"] = f"Generating {document.document_name} ({i+1}/{total_docs})..."
-            document_generation_tasks[batch_task_id]["progress"] = int((i / total_docs) * 100)
+        def mark_failed(document_id):
+            with session_scope() as db:
+                document = db.query(ProjectDocument).filter(ProjectDocument.id == document_id).first()
+                if document:
+                    document.generation_status = GenerationStatus.FAILED
+        
+        async def generate_one(planned: ProjectDocument):
+            batch_task["current_documents"].append(planned.document_name)
+            update_progress()
             
             try:
-                success, content_or_error, metadata = await generator.generate_document(
-                    db=db,
-                    document=document,
-                    assumptions=assumptions
-                )
+                token_callback = None
+                if job.payload.get("stream_tokens"):
+                    token_callback = websocket_token_streamer(
+                        [job.payload["project_id"], f"guided-flow-{planned.id}"]
+                    )
+                try:
+                    success, content_or_error, metadata = await generator.generate_and_save(
+                        document_id=str(planned.id),
+                        assumptions=assumptions,
+                        token_callback=token_callback
+                    )
+                except Exception as e:
+                    # Counted as failed here rather than retrying the whole batch
+                    await asyncio.to_thread(mark_failed, planned.id)
+                    success, content_or_error, metadata = False, str(e), None
                 
                 if success:
-                    document.generated_content = content_or_error
-                    document.generated_at = datetime.utcnow()
-                    document.generation_status = GenerationStatus.GENERATED
-                    
-                    if document.status == DocumentStatus.PENDING:
-                        document.status = DocumentStatus.UPLOADED
-                    
-                    if metadata and metadata.get("quality_analysis"):
-                        doc_quality = metadata["quality_analysis"].get(document.document_name, {})
-                        score = doc_quality.get("score", doc_quality.get("overall_score"))
-                        if score:
-                            document.ai_quality_score = int(score)
-                    
-                    db.commit()
-                    document_generation_tasks[batch_task_id]["completed_documents"].append({
-                        "id": str(document.id),
-                        "name": document.document_name,
-                        "quality_score": document.ai_quality_score
+                    batch_task["completed_documents"].append({
+                        "id": str(planned.id),
+                        "name": planned.document_name,
+                        "quality_score": extract_quality_score(planned.document_name, metadata)
                     })
                 else:
-                    document.generation_status = GenerationStatus.FAILED
-                    db.commit()
-                    document_generation_tasks[batch_task_id]["failed_documents"].append({
-                        "id": str(document.id),
-                        "name": document.document_name,
+                    batch_task["failed_documents"].append({
+                        "id": str(planned.id),
+                        "name": planned.document_name,
                         "error": content_or_error
                     })
-            except Exception as e:
-                document.generation_status = GenerationStatus.FAILED
-                db.commit()
-                document_generation_tasks[batch_task_id]["failed_documents"].append({
-                    "id": str(document.id),
-                    "name": document.document_name,
-                    "error": str(e)
-                })
+                
+                return success, content_or_error, metadata
+            finally:
+                batch_task["current_documents"].remove(planned.document_name)
+                update_progress()
+        
+        async def mark_blocked(planned: ProjectDocument, failed_deps: List[str]):
+            await asyncio.to_thread(mark_failed, planned.id)
+            batch_task["failed_documents"].append({
+                "id": str(planned.id),
+                "name": planned.document_name,
+                "error": f"{BLOCKED_PREFIX}: {', '.join(failed_deps)}"
+            })
+            update_progress()
+        
+        await generator.run_in_dependency_order(documents, generate_one, on_blocked=mark_blocked)
         
         # Complete batch
-        document_generation_tasks[batch_task_id]["status"] = "completed"
-        document_generation_tasks[batch_task_id]["progress"] = 100
-        document_generation_tasks[batch_task_id]["message"] = f"Batch generation complete. {len(document_generation_tasks[batch_task_id]['completed_documents'])}/{total_docs} succeeded."
-        document_generation_tasks[batch_task_id]["current_document"] = None
+        batch_task["status"] = "completed"
+        batch_task["progress"] = 100
+        batch_task["message"] = f"Batch generation complete. {len(batch_task['completed_documents'])}/{total_docs} succeeded."
+        batch_task["current_document"] = None
+        job.publish()
         
     except Exception as e:
-        document_generation_tasks[batch_task_id]["status"] = "failed"
-        document_generation_tasks[batch_task_id]["error"] = str(e)
-        document_generation_tasks[batch_task_id]["message"] = f"Batch generation failed: {str(e)}"
-    finally:
-        db.close()
+        if job.final_attempt:
+            job.publish(
+                status="failed",
+                error=str(e),
+                message=f"Batch generation failed: {str(e)}"
+            )
+        raise
 
 
 # ============================================================================
@@ -1769,26 +1885,7 @@ def get_document_approvals(
     db: Session = Depends(get_db)
 ):
     """Get all approval requests for a document"""
-    from backend.models.document import DocumentApproval
-
-    approvals = db.query(DocumentApproval).filter(
-        DocumentApproval.project_document_id == document_id
-    ).order_by(DocumentApproval.requested_at.desc()).all()
-
-    # Enrich with approver information
-    approval_list = []
-    for approval in approvals:
-        approval_dict = approval.to_dict()
-        approver = db.query(User).filter(User.id == approval.approver_id).first()
-        if approver:
-            approval_dict['approver'] = {
-                'id': str(approver.id),
-                'name': approver.name,
-                'email': approver.email
-            }
-        approval_list.append(approval_dict)
-
-    return {"approvals": approval_list}
+    return {"approvals": project_queries.list_document_approvals(db, document_id)}
 
 
 @app.get("/api/approvals/pending", tags=["Approvals"])
@@ -1797,39 +1894,7 @@ def get_pending_approvals(
     db: Session = Depends(get_db)
 ):
     """Get all pending approvals for the current user"""
-    from backend.models.document import DocumentApproval, ApprovalStatus
-
-    approvals = db.query(DocumentApproval).filter(
-        DocumentApproval.approver_id == current_user.id,
-        DocumentApproval.approval_status == ApprovalStatus.PENDING
-    ).order_by(DocumentApproval.requested_at.desc()).all()
-
-    # Enrich with document and project information
-    approval_list = []
-    for approval in approvals:
-        approval_dict = approval.to_dict()
-
-        # Get document info
-        document = db.query(ProjectDocument).filter(ProjectDocument.id == approval.project_document_id).first()
-        if document:
-            approval_dict['document'] = {
-                'id': str(document.id),
-                'name': document.document_name,
-                'description': document.description,
-                'status': document.status.value,
-                'category': document.category
-            }
-
-            # Get project info
-            project = db.query(ProcurementProject).filter(ProcurementProject.id == document.project_id).first()
-            if project:
-                approval_dict['project'] = {
-                    'id': str(project.id),
-                    'name': project.name
-                }
-
-        approval_list.append(approval_dict)
-
+    approval_list = project_queries.list_pending_approvals(db, current_user.id)
     return {"approvals": approval_list, "count": len(approval_list)}
 
 
@@ -1893,31 +1958,10 @@ def get_approval_audit_trail(
     db: Session = Depends(get_db)
 ):
     """Get complete audit trail for an approval"""
-    from backend.models.document import DocumentApproval, ApprovalAuditLog
-
-    approval = db.query(DocumentApproval).filter(DocumentApproval.id == approval_id).first()
-    if not approval:
+    audit_trail = project_queries.get_approval_audit_trail(db, approval_id)
+    if audit_trail is None:
         raise HTTPException(status_code=404, detail="Approval not found")
 
-    # Get all audit log entries for this approval
-    audit_logs = db.query(ApprovalAuditLog).filter(
-        ApprovalAuditLog.approval_id == approval_id
-    ).order_by(ApprovalAuditLog.timestamp.desc()).all()
-
-    # Enrich with user information
-    audit_trail = []
-    for log in audit_logs:
-        log_dict = log.to_dict()
-        user = db.query(User).filter(User.id == log.performed_by).first()
-        if user:
-            log_dict['performed_by_user'] = {
-                'id': str(user.id),
-                'name': user.name,
-                'email': user.email,
-                'role': user.role
-            }
-        audit_trail.append(log_dict)
-
     return {
         "approval_id": approval_id,
         "audit_trail": audit_trail
@@ -1931,64 +1975,14 @@ def get_document_approval_history(
     db: Session = Depends(get_db)
 ):
     """Get complete approval history for a document including all audit trails"""
-    from backend.models.document import ProjectDocument, DocumentApproval, ApprovalAuditLog
-
     document = db.query(ProjectDocument).filter(ProjectDocument.id == document_id).first()
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    # Get all approvals for this document
-    approvals = db.query(DocumentApproval).filter(
-        DocumentApproval.project_document_id == document_id
-    ).order_by(DocumentApproval.requested_at.desc()).all()
-
-    history = []
-    for approval in approvals:
-        approval_dict = approval.to_dict()
-
-        # Get approver info
-        approver = db.query(User).filter(User.id == approval.approver_id).first()
-        if approver:
-            approval_dict['approver'] = {
-                'id': str(approver.id),
-                'name': approver.name,
-                'email': approver.email,
-                'role': approver.role
-            }
-
-        # Get delegated from user if applicable
-        if approval.delegated_from_id:
-            delegated_from = db.query(User).filter(User.id == approval.delegated_from_id).first()
-            if delegated_from:
-                approval_dict['delegated_from'] = {
-                    'id': str(delegated_from.id),
-                    'name': delegated_from.name,
-                    'email': delegated_from.email
-                }
-
-        # Get audit trail for this approval
-        audit_logs = db.query(ApprovalAuditLog).filter(
-            ApprovalAuditLog.approval_id == approval.id
-        ).order_by(ApprovalAuditLog.timestamp.asc()).all()
-
-        approval_dict['audit_trail'] = []
-        for log in audit_logs:
-            log_dict = log.to_dict()
-            user = db.query(User).filter(User.id == log.performed_by).first()
-            if user:
-                log_dict['performed_by_user'] = {
-                    'id': str(user.id),
-                    'name': user.name,
-                    'email': user.email
-                }
-            approval_dict['audit_trail'].append(log_dict)
-
-        history.append(approval_dict)
-
     return {
         "document_id": document_id,
         "document_name": document.document_name,
-        "history": history
+        "history": project_queries.get_document_approval_history(db, document)
     }
 
 
@@ -2020,25 +2014,7 @@ def get_project_steps(
     db: Session = Depends(get_db)
 ):
     """Get all steps for a project"""
-    steps = db.query(ProcurementStep).filter(
-        ProcurementStep.project_id == project_id
-    ).order_by(ProcurementStep.step_order).all()
-
-    # Convert to dict with assigned user info
-    steps_data = []
-    for step in steps:
-        step_dict = step.to_dict()
-        # Add assigned user info if available
-        if step.assigned_user_id:
-            assigned_user = db.query(User).filter(User.id == step.assigned_user_id).first()
-            if assigned_user:
-                step_dict["assigned_user"] = {
-                    "name": assigned_user.name,
-                    "email": assigned_user.email
-                }
-        steps_data.append(step_dict)
-
-    return {"steps": steps_data}
+    return {"steps": project_queries.list_project_steps(db, project_id)}
 
 
 @app.patch("/api/steps/{step_id}", tags=["Steps"])
@@ -2739,14 +2715,14 @@ def get_project_transition_history(
 async def generate_document(
     project_id: str,
     document_type: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Trigger AI document generation for a project
     This will run your existing scripts/generate_all_phases_alms.py in the background
     """
-    project = db.query(ProcurementProject).filter(ProcurementProject.id == project_id).first()
+    project = await db.scalar(select(ProcurementProject).where(ProcurementProject.id == project_id))
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -2867,7 +2843,7 @@ async def websocket_endpoint(websocket: WebSocket, project_id: str):
 # RAG (Document Upload for Generation) Endpoints
 # ============================================================================
 
-@app.post("/api/rag/upload", tags=["RAG"])
+@app.post("/api/rag/upload", tags=["RAG"], status_code=status.HTTP_202_ACCEPTED)
 async def upload_document_to_rag(
     file: UploadFile = File(...),
     category: str = Query(None, description="Document category: strategy, market_research, requirements, or templates"),
@@ -2876,8 +2852,10 @@ async def upload_document_to_rag(
     """
     Upload a document to the RAG system for document generation
 
-    This endpoint accepts document uploads and processes them into the
-    RAG vector database for use in AI-powered document generation.
+    This endpoint stores the upload and returns immediately with an
+    ingestion job ID. Conversion, embedding and indexing run in the
+    background; poll GET /api/rag/upload/{job_id} for the stage
+    (parsing, chunking, embedding, indexing) and the final result.
 
     Supported formats: PDF, DOCX, PPTX, XLSX, TXT, MD, and more
     
@@ -2887,48 +2865,63 @@ async def upload_document_to_rag(
     - requirements: Requirements documents, CDRLs
     - templates: Standard forms and templates
     """
+    from datetime import datetime
+
+    # Prepare metadata
+    metadata = {
+        "uploaded_by_name": current_user.name,
+        "uploaded_by_email": current_user.email
+    }
+    
+    # Add category if provided
+    if category:
+        valid_categories = ["strategy", "market_research", "requirements", "templates"]
+        if category not in valid_categories:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid category. Must be one of: {', '.join(valid_categories)}"
+            )
+        metadata["category"] = category
+
     try:
         # Read file content
         file_content = await file.read()
 
-        # Get RAG service
+        # Store the file; ingestion happens in a job
         rag_service = get_rag_service()
-
-        # Prepare metadata
-        metadata = {
-            "uploaded_by_name": current_user.name,
-            "uploaded_by_email": current_user.email
-        }
-        
-        # Add category if provided
-        if category:
-            valid_categories = ["strategy", "market_research", "requirements", "templates"]
-            if category not in valid_categories:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid category. Must be one of: {', '.join(valid_categories)}"
-                )
-            metadata["category"] = category
-
-        # Process and upload document
-        result = rag_service.upload_and_process_document(
-            file_content=file_content,
-            filename=file.filename,
-            user_id=str(current_user.id),
-            metadata=metadata
+        saved = await asyncio.to_thread(rag_service.save_upload, file_content, file.filename)
+
+        job_id = f"rag_{uuid.uuid4().hex}"
+        await asyncio.to_thread(
+            get_job_queue().enqueue,
+            "rag_ingestion",
+            payload={
+                "file_path": saved["file_path"],
+                "filename": file.filename,
+                "upload_timestamp": saved["upload_timestamp"],
+                "user_id": str(current_user.id),
+                "metadata": metadata
+            },
+            job_id=job_id,
+            state={
+                "job_id": job_id,
+                "status": "pending",
+                "stage": "queued",
+                "progress": 0,
+                "message": f"Queued {file.filename} for ingestion",
+                "filename": file.filename,
+                "file_size": len(file_content),
+                "category": category,
+                "created_at": datetime.now().isoformat()
+            }
         )
 
-        if not result["success"]:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=result.get("error", "Failed to process document")
-            )
-
         return {
-            "message": result["message"],
-            "filename": result["filename"],
-            "chunks_created": result["chunks_created"],
-            "file_size": result["file_size"],
+            "message": f"{file.filename} uploaded; ingestion started",
+            "job_id": job_id,
+            "status_url": f"/api/rag/upload/{job_id}",
+            "filename": file.filename,
+            "file_size": len(file_content),
             "category": category
         }
 
@@ -2939,6 +2932,77 @@ async def upload_document_to_rag(
         )
 
 
+@app.get("/api/rag/upload/{job_id}", tags=["RAG"])
+def get_rag_upload_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the status of a RAG upload ingestion job
+
+    Returns status (pending, in_progress, completed, failed), the current
+    stage (queued, parsing, chunking, embedding, indexing, completed),
+    progress percentage and, once completed, chunks_created.
+    """
+    job_state = get_job_queue().get_state(job_id)
+    if job_state is None:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return job_state
+
+
+@job_handler("rag_ingestion", retry=RetryPolicy(max_attempts=2, backoff_seconds=5))
+async def run_rag_ingestion(job: JobContext):
+    """
+    Job handler to convert, embed and index an uploaded RAG document.
+
+    Any API or worker process may claim the job: the vector store is
+    written under its cross-process lock (see RAGService._commit_writes).
+    """
+    payload = job.payload
+    filename = payload["filename"]
+    rag_service = get_rag_service()
+
+    def on_stage(stage: str, progress: int):
+        job.publish(
+            status="in_progress",
+            stage=stage,
+            progress=progress,
+            message=f"{stage.capitalize()} {filename}..."
+        )
+
+    result = await rag_service.ingest_upload(
+        file_path=payload["file_path"],
+        filename=filename,
+        user_id=payload["user_id"],
+        upload_timestamp=payload["upload_timestamp"],
+        metadata=payload.get("metadata"),
+        on_stage=on_stage,
+        # A retried attempt may have stored chunks before failing
+        replace_existing=job.attempt > 1
+    )
+
+    if not result["success"]:
+        # Nothing to retry: the document has no extractable content
+        if os.path.exists(payload["file_path"]):
+            os.remove(payload["file_path"])
+        job.publish(
+            status="failed",
+            stage="failed",
+            error=result.get("error", "Failed to process document"),
+            message=f"Failed to process {filename}"
+        )
+        raise JobFailed(result.get("error", "Failed to process document"))
+
+    job.publish(
+        status="completed",
+        stage="completed",
+        progress=100,
+        message=result["message"],
+        chunks_created=result["chunks_created"],
+        result=result
+    )
+
+
 @app.get("/api/rag/documents", tags=["RAG"])
 def list_rag_documents(
     current_user: User = Depends(get_current_user)
@@ -3100,10 +3164,9 @@ async def extract_assumptions(
             "performance requirements KPP KSA technical specifications"
         ]
 
-        # Gather relevant context from RAG
+        # Gather relevant context from RAG (one batched search)
         all_context = []
-        for query in assumption_queries:
-            results = rag_service.search_documents(query=query, k=3)
+        for results in rag_service.search_documents_many(queries=assumption_queries, k=3):
             all_context.extend(results)
 
         # Build context string for AI
@@ -3195,8 +3258,7 @@ If no clear assumptions can be extracted, return an empty array []."""
 # Document Generation Endpoints
 # ============================================================================
 
-# In-memory task storage (in production, use Redis or database)
-generation_tasks = {}
+# Tasks are stored as jobs in the shared job queue (services/job_queue.py)
 
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
@@ -3214,6 +3276,9 @@ class DocumentRequest(BaseModel):
 class GenerateDocumentsRequest(BaseModel):
     assumptions: List[Dict[str, str]]
     documents: List[DocumentRequest]
+    # Stream generated text over /ws/{project_id} (requires project_id)
+    stream_tokens: bool = False
+    project_id: Optional[str] = None
 
 
 class AnalyzeDocumentsRequest(BaseModel):
@@ -3270,19 +3335,22 @@ async def generate_documents(
     try:
         task_id = str(uuid.uuid4())
 
-        # Initialize task status
-        generation_tasks[task_id] = {
-            "task_id": task_id,
-            "status": "pending",
-            "progress": 0,
-            "message": "Initializing document generation...",
-            "result": None,
-            "documents_requested": len(request.documents),
-            "created_at": __import__('datetime').datetime.now().isoformat()
-        }
-
-        # Start generation in background
-        asyncio.create_task(run_document_generation(task_id, request))
+        # Queue generation job with its initial task status
+        await asyncio.to_thread(
+            get_job_queue().enqueue,
+            "document_generation",
+            payload=request.model_dump(),
+            job_id=task_id,
+            state={
+                "task_id": task_id,
+                "status": "pending",
+                "progress": 0,
+                "message": "Initializing document generation...",
+                "result": None,
+                "documents_requested": len(request.documents),
+                "created_at": __import__('datetime').datetime.now().isoformat()
+            }
+        )
 
         return {
             "message": "Document generation started",
@@ -3303,19 +3371,28 @@ async def get_generation_status(
     current_user: User = Depends(get_current_user)
 ):
     """Get the status of a document generation task"""
-    if task_id not in generation_tasks:
+    task_info = await asyncio.to_thread(get_job_queue().get_state, task_id)
+    if task_info is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task {task_id} not found"
         )
 
-    return generation_tasks[task_id]
+    return task_info
 
 
-async def run_document_generation(task_id: str, request: GenerateDocumentsRequest):
+@job_handler("document_generation")
+async def run_document_generation(job: JobContext):
     """
-    Background task to generate documents using specialized agents and RAG
+    Job handler to generate documents using specialized agents and RAG
+    
+    Errors are re-raised so the job queue retries the attempt, including
+    transient Claude errors the coordinator re-raises (rate limits, timeouts,
+    5xx); a generation that finishes unsuccessfully raises JobFailed (no retry).
     """
+    task_id = job.id
+    request = GenerateDocumentsRequest(**job.payload)
+
     try:
         # Check if specialized agents should be used (feature flag)
         use_specialized_agents = os.getenv("USE_AGENT_BASED_GENERATION", "true").lower() == "true"
@@ -3335,14 +3412,16 @@ async def run_document_generation(task_id: str, request: GenerateDocumentsReques
             task_id=task_id,
             document_names=document_names,
             assumptions=request.assumptions,
-            linked_assumptions=linked_assumptions
+            linked_assumptions=linked_assumptions,
+            token_callback=(
+                websocket_token_streamer([request.project_id])
+                if request.stream_tokens and request.project_id else None
+            )
         )
 
         # Progress callback to update global task status
         def update_progress(task: GenerationTask):
-            generation_tasks[task_id]["status"] = task.status
-            generation_tasks[task_id]["progress"] = task.progress
-            generation_tasks[task_id]["message"] = task.message
+            job.publish(status=task.status, progress=task.progress, message=task.message)
 
         # Run generation with progress tracking
         completed_task = await coordinator.generate_documents(
@@ -3352,29 +3431,37 @@ async def run_document_generation(task_id: str, request: GenerateDocumentsReques
 
         # Update final result
         if completed_task.status == "completed":
-            generation_tasks[task_id]["status"] = "completed"
-            generation_tasks[task_id]["progress"] = 100
-            generation_tasks[task_id]["message"] = "Document generation complete!"
-            generation_tasks[task_id]["result"] = {
-                "sections": completed_task.sections,
-                "citations": completed_task.citations,
-                "agent_metadata": completed_task.agent_metadata,
-                "phase_info": completed_task.phase_info,
-                "collaboration_metadata": completed_task.collaboration_metadata,  # Phase 4
-                "quality_analysis": completed_task.quality_analysis  # Precomputed quality scores per section
-            }
+            job.publish(
+                status="completed",
+                progress=100,
+                message="Document generation complete!",
+                result={
+                    "sections": completed_task.sections,
+                    "citations": completed_task.citations,
+                    "agent_metadata": completed_task.agent_metadata,
+                    "phase_info": completed_task.phase_info,
+                    "collaboration_metadata": completed_task.collaboration_metadata,  # Phase 4
+                    "quality_analysis": completed_task.quality_analysis  # Precomputed quality scores per section
+                }
+            )
         else:
-            generation_tasks[task_id]["status"] = "failed"
-            generation_tasks[task_id]["message"] = completed_task.message
-            generation_tasks[task_id]["errors"] = completed_task.errors
+            job.publish(
+                status="failed",
+                message=completed_task.message,
+                errors=completed_task.errors
+            )
+            raise JobFailed(completed_task.errors[0] if completed_task.errors else completed_task.message)
 
+    except JobFailed:
+        raise
     except Exception as e:
         import traceback
         print(f"Error in document generation: {str(e)}")
         print(traceback.format_exc())
 
-        generation_tasks[task_id]["status"] = "failed"
-        generation_tasks[task_id]["message"] = f"Generation failed: {str(e)}"
+        if job.final_attempt:
+            job.publish(status="failed", message=f"Generation failed: {str(e)}")
+        raise
 
 
 # ============================================================================
@@ -3639,7 +3726,8 @@ async def download_pdf(export_id: str):
     Generate and download PDF file
     """
     try:
-        pdf_file = export_service.generate_pdf(export_id)
+        # Rendering waits on the render pool, so keep it off the event loop
+        pdf_file = await asyncio.to_thread(export_service.generate_pdf, export_id)
 
         return FileResponse(
             path=str(pdf_file),
@@ -3661,7 +3749,7 @@ async def download_docx(export_id: str, program_name: Optional[str] = None):
     Generate and download DOCX file
     """
     try:
-        docx_file = export_service.generate_docx(export_id, program_name)
+        docx_file = await asyncio.to_thread(export_service.generate_docx, export_id, program_name)
 
         return FileResponse(
             path=str(docx_file),
@@ -3705,7 +3793,8 @@ async def generate_compliance_report(request: ComplianceReportRequest = Body(...
     Generate compliance report PDF
     """
     try:
-        pdf_file = export_service.generate_compliance_report(
+        pdf_file = await asyncio.to_thread(
+            export_service.generate_compliance_report,
             compliance_analysis=request.compliance_analysis
         )
 
@@ -3761,7 +3850,7 @@ class BatchExportRequest(BaseModel):
 async def export_generated_batch(
     project_id: str,
     request: BatchExportRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Batch export multiple AI-generated documents as a ZIP file.
@@ -3773,26 +3862,33 @@ async def export_generated_batch(
     - pdf: PDF files
     - docx: Microsoft Word documents
     - markdown: Raw markdown files
-    """
-    import zipfile
-    import io
-    import tempfile
     
+    Conversions run on the export render pool and are cached by content,
+    and the ZIP is streamed as each document finishes.
+    """
     try:
+        if request.format not in ('pdf', 'docx', 'markdown'):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported format: {request.format}. Use 'pdf', 'docx', or 'markdown'"
+            )
+        
         # Validate project exists
-        project = db.query(ProcurementProject).filter(
-            ProcurementProject.id == project_id
-        ).first()
+        project = await db.scalar(
+            select(ProcurementProject).where(ProcurementProject.id == project_id)
+        )
         
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
         # Fetch the specified documents
-        documents = db.query(ProjectDocument).filter(
-            ProjectDocument.id.in_(request.document_ids),
-            ProjectDocument.project_id == project_id,
-            ProjectDocument.generation_status == GenerationStatus.GENERATED
-        ).all()
+        documents = (await db.scalars(
+            select(ProjectDocument).where(
+                ProjectDocument.id.in_(request.document_ids),
+                ProjectDocument.project_id == project_id,
+                ProjectDocument.generation_status == GenerationStatus.GENERATED
+            )
+        )).all()
         
         if not documents:
             raise HTTPException(
@@ -3800,86 +3896,24 @@ async def export_generated_batch(
                 detail="No generated documents found with the specified IDs"
             )
         
-        # Create a ZIP file in memory
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for doc in documents:
-                if not doc.generated_content:
-                    continue
-                
+        # Copy out what the ZIP needs: the response streams after this session closes
+        entries = [
+            (
                 # Sanitize filename
-                safe_name = doc.document_name.replace('/', '-').replace('\\', '-').replace(' ', '_')
-                
-                if request.format == 'markdown':
-                    # Add markdown file directly
-                    filename = f"{safe_name}.md"
-                    zip_file.writestr(filename, doc.generated_content)
-                    
-                elif request.format == 'pdf':
-                    # Create temporary files for PDF conversion
-                    with tempfile.NamedTemporaryFile(suffix='.md', delete=False, mode='w') as md_temp:
-                        md_temp.write(doc.generated_content)
-                        md_path = md_temp.name
-                    
-                    pdf_path = md_path.replace('.md', '.pdf')
-                    
-                    try:
-                        # Convert to PDF using existing utility
-                        from backend.utils.convert_md_to_pdf import convert_markdown_to_pdf
-                        convert_markdown_to_pdf(md_path, pdf_path)
-                        
-                        # Add PDF to ZIP
-                        filename = f"{safe_name}.pdf"
-                        with open(pdf_path, 'rb') as pdf_file:
-                            zip_file.writestr(filename, pdf_file.read())
-                    finally:
-                        # Clean up temp files
-                        import os
-                        if os.path.exists(md_path):
-                            os.remove(md_path)
-                        if os.path.exists(pdf_path):
-                            os.remove(pdf_path)
-                            
-                elif request.format == 'docx':
-                    # Create temporary files for DOCX conversion
-                    with tempfile.NamedTemporaryFile(suffix='.md', delete=False, mode='w') as md_temp:
-                        md_temp.write(doc.generated_content)
-                        md_path = md_temp.name
-                    
-                    docx_path = md_path.replace('.md', '.docx')
-                    
-                    try:
-                        # Convert to DOCX using existing utility
-                        from backend.utils.convert_md_to_docx import convert_markdown_to_docx
-                        convert_markdown_to_docx(md_path, docx_path, doc.document_name)
-                        
-                        # Add DOCX to ZIP
-                        filename = f"{safe_name}.docx"
-                        with open(docx_path, 'rb') as docx_file:
-                            zip_file.writestr(filename, docx_file.read())
-                    finally:
-                        # Clean up temp files
-                        import os
-                        if os.path.exists(md_path):
-                            os.remove(md_path)
-                        if os.path.exists(docx_path):
-                            os.remove(docx_path)
-                else:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Unsupported format: {request.format}. Use 'pdf', 'docx', or 'markdown'"
-                    )
-        
-        # Reset buffer position
-        zip_buffer.seek(0)
+                doc.document_name.replace('/', '-').replace('\\', '-').replace(' ', '_'),
+                doc.generated_content,
+                doc.document_name
+            )
+            for doc in documents
+            if doc.generated_content
+        ]
         
         # Generate filename for the ZIP
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         zip_filename = f"{project.name.replace(' ', '_')}_generated_docs_{timestamp}.zip"
         
         return StreamingResponse(
-            zip_buffer,
+            export_service.iter_batch_zip(entries, request.format),
             media_type="application/zip",
             headers={
                 "Content-Disposition": f"attachment; filename={zip_filename}"
@@ -3943,7 +3977,7 @@ async def get_guided_document(document_id: str):
 @app.post("/api/guided-flow/save", tags=["Guided Flow"])
 async def save_guided_progress(
     request: GuidedFlowSaveRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Save guided flow progress
@@ -4467,8 +4501,8 @@ async def analyze_quality(
             'evaluation_type': 'full'
         }
         
-        # Execute quality evaluation
-        result = quality_agent.execute(task)
+        # Execute quality evaluation off the event loop (blocking LLM calls)
+        result = await asyncio.to_thread(quality_agent.execute, task)
         
         # Format response with breakdown of all 5 categories
         response = {
@@ -6,12 +6,14 @@ from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import os
 import hashlib
 import secrets
 
-from backend.database.base import get_db
+from backend.database.base import get_async_db, get_db
 from backend.models.user import User, UserRole
 
 # Configuration
@@ -81,16 +83,9 @@ def decode_token(token: str) -> dict:
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Dependency to get the current authenticated user
-    Usage: current_user: User = Depends(get_current_user)
-    """
-    token = credentials.credentials
-    payload = decode_token(token)
+def _user_id_from_token(credentials: HTTPAuthorizationCredentials) -> str:
+    """Get the user ID (subject) from a bearer token"""
+    payload = decode_token(credentials.credentials)
 
     user_id: str = payload.get("sub")
     if user_id is None:
@@ -98,8 +93,11 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+    return user_id
+
 
-    user = db.query(User).filter(User.id == user_id).first()
+def _require_active(user: Optional[User]) -> User:
+    """Reject a missing or inactive user"""
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -115,6 +113,34 @@ async def get_current_user(
     return user
 
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to get the current authenticated user
+    Usage: current_user: User = Depends(get_current_user)
+
+    A plain def, so FastAPI runs the sync query in its threadpool instead
+    of on the event loop. Async endpoints use get_current_user_async.
+    """
+    user_id = _user_id_from_token(credentials)
+    return _require_active(db.query(User).filter(User.id == user_id).first())
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Dependency to get the current authenticated user with an AsyncSession
+    Usage: current_user: User = Depends(get_current_user_async)
+    """
+    user_id = _user_id_from_token(credentials)
+    result = await db.execute(select(User).where(User.id == user_id))
+    return _require_active(result.scalar_one_or_none())
+
+
 def require_roles(*allowed_roles: UserRole):
     """
     Dependency factory to require specific user roles
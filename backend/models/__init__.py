@@ -16,6 +16,7 @@ from backend.models.document import (
 )
 from backend.models.notification import Notification
 from backend.models.audit import AuditLog
+from backend.models.job import GenerationJob
 
 __all__ = [
     "User",
@@ -28,5 +29,6 @@ __all__ = [
     "DocumentUpload",
     "DocumentApproval",
     "Notification",
-    "AuditLog"
+    "AuditLog",
+    "GenerationJob"
 ]
@@ -1,7 +1,7 @@
 """
 Document management models for checklist and file uploads
 """
-from sqlalchemy import Column, String, DateTime, Date, Enum, Integer, BigInteger, ForeignKey, Boolean, Text
+from sqlalchemy import Column, String, DateTime, Date, Enum, Integer, BigInteger, ForeignKey, Boolean, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -133,6 +133,11 @@ class ProjectDocument(Base):
     # Relationship to default approver user (for DEFAULT routing)
     default_approver = relationship("User", foreign_keys=[default_approver_id])
 
+    __table_args__ = (
+        # Project checklist, in display order
+        Index("ix_project_documents_project_order", "project_id", "display_order"),
+    )
+
     def to_dict(self):
         return {
             "id": str(self.id),
@@ -182,6 +187,13 @@ class DocumentUpload(Base):
     # Relationships
     document = relationship("ProjectDocument", back_populates="uploads")
     approvals = relationship("DocumentApproval", back_populates="upload")
+    uploader = relationship("User", foreign_keys=[uploaded_by])
+
+    __table_args__ = (
+        # Upload history of a document, newest version first
+        Index("ix_document_uploads_document_version", "project_document_id", "version_number"),
+        Index("ix_document_uploads_uploaded_by", "uploaded_by"),
+    )
 
     def to_dict(self):
         return {
@@ -217,6 +229,21 @@ class DocumentApproval(Base):
     # Relationships
     document = relationship("ProjectDocument", back_populates="approvals")
     upload = relationship("DocumentUpload", back_populates="approvals")
+    approver = relationship("User", foreign_keys=[approver_id])
+    delegated_from = relationship("User", foreign_keys=[delegated_from_id])
+    # Read-only: audit rows are removed by the database's ON DELETE CASCADE
+    audit_logs = relationship(
+        "ApprovalAuditLog",
+        order_by="ApprovalAuditLog.timestamp",
+        viewonly=True
+    )
+
+    __table_args__ = (
+        # Approvals of a document, by request time
+        Index("ix_document_approvals_document_requested", "project_document_id", "requested_at"),
+        # An approver's pending queue
+        Index("ix_document_approvals_approver_status", "approver_id", "approval_status"),
+    )
 
     def to_dict(self):
         return {
@@ -242,6 +269,13 @@ class ApprovalAuditLog(Base):
     details = Column(Text, nullable=True)  # JSON or text details about the action
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Relationships
+    performer = relationship("User", foreign_keys=[performed_by])
+
+    __table_args__ = (
+        Index("ix_approval_audit_logs_approval_time", "approval_id", "timestamp"),
+    )
+
     def to_dict(self):
         return {
             "id": str(self.id),
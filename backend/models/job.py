@@ -0,0 +1,64 @@
+"""
+Generation job model for the durable job queue
+"""
+from sqlalchemy import Column, String, DateTime, Integer, Text, JSON, Index
+from datetime import datetime
+
+from backend.database.base import Base
+
+
+class JobStatus:
+    """Queue states of a GenerationJob (plain strings, no DB enum needed)"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class GenerationJob(Base):
+    """
+    A unit of background work shared by every API and worker process.
+
+    `state` holds the task dict that status endpoints return (status,
+    progress, message, result, ...); the remaining columns drive leasing
+    and retries.
+    """
+    __tablename__ = "generation_jobs"
+
+    id = Column(String, primary_key=True)
+    job_type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    state = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default=JobStatus.QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    # Earliest time the job may be claimed (pushed back between retries)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Worker holding the job and when its lease runs out unless renewed
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_generation_jobs_claim", "status", "available_at"),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "job_type": self.job_type,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "lease_owner": self.lease_owner,
+            "lease_expires_at": self.lease_expires_at.isoformat() if self.lease_expires_at else None,
+            "heartbeat_at": self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -1,7 +1,7 @@
 """
 Procurement project, phase, and step models
 """
-from sqlalchemy import Column, String, DateTime, Date, Enum, Integer, Numeric, ForeignKey, Boolean, Text, JSON
+from sqlalchemy import Column, String, DateTime, Date, Enum, Integer, Numeric, ForeignKey, Boolean, Text, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -178,6 +178,12 @@ class ProcurementStep(Base):
     # Relationships
     phase = relationship("ProcurementPhase", back_populates="steps")
     project = relationship("ProcurementProject", back_populates="steps")
+    assigned_user = relationship("User", foreign_keys=[assigned_user_id])
+
+    __table_args__ = (
+        # Project step list, in order
+        Index("ix_procurement_steps_project_order", "project_id", "step_order"),
+    )
 
     def to_dict(self):
         return {
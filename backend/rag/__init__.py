@@ -7,12 +7,14 @@ Components for document retrieval and processing:
 - Retrieval systems
 """
 
-from backend.rag.document_processor import DocumentProcessor
-from backend.rag.vector_store import VectorStore
-from backend.rag.retriever import Retriever
+from backend.utils.lazy_exports import install_lazy_exports
 
-__all__ = [
-    'DocumentProcessor',
-    'VectorStore',
-    'Retriever',
-]
+# Exported names are imported on first attribute access (PEP 562), so
+# importing one RAG module does not load every document parser
+_EXPORTS = {
+    'DocumentProcessor': 'backend.rag.document_processor',
+    'VectorStore': 'backend.rag.vector_store',
+    'Retriever': 'backend.rag.retriever',
+}
+
+__all__ = install_lazy_exports(globals(), _EXPORTS)
@@ -0,0 +1,254 @@
+"""
+Chunk Store: SQLite-backed storage for chunk text and metadata
+
+Row i of the store lines up with row i of the FAISS index and the embedding
+matrix. Only a small array of row ids is held in memory; chunk text and
+metadata are read from SQLite on demand, so a search only materializes its
+top-k hits.
+
+Each row also records a SHA-256 hash of its content, so ingestion can
+reuse the embedding of text that has already been embedded.
+
+Writes are committed on commit() (called from VectorStore.save()), keeping
+the chunk table consistent with the index files written alongside it. The
+table can hold rows past the store's last saved manifest (a save that
+crashed after committing chunks); a store opened with a limit ignores them
+and deletes them on its next write.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def content_hash(text: str) -> str:
+    """
+    Hash chunk text for embedding dedup
+
+    Args:
+        text: Chunk content
+
+    Returns:
+        SHA-256 hex digest
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class StoredChunk:
+    """A chunk read back from the store (same fields as DocumentChunk)"""
+    content: str
+    metadata: Dict
+    chunk_id: str
+
+
+class ChunkStore:
+    """
+    Lazily loaded, position-addressed chunk table
+
+    Supports len(), indexing and iteration like the list of chunks it
+    replaces.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, limit: Optional[int] = None):
+        """
+        Initialize chunk store
+
+        Args:
+            db_path: SQLite file path, or None for an in-memory store
+            limit: Rows to use; later rows are ignored and deleted on the next write
+        """
+        self.db_path = str(db_path) if db_path else None
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path or ":memory:", check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY,
+                chunk_id TEXT,
+                content TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                content_hash TEXT
+            )
+        """)
+        self._migrate()
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_content_hash ON chunks (content_hash)")
+        self._conn.commit()
+
+        # Position -> SQLite row id
+        ids = [row[0] for row in self._conn.execute("SELECT id FROM chunks ORDER BY id")]
+        self._has_ignored_rows = limit is not None and len(ids) > limit
+        if self._has_ignored_rows:
+            ids = ids[:limit]
+        self._row_ids = np.array(ids, dtype='int64')
+        # Queries only see rows below this id
+        self._next_id = int(self._row_ids[-1]) + 1 if len(self._row_ids) else 0
+
+    def _migrate(self) -> None:
+        """Add and backfill the content_hash column on stores created before it existed"""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(chunks)")}
+        if "content_hash" in columns:
+            return
+
+        self._conn.execute("ALTER TABLE chunks ADD COLUMN content_hash TEXT")
+        rows = self._conn.execute("SELECT id, content FROM chunks").fetchall()
+        self._conn.executemany(
+            "UPDATE chunks SET content_hash = ? WHERE id = ?",
+            [(content_hash(content), row_id) for row_id, content in rows]
+        )
+
+    def __len__(self) -> int:
+        return len(self._row_ids)
+
+    def __getitem__(self, position: int) -> StoredChunk:
+        if position < 0:
+            position += len(self._row_ids)
+        if not 0 <= position < len(self._row_ids):
+            raise IndexError("chunk position out of range")
+        return self.get_many([position])[0]
+
+    def __iter__(self) -> Iterator[StoredChunk]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT content, metadata, chunk_id FROM chunks WHERE id < ? ORDER BY id", (self._next_id,)
+            ).fetchall()
+        for content, metadata, chunk_id in rows:
+            yield StoredChunk(content=content, metadata=json.loads(metadata), chunk_id=chunk_id)
+
+    def get_many(self, positions: Sequence[int]) -> List[StoredChunk]:
+        """
+        Fetch chunks by position
+
+        Args:
+            positions: Row positions (as returned by FAISS)
+
+        Returns:
+            Chunks in the same order as positions
+        """
+        row_ids = [int(self._row_ids[p]) for p in positions]
+        if not row_ids:
+            return []
+
+        placeholders = ",".join("?" * len(row_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, content, metadata, chunk_id FROM chunks WHERE id IN ({placeholders})",
+                row_ids
+            ).fetchall()
+
+        by_id = {
+            row_id: StoredChunk(content=content, metadata=json.loads(metadata), chunk_id=chunk_id)
+            for row_id, content, metadata, chunk_id in rows
+        }
+        return [by_id[row_id] for row_id in row_ids]
+
+    def iter_metadata(self) -> Iterator[Tuple[int, Dict]]:
+        """
+        Iterate (position, metadata) pairs without loading chunk text
+
+        Yields:
+            Tuples of (position, metadata dict)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT metadata FROM chunks WHERE id < ? ORDER BY id", (self._next_id,)
+            ).fetchall()
+        for position, (metadata,) in enumerate(rows):
+            yield position, json.loads(metadata)
+
+    def find_hashes(self, hashes: Sequence[str]) -> Dict[str, int]:
+        """
+        Look up stored chunks by content hash
+
+        Args:
+            hashes: Content hashes to look for
+
+        Returns:
+            Dictionary mapping each found hash to the position of one chunk with it
+        """
+        hashes = list(set(hashes))
+        found: Dict[str, int] = {}
+
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(hashes), 500):
+                batch = hashes[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT content_hash, MIN(id) FROM chunks WHERE content_hash IN ({placeholders}) "
+                    f"AND id < ? GROUP BY content_hash",
+                    [*batch, self._next_id]
+                ).fetchall()
+                for digest, row_id in rows:
+                    found[digest] = int(np.searchsorted(self._row_ids, row_id))
+
+        return found
+
+    def extend(self, chunks: Sequence, hashes: Optional[Sequence[str]] = None) -> None:
+        """
+        Append chunks (any objects with content, metadata and chunk_id)
+
+        Args:
+            chunks: Chunks to append, in index order
+            hashes: Precomputed content hashes (computed if omitted)
+        """
+        if hashes is None:
+            hashes = [content_hash(chunk.content) for chunk in chunks]
+
+        with self._lock:
+            start = self._next_id
+            if self._has_ignored_rows:
+                self._conn.execute("DELETE FROM chunks WHERE id >= ?", (start,))
+                self._has_ignored_rows = False
+            self._conn.executemany(
+                "INSERT INTO chunks (id, chunk_id, content, metadata, content_hash) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (start + offset, getattr(chunk, 'chunk_id', None), chunk.content,
+                     json.dumps(chunk.metadata or {}, default=str), digest)
+                    for offset, (chunk, digest) in enumerate(zip(chunks, hashes))
+                ]
+            )
+            new_ids = np.arange(start, start + len(chunks), dtype='int64')
+            self._row_ids = np.concatenate([self._row_ids, new_ids])
+            self._next_id = start + len(chunks)
+
+    def keep(self, keep_mask: np.ndarray) -> None:
+        """
+        Drop every row whose mask entry is False
+
+        Args:
+            keep_mask: Boolean array, one entry per position
+        """
+        with self._lock:
+            removed = self._row_ids[~keep_mask]
+            self._conn.executemany("DELETE FROM chunks WHERE id = ?", [(int(i),) for i in removed])
+            self._row_ids = self._row_ids[keep_mask]
+
+    def commit(self) -> None:
+        """Commit pending writes"""
+        with self._lock:
+            self._conn.commit()
+
+    def save_as(self, db_path: str) -> None:
+        """
+        Write the store to a new SQLite file and switch to it
+
+        Args:
+            db_path: Destination file (replaced if it exists)
+        """
+        with self._lock:
+            self._conn.commit()
+            target = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._conn.backup(target)
+            self._conn.close()
+            self._conn = target
+            self.db_path = str(db_path)
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
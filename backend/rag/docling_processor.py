@@ -29,6 +29,13 @@ except ImportError:
     DOCLING_AVAILABLE = False
     print("⚠️  Warning: Docling not installed. Install with: pip install docling")
 
+# File types Docling (or the fallback processor) can convert
+SUPPORTED_EXTENSIONS = {
+    '.pdf', '.docx', '.pptx', '.xlsx',
+    '.html', '.htm', '.txt', '.md',
+    '.png', '.jpg', '.jpeg', '.tiff', '.bmp'
+}
+
 
 @dataclass
 class DocumentChunk:
@@ -142,17 +149,10 @@ class DoclingProcessor:
         
         print(f"🔍 Scanning directory: {directory_path}")
         
-        # Supported formats by Docling
-        supported_extensions = {
-            '.pdf', '.docx', '.pptx', '.xlsx', 
-            '.html', '.htm', '.txt', '.md',
-            '.png', '.jpg', '.jpeg', '.tiff', '.bmp'
-        }
-        
         # Find all supported files recursively
         files = [
             f for f in directory.rglob('*') 
-            if f.is_file() and f.suffix.lower() in supported_extensions
+            if f.is_file() and f.suffix.lower() in SUPPORTED_EXTENSIONS
         ]
         
         print(f"📚 Found {len(files)} supported documents")
@@ -338,7 +338,10 @@ class DoclingProcessor:
         """
         # Import the basic processor
         try:
-            from rag.document_processor import DocumentProcessor as BasicProcessor
+            try:
+                from .document_processor import DocumentProcessor as BasicProcessor
+            except ImportError:
+                from rag.document_processor import DocumentProcessor as BasicProcessor
             
             basic = BasicProcessor(self.chunk_size, self.chunk_overlap)
             
@@ -0,0 +1,376 @@
+"""
+Ingestion Pipeline: Parallel, resumable document ingestion
+
+Converts documents into chunks on a pool of worker processes (Docling's
+layout model is CPU-bound, so threads would not help) and streams finished
+chunks into a VectorStore as files complete, instead of building one list
+of every chunk first.
+
+A manifest (<index_path>.ingest.json) records the SHA-256 of every file
+that has been fully ingested. Unchanged files are skipped on later runs;
+changed files have their old chunks replaced. Files that yield no chunks
+(conversion failed) are reported as failed and never recorded, so the
+next run tries them again. Chunks are embedded in batches as they arrive,
+but the store is only written and saved every few batches (and at the end),
+since each save rewrites the whole index; the manifest is updated right
+after each save, so it only lists files whose chunks are on disk. A run
+that crashes can simply be started again: files that were not recorded are
+re-processed, and any of their chunks that did reach the store are deleted
+first so nothing is duplicated.
+
+Writes go through VectorStore.exclusive_write(), so the API can keep
+ingesting uploads into the same store while a run is in progress.
+
+Configuration (environment):
+- INGEST_WORKERS: Conversion processes (default: CPU count)
+- INGEST_FLUSH_CHUNKS: Chunks buffered before they are embedded (default 512)
+- INGEST_SAVE_EVERY: Embedded batches written to the store per save (default 8)
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .docling_processor import DoclingProcessor, SUPPORTED_EXTENSIONS
+except ImportError:
+    from rag.docling_processor import DoclingProcessor, SUPPORTED_EXTENSIONS
+
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", os.cpu_count() or 1))
+INGEST_FLUSH_CHUNKS = int(os.getenv("INGEST_FLUSH_CHUNKS", 512))
+INGEST_SAVE_EVERY = int(os.getenv("INGEST_SAVE_EVERY", 8))
+
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """
+    Hash a file's contents without reading it into memory at once
+
+    Args:
+        path: File path
+        block_size: Bytes read per step
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestionManifest:
+    """
+    Content hashes of the files already ingested into a vector store
+
+    Entries are keyed by file path as recorded in chunk metadata
+    ('file_path'). Size and mtime are kept so unchanged files can be
+    recognised without re-hashing them.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize manifest, loading it if it exists
+
+        Args:
+            path: JSON file path
+        """
+        self.path = path
+        self.files: Dict[str, Dict] = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.files = json.load(f).get('files', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable ingestion manifest {path}: {e}")
+
+    def is_current(self, file_path: str) -> bool:
+        """
+        Check whether a file is ingested and unchanged since
+
+        Args:
+            file_path: File path
+
+        Returns:
+            True if the file can be skipped
+        """
+        entry = self.files.get(file_path)
+        if entry is None:
+            return False
+
+        stat = os.stat(file_path)
+        if entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime:
+            return True
+
+        # Touched but possibly unchanged (copied, checked out again...)
+        if entry.get('size') == stat.st_size and entry.get('sha256') == file_sha256(file_path):
+            entry['mtime'] = stat.st_mtime
+            return True
+        return False
+
+    def record(self, file_path: str, sha256: str, chunk_count: int) -> None:
+        """Mark a file as ingested (call save() to persist)"""
+        stat = os.stat(file_path)
+        self.files[file_path] = {
+            'sha256': sha256,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'chunks': chunk_count,
+            'ingested_at': datetime.now().isoformat()
+        }
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.files}, f, indent=2)
+        os.replace(self.path + '.tmp', self.path)
+
+
+# One processor per worker process: building the Docling converter is slow,
+# so it is done once per process rather than once per file
+_worker_processor: Optional[DoclingProcessor] = None
+
+
+def init_conversion_worker(chunk_size: int, chunk_overlap: int) -> None:
+    """Process pool initializer: build this process's DoclingProcessor"""
+    global _worker_processor
+    _worker_processor = DoclingProcessor(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def convert_file(file_path: str) -> Tuple[str, str, List]:
+    """Hash and chunk one file (runs in a worker process)"""
+    sha256 = file_sha256(file_path)
+    return file_path, sha256, _worker_processor.process_document(file_path)
+
+
+@dataclass
+class EmbeddedBatch:
+    """Chunks embedded by the pipeline, waiting to be written to the store"""
+    chunks: List
+    hashes: List[str]
+    embeddings: np.ndarray
+    files: List[Tuple[str, str, int]]  # (file_path, sha256, chunk_count)
+
+
+class IngestionPipeline:
+    """
+    Ingests document files into a VectorStore in parallel, skipping files
+    that are unchanged since they were last ingested
+
+    Usage:
+        vector_store = VectorStore(index_path="data/vector_db/faiss_index")
+        vector_store.load()
+        stats = IngestionPipeline(vector_store).ingest("data/documents")
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        manifest_path: Optional[str] = None,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        workers: Optional[int] = None,
+        flush_chunks: Optional[int] = None,
+        save_every: Optional[int] = None
+    ):
+        """
+        Initialize ingestion pipeline
+
+        Args:
+            vector_store: VectorStore to add chunks to (saved every save_every batches)
+            manifest_path: Manifest file (default: <index_path>.ingest.json)
+            chunk_size: Target size for text chunks (characters)
+            chunk_overlap: Overlap between chunks
+            workers: Conversion processes (default INGEST_WORKERS env; 1 converts in-process)
+            flush_chunks: Chunks buffered before embedding (default INGEST_FLUSH_CHUNKS env)
+            save_every: Embedded batches per store save (default INGEST_SAVE_EVERY env)
+        """
+        self.vector_store = vector_store
+        self.manifest = IngestionManifest(manifest_path or str(vector_store.index_path) + '.ingest.json')
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.workers = max(1, workers or INGEST_WORKERS)
+        self.flush_chunks = max(1, flush_chunks or INGEST_FLUSH_CHUNKS)
+        self.save_every = max(1, save_every or INGEST_SAVE_EVERY)
+
+    def discover(self, target: str) -> List[str]:
+        """
+        List the supported files under a file or directory
+
+        Args:
+            target: File or directory path
+
+        Returns:
+            Sorted file paths
+        """
+        path = Path(target)
+        if path.is_file():
+            return [str(path)]
+        return sorted(
+            str(f) for f in path.rglob('*')
+            if f.is_file() and f.suffix.lower() in SUPPORTED_EXTENSIONS
+        )
+
+    def ingest(self, target: str, force: bool = False) -> Dict:
+        """
+        Ingest every new or changed file under a file or directory
+
+        Args:
+            target: File or directory path
+            force: Re-ingest files even if they are unchanged
+
+        Returns:
+            Dict with statistics (files_found, skipped, processed, failed, chunks_added, seconds)
+        """
+        start_time = time.time()
+        files = self.discover(target)
+        pending = [f for f in files if force or not self.manifest.is_current(f)]
+
+        print(f"📚 Found {len(files)} supported documents "
+              f"({len(files) - len(pending)} unchanged, {len(pending)} to ingest)")
+
+        stats = {
+            "files_found": len(files),
+            "skipped": len(files) - len(pending),
+            "processed": 0,
+            "failed": 0,
+            "chunks_added": 0,
+            "errors": {}
+        }
+
+        if pending:
+            # Old chunks of changed files, and chunks of files a crashed run
+            # stored without recording, are replaced rather than duplicated
+            with self.vector_store.exclusive_write():
+                if self.vector_store.delete_by_file_paths(pending)["success"]:
+                    self.vector_store.save()
+            self._run(pending, stats)
+
+        stats["seconds"] = round(time.time() - start_time, 3)
+        print(f"✅ Ingestion complete: {stats['processed']} processed, {stats['skipped']} skipped, "
+              f"{stats['failed']} failed, {stats['chunks_added']} chunks added in {stats['seconds']}s")
+        return stats
+
+    def _run(self, files: List[str], stats: Dict) -> None:
+        """Convert files and stream their chunks into the vector store"""
+        buffer: List = []
+        buffered_files: List[Tuple[str, str, int]] = []
+        # Embedded batches not yet written to the store
+        embedded: List[EmbeddedBatch] = []
+        total = len(files)
+
+        def on_converted(file_path: str, sha256: str, chunks: List):
+            if not chunks:
+                # Conversion errors are logged and yield no chunks; recording
+                # the file would skip it on every later run
+                on_failed(file_path, ValueError("no text could be extracted"))
+                return
+            stats["processed"] += 1
+            print(f"  [{stats['processed'] + stats['failed']}/{total}] {Path(file_path).name}: {len(chunks)} chunks")
+            buffer.extend(chunks)
+            buffered_files.append((file_path, sha256, len(chunks)))
+            if len(buffer) >= self.flush_chunks:
+                embedded.append(self._embed(buffer, buffered_files))
+                if len(embedded) >= self.save_every:
+                    self._save(embedded, stats)
+
+        def on_failed(file_path: str, error: Exception):
+            stats["failed"] += 1
+            stats["errors"][file_path] = str(error)
+            print(f"  ❌ Failed to ingest {file_path}: {error}")
+
+        try:
+            if self.workers == 1 or len(files) == 1:
+                init_conversion_worker(self.chunk_size, self.chunk_overlap)
+                for file_path in files:
+                    try:
+                        on_converted(*convert_file(file_path))
+                    except Exception as e:
+                        on_failed(file_path, e)
+            else:
+                self._run_pool(files, on_converted, on_failed)
+        finally:
+            # Whatever finished before an error or interrupt is kept
+            if buffered_files:
+                embedded.append(self._embed(buffer, buffered_files))
+            self._save(embedded, stats)
+
+    def _run_pool(self, files: List[str], on_converted, on_failed) -> None:
+        """Convert files on a process pool, handling results as they complete"""
+        workers = min(self.workers, len(files))
+        print(f"  Converting on {workers} worker processes...")
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_conversion_worker,
+            initargs=(self.chunk_size, self.chunk_overlap)
+        ) as executor:
+            remaining = iter(files)
+            in_flight = {}
+
+            def submit_next() -> bool:
+                file_path = next(remaining, None)
+                if file_path is None:
+                    return False
+                in_flight[executor.submit(convert_file, file_path)] = file_path
+                return True
+
+            # A bounded window keeps finished-but-unconsumed chunks from
+            # piling up in memory while the main process is embedding
+            for _ in range(workers * 2):
+                if not submit_next():
+                    break
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        on_failed(file_path, e)
+                    else:
+                        on_converted(*result)
+                    submit_next()
+
+    def _embed(self, buffer: List, buffered_files: List[Tuple[str, str, int]]) -> "EmbeddedBatch":
+        """Embed buffered chunks (without the write lock) and empty the buffers"""
+        chunks = list(buffer)
+        hashes, embeddings, _ = self.vector_store.embed_chunks(chunks)
+        batch = EmbeddedBatch(chunks, hashes, embeddings, list(buffered_files))
+        buffer.clear()
+        buffered_files.clear()
+        return batch
+
+    def _save(self, embedded: List["EmbeddedBatch"], stats: Dict) -> None:
+        """Add embedded batches to the store and save it, then record their files as ingested"""
+        if not embedded:
+            return
+
+        # Embedding already happened, so other writers only wait for this
+        with self.vector_store.exclusive_write():
+            for batch in embedded:
+                self.vector_store.add_embedded(batch.chunks, batch.hashes, batch.embeddings)
+            self.vector_store.save()
+
+        # Only after the store is on disk, so a crash never marks unsaved files
+        for batch in embedded:
+            stats["chunks_added"] += len(batch.chunks)
+            for file_path, sha256, chunk_count in batch.files:
+                self.manifest.record(file_path, sha256, chunk_count)
+        self.manifest.save()
+
+        embedded.clear()
@@ -0,0 +1,194 @@
+"""
+Lexical Index: BM25 inverted index over chunk text
+
+Complements the embedding index for exact procurement tokens that MiniLM
+embeds poorly: clause numbers ("DFARS 252.204-7012"), "CMMC Level 2",
+NAICS codes, CLIN numbers. Positions line up with the FAISS index rows.
+
+Tokenization keeps dotted/dashed identifiers whole ("252.204-7012") and
+also indexes their parts ("252", "204", "7012"), so both the full citation
+and a fragment of it match.
+
+Postings are kept as compact typed arrays and the whole index is persisted
+next to the FAISS index (.bm25).
+"""
+
+import math
+import os
+import pickle
+import re
+from array import array
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[./\-][a-z0-9]+)*")
+PART_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the
+this to was were will with what which who how
+""".split())
+
+FORMAT_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Lowercased terms (compound identifiers plus their parts), stopwords removed
+    """
+    terms = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token not in STOPWORDS:
+            terms.append(token)
+        parts = PART_PATTERN.findall(token)
+        if len(parts) > 1:
+            terms.extend(part for part in parts if part not in STOPWORDS)
+    return terms
+
+
+class LexicalIndex:
+    """
+    BM25 inverted index addressed by chunk position
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize lexical index
+
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        # term -> (positions, term frequencies)
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.doc_lengths = array('I')
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, texts: Sequence[str]) -> None:
+        """
+        Index texts at the next positions
+
+        Args:
+            texts: Chunk texts, in index order
+        """
+        start = len(self.doc_lengths)
+        for offset, text in enumerate(texts):
+            terms = tokenize(text)
+            self.doc_lengths.append(len(terms))
+            self._total_length += len(terms)
+            for term, tf in Counter(terms).items():
+                entry = self.postings.get(term)
+                if entry is None:
+                    entry = self.postings[term] = (array('I'), array('I'))
+                entry[0].append(start + offset)
+                entry[1].append(tf)
+
+    def keep(self, keep_mask: np.ndarray) -> None:
+        """
+        Drop every position whose mask entry is False and renumber the rest
+
+        Args:
+            keep_mask: Boolean array, one entry per position
+        """
+        new_position = np.cumsum(keep_mask) - 1
+        postings = {}
+        for term, (positions, tfs) in self.postings.items():
+            positions = np.frombuffer(positions, dtype=np.uint32)
+            kept = keep_mask[positions]
+            if kept.any():
+                postings[term] = (
+                    array('I', new_position[positions[kept]].astype(np.uint32).tobytes()),
+                    array('I', np.frombuffer(tfs, dtype=np.uint32)[kept].tobytes())
+                )
+        self.postings = postings
+
+        lengths = np.frombuffer(self.doc_lengths, dtype=np.uint32)[keep_mask]
+        self.doc_lengths = array('I', lengths.tobytes())
+        self._total_length = int(lengths.sum())
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        """
+        Score positions against a query with BM25
+
+        Args:
+            query: Search query
+            k: Number of results to return
+
+        Returns:
+            List of (position, score) tuples, best first
+        """
+        count = len(self.doc_lengths)
+        terms = [term for term in set(tokenize(query)) if term in self.postings]
+        if not count or not terms:
+            return []
+
+        lengths = np.frombuffer(self.doc_lengths, dtype=np.uint32).astype(np.float32)
+        norm = self.k1 * (1 - self.b + self.b * lengths / (self._total_length / count))
+        scores = np.zeros(count, dtype=np.float32)
+
+        for term in terms:
+            positions, tfs = self.postings[term]
+            positions = np.frombuffer(positions, dtype=np.uint32)
+            tfs = np.frombuffer(tfs, dtype=np.uint32).astype(np.float32)
+            idf = math.log(1 + (count - len(positions) + 0.5) / (len(positions) + 0.5))
+            scores[positions] += idf * tfs * (self.k1 + 1) / (tfs + norm[positions])
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k)[:k]]
+        ranked = matched[np.argsort(-scores[matched], kind='stable')]
+        return [(int(position), float(scores[position])) for position in ranked]
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to disk
+
+        Args:
+            path: Destination file
+        """
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump({
+                'format_version': FORMAT_VERSION,
+                'k1': self.k1,
+                'b': self.b,
+                'doc_lengths': self.doc_lengths,
+                'postings': self.postings
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalIndex":
+        """
+        Read an index written by save()
+
+        Args:
+            path: Index file
+
+        Returns:
+            LexicalIndex instance
+        """
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+
+        if data.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported lexical index format: {data.get('format_version')}")
+
+        index = cls(k1=data['k1'], b=data['b'])
+        index.doc_lengths = data['doc_lengths']
+        index.postings = data['postings']
+        index._total_length = sum(index.doc_lengths)
+        return index
@@ -1,11 +1,22 @@
 """
 Retriever: High-level interface for RAG queries
 Combines vector search with re-ranking and context assembly
+
+Retrieval is hybrid by default: embedding search and BM25 lexical search
+are fused with reciprocal-rank fusion (RRF), so exact tokens such as
+"DFARS 252.204-7012" or a NAICS code surface even when the embedding
+misses them.
+
+Results are memoized per vector store generation: repeated queries are
+served from memory until chunks are added, deleted or reloaded.
 """
 
 import os
 import sys
-from typing import List, Dict
+import copy
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Tuple
 
 # Add parent directory to path for imports
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -18,27 +29,72 @@ except ImportError:
     from rag.vector_store import VectorStore
 
 
+# Standard RRF damping constant
+RRF_K = 60
+
+# Retrieval results memoized per retriever
+RESULT_CACHE_SIZE = 256
+
+
+def reciprocal_rank_fusion(
+    result_lists: List[List[Tuple[Dict, float]]],
+    k: int,
+    rrf_k: int = RRF_K
+) -> List[Dict]:
+    """
+    Fuse ranked result lists with reciprocal-rank fusion
+    
+    Each document scores sum(1 / (rrf_k + rank)) over the lists it appears in.
+    
+    Args:
+        result_lists: Ranked lists of (chunk_dict, score) tuples
+        k: Number of fused results to return
+        rrf_k: Rank damping constant
+        
+    Returns:
+        Top-k chunk dicts, each with an added 'rrf_score'
+    """
+    fused: Dict[Tuple, Dict] = {}
+    
+    for results in result_lists:
+        for rank, (chunk, _) in enumerate(results, 1):
+            key = (chunk.get('chunk_id'), chunk['content'])
+            if key not in fused:
+                fused[key] = dict(chunk, rrf_score=0.0)
+            fused[key]['rrf_score'] += 1.0 / (rrf_k + rank)
+    
+    ranked = sorted(fused.values(), key=lambda doc: doc['rrf_score'], reverse=True)
+    return ranked[:k]
+
+
 class Retriever:
     """
     High-level retrieval interface for RAG system
     
     Handles:
     - Query processing
-    - Context retrieval
+    - Context retrieval (vector + BM25, fused by RRF)
     - Re-ranking (optional)
     - Context assembly for LLM
     """
     
-    def __init__(self, vector_store: VectorStore, top_k: int = 5):
+    def __init__(self, vector_store: VectorStore, top_k: int = 5, hybrid: bool = True):
         """
         Initialize retriever
         
         Args:
             vector_store: VectorStore instance
             top_k: Number of documents to retrieve
+            hybrid: Fuse BM25 lexical results with vector results
         """
         self.vector_store = vector_store
         self.top_k = top_k
+        self.hybrid = hybrid
+        
+        # (query, k, hybrid) -> documents, valid for one store generation
+        self._result_cache: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+        self._cache_generation = None
+        self._cache_lock = threading.Lock()
     
     def retrieve(self, query: str, k: int = None) -> List[Dict]:
         """
@@ -53,13 +109,65 @@ class Retriever:
         """
         k = k or self.top_k
         
-        # Search vector store
-        results = self.vector_store.search(query, k=k)
+        return self.retrieve_many([query], k=k)[0]
+    
+    def retrieve_many(self, queries: List[str], k: int = None) -> List[List[Dict]]:
+        """
+        Retrieve relevant documents for several queries in one batched search
         
-        # Extract document dictionaries
-        documents = [chunk for chunk, score in results]
+        Args:
+            queries: Search queries
+            k: Number of results per query (overrides default top_k)
+            
+        Returns:
+            One list of retrieved document dictionaries per query
+        """
+        k = k or self.top_k
+        hybrid = self._use_hybrid()
+        keys = [(query, k, hybrid) for query in queries]
+        
+        documents: Dict[Tuple, List[Dict]] = {}
+        with self._cache_lock:
+            # New uploads/deletes bump the store generation and invalidate results
+            generation = getattr(self.vector_store, 'generation', None)
+            if generation != self._cache_generation:
+                self._result_cache.clear()
+                self._cache_generation = generation
+            for key in keys:
+                if key in self._result_cache:
+                    self._result_cache.move_to_end(key)
+                    documents[key] = self._result_cache[key]
+        
+        missing = list(dict.fromkeys(query for query, _, _ in keys if (query, k, hybrid) not in documents))
+        if missing:
+            # Search vector store
+            results = self.vector_store.search_many(missing, k=k)
+            
+            for query, vector_results in zip(missing, results):
+                if hybrid:
+                    found = reciprocal_rank_fusion(
+                        [vector_results, self.vector_store.lexical_search(query, k=k)],
+                        k=k
+                    )
+                else:
+                    # Extract document dictionaries
+                    found = [chunk for chunk, score in vector_results]
+                documents[(query, k, hybrid)] = found
+            
+            with self._cache_lock:
+                # Don't cache results if the store changed mid-search
+                if self._cache_generation == generation == getattr(self.vector_store, 'generation', None):
+                    for query in missing:
+                        self._result_cache[(query, k, hybrid)] = documents[(query, k, hybrid)]
+                    while len(self._result_cache) > RESULT_CACHE_SIZE:
+                        self._result_cache.popitem(last=False)
         
-        return documents
+        # Callers annotate the returned dicts, so hand out copies
+        return [copy.deepcopy(documents[key]) for key in keys]
+    
+    def _use_hybrid(self) -> bool:
+        """Hybrid retrieval needs a store with a lexical index"""
+        return self.hybrid and hasattr(self.vector_store, 'lexical_search')
     
     def retrieve_with_context(self, query: str, k: int = None) -> str:
         """
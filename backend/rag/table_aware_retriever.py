@@ -53,8 +53,10 @@ class TableAwareRetriever:
         # Enhance query for table data
         enhanced_query = self._enhance_table_query(query, table_name, column_filter)
         
-        # Retrieve documents
-        documents = self.retriever.retrieve(enhanced_query, k=k * 2)  # Get more, then filter
+        # Retrieve documents (hybrid retrieval already ranks exact column/table
+        # tokens highly, so only over-fetch when results will be filtered)
+        fetch_k = k * 2 if (table_name or column_filter) else k
+        documents = self.retriever.retrieve(enhanced_query, k=fetch_k)
         
         # Filter for table documents if requested
         if table_name or column_filter:
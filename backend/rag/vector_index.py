@@ -0,0 +1,259 @@
+"""
+Vector Index: FAISS index construction and selection
+
+Supported index types:
+- flat: Exact brute-force L2 search (IndexFlatL2)
+- ivf_flat: Inverted file over exact vectors (IndexIVFFlat), needs training
+- ivf_pq: Inverted file over product-quantized vectors (IndexIVFPQ), needs training
+- hnsw: Graph-based search (IndexHNSWFlat), no training
+
+"auto" picks a type from the corpus size. Thresholds are configurable via
+environment variables:
+- VECTOR_INDEX_IVF_THRESHOLD: Chunk count at which flat -> ivf_flat (default 50000)
+- VECTOR_INDEX_PQ_THRESHOLD: Chunk count at which ivf_flat -> ivf_pq (default 1000000)
+
+benchmark_index_configs() measures recall@k and latency of candidate
+configurations against exact flat search so settings can be chosen from data.
+"""
+
+import math
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+IVF_THRESHOLD = int(os.getenv("VECTOR_INDEX_IVF_THRESHOLD", 50000))
+PQ_THRESHOLD = int(os.getenv("VECTOR_INDEX_PQ_THRESHOLD", 1000000))
+
+# FAISS k-means wants roughly this many training points per centroid
+MIN_POINTS_PER_CENTROID = 39
+
+
+@dataclass
+class IndexConfig:
+    """
+    Index type and tuning parameters
+
+    nlist defaults to 4 * sqrt(n) at build time. pq_m must divide the
+    embedding dimension (16 divides 384 and 768).
+    """
+    index_type: str = "flat"
+    nlist: Optional[int] = None
+    nprobe: int = 16
+    pq_m: int = 16
+    pq_bits: int = 8
+    hnsw_m: int = 32
+    ef_construction: int = 200
+    ef_search: int = 64
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "IndexConfig":
+        fields = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in (data or {}).items() if key in fields})
+
+
+def select_index_type(num_vectors: int) -> str:
+    """
+    Choose an index type for a corpus size
+
+    Args:
+        num_vectors: Number of vectors to index
+
+    Returns:
+        Index type name
+    """
+    if num_vectors >= PQ_THRESHOLD:
+        return "ivf_pq"
+    if num_vectors >= IVF_THRESHOLD:
+        return "ivf_flat"
+    return "flat"
+
+
+def resolve_index_type(requested: str, num_vectors: int, config: IndexConfig) -> str:
+    """
+    Resolve the requested type to one that can be built for num_vectors
+
+    "auto" is resolved by corpus size. IVF types fall back to flat until
+    there are enough vectors to train them.
+
+    Args:
+        requested: Index type or "auto"
+        num_vectors: Number of vectors to index
+        config: Index parameters
+
+    Returns:
+        Index type name to build
+    """
+    if requested == "auto":
+        requested = select_index_type(num_vectors)
+
+    if requested not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{requested}'. Use one of {INDEX_TYPES} or 'auto'")
+
+    if requested.startswith("ivf") and num_vectors < min_training_size(requested, config):
+        return "flat"
+
+    return requested
+
+
+def _nlist_for(num_vectors: int, config: IndexConfig) -> int:
+    """Number of IVF lists for a corpus size"""
+    if config.nlist:
+        return config.nlist
+    return max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // MIN_POINTS_PER_CENTROID))
+
+
+def min_training_size(index_type: str, config: IndexConfig) -> int:
+    """
+    Minimum number of vectors needed to train an index type
+
+    Args:
+        index_type: Index type name
+        config: Index parameters
+
+    Returns:
+        Vector count (0 for types that need no training)
+    """
+    if index_type == "ivf_pq":
+        return max(MIN_POINTS_PER_CENTROID * (config.nlist or 1), 2 ** config.pq_bits * MIN_POINTS_PER_CENTROID)
+    if index_type == "ivf_flat":
+        return MIN_POINTS_PER_CENTROID * (config.nlist or 1)
+    return 0
+
+
+def build_index(embeddings: np.ndarray, dimension: int, index_type: str, config: IndexConfig):
+    """
+    Build (and train if needed) an index, then add the embeddings
+
+    Args:
+        embeddings: float32 matrix of shape (n, dimension)
+        dimension: Embedding dimension
+        index_type: Resolved index type
+        config: Index parameters
+
+    Returns:
+        Populated FAISS index
+    """
+    embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dimension)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, config.hnsw_m)
+        index.hnsw.efConstruction = config.ef_construction
+    elif index_type in ("ivf_flat", "ivf_pq"):
+        nlist = _nlist_for(len(embeddings), config)
+        quantizer = faiss.IndexFlatL2(dimension)
+        if index_type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+        else:
+            index = faiss.IndexIVFPQ(quantizer, dimension, nlist, config.pq_m, config.pq_bits)
+        index.train(embeddings)
+    else:
+        raise ValueError(f"Unknown index type '{index_type}'")
+
+    apply_search_params(index, config)
+    if len(embeddings):
+        index.add(embeddings)
+    return index
+
+
+def apply_search_params(index, config: IndexConfig) -> None:
+    """
+    Set query-time parameters (nprobe / efSearch) on an index
+
+    Args:
+        index: FAISS index
+        config: Index parameters
+    """
+    if hasattr(index, "nprobe"):
+        index.nprobe = config.nprobe
+    if hasattr(index, "hnsw"):
+        index.hnsw.efSearch = config.ef_search
+
+
+def index_type_of(index) -> str:
+    """
+    Identify the index type of a FAISS index
+
+    Args:
+        index: FAISS index
+
+    Returns:
+        Index type name
+    """
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexIVFFlat):
+        return "ivf_flat"
+    if isinstance(index, faiss.IndexHNSWFlat):
+        return "hnsw"
+    return "flat"
+
+
+def benchmark_index_configs(
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    configs: List[IndexConfig],
+    k: int = 10
+) -> List[Dict]:
+    """
+    Measure recall@k and query latency of index configurations against flat search
+
+    Args:
+        embeddings: Corpus embeddings (n, dimension)
+        queries: Query embeddings (q, dimension)
+        configs: Configurations to evaluate
+        k: Number of neighbours compared
+
+    Returns:
+        One result dict per configuration (flat baseline first)
+    """
+    embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+    queries = np.ascontiguousarray(queries, dtype='float32')
+    dimension = embeddings.shape[1]
+    k = min(k, len(embeddings))
+
+    def measure(config: IndexConfig) -> Dict:
+        build_start = time.time()
+        index = build_index(embeddings, dimension, config.index_type, config)
+        build_seconds = time.time() - build_start
+
+        search_start = time.time()
+        _, indices = index.search(queries, k)
+        latency_ms = (time.time() - search_start) * 1000 / max(len(queries), 1)
+
+        return {
+            'index_type': config.index_type,
+            'params': config.to_dict(),
+            'indices': indices,
+            'build_seconds': round(build_seconds, 3),
+            'latency_ms': round(latency_ms, 4)
+        }
+
+    baseline = measure(IndexConfig(index_type="flat"))
+    truth = baseline['indices']
+
+    results = []
+    for result in [baseline] + [measure(config) for config in configs]:
+        hits = sum(
+            len(set(found) & set(expected))
+            for found, expected in zip(result.pop('indices'), truth)
+        )
+        result['recall_at_k'] = round(hits / (len(truth) * k), 4) if len(truth) else 0.0
+        results.append(result)
+
+    return results
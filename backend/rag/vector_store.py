@@ -2,18 +2,55 @@
 Vector Store: Manages embeddings and similarity search
 Uses FAISS for efficient vector similarity search
 
+On-disk layout (all share the index_path prefix):
+- .faiss: FAISS index
+- .npy: float32 embedding matrix, memory-mapped on load. Added rows are
+  appended to the file in place and save() rewrites only its header, so
+  growing the store never copies the existing matrix.
+- .chunks.db: SQLite chunk text and metadata, read lazily
+- .bm25: lexical inverted index for exact-token queries
+- .manifest.json: embedding model, dimension, chunk count and index settings
+- .lock: cross-process write lock (see exclusive_write)
+
+The manifest is written last and its chunk_count is the commit point: a save
+that crashed part way leaves chunk rows (and embedding rows) past it, which
+load() ignores, and an index that doesn't match it is rebuilt from the
+embeddings, so the store can still be loaded and written after a crash.
+
+Several processes (API workers, job workers, ingestion scripts) may write
+the same store. Each write runs inside exclusive_write(), which takes a
+file lock and first reloads the store if another process saved it, so no
+process saves over changes it has not seen.
+
+The index type (flat, ivf_flat, ivf_pq, hnsw or auto) is set per store or
+via the VECTOR_INDEX_TYPE environment variable; see vector_index.py.
+
+Stores saved in the legacy .faiss + .pkl layout are migrated on load.
+
 Dependencies:
 - anthropic: For generating embeddings via Claude (or use voyage-ai for dedicated embeddings)
 - faiss-cpu or faiss-gpu: Vector similarity search
 - numpy: Array operations
 """
 
+import io
 import os
+import json
+import time
 import pickle
+import inspect
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
 import numpy as np
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Iterator, Tuple, Any, Optional
 from pathlib import Path
-from sentence_transformers import SentenceTransformer
+
+try:
+    import fcntl
+except ImportError:  # Windows: the write lock only covers this process
+    fcntl = None
 
 try:
     import faiss
@@ -26,6 +63,57 @@ try:
 except ImportError:
     Anthropic = None
 
+try:
+    from .chunk_store import ChunkStore, content_hash
+    from .lexical_index import LexicalIndex
+    from .vector_index import (
+        IndexConfig, build_index, apply_search_params, index_type_of,
+        resolve_index_type, benchmark_index_configs
+    )
+except ImportError:
+    from rag.chunk_store import ChunkStore, content_hash
+    from rag.lexical_index import LexicalIndex
+    from rag.vector_index import (
+        IndexConfig, build_index, apply_search_params, index_type_of,
+        resolve_index_type, benchmark_index_configs
+    )
+
+
+MANIFEST_FORMAT_VERSION = 2
+
+# sentence-transformers pulls in torch/transformers (seconds of import time),
+# so it is imported when the first embedding model is loaded
+SentenceTransformer = None
+
+# Embedding models are large; every store in the process shares one per name
+_embedding_models: Dict[str, Any] = {}
+_embedding_models_lock = threading.Lock()
+
+
+def get_embedding_model(model_name: str):
+    """
+    Get the process-wide SentenceTransformer for a model name
+    
+    Args:
+        model_name: Sentence-transformers model name
+        
+    Returns:
+        Shared SentenceTransformer instance
+    """
+    global SentenceTransformer
+
+    with _embedding_models_lock:
+        model = _embedding_models.get(model_name)
+        if model is None:
+            if SentenceTransformer is None:
+                from sentence_transformers import SentenceTransformer
+            print(f"Loading embedding model: {model_name}...")
+            model = _embedding_models[model_name] = SentenceTransformer(model_name)
+        return model
+
+# Retrain IVF indexes once the corpus has grown this much since training
+RETRAIN_GROWTH_FACTOR = 4
+
 
 class VectorStore:
     """
@@ -41,7 +129,12 @@ class VectorStore:
         api_key: str = None,
         embedding_dimension: int = 384,  # all-MiniLM-L6-v2 dimension
         index_path: str = "data/vector_db/faiss_index",
-        embedding_model: str = "all-MiniLM-L6-v2"
+        embedding_model: str = "all-MiniLM-L6-v2",
+        index_type: Optional[str] = None,
+        index_params: Optional[Dict] = None,
+        embedding_batch_size: Optional[int] = None,
+        encode_workers: Optional[int] = None,
+        query_cache_size: Optional[int] = None
     ):
         """
         Initialize vector store
@@ -51,76 +144,321 @@ class VectorStore:
             embedding_dimension: Dimension of embedding vectors (384 for MiniLM, 768 for mpnet)
             index_path: Path to save/load FAISS index
             embedding_model: Sentence-transformers model name
+            index_type: flat, ivf_flat, ivf_pq, hnsw or auto (default VECTOR_INDEX_TYPE env, auto)
+            index_params: Optional IndexConfig overrides (nlist, nprobe, pq_m, hnsw_m, ef_search, ...)
+            embedding_batch_size: Texts per encode batch (default EMBEDDING_BATCH_SIZE env, 256)
+            encode_workers: Encoding processes for large ingests (default EMBEDDING_WORKERS env, 1)
+            query_cache_size: Query embeddings kept in the LRU cache (default QUERY_EMBEDDING_CACHE_SIZE env, 1024)
         """
         if not faiss:
             raise ImportError("faiss not installed. Install with: pip install faiss-cpu")
         
-        # Initialize sentence-transformers model for embeddings
-        print(f"Loading embedding model: {embedding_model}...")
-        self.embedding_model = SentenceTransformer(embedding_model)
+        # Initialize sentence-transformers model for embeddings (shared per process)
+        self.embedding_model = get_embedding_model(embedding_model)
+        self.embedding_model_name = embedding_model
         self.embedding_dimension = embedding_dimension
+        self.embedding_batch_size = embedding_batch_size or int(os.getenv("EMBEDDING_BATCH_SIZE", 256))
+        self.encode_workers = encode_workers or int(os.getenv("EMBEDDING_WORKERS", 1))
         self.index_path = Path(index_path)
         
-        # Initialize FAISS index
+        # Guards the index, embeddings, chunks and lexical index. Searches hold
+        # it only for the FAISS lookup; embedding runs outside it.
+        self._lock = threading.RLock()
+        # Serializes exclusive_write() between threads of this process
+        self._write_lock = threading.Lock()
+        # Bumped on every change so readers can tell their view is stale
+        self.generation = 0
+        # mtime of the manifest this store last loaded or saved
+        self.manifest_mtime: Optional[float] = None
+        # (st_dev, st_ino) of the .npy file self.embeddings maps, for in-place appends
+        self._embeddings_file_id: Optional[Tuple[int, int]] = None
+        
+        # LRU cache of query text -> embedding (queries repeat across agents)
+        if query_cache_size is None:
+            query_cache_size = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", 1024))
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        
+        # Initialize FAISS index (starts flat; promoted as the corpus grows)
+        self.index_type = index_type or os.getenv("VECTOR_INDEX_TYPE", "auto")
+        self.index_config = IndexConfig.from_dict(index_params)
+        self._index_params_explicit = index_params is not None
+        self.trained_on = 0  # Vectors the current IVF index was trained on
         self.index = faiss.IndexFlatL2(embedding_dimension)  # L2 distance
-        self.chunks = []  # Store original chunks
-        self.metadata = []  # Store metadata
+        self.chunks = ChunkStore()  # Chunk text and metadata, in-memory until first save
+        # Raw embeddings, row-aligned with chunks and the FAISS index.
+        # Kept so deletes can rebuild the index without re-encoding.
+        self.embeddings = np.empty((0, embedding_dimension), dtype='float32')
+        # BM25 index over the same rows, for exact citations and codes
+        self.lexical_index = LexicalIndex()
         
         # Create directory if needed
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
         
         print(f"✓ Embedding model loaded (dimension: {embedding_dimension})")
     
-    def add_documents(self, chunks: List) -> None:
+    def add_documents(self, chunks: List) -> Dict:
         """
         Add document chunks to vector store
         
+        Chunks whose exact text is already stored (or repeated within this
+        call) reuse the existing embedding instead of being encoded again.
+        
+        Args:
+            chunks: List of DocumentChunk objects
+            
+        Returns:
+            Dict with ingestion statistics (added, embedded, reused, seconds, chunks_per_sec)
+        """
+        start_time = time.time()
+        hashes, embeddings_array, embedded = self.embed_chunks(chunks)
+        self.add_embedded(chunks, hashes, embeddings_array)
+        
+        elapsed = time.time() - start_time
+        stats = {
+            "added": len(chunks),
+            "embedded": embedded,
+            "reused": len(chunks) - embedded,
+            "seconds": round(elapsed, 3),
+            "chunks_per_sec": round(len(chunks) / elapsed, 1) if elapsed > 0 else float(len(chunks))
+        }
+        
+        print(f"✅ Added {len(chunks)} chunks to vector store "
+              f"({stats['chunks_per_sec']} chunks/sec)")
+        return stats
+    
+    def embed_chunks(self, chunks: List) -> Tuple[List[str], np.ndarray, int]:
+        """
+        Embed chunks without adding them, reusing stored embeddings of identical text
+        
+        Lets writers encode before taking the write lock (see exclusive_write)
+        and add the result with add_embedded once they hold it.
+        
         Args:
             chunks: List of DocumentChunk objects
+            
+        Returns:
+            Tuple of (content hashes, embedding rows, number of texts encoded)
         """
-        print(f"Generating embeddings for {len(chunks)} chunks...")
+        # Work out which texts actually need encoding, copying the vectors of
+        # already-stored texts now in case a delete shifts positions meanwhile
+        hashes = [content_hash(c.content) for c in chunks]
+        embeddings_array = np.empty((len(chunks), self.embedding_dimension), dtype='float32')
+        with self._lock:
+            existing = self.chunks.find_hashes(hashes)
+            for i, digest in enumerate(hashes):
+                if digest in existing:
+                    embeddings_array[i] = self.embeddings[existing[digest]]
+        
+        to_encode: Dict[str, str] = {}
+        for digest, chunk in zip(hashes, chunks):
+            if digest not in existing and digest not in to_encode:
+                to_encode[digest] = chunk.content
+        
+        # Encode without holding the lock so searches keep running
+        print(f"Generating embeddings for {len(to_encode)} chunks "
+              f"({len(chunks) - len(to_encode)} reused)...")
+        new_vectors = self._generate_embeddings(list(to_encode.values()), show_progress=True)
+        
+        # Fill in the embedding rows of newly encoded chunks
+        new_row = {digest: row for row, digest in enumerate(to_encode)}
+        for i, digest in enumerate(hashes):
+            if digest in new_row:
+                embeddings_array[i] = new_vectors[new_row[digest]]
+        
+        return hashes, embeddings_array, len(to_encode)
+    
+    def add_embedded(self, chunks: List, hashes: List[str], embeddings_array: np.ndarray) -> None:
+        """
+        Add chunks whose embeddings were computed by embed_chunks
         
-        # Generate embeddings in batches
-        batch_size = 10
-        embeddings = []
+        Call inside exclusive_write() when other processes may write the
+        store: the rows are appended to the saved .npy file in place.
         
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i + batch_size]
-            batch_embeddings = self._generate_embeddings([c.content for c in batch])
-            embeddings.extend(batch_embeddings)
+        Args:
+            chunks: List of DocumentChunk objects
+            hashes: Content hashes from embed_chunks
+            embeddings_array: Embedding rows from embed_chunks
+        """
+        with self._lock:
+            # Add to FAISS index
+            self._append_embeddings(embeddings_array)
+            self._update_index(embeddings_array)
             
-            print(f"  Processed {min(i + batch_size, len(chunks))}/{len(chunks)} chunks")
+            # Store chunks and metadata
+            self.chunks.extend(chunks, hashes)
+            self.lexical_index.add([c.content for c in chunks])
+            self.generation += 1
+    
+    def _append_embeddings(self, rows: np.ndarray) -> None:
+        """
+        Append rows to self.embeddings
+        
+        When self.embeddings maps the saved .npy file, the rows are written
+        after the mapped ones and the file is mapped again; the header's row
+        count is updated by the next save(). Otherwise (a store not saved
+        yet, or changed by a delete) the in-memory matrix is extended.
+        
+        Args:
+            rows: Embedding rows to append
+        """
+        embeddings_file = self._path('.npy')
+        if not len(rows) or not self._embeddings_mapped_from(embeddings_file):
+            self.embeddings = np.concatenate([self.embeddings, rows])
+            return
+        
+        count, offset = len(self.embeddings), self.embeddings.offset
+        with open(embeddings_file, 'r+b') as f:
+            if self._file_id(f) != self._embeddings_file_id:
+                # Replaced by another writer since it was mapped
+                self.embeddings = np.concatenate([self.embeddings, rows])
+                return
+            f.seek(offset + count * self.embedding_dimension * 4)
+            f.write(np.ascontiguousarray(rows, dtype='float32').tobytes())
+        
+        self.embeddings = np.memmap(
+            embeddings_file, dtype='float32', mode='r', offset=offset,
+            shape=(count + len(rows), self.embedding_dimension)
+        )
+    
+    @staticmethod
+    def _file_id(f) -> Tuple[int, int]:
+        """(st_dev, st_ino) of an open file"""
+        stat = os.fstat(f.fileno())
+        return stat.st_dev, stat.st_ino
+    
+    def _map_embeddings(self, embeddings_file: str) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Memory-map a saved .npy file, returning it with its file id"""
+        with open(embeddings_file, 'rb') as f:
+            file_id = self._file_id(f)
+        return np.load(embeddings_file, mmap_mode='r'), file_id
+    
+    def _write_embeddings_header(self, embeddings_file: str) -> bool:
+        """
+        Record the mapped matrix's row count in the .npy header, in place
+        
+        Returns:
+            False if the new header doesn't fit where the old one was
+        """
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(header, {
+            'descr': np.lib.format.dtype_to_descr(np.dtype('float32')),
+            'fortran_order': False,
+            'shape': tuple(self.embeddings.shape)
+        })
+        if len(header.getvalue()) != self.embeddings.offset:
+            return False
+        with open(embeddings_file, 'r+b') as f:
+            f.write(header.getvalue())
+        return True
+    
+    def _update_index(self, new_embeddings: np.ndarray) -> None:
+        """
+        Add newly appended embeddings to the index, promoting or retraining it when needed
         
-        # Convert to numpy array
-        embeddings_array = np.array(embeddings).astype('float32')
+        Args:
+            new_embeddings: Rows just appended to self.embeddings
+        """
+        target = resolve_index_type(self.index_type, len(self.embeddings), self.index_config)
+        current = index_type_of(self.index)
+        stale_training = (
+            current.startswith("ivf")
+            and len(self.embeddings) > RETRAIN_GROWTH_FACTOR * self.trained_on
+        )
         
-        # Add to FAISS index
-        self.index.add(embeddings_array)
+        if target != current or stale_training:
+            self._rebuild_index(retrain=True)
+        else:
+            self.index.add(new_embeddings)
+    
+    def _rebuild_index(self, retrain: bool = False) -> None:
+        """
+        Rebuild the index from self.embeddings
         
-        # Store chunks and metadata
-        self.chunks.extend(chunks)
-        self.metadata.extend([c.metadata for c in chunks])
+        A trained IVF index of the right type keeps its centroids and is only
+        refilled, unless retrain is set.
         
-        print(f"✅ Added {len(chunks)} chunks to vector store")
+        Args:
+            retrain: Build (and train) a fresh index even if the current one could be reused
+        """
+        count = len(self.embeddings)
+        target = resolve_index_type(self.index_type, count, self.index_config)
+        
+        if not retrain and target.startswith("ivf") and index_type_of(self.index) == target:
+            self.index.reset()
+            if count:
+                self.index.add(np.ascontiguousarray(self.embeddings))
+            return
+        
+        if target != "flat":
+            print(f"Building {target} index over {count} vectors...")
+        self.index = build_index(self.embeddings, self.embedding_dimension, target, self.index_config)
+        self.trained_on = count if target.startswith("ivf") else 0
     
-    def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def _generate_embeddings(self, texts: List[str], show_progress: bool = False) -> np.ndarray:
         """
         Generate embeddings for texts using sentence-transformers
         
+        Large inputs are spread over a multi-process pool when
+        encode_workers > 1.
+        
         Args:
             texts: List of text strings
+            show_progress: Print progress per batch
             
         Returns:
-            List of embedding vectors
+            Contiguous float32 array of shape (len(texts), embedding_dimension)
         """
-        # Use sentence-transformers to generate embeddings
-        embeddings = self.embedding_model.encode(
-            texts,
-            convert_to_numpy=True,
-            show_progress_bar=False
-        )
+        if not texts:
+            return np.empty((0, self.embedding_dimension), dtype='float32')
+        
+        if self.encode_workers > 1 and len(texts) >= self.embedding_batch_size * self.encode_workers:
+            embeddings = self._encode_multi_process(texts)
+        else:
+            embeddings = np.empty((len(texts), self.embedding_dimension), dtype='float32')
+            for i in range(0, len(texts), self.embedding_batch_size):
+                batch = texts[i:i + self.embedding_batch_size]
+                embeddings[i:i + len(batch)] = self.embedding_model.encode(
+                    batch,
+                    batch_size=self.embedding_batch_size,
+                    convert_to_numpy=True,
+                    show_progress_bar=False
+                )
+                if show_progress:
+                    print(f"  Processed {i + len(batch)}/{len(texts)} chunks")
+        
+        return np.ascontiguousarray(embeddings, dtype='float32')
+    
+    def _encode_multi_process(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts on a pool of worker processes
+        
+        Uses one process per GPU when CUDA is available, otherwise
+        encode_workers CPU processes.
+        
+        Args:
+            texts: List of text strings
+            
+        Returns:
+            Embedding array
+        """
+        import torch  # installed with sentence-transformers; already loaded by the model
+
+        target_devices = None
+        if not torch.cuda.is_available():
+            target_devices = ['cpu'] * self.encode_workers
         
-        return embeddings.tolist()
+        print(f"  Encoding on {len(target_devices) if target_devices else 'all GPU'} worker processes...")
+        pool = self.embedding_model.start_multi_process_pool(target_devices=target_devices)
+        try:
+            # sentence-transformers >= 3 takes the pool in encode(); older releases
+            # only provide encode_multi_process()
+            if 'pool' in inspect.signature(self.embedding_model.encode).parameters:
+                return self.embedding_model.encode(texts, pool=pool, batch_size=self.embedding_batch_size)
+            return self.embedding_model.encode_multi_process(texts, pool, batch_size=self.embedding_batch_size)
+        finally:
+            self.embedding_model.stop_multi_process_pool(pool)
     
     def search(
         self,
@@ -139,59 +477,334 @@ class VectorStore:
         Returns:
             List of (chunk_dict, score) tuples
         """
-        # Generate query embedding
-        query_embedding = self._generate_embeddings([query])[0]
-        query_vector = np.array([query_embedding]).astype('float32')
+        return self.search_many([query], k=k, score_threshold=score_threshold)[0]
+    
+    def search_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        score_threshold: float = None
+    ) -> List[List[Tuple[Dict, float]]]:
+        """
+        Search for several queries at once
+        
+        Queries are embedded in one batch (cached ones are skipped) and
+        searched with a single FAISS call.
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            score_threshold: Optional threshold for similarity scores
+            
+        Returns:
+            One list of (chunk_dict, score) tuples per query, in query order
+        """
+        if not queries:
+            return []
         
-        # Search in FAISS
-        distances, indices = self.index.search(query_vector, k)
+        # Generate query embeddings
+        query_vectors = self._embed_queries(queries)
+        
+        with self._lock:
+            # Search in FAISS
+            distances, indices = self.index.search(query_vectors, k)
+            
+            # Keep valid hits within the threshold, then fetch only their text
+            hits_per_query = [
+                [
+                    (int(idx), float(distance))
+                    for distance, idx in zip(row_distances, row_indices)
+                    if 0 <= idx < len(self.chunks)
+                    and (score_threshold is None or float(distance) <= score_threshold)
+                ]
+                for row_distances, row_indices in zip(distances, indices)
+            ]
+            positions = sorted({idx for hits in hits_per_query for idx, _ in hits})
+            chunk_by_position = dict(zip(positions, self.chunks.get_many(positions)))
         
         # Prepare results
-        results = []
-        for distance, idx in zip(distances[0], indices[0]):
-            if idx < len(self.chunks):  # Valid index
-                score = float(distance)
-                
-                # Apply score threshold if provided
-                if score_threshold is None or score <= score_threshold:
-                    chunk = self.chunks[idx]
-                    results.append((
-                        {
-                            'content': chunk.content,
-                            'metadata': chunk.metadata,
-                            'chunk_id': chunk.chunk_id,
-                            'score': score
-                        },
-                        score
-                    ))
-        
-        return results
+        all_results = []
+        for hits in hits_per_query:
+            results = []
+            for idx, score in hits:
+                chunk = chunk_by_position[idx]
+                results.append((
+                    {
+                        'content': chunk.content,
+                        'metadata': chunk.metadata,
+                        'chunk_id': chunk.chunk_id,
+                        'score': score
+                    },
+                    score
+                ))
+            all_results.append(results)
+        
+        return all_results
+    
+    def lexical_search(self, query: str, k: int = 5) -> List[Tuple[Dict, float]]:
+        """
+        Search the BM25 index for exact terms (citations, codes, CLINs)
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            
+        Returns:
+            List of (chunk_dict, score) tuples; score is BM25 (higher is better)
+        """
+        with self._lock:
+            hits = self.lexical_index.search(query, k=k)
+            chunks = self.chunks.get_many([idx for idx, _ in hits])
+        
+        return [
+            (
+                {
+                    'content': chunk.content,
+                    'metadata': chunk.metadata,
+                    'chunk_id': chunk.chunk_id,
+                    'score': score
+                },
+                score
+            )
+            for chunk, (_, score) in zip(chunks, hits)
+        ]
+    
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed queries through the LRU query-embedding cache
+        
+        Args:
+            queries: Query texts
+            
+        Returns:
+            float32 array of shape (len(queries), embedding_dimension)
+        """
+        vectors = np.empty((len(queries), self.embedding_dimension), dtype='float32')
+        missing: Dict[str, List[int]] = {}
+        
+        with self._query_cache_lock:
+            for i, query in enumerate(queries):
+                cached = self._query_cache.get(query)
+                if cached is not None:
+                    self._query_cache.move_to_end(query)
+                    vectors[i] = cached
+                else:
+                    missing.setdefault(query, []).append(i)
+        
+        if missing:
+            encoded = self._generate_embeddings(list(missing))
+            with self._query_cache_lock:
+                for (query, rows), vector in zip(missing.items(), encoded):
+                    vectors[rows] = vector
+                    if self.query_cache_size > 0:
+                        self._query_cache[query] = vector
+                        self._query_cache.move_to_end(query)
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+        
+        return vectors
     
+    def _path(self, suffix: str) -> str:
+        """Path of one of the store's files"""
+        return str(self.index_path) + suffix
+
     def save(self) -> None:
-        """Save index and metadata to disk"""
-        # Save FAISS index
-        index_file = str(self.index_path) + '.faiss'
-        faiss.write_index(self.index, index_file)
-        
-        # Save chunks and metadata
-        data_file = str(self.index_path) + '.pkl'
-        with open(data_file, 'wb') as f:
-            pickle.dump({
-                'chunks': self.chunks,
-                'metadata': self.metadata
-            }, f)
-        
-        print(f"✅ Vector store saved to {self.index_path}")
+        """Save index, embeddings, chunks and manifest to disk"""
+        with self._lock:
+            # Chunk table first, so the index never references missing rows
+            chunk_file = self._path('.chunks.db')
+            if self.chunks.db_path == chunk_file:
+                self.chunks.commit()
+            else:
+                self.chunks.save_as(chunk_file)
+            
+            # Save FAISS index
+            index_file = self._path('.faiss')
+            faiss.write_index(self.index, index_file + '.tmp')
+            os.replace(index_file + '.tmp', index_file)
+            self.lexical_index.save(self._path('.bm25'))
+            
+            # Rows appended in place only need the header updated. Otherwise save
+            # the matrix, then re-map it so the in-memory copy is released
+            # (written via rename so an existing memmap of the old file stays valid).
+            embeddings_file = self._path('.npy')
+            if not (self._embeddings_mapped_from(embeddings_file)
+                    and self._write_embeddings_header(embeddings_file)):
+                with open(embeddings_file + '.tmp', 'wb') as f:
+                    np.save(f, np.ascontiguousarray(self.embeddings, dtype='float32'))
+                os.replace(embeddings_file + '.tmp', embeddings_file)
+                self.embeddings, self._embeddings_file_id = self._map_embeddings(embeddings_file)
+            
+            # Manifest last: it marks the new-format files as complete
+            manifest_file = self._path('.manifest.json')
+            with open(manifest_file + '.tmp', 'w') as f:
+                json.dump({
+                    'format_version': MANIFEST_FORMAT_VERSION,
+                    'embedding_model': self.embedding_model_name,
+                    'embedding_dimension': self.embedding_dimension,
+                    'chunk_count': len(self.chunks),
+                    'index_type': index_type_of(self.index),
+                    'index_params': self.index_config.to_dict(),
+                    'trained_on': self.trained_on,
+                    'updated_at': datetime.now().isoformat()
+                }, f, indent=2)
+            os.replace(manifest_file + '.tmp', manifest_file)
+            self.manifest_mtime = os.path.getmtime(manifest_file)
+            
+            print(f"✅ Vector store saved to {self.index_path}")
+
+    def changed_on_disk(self) -> bool:
+        """
+        Check whether another process saved the store since this one last loaded or saved it
+        
+        Returns:
+            True if the manifest on disk is not the one this store last saw
+        """
+        try:
+            disk_mtime = os.path.getmtime(self._path('.manifest.json'))
+        except OSError:
+            return False
+        return self.manifest_mtime is None or disk_mtime != self.manifest_mtime
+
+    @contextmanager
+    def exclusive_write(self) -> Iterator["VectorStore"]:
+        """
+        Hold the store's cross-process write lock
+        
+        The store is reloaded first if another process saved it, so changes
+        made and saved inside the block build on the latest files instead of
+        overwriting them. Writers in other processes wait; readers don't.
+        
+        Usage:
+            with store.exclusive_write():
+                store.add_embedded(chunks, hashes, embeddings)
+                store.save()
+        
+        Raises:
+            RuntimeError: If the changed store could not be reloaded
+        """
+        with self._write_lock, open(self._path('.lock'), 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if self.changed_on_disk():
+                    print(f"Reloading vector store {self.index_path} (changed by another process)...")
+                    if not self.load():
+                        raise RuntimeError(f"Could not reload vector store {self.index_path} before writing")
+                yield self
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _embeddings_mapped_from(self, path: str) -> bool:
+        """Check whether self.embeddings is an unmodified memmap of path"""
+        return (
+            isinstance(self.embeddings, np.memmap)
+            and self.embeddings.filename is not None
+            and os.path.abspath(self.embeddings.filename) == os.path.abspath(path)
+        )
     
     def load(self) -> bool:
         """
-        Load index and metadata from disk
+        Load index, embeddings and chunk store from disk
+        
+        Chunk text is not read until it is needed.
+        
+        Returns:
+            True if loaded successfully, False otherwise
+        """
+        with self._lock:
+            manifest_file = self._path('.manifest.json')
+            
+            if not os.path.exists(manifest_file):
+                return self._load_legacy()
+            
+            try:
+                with open(manifest_file) as f:
+                    manifest = json.load(f)
+            
+                if manifest.get('embedding_dimension') != self.embedding_dimension:
+                    print(f"❌ Vector store dimension {manifest.get('embedding_dimension')} "
+                          f"does not match embedding dimension {self.embedding_dimension}")
+                    return False
+                if manifest.get('embedding_model') != self.embedding_model_name:
+                    print(f"⚠️  Vector store was built with {manifest.get('embedding_model')}, "
+                          f"loading with {self.embedding_model_name}")
+            
+                # Load FAISS index
+                index = faiss.read_index(self._path('.faiss'))
+                embeddings, embeddings_file_id = self._map_embeddings(self._path('.npy'))
+                
+                # Rows past the manifest's count are from a save that didn't finish
+                count = manifest.get('chunk_count', index.ntotal)
+                chunks = ChunkStore(self._path('.chunks.db'), limit=count)
+                embeddings = embeddings[:count]
+            
+                if not (len(embeddings) == len(chunks) == count):
+                    chunks.close()
+                    print(f"❌ Vector store files are out of sync (manifest: {count}, index: {index.ntotal}, "
+                          f"embeddings: {len(embeddings)}, chunks: {len(chunks)})")
+                    return False
+            
+                self.index = index
+                self.embeddings = embeddings
+                self._embeddings_file_id = embeddings_file_id
+                self.chunks = chunks
+                self.lexical_index = self._load_lexical_index()
+                self.trained_on = manifest.get('trained_on', 0)
+                if not self._index_params_explicit:
+                    self.index_config = IndexConfig.from_dict(manifest.get('index_params'))
+                apply_search_params(self.index, self.index_config)
+            
+                # Rebuild an index left from an unfinished save, or whose type
+                # the configuration changed since the last save
+                if index.ntotal != count:
+                    print(f"⚠️  Index holds {index.ntotal} vectors, manifest {count}: rebuilding from embeddings")
+                    self._rebuild_index(retrain=True)
+                elif resolve_index_type(self.index_type, len(self.embeddings), self.index_config) != index_type_of(self.index):
+                    self._rebuild_index(retrain=True)
+            
+                self.manifest_mtime = os.path.getmtime(manifest_file)
+                self.generation += 1
+                print(f"✅ Loaded vector store with {len(self.chunks)} chunks")
+                return True
+            
+            except Exception as e:
+                print(f"❌ Error loading vector store: {e}")
+                return False
+
+    def _load_lexical_index(self) -> LexicalIndex:
+        """
+        Load the BM25 index, building it from the chunk store if missing or stale
+        
+        Returns:
+            LexicalIndex aligned with self.chunks
+        """
+        lexical_file = self._path('.bm25')
+        
+        if os.path.exists(lexical_file):
+            try:
+                lexical_index = LexicalIndex.load(lexical_file)
+                if len(lexical_index) == len(self.chunks):
+                    return lexical_index
+            except Exception as e:
+                print(f"⚠️  Could not read lexical index: {e}")
+        
+        print(f"Building lexical index for {len(self.chunks)} chunks...")
+        lexical_index = LexicalIndex()
+        lexical_index.add([chunk.content for chunk in self.chunks])
+        lexical_index.save(lexical_file)
+        return lexical_index
+
+    def _load_legacy(self) -> bool:
+        """
+        Load a store saved as .faiss + .pkl and migrate it to the current layout
         
         Returns:
             True if loaded successfully, False otherwise
         """
-        index_file = str(self.index_path) + '.faiss'
-        data_file = str(self.index_path) + '.pkl'
+        index_file = self._path('.faiss')
+        data_file = self._path('.pkl')
         
         if not os.path.exists(index_file) or not os.path.exists(data_file):
             return False
@@ -200,11 +813,20 @@ class VectorStore:
             # Load FAISS index
             self.index = faiss.read_index(index_file)
             
-            # Load chunks and metadata
+            # Load chunks
             with open(data_file, 'rb') as f:
                 data = pickle.load(f)
-                self.chunks = data['chunks']
-                self.metadata = data['metadata']
+            self.chunks = ChunkStore()
+            self.chunks.extend(data['chunks'])
+            self.lexical_index = LexicalIndex()
+            self.lexical_index.add([c.content for c in data['chunks']])
+
+            # Recover raw embeddings from the flat index (exact for IndexFlatL2)
+            self.embeddings = self.index.reconstruct_n(0, self.index.ntotal).astype('float32')
+            
+            print(f"Migrating legacy vector store at {self.index_path}...")
+            self.save()
+            self.generation += 1
             
             print(f"✅ Loaded vector store with {len(self.chunks)} chunks")
             return True
@@ -213,13 +835,60 @@ class VectorStore:
             print(f"❌ Error loading vector store: {e}")
             return False
 
+    def evaluate_index_configs(
+        self,
+        configs: Optional[List[IndexConfig]] = None,
+        queries: Optional[List[str]] = None,
+        num_queries: int = 200,
+        k: int = 10
+    ) -> List[Dict]:
+        """
+        Report recall@k and latency of index configurations against exact flat search
+        
+        Args:
+            configs: Configurations to compare (defaults to a standard IVF/HNSW sweep)
+            queries: Query texts; defaults to a sample of stored chunk embeddings
+            num_queries: Number of sampled queries when queries is not given
+            k: Number of neighbours compared
+            
+        Returns:
+            List of result dicts (index_type, params, recall_at_k, latency_ms, build_seconds)
+        """
+        if not len(self.embeddings):
+            return []
+        
+        if configs is None:
+            configs = [
+                IndexConfig(index_type="hnsw", ef_search=32),
+                IndexConfig(index_type="hnsw", ef_search=128),
+                IndexConfig(index_type="ivf_flat", nprobe=8),
+                IndexConfig(index_type="ivf_flat", nprobe=32),
+                IndexConfig(index_type="ivf_pq", nprobe=16),
+            ]
+        # Skip configurations the corpus is too small to train
+        configs = [
+            c for c in configs
+            if resolve_index_type(c.index_type, len(self.embeddings), c) == c.index_type
+        ]
+        
+        if queries:
+            query_vectors = self._generate_embeddings(queries)
+        else:
+            rng = np.random.default_rng(0)
+            sample = rng.choice(len(self.embeddings), size=min(num_queries, len(self.embeddings)), replace=False)
+            query_vectors = np.asarray(self.embeddings[np.sort(sample)], dtype='float32')
+        
+        return benchmark_index_configs(self.embeddings, query_vectors, configs, k=k)
+
     def delete_by_source(self, source_filename: str) -> Dict:
         """
         Delete all chunks associated with a specific source document
         
-        FAISS doesn't support direct deletion, so we need to:
+        FAISS flat indexes don't support cheap in-place deletion, so we:
         1. Filter out chunks from the document
-        2. Rebuild the index with remaining chunks
+        2. Rebuild the index from the stored embeddings of the remaining chunks
+        
+        No text is re-encoded, so the cost is one copy of the remaining vectors.
         
         Args:
             source_filename: The filename/source identifier to delete
@@ -227,69 +896,76 @@ class VectorStore:
         Returns:
             Dict with deletion results (success, deleted_chunks count)
         """
-        # Find indices of chunks to keep (those NOT from this source)
-        chunks_to_keep = []
-        metadata_to_keep = []
-        deleted_count = 0
-        
-        for i, chunk in enumerate(self.chunks):
-            # Check multiple metadata fields where the filename might be stored
-            chunk_source = chunk.metadata.get('source', '')
-            chunk_file_path = chunk.metadata.get('file_path', '')
-            original_filename = chunk.metadata.get('original_filename', '')
-            
-            # Check if this chunk belongs to the document being deleted
-            is_match = (
-                source_filename in chunk_source or
-                source_filename in chunk_file_path or
-                source_filename == original_filename or
-                chunk_source.endswith(source_filename) or
-                chunk_file_path.endswith(source_filename)
-            )
-            
-            if is_match:
-                deleted_count += 1
-            else:
-                chunks_to_keep.append(chunk)
-                metadata_to_keep.append(self.metadata[i])
-        
-        if deleted_count == 0:
-            return {
-                "success": False,
-                "deleted_chunks": 0,
-                "message": f"No chunks found for source: {source_filename}"
-            }
-        
-        # Rebuild the index with remaining chunks
-        print(f"Rebuilding index after deleting {deleted_count} chunks...")
+        result = self._delete_matching(
+            lambda metadata: self._metadata_matches_source(metadata, source_filename)
+        )
+        if not result["success"]:
+            result["message"] = f"No chunks found for source: {source_filename}"
+        return result
+
+    def delete_by_file_paths(self, file_paths: List[str]) -> Dict:
+        """
+        Delete the chunks of several files in one index rebuild
         
-        # Reset the index
-        self.index = faiss.IndexFlatL2(self.embedding_dimension)
+        Unlike delete_by_source, matches the chunk 'file_path' metadata exactly.
         
-        if chunks_to_keep:
-            # Re-generate embeddings and add to index
-            batch_size = 10
-            embeddings = []
+        Args:
+            file_paths: File paths as recorded in chunk metadata
             
-            for i in range(0, len(chunks_to_keep), batch_size):
-                batch = chunks_to_keep[i:i + batch_size]
-                batch_embeddings = self._generate_embeddings([c.content for c in batch])
-                embeddings.extend(batch_embeddings)
+        Returns:
+            Dict with deletion results (success, deleted_chunks count)
+        """
+        targets = set(file_paths)
+        if not targets:
+            return {"success": False, "deleted_chunks": 0}
+        return self._delete_matching(lambda metadata: metadata.get('file_path') in targets)
+
+    def _delete_matching(self, matches) -> Dict:
+        """Delete every chunk whose metadata matches, rebuilding the index once"""
+        with self._lock:
+            keep_mask = np.ones(len(self.chunks), dtype=bool)
+            for position, metadata in self.chunks.iter_metadata():
+                if matches(metadata):
+                    keep_mask[position] = False
+            deleted_count = int(len(keep_mask) - keep_mask.sum())
             
-            embeddings_array = np.array(embeddings).astype('float32')
-            self.index.add(embeddings_array)
-        
-        # Update chunks and metadata
-        self.chunks = chunks_to_keep
-        self.metadata = metadata_to_keep
-        
-        print(f"✅ Deleted {deleted_count} chunks, {len(self.chunks)} remaining")
-        
-        return {
-            "success": True,
-            "deleted_chunks": deleted_count,
-            "remaining_chunks": len(self.chunks)
-        }
+            if deleted_count == 0:
+                return {"success": False, "deleted_chunks": 0}
+            
+            print(f"Rebuilding index after deleting {deleted_count} chunks...")
+            
+            # Rebuild the index from the kept embeddings
+            self.embeddings = np.ascontiguousarray(self.embeddings[keep_mask])
+            self._rebuild_index()
+            
+            # Drop the deleted rows from the chunk store and lexical index
+            self.chunks.keep(keep_mask)
+            self.lexical_index.keep(keep_mask)
+            self.generation += 1
+            
+            print(f"✅ Deleted {deleted_count} chunks, {len(self.chunks)} remaining")
+            
+            return {
+                "success": True,
+                "deleted_chunks": deleted_count,
+                "remaining_chunks": len(self.chunks)
+            }
+
+    @staticmethod
+    def _metadata_matches_source(metadata: Dict, source_filename: str) -> bool:
+        """Check whether a chunk's metadata belongs to the given source document"""
+        # Check multiple metadata fields where the filename might be stored
+        chunk_source = metadata.get('source', '')
+        chunk_file_path = metadata.get('file_path', '')
+        original_filename = metadata.get('original_filename', '')
+        
+        return (
+            source_filename in chunk_source or
+            source_filename in chunk_file_path or
+            source_filename == original_filename or
+            chunk_source.endswith(source_filename) or
+            chunk_file_path.endswith(source_filename)
+        )
 
 
 # Example usage
@@ -0,0 +1,201 @@
+"""
+Vector Store Registry: One vector store per index for the whole process
+
+RAGService (which writes uploads) and AgentRouter's retriever (which reads
+them) used to build separate VectorStore instances from the same files,
+holding two embedding models and two indexes and leaving the reader blind
+to later uploads. The registry owns a single store per index path:
+
+- Writers get the store itself via get().
+- Readers get a VectorStoreView via view(): a cheap read-only handle that
+  always resolves to the current store and exposes its generation counter.
+
+Files changed by another process (e.g. scripts/add_documents_to_rag.py)
+are picked up by reloading in place when the manifest on disk is not the
+one the store last loaded or saved (see VectorStore.changed_on_disk). The check is throttled by
+VECTOR_STORE_RELOAD_INTERVAL seconds (default 5).
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .vector_store import VectorStore
+except ImportError:
+    from rag.vector_store import VectorStore
+
+
+DEFAULT_INDEX_PATH = "backend/data/vector_db/faiss_index"
+RELOAD_CHECK_INTERVAL = float(os.getenv("VECTOR_STORE_RELOAD_INTERVAL", 5))
+
+
+class VectorStoreView:
+    """
+    Read-only handle on the registry's store for one index path
+
+    Holds no data of its own; every call goes to the current store.
+    """
+
+    def __init__(self, registry: "VectorStoreRegistry", index_path: str):
+        self._registry = registry
+        self._index_path = index_path
+
+    @property
+    def store(self) -> VectorStore:
+        return self._registry.get(self._index_path)
+
+    @property
+    def generation(self) -> int:
+        """Changes whenever chunks are added, deleted or reloaded"""
+        return self.store.generation
+
+    @property
+    def chunks(self):
+        return self.store.chunks
+
+    @property
+    def index(self):
+        return self.store.index
+
+    @property
+    def embedding_dimension(self) -> int:
+        return self.store.embedding_dimension
+
+    def search(self, query: str, k: int = 5, score_threshold: float = None) -> List[Tuple[Dict, float]]:
+        return self.store.search(query, k=k, score_threshold=score_threshold)
+
+    def search_many(self, queries: List[str], k: int = 5, score_threshold: float = None) -> List[List[Tuple[Dict, float]]]:
+        return self.store.search_many(queries, k=k, score_threshold=score_threshold)
+
+    def lexical_search(self, query: str, k: int = 5) -> List[Tuple[Dict, float]]:
+        return self.store.lexical_search(query, k=k)
+
+
+class VectorStoreRegistry:
+    """
+    Process-wide registry of loaded vector stores, keyed by index path
+
+    Stores share one embedding model per model name (see
+    vector_store.get_embedding_model).
+    """
+
+    def __init__(self, reload_interval: float = RELOAD_CHECK_INTERVAL):
+        """
+        Initialize registry
+
+        Args:
+            reload_interval: Minimum seconds between on-disk change checks per store
+        """
+        self.reload_interval = reload_interval
+        self._stores: Dict[str, VectorStore] = {}
+        self._last_checked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, index_path: str = DEFAULT_INDEX_PATH, **store_kwargs) -> VectorStore:
+        """
+        Get (creating and loading on first use) the store for an index path
+
+        Args:
+            index_path: Vector store path prefix
+            **store_kwargs: VectorStore arguments, used only on first creation
+
+        Returns:
+            Shared VectorStore
+        """
+        key = os.path.abspath(index_path)
+
+        with self._lock:
+            store = self._stores.get(key)
+            if store is None:
+                store = VectorStore(index_path=index_path, **store_kwargs)
+                store.load()
+                self._stores[key] = store
+                self._last_checked[key] = time.time()
+                return store
+
+        self._reload_if_changed(key, store)
+        return store
+
+    def view(self, index_path: str = DEFAULT_INDEX_PATH, **store_kwargs) -> VectorStoreView:
+        """
+        Get a read-only view of the store for an index path
+
+        Args:
+            index_path: Vector store path prefix
+            **store_kwargs: VectorStore arguments, used only on first creation
+
+        Returns:
+            VectorStoreView
+        """
+        self.get(index_path, **store_kwargs)
+        return VectorStoreView(self, index_path)
+
+    def reload_if_changed(self, index_path: str = DEFAULT_INDEX_PATH) -> bool:
+        """
+        Reload a store now if its files were changed by another process
+
+        Args:
+            index_path: Vector store path prefix
+
+        Returns:
+            True if the store was reloaded
+        """
+        key = os.path.abspath(index_path)
+        with self._lock:
+            store = self._stores.get(key)
+            self._last_checked[key] = 0.0
+        return store is not None and self._reload_if_changed(key, store)
+
+    def _reload_if_changed(self, key: str, store: VectorStore) -> bool:
+        """Throttled manifest mtime check, reloading the store in place"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_checked.get(key, 0.0) < self.reload_interval:
+                return False
+            self._last_checked[key] = now
+
+        if not store.changed_on_disk():
+            return False
+
+        print(f"Reloading vector store {store.index_path} (changed on disk)...")
+        return store.load()
+
+    def get_statistics(self) -> Dict:
+        """
+        Get per-store statistics
+
+        Returns:
+            Dictionary mapping index path -> chunk count, generation and model
+        """
+        with self._lock:
+            stores = dict(self._stores)
+
+        return {
+            key: {
+                'chunks': len(store.chunks),
+                'generation': store.generation,
+                'embedding_model': store.embedding_model_name
+            }
+            for key, store in stores.items()
+        }
+
+
+# Singleton instance
+_registry: Optional[VectorStoreRegistry] = None
+
+
+def get_vector_store_registry() -> VectorStoreRegistry:
+    """
+    Get the process-wide vector store registry
+
+    Returns:
+        VectorStoreRegistry instance
+    """
+    global _registry
+
+    if _registry is None:
+        _registry = VectorStoreRegistry()
+
+    return _registry
@@ -2,6 +2,10 @@
 Add Documents to Existing RAG System
 Use this to add new documents without rebuilding the entire vector database
 
+Files already ingested and unchanged since are skipped (see the
+.ingest.json manifest next to the vector store), and changed files replace
+their old chunks, so re-running over the same directory is safe.
+
 Usage:
     # Add all new documents from data/documents/
     python scripts/add_documents_to_rag.py
@@ -24,7 +28,7 @@ sys.path.insert(0, parent_dir)
 
 # Import enhanced Docling processor for superior document understanding
 # Falls back to basic processor if Docling is unavailable
-from backend.rag.docling_processor import DoclingProcessor as DocumentProcessor
+from backend.rag.ingestion import IngestionPipeline
 from backend.rag.vector_store import VectorStore
 
 
@@ -62,12 +66,8 @@ def add_documents(file_or_dir_path: str = None, vector_db_path: str = "data/vect
     else:
         target_path = "data/documents"
         print("⚠️  No specific path provided. Scanning data/documents/")
-        print("   This will re-index ALL documents (may create duplicates)")
+        print("   Unchanged documents already in the store will be skipped")
         print()
-        response = input("Continue? (y/n): ")
-        if response.lower() != 'y':
-            print("Cancelled.")
-            return 0
 
     if not os.path.exists(target_path):
         print(f"❌ Path does not exist: {target_path}")
@@ -94,55 +94,27 @@ def add_documents(file_or_dir_path: str = None, vector_db_path: str = "data/vect
     print("-"*70)
     print()
 
-    processor = DocumentProcessor(
+    # Converts in parallel and saves the store as files complete
+    pipeline = IngestionPipeline(
+        vector_store,
         chunk_size=1000,
         chunk_overlap=200
     )
+    stats = pipeline.ingest(target_path)
 
-    # Process based on path type
-    path_obj = Path(target_path)
-    if path_obj.is_file():
-        # Single file
-        if path_obj.suffix.lower() == '.pdf':
-            chunks = processor.process_pdf(str(path_obj))
-        elif path_obj.suffix.lower() in ['.txt', '.md']:
-            chunks = processor.process_text_file(str(path_obj))
-        elif path_obj.suffix.lower() == '.docx':
-            chunks = processor.process_docx(str(path_obj))
-        else:
-            print(f"❌ Unsupported file type: {path_obj.suffix}")
-            return 1
-    else:
-        # Directory
-        chunks = processor.process_directory(target_path)
-
-    if not chunks:
+    if stats['processed'] == 0:
         print()
         print("⚠️  No new documents processed!")
         return 0
 
-    print()
-    print(f"✓ Processed {len(chunks)} new chunks")
-    print()
-
-    # Add to existing vector store
-    print("Adding to vector store...")
-    print("-"*70)
-    print()
-
-    vector_store.add_documents(chunks)
-
-    # Save updated vector store
-    print("\nSaving updated vector store...")
-    vector_store.save()
-
     new_total = len(vector_store.chunks)
     print()
     print("="*70)
     print("✅ DOCUMENTS ADDED SUCCESSFULLY")
     print("="*70)
     print(f"  Previous chunks: {existing_count}")
-    print(f"  New chunks added: {len(chunks)}")
+    print(f"  New chunks added: {stats['chunks_added']}")
+    print(f"  Unchanged files skipped: {stats['skipped']}")
     print(f"  Total chunks now: {new_total}")
     print()
     print("The RAG system is ready to use with the new documents!")
@@ -0,0 +1,131 @@
+"""
+Benchmark Vague Language Scanning
+Compares the single-pass VagueLanguageScanner with the previous approach
+(one re.finditer over the whole document per term, plus a line count from
+the start of the document for every finding) on a PWS-sized document, and
+checks that both find the same occurrences.
+
+Usage:
+    python scripts/benchmark_vague_scanner.py
+    python scripts/benchmark_vague_scanner.py --pages 250 --repeat 10
+    python scripts/benchmark_vague_scanner.py --file output/pws_alms.md
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+# Add parent directory to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from backend.utils.vague_language_fixer import VagueLanguageFixer
+
+
+WORDS_PER_PAGE = 500
+
+SAMPLE_PARAGRAPHS = [
+    "The contractor shall provide timely maintenance support for the Advanced Logistics "
+    "Management System (ALMS) as needed. Several subsystems may require significant "
+    "configuration changes, and the contractor shall submit adequate documentation within "
+    "30 calendar days of each change (Ref: PWS 3.2).",
+    "Performance will be measured against the service level agreement. System availability "
+    "shall be 99.5% per month, measured by the Government monitoring tool, excluding "
+    "scheduled maintenance windows approved by the COR at least 5 business days in advance.",
+    "The contractor should deliver improved reporting capabilities to the extent practicable. "
+    "Approximately 2,800 users across 15 installations will access the system, with many "
+    "reports generated monthly and some generated on request when necessary.",
+    "All deliverables shall be submitted in Microsoft Word and PDF formats to the Contracting "
+    "Officer Representative. The Government will review each deliverable within 10 business "
+    "days and provide written acceptance or comments.",
+    "Transition-in activities shall be completed within 60 days of contract award. The "
+    "contractor shall provide a reasonable staffing plan with appropriate labor categories, "
+    "and may propose enhanced tooling if possible.",
+]
+
+
+def build_document(pages: int) -> str:
+    """Build a synthetic PWS of roughly `pages` pages"""
+    paragraphs = []
+    words = 0
+    section = 1
+    while words < pages * WORDS_PER_PAGE:
+        if len(paragraphs) % 8 == 0:
+            paragraphs.append(f"## {section}. Section {section}")
+            section += 1
+        paragraph = SAMPLE_PARAGRAPHS[len(paragraphs) % len(SAMPLE_PARAGRAPHS)]
+        paragraphs.append(paragraph)
+        words += len(paragraph.split())
+    return "\n\n".join(paragraphs)
+
+
+def legacy_scan(content: str):
+    """The per-term scan VagueLanguageFixer used before the shared scanner"""
+    findings = []
+    for vague_term in VagueLanguageFixer.VAGUE_TERMS:
+        for match in re.finditer(rf'\b{re.escape(vague_term)}\b', content, re.IGNORECASE):
+            line = content[:match.start()].count('\n') + 1
+            findings.append((match.start(), line, match.group(0)))
+    for pattern in VagueLanguageFixer.VAGUE_PATTERNS:
+        for match in re.finditer(pattern, content, re.IGNORECASE):
+            line = content[:match.start()].count('\n') + 1
+            findings.append((match.start(), line, match.group(0)))
+    findings.sort(key=lambda f: f[0])
+    return findings
+
+
+def single_pass_scan(content: str):
+    """The shared single-pass scan"""
+    return [(m.start, m.line, m.text) for m in VagueLanguageFixer.get_scanner().iter_matches(content)]
+
+
+def best_time(function, content: str, repeat: int) -> float:
+    """Fastest of `repeat` runs, in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(content)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vague language scanning")
+    parser.add_argument("--pages", type=int, default=100, help="Pages in the synthetic PWS")
+    parser.add_argument("--file", help="Scan this document instead of a synthetic PWS")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per approach; the fastest is reported")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        source = args.file
+    else:
+        content = build_document(args.pages)
+        source = f"synthetic {args.pages}-page PWS"
+
+    # Compile outside the timed runs, as it is once per process in use
+    VagueLanguageFixer.get_scanner()
+
+    legacy = legacy_scan(content)
+    single_pass = single_pass_scan(content)
+    if legacy != single_pass:
+        print(f"❌ Results differ: legacy found {len(legacy)}, single pass found {len(single_pass)}")
+        sys.exit(1)
+
+    legacy_time = best_time(legacy_scan, content, args.repeat)
+    single_pass_time = best_time(single_pass_scan, content, args.repeat)
+
+    print(f"\nScanning {source}: {len(content.split()):,} words, {len(content):,} characters, "
+          f"{len(single_pass):,} findings\n")
+    print(f"{'Approach':<28} {'Best ms':>10}")
+    print("-" * 40)
+    print(f"{'Per-term finditer':<28} {legacy_time * 1000:>10.2f}")
+    print(f"{'Single-pass scanner':<28} {single_pass_time * 1000:>10.2f}")
+    print(f"\n✅ Identical findings; single pass is {legacy_time / single_pass_time:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark Vector Index Configurations
+Reports recall@k and query latency of IVF/HNSW settings against exact flat
+search on the current knowledge base, to pick VECTOR_INDEX_TYPE and index
+parameters.
+
+Usage:
+    python scripts/benchmark_vector_index.py
+    python scripts/benchmark_vector_index.py --k 5 --queries 500
+    python scripts/benchmark_vector_index.py --vector-db data/vector_db/faiss_index
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from backend.rag.vector_store import VectorStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FAISS index configurations")
+    parser.add_argument("--vector-db", default="data/vector_db/faiss_index", help="Vector store path prefix")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours compared for recall@k")
+    parser.add_argument("--queries", type=int, default=200, help="Number of sampled queries")
+    args = parser.parse_args()
+
+    vector_store = VectorStore(index_path=args.vector_db)
+    if not vector_store.load():
+        print("❌ No vector store found. Run setup_rag_system.py first.")
+        return
+
+    print(f"\nBenchmarking {len(vector_store.chunks):,} chunks "
+          f"(current index: {vector_store.index_type} -> {type(vector_store.index).__name__})\n")
+
+    results = vector_store.evaluate_index_configs(num_queries=args.queries, k=args.k)
+
+    print(f"{'Index':<10} {'Params':<28} {'Recall@' + str(args.k):>10} {'Latency ms':>11} {'Build s':>9}")
+    print("-" * 72)
+    for result in results:
+        params = result['params']
+        if result['index_type'] == 'hnsw':
+            summary = f"M={params['hnsw_m']} efSearch={params['ef_search']}"
+        elif result['index_type'].startswith('ivf'):
+            summary = f"nlist={params['nlist'] or 'auto'} nprobe={params['nprobe']}"
+        else:
+            summary = "exact"
+        print(f"{result['index_type']:<10} {summary:<28} {result['recall_at_k']:>10.4f} "
+              f"{result['latency_ms']:>11.4f} {result['build_seconds']:>9.3f}")
+
+    print("\nSet VECTOR_INDEX_TYPE (flat, ivf_flat, ivf_pq, hnsw, auto) to switch index types.")
+
+
+if __name__ == "__main__":
+    main()
@@ -956,8 +956,7 @@ def main():
 
     # Get cross-reference statistics
     store = DocumentMetadataStore()
-    program_docs = [doc for doc in store.metadata['documents'].values()
-                   if doc['program'] == PROGRAM_NAME]
+    program_docs = store.list_documents(program=PROGRAM_NAME)
     total_refs = sum(len(doc.get('references', {})) for doc in program_docs)
     all_results['total_cross_references'] = total_refs
 
@@ -293,8 +293,7 @@ def main():
     # Show cross-reference info
     print("\n🔗 Cross-References:")
     store = DocumentMetadataStore()
-    program_docs = [doc for doc in store.metadata['documents'].values()
-                   if doc['program'] == project_info['program_name']]
+    program_docs = store.list_documents(program=project_info['program_name'])
 
     for doc in program_docs:
         refs = doc.get('references', {})
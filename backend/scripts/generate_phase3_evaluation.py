@@ -405,8 +405,7 @@ def main():
     # Show cross-reference summary
     print("\n🔗 Cross-Reference Summary:")
     store = DocumentMetadataStore()
-    program_docs = [doc for doc in store.metadata['documents'].values()
-                   if doc['program'] == project_info['program_name']]
+    program_docs = store.list_documents(program=project_info['program_name'])
 
     total_refs = sum(len(doc.get('references', {})) for doc in program_docs)
     print(f"   • Total documents for {project_info['program_name']}: {len(program_docs)}")
@@ -0,0 +1,53 @@
+"""
+Migration script to add foreign-key and lookup indexes.
+
+This adds (if missing):
+- ix_project_documents_project_order: project_documents (project_id, display_order)
+- ix_document_uploads_document_version: document_uploads (project_document_id, version_number)
+- ix_document_uploads_uploaded_by: document_uploads (uploaded_by)
+- ix_document_approvals_document_requested: document_approvals (project_document_id, requested_at)
+- ix_document_approvals_approver_status: document_approvals (approver_id, approval_status)
+- ix_approval_audit_logs_approval_time: approval_audit_logs (approval_id, timestamp)
+- ix_procurement_steps_project_order: procurement_steps (project_id, step_order)
+
+The definitions come from the models' __table_args__, so new databases get
+them from init_db() and existing databases from this script.
+
+Run with: python -m backend.scripts.migrate_add_indexes
+"""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.database.base import engine
+from backend.models.document import ApprovalAuditLog, DocumentApproval, DocumentUpload, ProjectDocument
+from backend.models.procurement import ProcurementStep
+
+INDEXED_MODELS = [ProjectDocument, DocumentUpload, DocumentApproval, ApprovalAuditLog, ProcurementStep]
+
+
+def migrate_add_indexes(bind=engine):
+    """Create any model indexes missing from the database."""
+    for model in INDEXED_MODELS:
+        for index in sorted(model.__table__.indexes, key=lambda i: i.name):
+            print(f"Creating {index.name}...")
+            try:
+                # checkfirst skips indexes that already exist
+                index.create(bind=bind, checkfirst=True)
+                print(f"✓ {index.name}")
+            except Exception as e:
+                print(f"⚠ {index.name}: {e}")
+
+    print("\n" + "=" * 60)
+    print("Migration complete!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Adding document, approval and step indexes")
+    print("=" * 60)
+    migrate_add_indexes()
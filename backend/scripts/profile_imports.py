@@ -0,0 +1,169 @@
+"""
+Profile Backend Import Time
+Imports a module in a fresh interpreter under `python -X importtime` and
+reports the total cold-start import time plus the most expensive modules,
+so startup regressions show up as a number.
+
+Usage:
+    python -m backend.scripts.profile_imports
+    python -m backend.scripts.profile_imports --module backend.services.agent_router --top 30
+    python -m backend.scripts.profile_imports --runs 5 --json
+    python -m backend.scripts.profile_imports --budget-ms 1500   # exit 1 if slower
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# "import time:       self [us] |   cumulative |   imported package"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+def parse_import_times(stderr: str) -> List[Dict]:
+    """
+    Parse `-X importtime` output
+
+    Args:
+        stderr: Interpreter stderr
+
+    Returns:
+        One entry per imported module, in import order, with self/cumulative
+        time in milliseconds and nesting depth (0 = imported directly)
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entries.append({
+            "module": module,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": (len(indent) - 1) // 2,
+        })
+    return entries
+
+
+def profile_import(module: str) -> Dict:
+    """
+    Import a module in a fresh interpreter and collect import times
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        Dictionary with total_ms, entries and any import error
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    env.pop("PYTHONIMPORTTIME", None)
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    entries = parse_import_times(proc.stderr)
+
+    error = None
+    if proc.returncode != 0:
+        other_lines = [line for line in proc.stderr.splitlines() if not IMPORT_TIME_LINE.match(line)]
+        error = other_lines[-1] if other_lines else f"exit code {proc.returncode}"
+
+    return {
+        "module": module,
+        "total_ms": sum(e["cumulative_ms"] for e in entries if e["depth"] == 0),
+        "entries": entries,
+        "error": error,
+    }
+
+
+def summarize(profile: Dict, top: int) -> Dict:
+    """
+    Build the report for one profile run
+
+    Args:
+        profile: Result of profile_import
+        top: Number of modules to list
+
+    Returns:
+        Report dictionary
+    """
+    entries = profile["entries"]
+
+    # Self time rolled up to top-level distributions (torch, anthropic, backend, ...)
+    packages = defaultdict(float)
+    for entry in entries:
+        packages[entry["module"].split(".")[0]] += entry["self_ms"]
+
+    return {
+        "module": profile["module"],
+        "total_ms": round(profile["total_ms"], 1),
+        "modules_imported": len(entries),
+        "error": profile["error"],
+        "top_cumulative": sorted(entries, key=lambda e: e["cumulative_ms"], reverse=True)[:top],
+        "top_self": sorted(entries, key=lambda e: e["self_ms"], reverse=True)[:top],
+        "top_packages": sorted(
+            ({"package": name, "self_ms": round(ms, 1)} for name, ms in packages.items()),
+            key=lambda p: p["self_ms"], reverse=True
+        )[:top],
+    }
+
+
+def print_report(report: Dict, runs: List[float]):
+    print(f"\nImport profile: {report['module']}")
+    print("=" * 72)
+    if report["error"]:
+        print(f"⚠️  Import failed: {report['error']}")
+        print("   Times below cover the modules imported before the failure.")
+    print(f"Total import time: {report['total_ms']:.1f} ms "
+          f"({report['modules_imported']} modules; runs: {', '.join(f'{r:.0f}' for r in runs)} ms)")
+
+    print(f"\n{'Cumulative ms':>14} {'Self ms':>9}  Module")
+    print("-" * 72)
+    for entry in report["top_cumulative"]:
+        print(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>9.1f}  "
+              f"{'  ' * min(entry['depth'], 8)}{entry['module']}")
+
+    print(f"\n{'Self ms':>14}  Package")
+    print("-" * 72)
+    for package in report["top_packages"]:
+        print(f"{package['self_ms']:>14.1f}  {package['package']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile backend import time")
+    parser.add_argument("--module", default="backend.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Number of modules/packages to list")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh-interpreter runs; the fastest is reported")
+    parser.add_argument("--budget-ms", type=float, help="Exit with status 1 if the import is slower")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    # The fastest run is the least disturbed by disk cache and scheduling noise
+    profiles = [profile_import(args.module) for _ in range(max(1, args.runs))]
+    fastest = min(profiles, key=lambda p: p["total_ms"])
+    report = summarize(fastest, args.top)
+    runs = [p["total_ms"] for p in profiles]
+
+    if args.json:
+        print(json.dumps({**report, "runs_ms": [round(r, 1) for r in runs]}, indent=2))
+    else:
+        print_report(report, runs)
+
+    if report["error"]:
+        sys.exit(1)
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        print(f"\n❌ Import time {report['total_ms']:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Run a Generation Job Worker
+Claims and runs queued generation jobs from the shared job queue, so that
+generation can run outside (or alongside) the API processes. Start as many
+as needed; job leases keep each job on one worker at a time.
+
+Usage:
+    python -m backend.scripts.run_job_worker
+    python -m backend.scripts.run_job_worker --concurrency 4
+
+Set JOB_WORKER_IN_PROCESS=false on API processes that should only enqueue.
+Set WS_STREAM_BUS_URL (here and on the API processes) so streamed tokens
+reach the clients' WebSockets.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.database.base import init_db
+from backend.services.job_queue import JobWorker, get_job_queue, JOB_WORKER_CONCURRENCY
+
+# Importing the app registers the generation job handlers
+import backend.main
+
+
+async def run(concurrency: int):
+    # Room messages from jobs go to the API processes over the stream bus
+    ws_manager = backend.main.ws_manager
+    if ws_manager.bus is None:
+        print("⚠️  WS_STREAM_BUS_URL is not set - streamed tokens won't reach any WebSocket")
+    await ws_manager.start()
+
+    worker = JobWorker(get_job_queue(), concurrency=concurrency)
+    worker.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await stop.wait()
+    print("🛑 Stopping job worker...")
+    await worker.stop()
+    await ws_manager.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a generation job worker")
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKER_CONCURRENCY, help="Jobs run at once")
+    args = parser.parse_args()
+
+    init_db()
+    asyncio.run(run(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
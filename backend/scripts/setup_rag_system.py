@@ -2,11 +2,21 @@
 Setup Script: Initialize RAG system with documents
 Run this first to process documents and create vector store
 
+Documents are converted in parallel and only new or changed files are
+processed, so the script can be re-run after adding documents or after an
+interrupted run. Use --force to re-process everything.
+
+Usage:
+    python scripts/setup_rag_system.py
+    python scripts/setup_rag_system.py --workers 4
+    python scripts/setup_rag_system.py --force
+
 Dependencies:
 - All RAG system components
 - Documents in data/documents/ directory
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -18,7 +28,7 @@ sys.path.insert(0, parent_dir)
 
 # Import enhanced Docling processor for superior document understanding
 # Falls back to basic processor if Docling is unavailable
-from backend.rag.docling_processor import DoclingProcessor as DocumentProcessor
+from backend.rag.ingestion import IngestionPipeline
 from backend.rag.vector_store import VectorStore
 
 
@@ -30,6 +40,10 @@ def main():
     3. Build vector store
     4. Save index
     """
+    parser = argparse.ArgumentParser(description="Build the RAG vector store from data/documents")
+    parser.add_argument("--workers", type=int, help="Conversion processes (default: INGEST_WORKERS env or CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-process files that are unchanged")
+    args = parser.parse_args()
     
     print("="*70)
     print("RAG SYSTEM SETUP")
@@ -58,44 +72,47 @@ def main():
         print("Then run this script again.")
         return 1
     
-    # Step 1: Process documents
-    print("STEP 1: Processing Documents")
+    # Step 1: Open (or create) the vector store
+    print("STEP 1: Opening Vector Store")
     print("-"*70)
     print()
     
-    processor = DocumentProcessor(
-        chunk_size=1000,
-        chunk_overlap=200
+    vector_store = VectorStore(
+        api_key=api_key,
+        embedding_dimension=384,  # Updated to match sentence-transformers all-MiniLM-L6-v2
+        index_path=vector_db_path
     )
     
-    chunks = processor.process_directory(documents_dir)
-    
-    if not chunks:
-        print()
-        print("❌ No documents processed!")
-        print(f"Please add PDF or text files to: {documents_dir}/")
-        return 1
-    
-    print()
-    print(f"✅ Processed {len(chunks)} chunks from documents")
+    # Continue from an existing store so unchanged documents are skipped
+    if vector_store.load():
+        print(f"✓ Loaded existing store with {len(vector_store.chunks)} chunks")
     print()
     
-    # Step 2: Create vector store
-    print("STEP 2: Creating Vector Store")
+    # Step 2: Process documents, streaming chunks into the store as files finish
+    print("STEP 2: Processing Documents")
     print("-"*70)
     print()
     
-    vector_store = VectorStore(
-        api_key=api_key,
-        embedding_dimension=384,  # Updated to match sentence-transformers all-MiniLM-L6-v2
-        index_path=vector_db_path
+    pipeline = IngestionPipeline(
+        vector_store,
+        chunk_size=1000,
+        chunk_overlap=200,
+        workers=args.workers
     )
     
-    # Add documents to vector store
-    vector_store.add_documents(chunks)
+    stats = pipeline.ingest(documents_dir, force=args.force)
     
-    # Save vector store
-    vector_store.save()
+    if len(vector_store.chunks) == 0:
+        print()
+        print("❌ No documents processed!")
+        print(f"Please add PDF or text files to: {documents_dir}/")
+        return 1
+    
+    print()
+    print(f"✅ Vector store holds {len(vector_store.chunks)} chunks "
+          f"({stats['chunks_added']} added this run)")
+    if stats['failed']:
+        print(f"⚠️  {stats['failed']} documents failed; re-run to retry them")
     
     print()
     print("="*70)
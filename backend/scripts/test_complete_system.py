@@ -211,8 +211,7 @@ class CompleteSystemTest:
         print("="*80)
 
         self.metadata_store = DocumentMetadataStore()
-        all_docs = [doc for doc in self.metadata_store.metadata['documents'].values()
-                   if doc['program'] == self.test_program]
+        all_docs = self.metadata_store.list_documents(program=self.test_program)
 
         print(f"\n📊 Total documents generated: {len(all_docs)}")
         print(f"\n📝 Document types:")
@@ -234,7 +233,7 @@ class CompleteSystemTest:
             refs = doc.get('references', {})
             total_refs += len(refs)
             for ref_type, ref_id in refs.items():
-                if ref_id not in self.metadata_store.metadata['documents']:
+                if self.metadata_store.find_document_by_id(ref_id) is None:
                     print(f"   ⚠️  Broken reference: {doc['id']} -> {ref_id}")
                     broken_refs += 1
 
@@ -259,14 +258,10 @@ class CompleteSystemTest:
             self.metadata_store = DocumentMetadataStore()
             removed = 0
 
-            docs_to_remove = [doc_id for doc_id, doc in self.metadata_store.metadata['documents'].items()
-                             if doc['program'] == self.test_program]
+            for doc in self.metadata_store.list_documents(program=self.test_program):
+                if self.metadata_store.delete_document(doc['id']):
+                    removed += 1
 
-            for doc_id in docs_to_remove:
-                del self.metadata_store.metadata['documents'][doc_id]
-                removed += 1
-
-            self.metadata_store._save_metadata()
             print(f"✅ Removed {removed} test documents")
 
         except Exception as e:
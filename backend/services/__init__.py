@@ -6,13 +6,15 @@ Core backend services for the DoD Procurement system:
 - WebSocket manager for real-time updates
 """
 
-from backend.services.document_generator import DocumentGenerator, get_document_generator
-from backend.services.websocket_manager import WebSocketManager, ws_manager
+from backend.utils.lazy_exports import install_lazy_exports
 
-__all__ = [
-    'DocumentGenerator',
-    'get_document_generator',
-    'WebSocketManager',
-    'ws_manager',
-]
+# Exported names are imported on first attribute access (PEP 562), so
+# importing one service module does not load the whole generation stack
+_EXPORTS = {
+    'DocumentGenerator': 'backend.services.document_generator',
+    'get_document_generator': 'backend.services.document_generator',
+    'WebSocketManager': 'backend.services.websocket_manager',
+    'ws_manager': 'backend.services.websocket_manager',
+}
 
+__all__ = install_lazy_exports(globals(), _EXPORTS)
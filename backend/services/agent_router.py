@@ -6,41 +6,75 @@ Provides intelligent mapping of 41+ specialized agents to document names.
 """
 
 from typing import Optional, Dict, Type, List
+import importlib
 import os
+import threading
 from pathlib import Path
 
-# Import all specialized agents
 from backend.agents.base_agent import BaseAgent
-from backend.agents.section_l_generator_agent import SectionLGeneratorAgent
-from backend.agents.section_m_generator_agent import SectionMGeneratorAgent
-from backend.agents.section_b_generator_agent import SectionBGeneratorAgent
-from backend.agents.section_h_generator_agent import SectionHGeneratorAgent
-from backend.agents.section_i_generator_agent import SectionIGeneratorAgent
-from backend.agents.section_k_generator_agent import SectionKGeneratorAgent
-from backend.agents.pws_writer_agent import PWSWriterAgent
-from backend.agents.sow_writer_agent import SOWWriterAgent
-from backend.agents.soo_writer_agent import SOOWriterAgent
-from backend.agents.qasp_generator_agent import QASPGeneratorAgent
-from backend.agents.igce_generator_agent import IGCEGeneratorAgent
-from backend.agents.market_research_report_generator_agent import MarketResearchReportGeneratorAgent
-from backend.agents.acquisition_plan_generator_agent import AcquisitionPlanGeneratorAgent
-from backend.agents.sources_sought_generator_agent import SourcesSoughtGeneratorAgent
-from backend.agents.pre_solicitation_notice_generator_agent import PreSolicitationNoticeGeneratorAgent
-from backend.agents.industry_day_generator_agent import IndustryDayGeneratorAgent
-from backend.agents.rfi_generator_agent import RFIGeneratorAgent
-from backend.agents.rfp_writer_agent import RFPWriterAgent
-from backend.agents.sf33_generator_agent import SF33GeneratorAgent
-from backend.agents.sf26_generator_agent import SF26GeneratorAgent
-from backend.agents.source_selection_plan_generator_agent import SourceSelectionPlanGeneratorAgent
-from backend.agents.evaluation_scorecard_generator_agent import EvaluationScorecardGeneratorAgent
-from backend.agents.ppq_generator_agent import PPQGeneratorAgent
-from backend.agents.ssdd_generator_agent import SSDDGeneratorAgent
-from backend.agents.amendment_generator_agent import AmendmentGeneratorAgent
-from backend.agents.award_notification_generator_agent import AwardNotificationGeneratorAgent
-from backend.agents.debriefing_generator_agent import DebriefingGeneratorAgent
-
-# Import orchestrators
-from backend.agents.solicitation_package_orchestrator import SolicitationPackageOrchestrator
+
+# Specialized agent classes as "module:ClassName" import paths. Agent modules
+# are imported the first time a document is routed to them, not when the
+# router is imported, so API startup does not pay for ~27 agent modules.
+SECTION_L_AGENT = "backend.agents.section_l_generator_agent:SectionLGeneratorAgent"
+SECTION_M_AGENT = "backend.agents.section_m_generator_agent:SectionMGeneratorAgent"
+SECTION_B_AGENT = "backend.agents.section_b_generator_agent:SectionBGeneratorAgent"
+SECTION_H_AGENT = "backend.agents.section_h_generator_agent:SectionHGeneratorAgent"
+SECTION_I_AGENT = "backend.agents.section_i_generator_agent:SectionIGeneratorAgent"
+SECTION_K_AGENT = "backend.agents.section_k_generator_agent:SectionKGeneratorAgent"
+PWS_AGENT = "backend.agents.pws_writer_agent:PWSWriterAgent"
+SOW_AGENT = "backend.agents.sow_writer_agent:SOWWriterAgent"
+SOO_AGENT = "backend.agents.soo_writer_agent:SOOWriterAgent"
+QASP_AGENT = "backend.agents.qasp_generator_agent:QASPGeneratorAgent"
+IGCE_AGENT = "backend.agents.igce_generator_agent:IGCEGeneratorAgent"
+MARKET_RESEARCH_REPORT_AGENT = "backend.agents.market_research_report_generator_agent:MarketResearchReportGeneratorAgent"
+ACQUISITION_PLAN_AGENT = "backend.agents.acquisition_plan_generator_agent:AcquisitionPlanGeneratorAgent"
+SOURCES_SOUGHT_AGENT = "backend.agents.sources_sought_generator_agent:SourcesSoughtGeneratorAgent"
+PRE_SOLICITATION_NOTICE_AGENT = "backend.agents.pre_solicitation_notice_generator_agent:PreSolicitationNoticeGeneratorAgent"
+INDUSTRY_DAY_AGENT = "backend.agents.industry_day_generator_agent:IndustryDayGeneratorAgent"
+RFI_AGENT = "backend.agents.rfi_generator_agent:RFIGeneratorAgent"
+RFP_AGENT = "backend.agents.rfp_writer_agent:RFPWriterAgent"
+SF33_AGENT = "backend.agents.sf33_generator_agent:SF33GeneratorAgent"
+SF26_AGENT = "backend.agents.sf26_generator_agent:SF26GeneratorAgent"
+SOURCE_SELECTION_PLAN_AGENT = "backend.agents.source_selection_plan_generator_agent:SourceSelectionPlanGeneratorAgent"
+EVALUATION_SCORECARD_AGENT = "backend.agents.evaluation_scorecard_generator_agent:EvaluationScorecardGeneratorAgent"
+PPQ_AGENT = "backend.agents.ppq_generator_agent:PPQGeneratorAgent"
+SSDD_AGENT = "backend.agents.ssdd_generator_agent:SSDDGeneratorAgent"
+AMENDMENT_AGENT = "backend.agents.amendment_generator_agent:AmendmentGeneratorAgent"
+AWARD_NOTIFICATION_AGENT = "backend.agents.award_notification_generator_agent:AwardNotificationGeneratorAgent"
+DEBRIEFING_AGENT = "backend.agents.debriefing_generator_agent:DebriefingGeneratorAgent"
+
+# Loaded agent classes by import path (shared by all routers)
+_agent_classes: Dict[str, Type[BaseAgent]] = {}
+_agent_classes_lock = threading.Lock()
+
+
+def load_agent_class(agent_path: str) -> Type[BaseAgent]:
+    """
+    Import an agent class on first use
+
+    Args:
+        agent_path: Import path in "module:ClassName" form
+
+    Returns:
+        Agent class
+
+    Raises:
+        ImportError: If the module or class cannot be imported
+    """
+    agent_class = _agent_classes.get(agent_path)
+    if agent_class is not None:
+        return agent_class
+
+    with _agent_classes_lock:
+        if agent_path not in _agent_classes:
+            module_name, _, class_name = agent_path.partition(":")
+            module = importlib.import_module(module_name)
+            try:
+                _agent_classes[agent_path] = getattr(module, class_name)
+            except AttributeError:
+                raise ImportError(f"{module_name} has no agent class '{class_name}'")
+        return _agent_classes[agent_path]
 
 
 class AgentRouter:
@@ -77,133 +111,161 @@ class AgentRouter:
         # Build agent registry
         self._agent_registry = self._build_agent_registry()
 
-    def _build_agent_registry(self) -> Dict[str, Type[BaseAgent]]:
+    def _build_agent_registry(self) -> Dict[str, str]:
         """
-        Build comprehensive agent registry mapping document names to agent classes
+        Build comprehensive agent registry mapping document names to agent import paths
 
         Returns:
-            Dictionary mapping document names/patterns to agent classes
+            Dictionary mapping document names/patterns to "module:ClassName" paths
         """
         return {
             # RFP/Solicitation Sections (A-M)
-            "Section A": SF33GeneratorAgent,
-            "SF33": SF33GeneratorAgent,
-            "Standard Form 33": SF33GeneratorAgent,
-            "SF33 - Solicitation, Offer and Award": SF33GeneratorAgent,
-
-            "Section B": SectionBGeneratorAgent,
-            "Section B - Supplies or Services and Prices": SectionBGeneratorAgent,
-            "Section B - Supplies/Services and Prices": SectionBGeneratorAgent,
-            "Supplies or Services": SectionBGeneratorAgent,
-            "CLIN Structure": SectionBGeneratorAgent,
-
-            "Section C": PWSWriterAgent,  # Default to PWS
-            "Section C - Description/Specs/Work Statement": PWSWriterAgent,
-            "Section C - Performance Work Statement": PWSWriterAgent,
-            "Work Statement": PWSWriterAgent,
-
-            "Section H": SectionHGeneratorAgent,
-            "Section H - Special Contract Requirements": SectionHGeneratorAgent,
-            "Special Contract Requirements": SectionHGeneratorAgent,
-
-            "Section I": SectionIGeneratorAgent,
-            "Section I - Contract Clauses": SectionIGeneratorAgent,
-            "Contract Clauses": SectionIGeneratorAgent,
-
-            "Section K": SectionKGeneratorAgent,
-            "Section K - Representations and Certifications": SectionKGeneratorAgent,
-            "Section K - Representations, Certifications, and Other Statements": SectionKGeneratorAgent,
-            "Representations and Certifications": SectionKGeneratorAgent,
-
-            "Section L": SectionLGeneratorAgent,
-            "Section L - Instructions to Offerors": SectionLGeneratorAgent,
-            "Section L - Instructions, Conditions, and Notices to Offerors": SectionLGeneratorAgent,
-            "Instructions to Offerors": SectionLGeneratorAgent,
-
-            "Section M": SectionMGeneratorAgent,
-            "Section M - Evaluation Factors": SectionMGeneratorAgent,
-            "Section M - Evaluation Factors for Award": SectionMGeneratorAgent,
-            "Evaluation Factors": SectionMGeneratorAgent,
+            "Section A": SF33_AGENT,
+            "SF33": SF33_AGENT,
+            "Standard Form 33": SF33_AGENT,
+            "SF33 - Solicitation, Offer and Award": SF33_AGENT,
+
+            "Section B": SECTION_B_AGENT,
+            "Section B - Supplies or Services and Prices": SECTION_B_AGENT,
+            "Section B - Supplies/Services and Prices": SECTION_B_AGENT,
+            "Supplies or Services": SECTION_B_AGENT,
+            "CLIN Structure": SECTION_B_AGENT,
+
+            "Section C": PWS_AGENT,  # Default to PWS
+            "Section C - Description/Specs/Work Statement": PWS_AGENT,
+            "Section C - Performance Work Statement": PWS_AGENT,
+            "Work Statement": PWS_AGENT,
+
+            "Section H": SECTION_H_AGENT,
+            "Section H - Special Contract Requirements": SECTION_H_AGENT,
+            "Special Contract Requirements": SECTION_H_AGENT,
+
+            "Section I": SECTION_I_AGENT,
+            "Section I - Contract Clauses": SECTION_I_AGENT,
+            "Contract Clauses": SECTION_I_AGENT,
+
+            "Section K": SECTION_K_AGENT,
+            "Section K - Representations and Certifications": SECTION_K_AGENT,
+            "Section K - Representations, Certifications, and Other Statements": SECTION_K_AGENT,
+            "Representations and Certifications": SECTION_K_AGENT,
+
+            "Section L": SECTION_L_AGENT,
+            "Section L - Instructions to Offerors": SECTION_L_AGENT,
+            "Section L - Instructions, Conditions, and Notices to Offerors": SECTION_L_AGENT,
+            "Instructions to Offerors": SECTION_L_AGENT,
+
+            "Section M": SECTION_M_AGENT,
+            "Section M - Evaluation Factors": SECTION_M_AGENT,
+            "Section M - Evaluation Factors for Award": SECTION_M_AGENT,
+            "Evaluation Factors": SECTION_M_AGENT,
 
             # Work Statements (different types)
-            "PWS": PWSWriterAgent,
-            "Performance Work Statement": PWSWriterAgent,
-            "Performance Work Statement (PWS)": PWSWriterAgent,
+            "PWS": PWS_AGENT,
+            "Performance Work Statement": PWS_AGENT,
+            "Performance Work Statement (PWS)": PWS_AGENT,
 
-            "SOW": SOWWriterAgent,
-            "Statement of Work": SOWWriterAgent,
-            "Statement of Work (SOW)": SOWWriterAgent,
+            "SOW": SOW_AGENT,
+            "Statement of Work": SOW_AGENT,
+            "Statement of Work (SOW)": SOW_AGENT,
 
-            "SOO": SOOWriterAgent,
-            "Statement of Objectives": SOOWriterAgent,
-            "Statement of Objectives (SOO)": SOOWriterAgent,
+            "SOO": SOO_AGENT,
+            "Statement of Objectives": SOO_AGENT,
+            "Statement of Objectives (SOO)": SOO_AGENT,
 
             # Supporting Documents
-            "QASP": QASPGeneratorAgent,
-            "Quality Assurance Surveillance Plan": QASPGeneratorAgent,
-            "Quality Assurance Surveillance Plan (QASP)": QASPGeneratorAgent,
+            "QASP": QASP_AGENT,
+            "Quality Assurance Surveillance Plan": QASP_AGENT,
+            "Quality Assurance Surveillance Plan (QASP)": QASP_AGENT,
 
-            "IGCE": IGCEGeneratorAgent,
-            "Independent Government Cost Estimate": IGCEGeneratorAgent,
-            "Independent Government Cost Estimate (IGCE)": IGCEGeneratorAgent,
-            "Cost Estimate": IGCEGeneratorAgent,
+            "IGCE": IGCE_AGENT,
+            "Independent Government Cost Estimate": IGCE_AGENT,
+            "Independent Government Cost Estimate (IGCE)": IGCE_AGENT,
+            "Cost Estimate": IGCE_AGENT,
 
             # Pre-Solicitation Documents
-            "Market Research": MarketResearchReportGeneratorAgent,
-            "Market Research Report": MarketResearchReportGeneratorAgent,
+            "Market Research": MARKET_RESEARCH_REPORT_AGENT,
+            "Market Research Report": MARKET_RESEARCH_REPORT_AGENT,
 
-            "Acquisition Plan": AcquisitionPlanGeneratorAgent,
-            "Acquisition Strategy": AcquisitionPlanGeneratorAgent,
+            "Acquisition Plan": ACQUISITION_PLAN_AGENT,
+            "Acquisition Strategy": ACQUISITION_PLAN_AGENT,
 
-            "Sources Sought": SourcesSoughtGeneratorAgent,
-            "Sources Sought Notice": SourcesSoughtGeneratorAgent,
+            "Sources Sought": SOURCES_SOUGHT_AGENT,
+            "Sources Sought Notice": SOURCES_SOUGHT_AGENT,
 
-            "Presolicitation Notice": PreSolicitationNoticeGeneratorAgent,
-            "Pre-Solicitation Notice": PreSolicitationNoticeGeneratorAgent,
-            "Pre-solicitation Notice": PreSolicitationNoticeGeneratorAgent,
+            "Presolicitation Notice": PRE_SOLICITATION_NOTICE_AGENT,
+            "Pre-Solicitation Notice": PRE_SOLICITATION_NOTICE_AGENT,
+            "Pre-solicitation Notice": PRE_SOLICITATION_NOTICE_AGENT,
 
-            "Industry Day": IndustryDayGeneratorAgent,
-            "Industry Day Materials": IndustryDayGeneratorAgent,
+            "Industry Day": INDUSTRY_DAY_AGENT,
+            "Industry Day Materials": INDUSTRY_DAY_AGENT,
 
-            "RFI": RFIGeneratorAgent,
-            "Request for Information": RFIGeneratorAgent,
-            "Request for Information (RFI)": RFIGeneratorAgent,
+            "RFI": RFI_AGENT,
+            "Request for Information": RFI_AGENT,
+            "Request for Information (RFI)": RFI_AGENT,
 
             # Complete Documents
-            "RFP": RFPWriterAgent,
-            "Request for Proposal": RFPWriterAgent,
-            "Request for Proposal (RFP)": RFPWriterAgent,
+            "RFP": RFP_AGENT,
+            "Request for Proposal": RFP_AGENT,
+            "Request for Proposal (RFP)": RFP_AGENT,
 
             # Evaluation Documents
-            "Source Selection Plan": SourceSelectionPlanGeneratorAgent,
-            "SSP": SourceSelectionPlanGeneratorAgent,
+            "Source Selection Plan": SOURCE_SELECTION_PLAN_AGENT,
+            "SSP": SOURCE_SELECTION_PLAN_AGENT,
 
-            "Evaluation Scorecard": EvaluationScorecardGeneratorAgent,
-            "Scorecard": EvaluationScorecardGeneratorAgent,
+            "Evaluation Scorecard": EVALUATION_SCORECARD_AGENT,
+            "Scorecard": EVALUATION_SCORECARD_AGENT,
 
-            "PPQ": PPQGeneratorAgent,
-            "Past Performance Questionnaire": PPQGeneratorAgent,
-            "Past Performance Questionnaire (PPQ)": PPQGeneratorAgent,
+            "PPQ": PPQ_AGENT,
+            "Past Performance Questionnaire": PPQ_AGENT,
+            "Past Performance Questionnaire (PPQ)": PPQ_AGENT,
 
-            "SSDD": SSDDGeneratorAgent,
-            "Source Selection Decision Document": SSDDGeneratorAgent,
+            "SSDD": SSDD_AGENT,
+            "Source Selection Decision Document": SSDD_AGENT,
 
             # Forms
-            "SF26": SF26GeneratorAgent,
-            "Standard Form 26": SF26GeneratorAgent,
-            "SF26 - Award/Contract": SF26GeneratorAgent,
+            "SF26": SF26_AGENT,
+            "Standard Form 26": SF26_AGENT,
+            "SF26 - Award/Contract": SF26_AGENT,
 
             # Post-Award Documents
-            "Amendment": AmendmentGeneratorAgent,
-            "Contract Amendment": AmendmentGeneratorAgent,
+            "Amendment": AMENDMENT_AGENT,
+            "Contract Amendment": AMENDMENT_AGENT,
 
-            "Award Notification": AwardNotificationGeneratorAgent,
-            "Award Notice": AwardNotificationGeneratorAgent,
+            "Award Notification": AWARD_NOTIFICATION_AGENT,
+            "Award Notice": AWARD_NOTIFICATION_AGENT,
 
-            "Debriefing": DebriefingGeneratorAgent,
-            "Debriefing Letter": DebriefingGeneratorAgent,
+            "Debriefing": DEBRIEFING_AGENT,
+            "Debriefing Letter": DEBRIEFING_AGENT,
         }
 
+    def resolve_agent_path(self, document_name: str) -> Optional[str]:
+        """
+        Find the agent import path for a document without importing the agent
+
+        Args:
+            document_name: Name of document to generate
+
+        Returns:
+            "module:ClassName" path or None if no matching agent found
+        """
+        # Try exact match
+        agent_path = self._agent_registry.get(document_name)
+        if agent_path:
+            return agent_path
+
+        # Try case-insensitive match
+        document_name_lower = document_name.lower()
+        for key, value in self._agent_registry.items():
+            if key.lower() == document_name_lower:
+                return value
+
+        # Try partial match (contains)
+        for key, value in self._agent_registry.items():
+            if key.lower() in document_name_lower or document_name_lower in key.lower():
+                return value
+
+        return None
+
     def get_agent_for_document(
         self,
         document_name: str,
@@ -223,27 +285,17 @@ class AgentRouter:
         if use_cache and document_name in self._agent_cache:
             return self._agent_cache[document_name]
 
-        # Try exact match
-        agent_class = self._agent_registry.get(document_name)
-
-        # Try case-insensitive match
-        if not agent_class:
-            document_name_lower = document_name.lower()
-            for key, value in self._agent_registry.items():
-                if key.lower() == document_name_lower:
-                    agent_class = value
-                    break
-
-        # Try partial match (contains)
-        if not agent_class:
-            document_name_lower = document_name.lower()
-            for key, value in self._agent_registry.items():
-                if key.lower() in document_name_lower or document_name_lower in key.lower():
-                    agent_class = value
-                    break
+        agent_path = self.resolve_agent_path(document_name)
 
         # If no agent found, return None (will fall back to generic generation)
-        if not agent_class:
+        if not agent_path:
+            return None
+
+        # Import the agent module the first time it is routed to
+        try:
+            agent_class = load_agent_class(agent_path)
+        except ImportError as e:
+            print(f"Error loading agent '{agent_path}' for '{document_name}': {e}")
             return None
 
         # Instantiate agent
@@ -253,20 +305,16 @@ class AgentRouter:
             if self._retriever is None:
                 try:
                     from backend.rag.retriever import Retriever
-                    from backend.rag.vector_store import VectorStore
+                    from backend.rag.vector_store_registry import get_vector_store_registry
                     
-                    # Initialize VectorStore with default settings
-                    # Uses sentence-transformers for embeddings (no API key needed)
+                    # Read-only view of the process-wide store that RAGService
+                    # writes to, so new uploads are visible without reloading
                     vector_db_path = "backend/data/vector_db/faiss_index"
-                    vector_store = VectorStore(
-                        api_key=None,  # Not needed for local sentence-transformers
-                        embedding_dimension=384,  # all-MiniLM-L6-v2 dimension
-                        index_path=vector_db_path
+                    vector_store = get_vector_store_registry().view(
+                        vector_db_path,
+                        embedding_dimension=384  # all-MiniLM-L6-v2 dimension
                     )
                     
-                    # Try to load existing index (may be empty if no docs uploaded)
-                    vector_store.load()
-                    
                     # Create retriever with the vector store
                     self._retriever = Retriever(vector_store=vector_store, top_k=5)
                     print("✓ RAG retriever initialized successfully")
@@ -10,18 +10,37 @@ Key responsibilities:
 3. Check and enforce document dependencies
 4. Call GenerationCoordinator for content generation
 5. Save results to ProjectDocument.generated_content
+
+Background jobs call generate_and_save, which reads and writes in short
+sessions (see database.base.session_scope) and runs the agents with no
+connection checked out, so long generations don't drain the pool.
+
+Batches are scheduled as a dependency DAG: documents are grouped into
+levels (DependencyGraph order plus the phase_definitions.yaml edges), each
+level runs concurrently under BATCH_GENERATION_CONCURRENCY (default 4), and
+a failed document only blocks the documents that depend on it.
 """
 
 import os
 import yaml
 import asyncio
-from typing import List, Dict, Optional, Tuple
+import inspect
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
 
-from backend.models.document import ProjectDocument, GenerationStatus
+from backend.database.base import session_scope
+from backend.models.document import ProjectDocument, GenerationStatus, DocumentStatus
 from backend.models.procurement import ProcurementProject, PhaseName
 from backend.services.generation_coordinator import GenerationCoordinator, GenerationTask, get_generation_coordinator
+from backend.services.dependency_graph import get_dependency_graph
+
+
+# Maximum documents generated at once within a batch
+BATCH_GENERATION_CONCURRENCY = int(os.getenv("BATCH_GENERATION_CONCURRENCY", 4))
+
+# Error prefix for documents skipped because a dependency failed
+BLOCKED_PREFIX = "Blocked by failed dependency"
 
 
 # Document dependencies - documents that must exist/be approved before generating others
@@ -58,6 +77,24 @@ def load_document_dependencies() -> Dict[str, List[str]]:
         return {}
 
 
+def extract_quality_score(document_name: str, metadata: Optional[Dict]) -> Optional[int]:
+    """
+    Quality score for a document from generation metadata
+
+    Args:
+        document_name: Name of the generated document
+        metadata: Metadata returned by generate_document
+
+    Returns:
+        Integer score, or None if the quality analysis has none
+    """
+    if not metadata or not metadata.get("quality_analysis"):
+        return None
+    doc_quality = metadata["quality_analysis"].get(document_name, {})
+    score = doc_quality.get("score", doc_quality.get("overall_score"))
+    return int(score) if score else None
+
+
 class DocumentGenerator:
     """
     Service for generating AI content for ProjectDocument records.
@@ -180,125 +217,306 @@ class DocumentGenerator:
             ]
         }
     
-    async def generate_document(
+    def _prepare_task(
         self,
         db: Session,
         document: ProjectDocument,
         assumptions: List[Dict[str, str]],
         additional_context: Optional[str] = None,
-        progress_callback: Optional[callable] = None
-    ) -> Tuple[bool, str, Optional[Dict]]:
+        token_callback: Optional[callable] = None
+    ) -> Tuple[Optional[GenerationTask], Optional[str]]:
         """
-        Generate AI content for a single document.
+        Check dependencies, gather project context and build the generation task.
+        
+        Marks the document GENERATING; the caller commits.
         
         Args:
             db: Database session
             document: ProjectDocument to generate content for
             assumptions: List of assumption dictionaries
             additional_context: Optional additional context from user
+            token_callback: Optional streaming callback (see GenerationTask)
+            
+        Returns:
+            Tuple of (task, None), or (None, error) if dependencies are missing
+        """
+        # Check dependencies - ensures required documents are generated first
+        deps_met, missing_deps, available_deps = self.check_dependencies(
+            db, document.project_id, document.document_name
+        )
+        
+        if not deps_met:
+            return None, f"Missing dependencies: {', '.join(missing_deps)}"
+        
+        # Get project context including name, description, type, and dependency content
+        project_context = self.get_project_context(
+            db, document.project_id, document.document_name
+        )
+
+        # Build generation assumptions including project context
+        generation_assumptions = assumptions.copy()
+        
+        # Add project context as assumptions
+        if project_context.get("project_name"):
+            generation_assumptions.append({
+                "id": "project_name",
+                "text": f"Project: {project_context['project_name']}",
+                "source": "Project Settings"
+            })
+        
+        if project_context.get("project_description"):
+            generation_assumptions.append({
+                "id": "project_desc",
+                "text": project_context['project_description'],
+                "source": "Project Description"
+            })
+        
+        if additional_context:
+            generation_assumptions.append({
+                "id": "user_context",
+                "text": additional_context,
+                "source": "User Input"
+            })
+        
+        # Add dependency content as assumptions
+        for dep_name, dep_content in project_context.get("dependency_documents", {}).items():
+            # Truncate very long content to avoid token limits
+            content_preview = dep_content[:2000] + "..." if len(dep_content) > 2000 else dep_content
+            generation_assumptions.append({
+                "id": f"dep_{dep_name.lower().replace(' ', '_')}",
+                "text": f"From {dep_name}: {content_preview}",
+                "source": dep_name
+            })
+        
+        # Create generation task with unique ID
+        task_id = f"doc_{document.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        task = GenerationTask(
+            task_id=task_id,
+            document_names=[document.document_name],
+            assumptions=generation_assumptions,
+            linked_assumptions={document.document_name: [a.get("id", "") for a in generation_assumptions]},
+            token_callback=token_callback
+        )
+
+        # Update document status to show generation in progress
+        document.generation_status = GenerationStatus.GENERATING
+        document.generation_task_id = task_id
+        return task, None
+    
+    async def _run_task(
+        self,
+        task: GenerationTask,
+        document_name: str,
+        progress_callback: Optional[callable] = None
+    ) -> Tuple[bool, str, Optional[Dict]]:
+        """
+        Run a prepared generation task through the coordinator (no database access).
+        
+        Args:
+            task: Task from _prepare_task
+            document_name: Name of the document being generated
             progress_callback: Optional callback for progress updates
             
         Returns:
             Tuple of (success, content_or_error, metadata)
         """
-        try:
-            # Check dependencies - ensures required documents are generated first
-            deps_met, missing_deps, available_deps = self.check_dependencies(
-                db, str(document.project_id), document.document_name
+        # Run generation via the coordinator (handles agent routing and AI calls)
+        completed_task = await self.coordinator.generate_documents(
+            task=task,
+            progress_callback=progress_callback
+        )
+        
+        if completed_task.status == "completed" and completed_task.sections:
+            # Get the generated content from sections dictionary
+            content = completed_task.sections.get(
+                document_name,
+                list(completed_task.sections.values())[0] if completed_task.sections else ""
             )
             
-            if not deps_met:
-                return False, f"Missing dependencies: {', '.join(missing_deps)}", None
-            
-            # Get project context including name, description, type, and dependency content
-            project_context = self.get_project_context(
-                db, str(document.project_id), document.document_name
-            )
-
-            # Build generation assumptions including project context
-            generation_assumptions = assumptions.copy()
+            # Return metadata for frontend display
+            metadata = {
+                "agent_metadata": completed_task.agent_metadata,
+                "citations": completed_task.citations,
+                "quality_analysis": completed_task.quality_analysis,
+                "phase_info": completed_task.phase_info
+            }
             
-            # Add project context as assumptions
-            if project_context.get("project_name"):
-                generation_assumptions.append({
-                    "id": "project_name",
-                    "text": f"Project: {project_context['project_name']}",
-                    "source": "Project Settings"
-                })
-            
-            if project_context.get("project_description"):
-                generation_assumptions.append({
-                    "id": "project_desc",
-                    "text": project_context['project_description'],
-                    "source": "Project Description"
-                })
-            
-            if additional_context:
-                generation_assumptions.append({
-                    "id": "user_context",
-                    "text": additional_context,
-                    "source": "User Input"
-                })
-            
-            # Add dependency content as assumptions
-            for dep_name, dep_content in project_context.get("dependency_documents", {}).items():
-                # Truncate very long content to avoid token limits
-                content_preview = dep_content[:2000] + "..." if len(dep_content) > 2000 else dep_content
-                generation_assumptions.append({
-                    "id": f"dep_{dep_name.lower().replace(' ', '_')}",
-                    "text": f"From {dep_name}: {content_preview}",
-                    "source": dep_name
-                })
+            return True, content, metadata
+        else:
+            error_msg = completed_task.errors[0] if completed_task.errors else "Generation failed - no sections returned"
+            return False, error_msg, None
+    
+    async def generate_document(
+        self,
+        db: Session,
+        document: ProjectDocument,
+        assumptions: List[Dict[str, str]],
+        additional_context: Optional[str] = None,
+        progress_callback: Optional[callable] = None,
+        token_callback: Optional[callable] = None
+    ) -> Tuple[bool, str, Optional[Dict]]:
+        """
+        Generate AI content for a single document.
+        
+        The session stays checked out during generation; background jobs use
+        generate_and_save instead.
+        
+        Args:
+            db: Database session
+            document: ProjectDocument to generate content for
+            assumptions: List of assumption dictionaries
+            additional_context: Optional additional context from user
+            progress_callback: Optional callback for progress updates
+            token_callback: Optional streaming callback (see GenerationTask)
             
-            # Create generation task with unique ID
-            task_id = f"doc_{document.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            task = GenerationTask(
-                task_id=task_id,
-                document_names=[document.document_name],
-                assumptions=generation_assumptions,
-                linked_assumptions={document.document_name: [a.get("id", "") for a in generation_assumptions]}
+        Returns:
+            Tuple of (success, content_or_error, metadata)
+        """
+        try:
+            task, error = self._prepare_task(
+                db, document, assumptions, additional_context, token_callback
             )
-
-            # Update document status to show generation in progress
-            document.generation_status = GenerationStatus.GENERATING
-            document.generation_task_id = task_id
+            if error:
+                return False, error, None
             db.commit()
             
-            # Run generation via the coordinator (handles agent routing and AI calls)
-            completed_task = await self.coordinator.generate_documents(
-                task=task,
-                progress_callback=progress_callback
-            )
-            
-            if completed_task.status == "completed" and completed_task.sections:
-                # Get the generated content from sections dictionary
-                content = completed_task.sections.get(
-                    document.document_name,
-                    list(completed_task.sections.values())[0] if completed_task.sections else ""
-                )
-                
-                # Get quality score if available from quality analysis
-                quality_score = None
-                if completed_task.quality_analysis:
-                    doc_quality = completed_task.quality_analysis.get(document.document_name, {})
-                    quality_score = doc_quality.get("score", doc_quality.get("overall_score"))
-                
-                # Return metadata for frontend display
-                metadata = {
-                    "agent_metadata": completed_task.agent_metadata,
-                    "citations": completed_task.citations,
-                    "quality_analysis": completed_task.quality_analysis,
-                    "phase_info": completed_task.phase_info
-                }
-                
-                return True, content, metadata
-            else:
-                error_msg = completed_task.errors[0] if completed_task.errors else "Generation failed - no sections returned"
-                return False, error_msg, None
+            return await self._run_task(task, document.document_name, progress_callback)
 
         except Exception as e:
             return False, str(e), None
     
+    def save_result(
+        self,
+        db: Session,
+        document: ProjectDocument,
+        success: bool,
+        content_or_error: str,
+        metadata: Optional[Dict]
+    ):
+        """
+        Store a generation result on the document; the caller commits.
+        
+        Args:
+            db: Database session
+            document: The generated document
+            success: Whether generation succeeded
+            content_or_error: Generated content (stored only on success)
+            metadata: Generation metadata with quality_analysis
+        """
+        if not success:
+            document.generation_status = GenerationStatus.FAILED
+            return
+        
+        document.generated_content = content_or_error
+        document.generated_at = datetime.utcnow()
+        document.generation_status = GenerationStatus.GENERATED
+        
+        # Update document status
+        if document.status == DocumentStatus.PENDING:
+            document.status = DocumentStatus.UPLOADED
+        
+        # Save quality score if available
+        score = extract_quality_score(document.document_name, metadata)
+        if score:
+            document.ai_quality_score = score
+    
+    async def generate_and_save(
+        self,
+        document_id: str,
+        assumptions: List[Dict[str, str]],
+        additional_context: Optional[str] = None,
+        progress_callback: Optional[callable] = None,
+        token_callback: Optional[callable] = None,
+        session_factory: Optional[Callable[[], Session]] = None
+    ) -> Tuple[bool, str, Optional[Dict]]:
+        """
+        Generate a document and store the result, without holding a database
+        connection while the agents run.
+        
+        One short session reads the context and marks the document GENERATING,
+        another stores the result; both run in threads so queries don't block
+        the event loop. Generation itself runs with no session open.
+        
+        Args:
+            document_id: ProjectDocument UUID
+            assumptions: List of assumption dictionaries
+            additional_context: Optional additional context from user
+            progress_callback: Optional callback for progress updates
+            token_callback: Optional streaming callback (see GenerationTask)
+            session_factory: Session factory (default SessionLocal)
+            
+        Returns:
+            Tuple of (success, content_or_error, metadata)
+        
+        Raises:
+            Exception: Errors raised while the agents run (e.g. Claude rate
+                limits), so a job can retry; the document stays GENERATING
+                and the caller marks it FAILED once it gives up
+        """
+        # Database work runs in threads so it doesn't block the event loop
+        document_name, task, error = await asyncio.to_thread(
+            self._prepare_in_session, document_id, assumptions, additional_context,
+            token_callback, session_factory
+        )
+        if document_name is None:
+            return False, "Document not found", None
+        
+        if error:
+            success, content_or_error, metadata = False, error, None
+        else:
+            success, content_or_error, metadata = await self._run_task(
+                task, document_name, progress_callback
+            )
+        
+        await asyncio.to_thread(
+            self._save_in_session, document_id, success, content_or_error, metadata, session_factory
+        )
+        
+        return success, content_or_error, metadata
+    
+    def _prepare_in_session(
+        self,
+        document_id: str,
+        assumptions: List[Dict[str, str]],
+        additional_context: Optional[str],
+        token_callback: Optional[callable],
+        session_factory: Optional[Callable[[], Session]]
+    ) -> Tuple[Optional[str], Optional[GenerationTask], Optional[str]]:
+        """
+        Build the generation task in a short session (sync; run in a thread).
+        
+        Returns:
+            Tuple of (document_name, task, error); document_name is None if
+            the document doesn't exist
+        """
+        with session_scope(session_factory) as db:
+            document = db.query(ProjectDocument).filter(ProjectDocument.id == document_id).first()
+            if not document:
+                return None, None, None
+            document_name = document.document_name
+            try:
+                task, error = self._prepare_task(
+                    db, document, assumptions, additional_context, token_callback
+                )
+            except Exception as e:
+                db.rollback()
+                task, error = None, str(e)
+            return document_name, task, error
+    
+    def _save_in_session(
+        self,
+        document_id: str,
+        success: bool,
+        content_or_error: str,
+        metadata: Optional[Dict],
+        session_factory: Optional[Callable[[], Session]]
+    ):
+        """Store a generation result in a short session (sync; run in a thread)."""
+        with session_scope(session_factory) as db:
+            document = db.query(ProjectDocument).filter(ProjectDocument.id == document_id).first()
+            if document:
+                self.save_result(db, document, success, content_or_error, metadata)
+    
     async def generate_batch(
         self,
         db: Session,
@@ -325,12 +543,7 @@ class DocumentGenerator:
             ProjectDocument.id.in_(document_ids)
         ).all()
         
-        # Sort by dependencies
-        sorted_docs = self._sort_by_dependencies(documents)
-        
-        results = {}
-        
-        for doc in sorted_docs:
+        async def generate_one(doc: ProjectDocument) -> Tuple[bool, str, Optional[Dict]]:
             success, content_or_error, metadata = await self.generate_document(
                 db=db,
                 document=doc,
@@ -338,8 +551,6 @@ class DocumentGenerator:
                 progress_callback=progress_callback
             )
             
-            results[str(doc.id)] = (success, content_or_error, metadata)
-            
             if success:
                 # Save generated content for downstream documents
                 doc.generated_content = content_or_error
@@ -352,8 +563,17 @@ class DocumentGenerator:
             else:
                 doc.generation_status = GenerationStatus.FAILED
                 db.commit()
+            
+            return success, content_or_error, metadata
         
-        return results
+        def mark_blocked(doc: ProjectDocument, failed_deps: List[str]):
+            doc.generation_status = GenerationStatus.FAILED
+            db.commit()
+        
+        # All documents share one session here, so generate them one at a time
+        return await self.run_in_dependency_order(
+            documents, generate_one, concurrency=1, on_blocked=mark_blocked
+        )
     
     def _sort_by_dependencies(self, documents: List[ProjectDocument]) -> List[ProjectDocument]:
         """Sort documents by their dependencies (topological sort)."""
@@ -379,6 +599,141 @@ class DocumentGenerator:
         
         return result
     
+    def get_batch_dependencies(self, document_names: List[str]) -> Dict[str, List[str]]:
+        """
+        Get the direct dependencies of each document within a batch.
+        
+        Combines the DependencyGraph edges (document_dependencies.json) with
+        the phase_definitions.yaml edges that check_dependencies enforces.
+        
+        Args:
+            document_names: Names of the documents in the batch
+            
+        Returns:
+            Dictionary mapping document name to the batch documents it depends on
+        """
+        graph = get_dependency_graph()
+        in_batch = set(document_names)
+        
+        batch_deps = {}
+        for name in document_names:
+            deps = list(dict.fromkeys(graph.get_dependencies(name) + self.dependencies.get(name, [])))
+            batch_deps[name] = [dep for dep in deps if dep in in_batch and dep != name]
+        
+        return batch_deps
+    
+    def plan_generation_levels(self, documents: List[ProjectDocument]) -> List[List[ProjectDocument]]:
+        """
+        Group documents into levels that can be generated concurrently.
+        
+        Every document lands one level after its deepest dependency in the
+        batch. Within a level, documents keep the priority order from
+        DependencyGraph.get_generation_order.
+        
+        Args:
+            documents: Documents to generate
+            
+        Returns:
+            List of levels, each a list of documents with no dependencies on each other
+        """
+        doc_map = {doc.document_name: doc for doc in documents}
+        names = list(doc_map)
+        
+        try:
+            graph_levels = get_dependency_graph().get_generation_order(names)
+        except ValueError as e:
+            print(f"⚠️  {e} - falling back to phase dependency order")
+            graph_levels = [[doc.document_name] for doc in self._sort_by_dependencies(documents)]
+        
+        ordered = list(dict.fromkeys([name for batch in graph_levels for name in batch] + names))
+        
+        batch_deps = self.get_batch_dependencies(names)
+        level: Dict[str, int] = {}
+        visiting = set()
+        
+        def assign(name: str) -> int:
+            if name in level:
+                return level[name]
+            visiting.add(name)
+            depth = 0
+            for dep in batch_deps[name]:
+                if dep in visiting:
+                    print(f"⚠️  Circular dependency between {dep} and {name} - ignoring edge")
+                    continue
+                depth = max(depth, assign(dep) + 1)
+            visiting.discard(name)
+            level[name] = depth
+            return depth
+        
+        for name in ordered:
+            assign(name)
+        
+        levels: List[List[ProjectDocument]] = [[] for _ in range(max(level.values(), default=-1) + 1)]
+        for name in ordered:
+            levels[level[name]].append(doc_map[name])
+        
+        return [batch for batch in levels if batch]
+    
+    async def run_in_dependency_order(
+        self,
+        documents: List[ProjectDocument],
+        generate: Callable[[ProjectDocument], Awaitable[Tuple[bool, str, Optional[Dict]]]],
+        concurrency: Optional[int] = None,
+        on_blocked: Optional[Callable[[ProjectDocument, List[str]], Optional[Awaitable[None]]]] = None
+    ) -> Dict[str, Tuple[bool, str, Optional[Dict]]]:
+        """
+        Run a generation callable over documents level by level.
+        
+        Documents within a level run concurrently, at most `concurrency` at a
+        time. A document whose dependency failed (or was itself blocked) is
+        not generated; its result is a failure naming the blocking documents.
+        
+        Args:
+            documents: Documents to generate
+            generate: Async callable returning (success, content_or_error, metadata);
+                exceptions are treated as failures
+            concurrency: Maximum concurrent generations (default BATCH_GENERATION_CONCURRENCY)
+            on_blocked: Optional callback(document, failed_dependencies) for skipped
+                documents; may be async
+            
+        Returns:
+            Dictionary mapping document_id to (success, content_or_error, metadata)
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency or BATCH_GENERATION_CONCURRENCY))
+        batch_deps = self.get_batch_dependencies([doc.document_name for doc in documents])
+        failed = set()
+        results: Dict[str, Tuple[bool, str, Optional[Dict]]] = {}
+        
+        async def run_one(doc: ProjectDocument) -> Tuple[bool, str, Optional[Dict]]:
+            async with semaphore:
+                try:
+                    return await generate(doc)
+                except Exception as e:
+                    return False, str(e), None
+        
+        for level in self.plan_generation_levels(documents):
+            ready = []
+            for doc in level:
+                blocking = [dep for dep in batch_deps[doc.document_name] if dep in failed]
+                if blocking:
+                    failed.add(doc.document_name)
+                    results[str(doc.id)] = (False, f"{BLOCKED_PREFIX}: {', '.join(blocking)}", None)
+                    if on_blocked:
+                        blocked = on_blocked(doc, blocking)
+                        if inspect.isawaitable(blocked):
+                            await blocked
+                else:
+                    ready.append(doc)
+            
+            level_results = await asyncio.gather(*(run_one(doc) for doc in ready))
+            
+            for doc, result in zip(ready, level_results):
+                results[str(doc.id)] = result
+                if not result[0]:
+                    failed.add(doc.document_name)
+        
+        return results
+    
     def get_generation_estimate(self, document_name: str) -> Dict:
         """
         Get estimated generation time and info for a document.
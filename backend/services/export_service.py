@@ -2,15 +2,33 @@
 Export Service
 
 Handles document export in multiple formats (PDF, DOCX, JSON)
+
+PDF/DOCX conversion is CPU-bound, so it runs on a process pool, and each
+rendered file is cached on disk by (content hash, format, options): a
+document downloaded again, or exported again in a batch, is not re-rendered.
+Concurrent requests for the same rendering share one conversion.
+
+Configuration (environment):
+- EXPORT_RENDER_WORKERS: Processes converting markdown to PDF/DOCX (default 2)
+- EXPORT_CACHE_DIR: Directory for rendered files (default data/export_cache)
+- EXPORT_CACHE_MAX_FILES: Rendered files kept, least recently used removed first (default 256)
 """
 
 import os
 import json
 import uuid
 import shutil
+import asyncio
+import hashlib
+import multiprocessing
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 # Import existing conversion utilities
 import sys
@@ -27,19 +45,329 @@ from utils.export_formatter import (
 )
 
 
+EXPORT_RENDER_WORKERS = int(os.getenv("EXPORT_RENDER_WORKERS", 2))
+EXPORT_CACHE_DIR = os.getenv("EXPORT_CACHE_DIR", "data/export_cache")
+EXPORT_CACHE_MAX_FILES = int(os.getenv("EXPORT_CACHE_MAX_FILES", 256))
+
+# Rendered formats and their file extensions
+RENDER_FORMATS = {
+    'pdf': '.pdf',
+    'docx': '.docx',
+}
+
+# Bytes read per ZIP entry write while streaming a batch export
+ZIP_STREAM_CHUNK_SIZE = 256 * 1024
+
+
+def render_cache_key(content: str, fmt: str, program_name: Optional[str] = None) -> str:
+    """
+    Cache key for a rendering of markdown content
+
+    Args:
+        content: Markdown content
+        fmt: 'pdf' or 'docx'
+        program_name: DOCX metadata program name (part of the key for DOCX only)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    options = (program_name or '') if fmt == 'docx' else ''
+    digest = hashlib.sha256()
+    digest.update(f"{fmt}\0{options}\0".encode('utf-8'))
+    digest.update(content.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def render_markdown(content: str, fmt: str, output_path: str, program_name: Optional[str] = None) -> None:
+    """
+    Convert markdown content to a PDF or DOCX file (runs in the render pool)
+
+    The file is written next to output_path and moved into place, so a
+    partially written rendering is never visible at output_path.
+
+    Args:
+        content: Markdown content
+        fmt: 'pdf' or 'docx'
+        output_path: Destination file
+        program_name: Optional program name for DOCX metadata
+    """
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=output.parent) as work_dir:
+        md_file = Path(work_dir) / "document.md"
+        rendered_file = Path(work_dir) / f"document{RENDER_FORMATS[fmt]}"
+        md_file.write_text(content, encoding='utf-8')
+
+        if fmt == 'pdf':
+            convert_markdown_to_pdf(str(md_file), str(rendered_file))
+        else:
+            convert_markdown_to_docx(str(md_file), str(rendered_file), program_name)
+
+        os.replace(rendered_file, output)
+
+
+class _ZipStreamBuffer:
+    """Write-only file object that collects ZIP output until it is drained"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        """Return and clear everything written since the last drain"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _zip_info(arcname: str, compress_type: int) -> zipfile.ZipInfo:
+    """ZIP entry stamped with the current time"""
+    info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+    info.compress_type = compress_type
+    return info
+
+
 class ExportService:
     """Service for managing document exports"""
 
-    def __init__(self, exports_dir: str = "data/exports"):
+    def __init__(
+        self,
+        exports_dir: str = "data/exports",
+        cache_dir: Optional[str] = None,
+        cache_max_files: Optional[int] = None
+    ):
         """
         Initialize export service
 
         Args:
             exports_dir: Directory to store temporary export files
+            cache_dir: Directory for rendered PDF/DOCX files (default EXPORT_CACHE_DIR env)
+            cache_max_files: Rendered files kept (default EXPORT_CACHE_MAX_FILES env, 256)
         """
         self.exports_dir = Path(exports_dir)
         self.exports_dir.mkdir(parents=True, exist_ok=True)
 
+        # Kept outside exports_dir so export cleanup and history ignore it
+        self.cache_dir = Path(cache_dir or EXPORT_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_max_files = cache_max_files or EXPORT_CACHE_MAX_FILES
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self._renders_in_flight: Dict[str, Future] = {}
+        self._render_lock = threading.Lock()
+        self._render_pool: Optional[ProcessPoolExecutor] = None
+        self._render_pool_lock = threading.Lock()
+
+    def _get_render_pool(self) -> ProcessPoolExecutor:
+        """Create the render pool on first use"""
+        with self._render_pool_lock:
+            if self._render_pool is None:
+                # Spawned, not forked: the API process runs threads that a
+                # forked child would inherit in an unknown state
+                self._render_pool = ProcessPoolExecutor(
+                    max_workers=EXPORT_RENDER_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._render_pool
+
+    def shutdown(self) -> None:
+        """Stop the render pool (called at shutdown)"""
+        with self._render_pool_lock:
+            if self._render_pool is not None:
+                self._render_pool.shutdown(wait=False, cancel_futures=True)
+                self._render_pool = None
+
+    def render(self, content: str, fmt: str, program_name: Optional[str] = None) -> Path:
+        """
+        Render markdown content to PDF or DOCX, reusing a cached rendering
+
+        Blocks until the rendering is available; async callers use render_async().
+
+        Args:
+            content: Markdown content
+            fmt: 'pdf' or 'docx'
+            program_name: Optional program name for DOCX metadata
+
+        Returns:
+            Path to the rendered file in the cache (copy it before handing it out)
+
+        Raises:
+            ValueError: If fmt is not a rendered format
+        """
+        return self._submit_render(content, fmt, program_name).result()
+
+    async def render_async(self, content: str, fmt: str, program_name: Optional[str] = None) -> Path:
+        """
+        Render markdown content without blocking the event loop
+
+        Args:
+            content: Markdown content
+            fmt: 'pdf' or 'docx'
+            program_name: Optional program name for DOCX metadata
+
+        Returns:
+            Path to the rendered file in the cache
+        """
+        return await asyncio.wrap_future(self._submit_render(content, fmt, program_name))
+
+    def _submit_render(self, content: str, fmt: str, program_name: Optional[str]) -> Future:
+        """Return a future for a rendering: cached, already in progress, or newly started"""
+        if fmt not in RENDER_FORMATS:
+            raise ValueError(f"Unsupported render format: {fmt}. Use 'pdf' or 'docx'")
+
+        key = render_cache_key(content, fmt, program_name)
+        path = self.cache_dir / f"{key}{RENDER_FORMATS[fmt]}"
+
+        with self._render_lock:
+            in_flight = self._renders_in_flight.get(key)
+            if in_flight is not None:
+                return in_flight
+
+            try:
+                # Touch on hit: pruning removes the least recently used files
+                os.utime(path)
+                self.cache_hits += 1
+                cached = Future()
+                cached.set_result(path)
+                return cached
+            except FileNotFoundError:
+                pass
+
+            future = Future()
+            self._renders_in_flight[key] = future
+            self.cache_misses += 1
+
+        def finish(pool_future: Future) -> None:
+            if pool_future.cancelled():
+                error = CancelledError()
+            else:
+                error = pool_future.exception()
+            self._finish_render(key, path, future, error)
+
+        try:
+            pool_future = self._get_render_pool().submit(render_markdown, content, fmt, str(path), program_name)
+        except Exception as e:
+            self._finish_render(key, path, future, e)
+        else:
+            pool_future.add_done_callback(finish)
+        return future
+
+    def _finish_render(self, key: str, path: Path, future: Future, error: Optional[BaseException]) -> None:
+        """Resolve a rendering's waiters and keep the cache within its size limit"""
+        with self._render_lock:
+            self._renders_in_flight.pop(key, None)
+
+        if error is not None:
+            future.set_exception(error)
+            return
+
+        self._prune_render_cache()
+        future.set_result(path)
+
+    def _prune_render_cache(self) -> None:
+        """Remove least recently used renderings beyond cache_max_files"""
+        extensions = set(RENDER_FORMATS.values())
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.suffix not in extensions:
+                continue
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+
+        excess = len(entries) - self.cache_max_files
+        if excess <= 0:
+            return
+
+        entries.sort()
+        for _, path in entries[:excess]:
+            path.unlink(missing_ok=True)
+
+    async def iter_batch_zip(self, documents: List[Tuple[str, str, Optional[str]]], fmt: str) -> AsyncIterator[bytes]:
+        """
+        Stream a ZIP of documents, adding each entry as soon as it is ready
+
+        PDF/DOCX renderings for all documents are started at once; entries
+        are written in the order they finish, and ZIP bytes are yielded as
+        they are produced rather than buffering the whole archive.
+
+        The response headers are already sent by the time a rendering can
+        fail, so a failed document is left out and listed with its error in
+        a _errors.txt entry instead of ending the stream; the archive is
+        always closed, so the client receives a valid ZIP.
+
+        Args:
+            documents: (file name without extension, markdown content, title) per document
+            fmt: 'pdf', 'docx' or 'markdown'
+
+        Yields:
+            Chunks of the ZIP file
+        """
+        buffer = _ZipStreamBuffer()
+        errors: List[str] = []
+
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            if fmt == 'markdown':
+                for name, content, _ in documents:
+                    zip_file.writestr(_zip_info(f"{name}.md", zipfile.ZIP_DEFLATED), content)
+                    yield buffer.drain()
+            else:
+                async def render_entry(
+                    name: str, content: str, title: Optional[str]
+                ) -> Tuple[str, Optional[Path], Optional[Exception]]:
+                    arcname = f"{name}{RENDER_FORMATS[fmt]}"
+                    try:
+                        return arcname, await self.render_async(content, fmt, title), None
+                    except Exception as e:
+                        return arcname, None, e
+
+                renders = [asyncio.ensure_future(render_entry(*document)) for document in documents]
+                try:
+                    for next_render in asyncio.as_completed(renders):
+                        arcname, rendered_file, error = await next_render
+                        if error is None:
+                            try:
+                                source = open(rendered_file, 'rb')
+                            except OSError as e:
+                                # Pruned from the render cache since it finished
+                                error = e
+                        if error is not None:
+                            print(f"Batch export: skipping {arcname}: {error}")
+                            errors.append(f"{arcname}: {type(error).__name__}: {error}")
+                            continue
+
+                        # PDF and DOCX are already compressed
+                        info = _zip_info(arcname, zipfile.ZIP_STORED)
+                        with source, zip_file.open(info, 'w') as entry:
+                            while True:
+                                chunk = source.read(ZIP_STREAM_CHUNK_SIZE)
+                                if not chunk:
+                                    break
+                                entry.write(chunk)
+                                data = buffer.drain()
+                                if data:
+                                    yield data
+                        yield buffer.drain()
+                finally:
+                    for render in renders:
+                        render.cancel()
+
+            if errors:
+                report = "The following documents could not be exported:\n\n" + "\n".join(errors) + "\n"
+                zip_file.writestr(_zip_info("_errors.txt", zipfile.ZIP_DEFLATED), report)
+
+        # Central directory, written when the archive closes
+        yield buffer.drain()
+
     def prepare_export(
         self,
         sections: Dict[str, str],
@@ -140,8 +468,9 @@ class ExportService:
         md_file = export_path / "document.md"
         pdf_file = export_path / "document.pdf"
 
-        # Convert markdown to PDF using existing utility
-        convert_markdown_to_pdf(str(md_file), str(pdf_file))
+        # Render (or reuse the cached rendering) and copy into the export
+        rendered = self.render(md_file.read_text(encoding='utf-8'), 'pdf')
+        shutil.copyfile(rendered, pdf_file)
 
         return pdf_file
 
@@ -175,8 +504,9 @@ class ExportService:
                     metadata = json.load(f)
                     program_name = metadata.get('metadata', {}).get('project_name', 'Procurement Document')
 
-        # Convert markdown to DOCX using existing utility
-        convert_markdown_to_docx(str(md_file), str(docx_file), program_name)
+        # Render (or reuse the cached rendering) and copy into the export
+        rendered = self.render(md_file.read_text(encoding='utf-8'), 'docx', program_name)
+        shutil.copyfile(rendered, docx_file)
 
         return docx_file
 
@@ -237,7 +567,7 @@ class ExportService:
 
         # Convert to PDF
         pdf_file = export_path / "compliance_report.pdf"
-        convert_markdown_to_pdf(str(md_file), str(pdf_file))
+        shutil.copyfile(self.render(report_md, 'pdf'), pdf_file)
 
         return pdf_file
 
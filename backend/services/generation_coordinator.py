@@ -16,6 +16,8 @@ from backend.services.phase_detector import get_phase_detector
 from backend.services.rag_service import get_rag_service
 from backend.services.dependency_graph import get_dependency_graph
 from backend.services.context_manager import get_context_manager
+from backend.agents.llm_client import get_async_client, is_transient_llm_error
+from backend.agents.llm_stream import TokenStream, get_token_stream, stream_llm_tokens
 # Quality analysis agent for precomputing scores during generation
 from backend.agents.quality_agent import QualityAgent
 
@@ -32,7 +34,8 @@ class GenerationTask:
         task_id: str,
         document_names: List[str],
         assumptions: List[Dict[str, str]],
-        linked_assumptions: Optional[Dict[str, List[str]]] = None
+        linked_assumptions: Optional[Dict[str, List[str]]] = None,
+        token_callback: Optional[Callable[..., None]] = None
     ):
         """
         Initialize generation task
@@ -42,11 +45,16 @@ class GenerationTask:
             document_names: List of document names to generate
             assumptions: List of assumption dictionaries
             linked_assumptions: Optional mapping of document -> assumption IDs
+            token_callback: Optional streaming mode; called with (document_name,
+                section, text_delta) as text is generated, and with a None delta
+                when a section finishes (plus aborted=True when its LLM call
+                failed part way). May be called from worker threads.
         """
         self.task_id = task_id
         self.document_names = document_names
         self.assumptions = assumptions
         self.linked_assumptions = linked_assumptions or {}
+        self.token_callback = token_callback
 
         # Status tracking
         self.status = "pending"  # pending, in_progress, completed, failed
@@ -185,6 +193,11 @@ class GenerationCoordinator:
 
         Returns:
             Updated GenerationTask with results
+
+        Raises:
+            Exception: Transient Claude errors (see is_transient_llm_error),
+                after the task is marked failed, so callers can retry; other
+                errors are reported on the returned task
         """
         try:
             # Update status
@@ -255,12 +268,13 @@ class GenerationCoordinator:
                     )
 
                     # Generate document using appropriate agent
-                    result = await self._generate_single_document(
-                        document_name=doc_name,
-                        assumptions=doc_assumptions,
-                        context=context_text,
-                        all_assumptions=assumptions_text
-                    )
+                    with stream_llm_tokens(self._token_stream(task, doc_name)):
+                        result = await self._generate_single_document(
+                            document_name=doc_name,
+                            assumptions=doc_assumptions,
+                            context=context_text,
+                            all_assumptions=assumptions_text
+                        )
 
                     # Store results
                     task.sections[doc_name] = result["content"]
@@ -271,7 +285,8 @@ class GenerationCoordinator:
                     # This ensures the editor shows AI-verified scores immediately on load
                     try:
                         quality_agent = QualityAgent(api_key=self.api_key)
-                        quality_result = quality_agent.evaluate(
+                        quality_result = await asyncio.to_thread(
+                            quality_agent.evaluate,
                             content=result["content"],
                             document_type=doc_name,
                             project_info={"assumptions": doc_assumptions}
@@ -329,6 +344,9 @@ class GenerationCoordinator:
             if progress_callback:
                 progress_callback(task)
 
+            if is_transient_llm_error(e):
+                raise
+
             return task
 
     async def _generate_single_document(
@@ -424,8 +442,9 @@ class GenerationCoordinator:
                 context=context
             )
         elif hasattr(agent, 'generate'):
-            # Synchronous generate
-            result = agent.generate(
+            # Synchronous generate - run off the event loop
+            result = await asyncio.to_thread(
+                agent.generate,
                 requirements=assumptions_text,
                 context=context
             )
@@ -436,7 +455,8 @@ class GenerationCoordinator:
                 'context': context,
                 'assumptions': assumptions
             }
-            result = agent.execute(task)
+            # Sync agents make blocking LLM calls - run off the event loop
+            result = await asyncio.to_thread(agent.execute, task)
             # Convert execute result format to generate result format
             if isinstance(result, dict) and 'content' in result:
                 return result
@@ -634,27 +654,48 @@ class GenerationCoordinator:
         if self.use_specialized_agents and self.agent_router:
             agent = self.agent_router.get_agent_for_document(document_name)
 
-        # If agent has collaboration enabled, use collaborative generation
-        if agent and hasattr(agent, 'has_collaboration_enabled') and agent.has_collaboration_enabled():
-            # Pass dependencies to agent
-            result = await self._call_specialized_agent_with_collaboration(
-                agent=agent,
-                document_name=document_name,
-                assumptions=doc_assumptions,
-                context=context_text,
-                dependencies=dependency_content
-            )
-        else:
-            # Legacy generation (no collaboration)
-            result = await self._generate_single_document(
-                document_name=document_name,
-                assumptions=doc_assumptions,
-                context=context_text,
-                all_assumptions=assumptions_text
-            )
+        with stream_llm_tokens(self._token_stream(task, document_name)):
+            # If agent has collaboration enabled, use collaborative generation
+            if agent and hasattr(agent, 'has_collaboration_enabled') and agent.has_collaboration_enabled():
+                # Pass dependencies to agent
+                result = await self._call_specialized_agent_with_collaboration(
+                    agent=agent,
+                    document_name=document_name,
+                    assumptions=doc_assumptions,
+                    context=context_text,
+                    dependencies=dependency_content
+                )
+            else:
+                # Legacy generation (no collaboration)
+                result = await self._generate_single_document(
+                    document_name=document_name,
+                    assumptions=doc_assumptions,
+                    context=context_text,
+                    all_assumptions=assumptions_text
+                )
 
         return result
 
+    def _token_stream(self, task: GenerationTask, document_name: str) -> Optional[TokenStream]:
+        """
+        Build the token stream for one document of a streaming task
+
+        Args:
+            task: GenerationTask instance
+            document_name: Document being generated
+
+        Returns:
+            TokenStream forwarding to task.token_callback, or None when not streaming
+        """
+        if not task.token_callback:
+            return None
+
+        return TokenStream(
+            on_delta=lambda section, delta: task.token_callback(document_name, section, delta),
+            on_section_end=lambda section: task.token_callback(document_name, section, None),
+            on_section_abort=lambda section: task.token_callback(document_name, section, None, aborted=True)
+        )
+
     async def _call_specialized_agent_with_collaboration(
         self,
         agent,
@@ -697,8 +738,9 @@ class GenerationCoordinator:
                 context=context
             )
         elif hasattr(agent, 'generate'):
-            # Synchronous generate
-            result = agent.generate(
+            # Synchronous generate - run off the event loop
+            result = await asyncio.to_thread(
+                agent.generate,
                 requirements=assumptions_text,
                 context=context
             )
@@ -719,17 +761,20 @@ class GenerationCoordinator:
         model: str,
         max_tokens: int,
         messages: List[Dict],
-        max_retries: int = 3
+        max_retries: int = 3,
+        token_stream: Optional[TokenStream] = None
     ):
         """
         Call Claude API with exponential backoff retry logic
 
         Args:
-            client: Anthropic client
+            client: AsyncAnthropic client (see agents/llm_client.py)
             model: Model name
             max_tokens: Max tokens to generate
             messages: Message list
             max_retries: Maximum retry attempts (default 3)
+            token_stream: Optional stream to forward text deltas to (a retry
+                starts a new section)
 
         Returns:
             API response
@@ -741,7 +786,19 @@ class GenerationCoordinator:
 
         for attempt in range(max_retries):
             try:
-                return client.messages.create(
+                if token_stream:
+                    with token_stream.section() as section:
+                        async with client.messages.stream(
+                            model=model,
+                            max_tokens=max_tokens,
+                            messages=messages
+                        ) as stream:
+                            async for delta in stream.text_stream:
+                                token_stream.write(section, delta)
+                            message = await stream.get_final_message()
+                    return message
+
+                return await client.messages.create(
                     model=model,
                     max_tokens=max_tokens,
                     messages=messages
@@ -787,9 +844,7 @@ class GenerationCoordinator:
         Returns:
             Generation result dictionary
         """
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=self.api_key)
+        client = get_async_client(self.api_key)
 
         prompt = f"""You are a DoD acquisition expert writing {document_name} for a federal procurement.
 
@@ -814,7 +869,8 @@ Write the section content now:"""
             client=client,
             model="claude-sonnet-4-20250514",
             max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": prompt}],
+            token_stream=get_token_stream()
         )
 
         content = message.content[0].text.strip()
@@ -844,10 +900,12 @@ Write the section content now:"""
         """
         all_context = []
 
-        for doc_name in document_names:
-            # Search for relevant content
-            search_query = f"{doc_name} DoD acquisition federal requirements"
-            results = self.rag_service.search_documents(query=search_query, k=5)
+        # Search for relevant content for every document in one batch
+        search_queries = [
+            f"{doc_name} DoD acquisition federal requirements"
+            for doc_name in document_names
+        ]
+        for results in self.rag_service.search_documents_many(queries=search_queries, k=5):
             all_context.extend(results)
 
         # Return top 20 unique chunks
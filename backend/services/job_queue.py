@@ -0,0 +1,654 @@
+"""
+Job Queue Service
+
+Durable background job queue for document generation, shared by every API
+and worker process. Replaces the per-process task dicts so that:
+
+1. Status polls can be answered by any process (state lives in the database)
+2. In-flight jobs survive restarts (a lost lease makes the job claimable again)
+3. Generation scales out by running more workers
+
+Each job holds a JSON `state` dict (status/progress/message/result) that the
+status endpoints return unchanged. Workers lease jobs, renew the lease with
+heartbeats while running, and retry failed jobs per the handler's RetryPolicy.
+A handler that raises fails the attempt; raising JobFailed fails the job
+without retrying (for outcomes a retry can't change). A job type can register
+an on_exhausted hook, run once when the queue gives up on a job (its last
+attempt failed, or its workers kept dying), to clean up what the job left
+behind - e.g. a document still marked GENERATING.
+
+DatabaseJobQueue stores jobs in the application database via SQLAlchemy,
+so it runs on SQLite locally and Postgres in production. Other backends
+implement the JobQueue interface and are selected with JOB_QUEUE_BACKEND.
+
+Workers run inside the API process (JOB_WORKER_IN_PROCESS, default on) and/or
+as separate processes: python -m backend.scripts.run_job_worker
+"""
+
+import os
+import json
+import uuid
+import socket
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_
+
+from backend.models.job import GenerationJob, JobStatus
+
+
+# Seconds a claimed job stays leased without a heartbeat
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 60))
+# Seconds between polls for new jobs when idle
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 1))
+# Jobs run concurrently by one worker
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", 2))
+# Minimum seconds between progress writes from JobContext.publish
+JOB_PROGRESS_INTERVAL = float(os.getenv("JOB_PROGRESS_INTERVAL", 0.5))
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How often and how soon a failed job is retried
+
+    Attributes:
+        max_attempts: Total attempts including the first run
+        backoff_seconds: Delay before the first retry
+        backoff_multiplier: Factor applied to the delay for each later retry
+    """
+    max_attempts: int = 3
+    backoff_seconds: float = 10.0
+    backoff_multiplier: float = 2.0
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after the given (1-based) failed attempt"""
+        return self.backoff_seconds * self.backoff_multiplier ** max(0, attempt - 1)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+class JobFailed(Exception):
+    """
+    Raised by a handler when the job has failed and retrying won't help
+    (e.g. its document no longer exists). The job fails without a retry.
+    """
+
+
+def _to_json(state: Dict) -> Dict:
+    """Make state JSON-safe (agent metadata may hold datetimes etc.)"""
+    return json.loads(json.dumps(state, default=str))
+
+
+class JobContext:
+    """
+    A claimed job as seen by its handler
+
+    Handlers running on the event loop report progress with publish(), which
+    writes in a thread and coalesces frequent updates. save()/update() write
+    synchronously. The worker persists the final state when the handler
+    returns or raises.
+    """
+
+    def __init__(self, queue: "JobQueue", job_id: str, job_type: str, payload: Dict,
+                 state: Dict, attempt: int, owner: str, max_attempts: Optional[int] = None,
+                 progress_interval: float = JOB_PROGRESS_INTERVAL):
+        self.queue = queue
+        self.id = job_id
+        self.job_type = job_type
+        self.payload = payload
+        self.state = state
+        self.attempt = attempt
+        self.max_attempts = max_attempts if max_attempts is not None else attempt
+        self.owner = owner
+        self.progress_interval = progress_interval
+        self._pending_write: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        self._last_write = float("-inf")
+
+    @property
+    def final_attempt(self) -> bool:
+        """Whether a failure now fails the job instead of retrying it"""
+        return self.attempt >= self.max_attempts
+
+    def save(self) -> bool:
+        """
+        Persist the current state
+
+        Returns:
+            False if this worker no longer holds the job's lease
+        """
+        return self.queue.update_state(self.id, self.state, owner=self.owner)
+
+    def update(self, **fields) -> bool:
+        """
+        Set state fields and persist
+
+        Args:
+            **fields: State keys to set
+
+        Returns:
+            False if this worker no longer holds the job's lease
+        """
+        self.state.update(fields)
+        return self.save()
+
+    async def save_async(self) -> bool:
+        """
+        Persist the current state from a thread, without blocking the event loop
+
+        Returns:
+            False if this worker no longer holds the job's lease
+        """
+        async with self._write_lock:
+            self._last_write = asyncio.get_running_loop().time()
+            # Snapshot on the loop thread; handlers keep mutating state
+            state = _to_json(self.state)
+            return await asyncio.to_thread(self.queue.update_state, self.id, state, self.owner)
+
+    def publish(self, **fields) -> None:
+        """
+        Set state fields and persist them in the background
+
+        Writes run in a thread at most every progress_interval seconds; fields
+        set in between go out with the next write.
+
+        Args:
+            **fields: State keys to set
+        """
+        self.state.update(fields)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not on the event loop (e.g. an agent thread): write directly
+            self.save()
+            return
+
+        if self._pending_write is None:
+            delay = max(0.0, self._last_write + self.progress_interval - loop.time())
+            self._pending_write = loop.create_task(self._write_later(delay))
+
+    async def _write_later(self, delay: float) -> None:
+        """Write the state after a delay (scheduled by publish)"""
+        await asyncio.sleep(delay)
+        # Later publishes schedule a new write; this one is now committed to
+        self._pending_write = None
+        try:
+            await self.save_async()
+        except Exception as e:
+            print(f"⚠️  Progress write for job {self.id} failed: {e}")
+
+    def cancel_pending_write(self) -> None:
+        """Drop a scheduled progress write (the final state is written instead)"""
+        if self._pending_write is not None:
+            self._pending_write.cancel()
+            self._pending_write = None
+
+
+JobHandler = Callable[[JobContext], Awaitable[Any]]
+# Called with (payload, error) when the queue gives up on a job; runs in a worker thread
+ExhaustedHook = Callable[[Dict, str], None]
+
+# job_type -> (handler, retry policy, on_exhausted hook or None)
+_job_handlers: Dict[str, tuple] = {}
+
+
+def register_job_handler(job_type: str, handler: JobHandler, retry: Optional[RetryPolicy] = None,
+                         on_exhausted: Optional[ExhaustedHook] = None) -> None:
+    """
+    Register the coroutine that runs jobs of a type
+
+    Args:
+        job_type: Job type name
+        handler: Async callable taking a JobContext; raising fails the attempt
+            (JobFailed fails the job without retrying)
+        retry: Retry policy (default DEFAULT_RETRY_POLICY)
+        on_exhausted: Sync callable taking (payload, error), run when a job
+            of this type fails for good
+    """
+    _job_handlers[job_type] = (handler, retry or DEFAULT_RETRY_POLICY, on_exhausted)
+
+
+def job_handler(job_type: str, retry: Optional[RetryPolicy] = None,
+                on_exhausted: Optional[ExhaustedHook] = None):
+    """Decorator form of register_job_handler"""
+    def decorator(handler: JobHandler) -> JobHandler:
+        register_job_handler(job_type, handler, retry, on_exhausted)
+        return handler
+    return decorator
+
+
+def get_job_handler(job_type: str) -> Optional[tuple]:
+    """Get (handler, retry policy, on_exhausted hook) for a job type, or None"""
+    return _job_handlers.get(job_type)
+
+
+def _run_exhausted_hook(job_id: str, job_type: str, payload: Dict, error: str) -> None:
+    """Run a job type's on_exhausted hook (errors are logged, not raised)"""
+    registered = get_job_handler(job_type)
+    if not registered or registered[2] is None:
+        return
+    try:
+        registered[2](payload, error)
+    except Exception as e:
+        print(f"⚠️  on_exhausted hook for job {job_id} failed: {e}")
+
+
+class JobQueue(ABC):
+    """
+    Interface for job queue backends
+    """
+
+    @abstractmethod
+    def enqueue(self, job_type: str, payload: Dict, job_id: Optional[str] = None,
+                state: Optional[Dict] = None, max_attempts: Optional[int] = None) -> str:
+        """
+        Add a job
+
+        Args:
+            job_type: Registered job type
+            payload: JSON arguments for the handler
+            job_id: Job ID (generated if omitted); doubles as the task_id clients poll
+            state: Initial state returned by status endpoints
+            max_attempts: Attempts allowed (default from the handler's retry policy)
+
+        Returns:
+            Job ID
+        """
+
+    @abstractmethod
+    def get_state(self, job_id: str) -> Optional[Dict]:
+        """Get a job's state dict, or None if the job does not exist"""
+
+    @abstractmethod
+    def update_state(self, job_id: str, state: Dict, owner: Optional[str] = None) -> bool:
+        """Replace a job's state; with an owner, only while that owner holds the lease"""
+
+    @abstractmethod
+    def claim(self, owner: str, job_types: List[str], lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[JobContext]:
+        """
+        Lease the oldest runnable job (queued, or running with an expired lease)
+
+        A reclaimed job already past max_attempts is failed (running its
+        on_exhausted hook) instead of being returned.
+        """
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, owner: str, lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+        """Extend a lease; False if the owner lost it"""
+
+    @abstractmethod
+    def complete(self, job_id: str, owner: str, state: Dict) -> bool:
+        """Mark a job done with its final state"""
+
+    @abstractmethod
+    def fail(self, job_id: str, owner: str, state: Dict, error: str, retry: RetryPolicy,
+             retryable: bool = True) -> bool:
+        """
+        Record a failed attempt: requeue it as "retrying", or fail the job and
+        run its on_exhausted hook
+
+        Returns:
+            True if the job was requeued (never when not retryable)
+        """
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get queue metadata (status, attempts, lease) for a job"""
+
+
+class DatabaseJobQueue(JobQueue):
+    """
+    Job queue stored in the application database (SQLite or Postgres)
+
+    Leases are taken with a conditional UPDATE, so only one worker wins a
+    job no matter how many processes poll.
+    """
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        """
+        Initialize database job queue
+
+        Args:
+            session_factory: SQLAlchemy session factory (default SessionLocal)
+        """
+        if session_factory is None:
+            from backend.database.base import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+
+    def enqueue(self, job_type: str, payload: Dict, job_id: Optional[str] = None,
+                state: Optional[Dict] = None, max_attempts: Optional[int] = None) -> str:
+        job_id = job_id or str(uuid.uuid4())
+        if max_attempts is None:
+            registered = get_job_handler(job_type)
+            max_attempts = (registered[1] if registered else DEFAULT_RETRY_POLICY).max_attempts
+
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            db.add(GenerationJob(
+                id=job_id,
+                job_type=job_type,
+                payload=_to_json(payload),
+                state=_to_json(state or {"task_id": job_id, "status": "pending", "progress": 0}),
+                status=JobStatus.QUEUED,
+                attempts=0,
+                max_attempts=max_attempts,
+                available_at=now,
+                created_at=now,
+                updated_at=now
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+        return job_id
+
+    def get_state(self, job_id: str) -> Optional[Dict]:
+        db = self.session_factory()
+        try:
+            job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+            return dict(job.state) if job else None
+        finally:
+            db.close()
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        db = self.session_factory()
+        try:
+            job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+            return job.to_dict() if job else None
+        finally:
+            db.close()
+
+    def update_state(self, job_id: str, state: Dict, owner: Optional[str] = None) -> bool:
+        return self._update(job_id, owner, state=_to_json(state))
+
+    def _update(self, job_id: str, owner: Optional[str], **values) -> bool:
+        """Conditional update of one job (only by the lease owner, if given)"""
+        values["updated_at"] = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            query = db.query(GenerationJob).filter(GenerationJob.id == job_id)
+            if owner is not None:
+                query = query.filter(
+                    GenerationJob.lease_owner == owner,
+                    GenerationJob.status == JobStatus.RUNNING
+                )
+            updated = query.update(values, synchronize_session=False)
+            db.commit()
+            return updated == 1
+        finally:
+            db.close()
+
+    def claim(self, owner: str, job_types: List[str], lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[JobContext]:
+        if not job_types:
+            return None
+
+        now = datetime.utcnow()
+        claimable = or_(
+            and_(GenerationJob.status == JobStatus.QUEUED, GenerationJob.available_at <= now),
+            and_(GenerationJob.status == JobStatus.RUNNING, GenerationJob.lease_expires_at < now)
+        )
+
+        db = self.session_factory()
+        try:
+            candidates = [
+                row[0] for row in db.query(GenerationJob.id)
+                .filter(GenerationJob.job_type.in_(job_types), claimable)
+                .order_by(GenerationJob.available_at, GenerationJob.created_at)
+                .limit(10)
+                .all()
+            ]
+
+            for job_id in candidates:
+                won = db.query(GenerationJob).filter(GenerationJob.id == job_id, claimable).update({
+                    "status": JobStatus.RUNNING,
+                    "lease_owner": owner,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "heartbeat_at": now,
+                    "attempts": GenerationJob.attempts + 1,
+                    "updated_at": now
+                }, synchronize_session=False)
+                db.commit()
+                if won != 1:
+                    continue  # Another worker got there first
+
+                job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+                if job.attempts > job.max_attempts:
+                    # Reclaimed after its workers kept dying - give up
+                    error = job.last_error or "Worker lost the job"
+                    state = dict(job.state)
+                    state.update(
+                        status="failed",
+                        error=error,
+                        message=f"Generation failed after {job.max_attempts} attempts"
+                    )
+                    if self._finish(job_id, owner, JobStatus.FAILED, state):
+                        _run_exhausted_hook(job_id, job.job_type, dict(job.payload), error)
+                    continue
+
+                return JobContext(self, job.id, job.job_type, dict(job.payload), dict(job.state),
+                                  job.attempts, owner, max_attempts=job.max_attempts)
+
+            return None
+        finally:
+            db.close()
+
+    def heartbeat(self, job_id: str, owner: str, lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+        now = datetime.utcnow()
+        return self._update(
+            job_id, owner,
+            heartbeat_at=now,
+            lease_expires_at=now + timedelta(seconds=lease_seconds)
+        )
+
+    def _finish(self, job_id: str, owner: str, status: str, state: Dict, error: Optional[str] = None) -> bool:
+        """Move a leased job to a terminal status"""
+        return self._update(
+            job_id, owner,
+            status=status,
+            state=_to_json(state),
+            last_error=error,
+            lease_owner=None,
+            lease_expires_at=None,
+            finished_at=datetime.utcnow()
+        )
+
+    def complete(self, job_id: str, owner: str, state: Dict) -> bool:
+        return self._finish(job_id, owner, JobStatus.COMPLETED, state)
+
+    def fail(self, job_id: str, owner: str, state: Dict, error: str, retry: RetryPolicy,
+             retryable: bool = True) -> bool:
+        db = self.session_factory()
+        try:
+            job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+            attempts = job.attempts if job else retry.max_attempts
+            max_attempts = job.max_attempts if job else retry.max_attempts
+            job_type = job.job_type if job else None
+            payload = dict(job.payload) if job else {}
+        finally:
+            db.close()
+
+        state = dict(state)
+        if retryable and attempts < max_attempts:
+            delay = retry.delay(attempts)
+            state.update(
+                status="retrying",
+                message=f"Attempt {attempts} failed ({error}); retrying in {delay:.0f}s"
+            )
+            return self._update(
+                job_id, owner,
+                status=JobStatus.QUEUED,
+                state=_to_json(state),
+                last_error=error,
+                lease_owner=None,
+                lease_expires_at=None,
+                available_at=datetime.utcnow() + timedelta(seconds=delay)
+            )
+
+        # Keep the handler's own failure message if it recorded one
+        message = state.get("message") if state.get("status") == "failed" else None
+        state.update(status="failed", error=error, message=message or f"Generation failed: {error}")
+        if self._finish(job_id, owner, JobStatus.FAILED, state, error=error) and job_type:
+            _run_exhausted_hook(job_id, job_type, payload, error)
+        return False
+
+
+class JobWorker:
+    """
+    Claims and runs jobs for every registered job type
+
+    Runs up to `concurrency` jobs at once. While a job runs its lease is
+    renewed every lease_seconds / 3; if the lease is lost (e.g. this worker
+    stalled and another took over) the job is cancelled here.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        concurrency: int = JOB_WORKER_CONCURRENCY,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        worker_id: Optional[str] = None
+    ):
+        """
+        Initialize worker
+
+        Args:
+            queue: Job queue to consume
+            concurrency: Maximum concurrent jobs
+            poll_interval: Seconds to sleep when no job is available
+            lease_seconds: Lease length renewed by heartbeats
+            worker_id: Lease owner name (default host:pid:random)
+        """
+        self.queue = queue
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._running: set = set()
+        self._stopping = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def start(self) -> asyncio.Task:
+        """Start the worker loop on the running event loop"""
+        self._stopping.clear()
+        self._loop_task = asyncio.create_task(self.run())
+        return self._loop_task
+
+    async def stop(self) -> None:
+        """Stop claiming jobs and cancel running ones (their leases expire and they are retried)"""
+        self._stopping.set()
+        for task in list(self._running):
+            task.cancel()
+        if self._loop_task:
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def run(self) -> None:
+        """Claim and run jobs until stop() is called"""
+        print(f"✅ Job worker {self.worker_id} started ({self.concurrency} slots)")
+        while not self._stopping.is_set():
+            job = None
+            if len(self._running) < self.concurrency:
+                try:
+                    job = await asyncio.to_thread(
+                        self.queue.claim, self.worker_id, list(_job_handlers), self.lease_seconds
+                    )
+                except Exception as e:
+                    print(f"⚠️  Job claim failed: {e}")
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self.run_job(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def run_job(self, job: JobContext) -> None:
+        """
+        Run one claimed job to completion, failure or lease loss
+
+        Args:
+            job: Claimed job
+        """
+        handler, retry, _ = get_job_handler(job.job_type)
+        work = asyncio.create_task(handler(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, work))
+
+        try:
+            await work
+        except asyncio.CancelledError:
+            job.cancel_pending_write()
+            if not heartbeat.done():
+                # Worker shutdown: leave the lease to expire so another worker retries
+                heartbeat.cancel()
+                raise
+            print(f"⚠️  Job {job.id} cancelled after losing its lease")
+            return
+        except JobFailed as e:
+            heartbeat.cancel()
+            job.cancel_pending_write()
+            print(f"❌ Job {job.id} failed: {e}")
+            await asyncio.to_thread(self.queue.fail, job.id, job.owner, job.state, str(e), retry, False)
+            return
+        except Exception as e:
+            heartbeat.cancel()
+            job.cancel_pending_write()
+            print(f"❌ Job {job.id} attempt {job.attempt} failed: {e}")
+            await asyncio.to_thread(self.queue.fail, job.id, job.owner, job.state, str(e), retry)
+            return
+
+        heartbeat.cancel()
+        job.cancel_pending_write()
+        await asyncio.to_thread(self.queue.complete, job.id, job.owner, job.state)
+
+    async def _heartbeat(self, job: JobContext, work: asyncio.Task) -> None:
+        """Renew the job's lease until it finishes; cancel it if the lease is lost"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                alive = await asyncio.to_thread(self.queue.heartbeat, job.id, job.owner, self.lease_seconds)
+            except Exception as e:
+                print(f"⚠️  Heartbeat for job {job.id} failed: {e}")
+                continue
+            if not alive:
+                work.cancel()
+                return
+
+
+# Singleton instance
+_job_queue: Optional[JobQueue] = None
+
+# JOB_QUEUE_BACKEND name -> JobQueue class
+JOB_QUEUE_BACKENDS = {
+    "database": DatabaseJobQueue,
+}
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get or create the job queue singleton
+
+    Returns:
+        JobQueue for the backend named by JOB_QUEUE_BACKEND (default "database")
+    """
+    global _job_queue
+
+    if _job_queue is None:
+        backend = os.getenv("JOB_QUEUE_BACKEND", "database").lower()
+        if backend not in JOB_QUEUE_BACKENDS:
+            supported = ", ".join(sorted(JOB_QUEUE_BACKENDS))
+            raise ValueError(f"Unknown JOB_QUEUE_BACKEND: {backend} (supported: {supported})")
+        _job_queue = JOB_QUEUE_BACKENDS[backend]()
+
+    return _job_queue
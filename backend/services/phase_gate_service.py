@@ -152,13 +152,21 @@ class PhaseGateService:
         required_docs = self.get_required_documents(phase_name)
         results = {}
         
+        # One query for the project's documents; each requirement is then
+        # matched case-insensitively as a substring of the document name
+        # (the rule the per-requirement ILIKE '%name%' queries applied)
+        documents = db.query(
+            ProjectDocument.id, ProjectDocument.document_name, ProjectDocument.status
+        ).filter(
+            ProjectDocument.project_id == project_id
+        ).order_by(ProjectDocument.display_order).all() if required_docs else []
+        
         for doc_name in required_docs:
-            # Query for the document in this project
-            # Use ILIKE for case-insensitive partial matching
-            document = db.query(ProjectDocument).filter(
-                ProjectDocument.project_id == project_id,
-                ProjectDocument.document_name.ilike(f"%{doc_name}%")
-            ).first()
+            needle = doc_name.casefold()
+            document = next(
+                (d for d in documents if needle in (d.document_name or '').casefold()),
+                None
+            )
             
             if document:
                 results[doc_name] = {
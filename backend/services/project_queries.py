@@ -0,0 +1,221 @@
+"""
+Project Queries: Read queries behind the document, approval and step endpoints
+
+Each function loads the rows an endpoint returns together with the users,
+documents and projects it reports on, using joined/select-in eager loading.
+The number of queries is fixed per call, however many rows come back,
+instead of one extra user or project lookup per row.
+
+Usage:
+    uploads = list_document_uploads(db, document_id)
+    approvals = list_pending_approvals(db, current_user.id)
+"""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from backend.models.document import (
+    ApprovalAuditLog, ApprovalStatus, DocumentApproval, DocumentUpload, ProjectDocument
+)
+from backend.models.procurement import ProcurementStep
+from backend.models.user import User
+
+
+def _user_summary(user: Optional[User], *fields: str) -> Optional[Dict]:
+    """Selected fields of a user, with id as a string"""
+    if user is None:
+        return None
+    return {field: str(user.id) if field == 'id' else getattr(user, field) for field in fields}
+
+
+def list_document_uploads(db: Session, document_id) -> List[Dict]:
+    """
+    Upload history for a document, newest version first, with uploader info
+
+    Args:
+        db: Database session
+        document_id: ProjectDocument ID
+
+    Returns:
+        List of upload dictionaries
+    """
+    uploads = db.query(DocumentUpload).options(
+        joinedload(DocumentUpload.uploader)
+    ).filter(
+        DocumentUpload.project_document_id == document_id
+    ).order_by(DocumentUpload.version_number.desc()).all()
+
+    uploads_data = []
+    for upload in uploads:
+        upload_dict = upload.to_dict()
+        if upload.uploader:
+            upload_dict["uploader"] = _user_summary(upload.uploader, "name", "email")
+        uploads_data.append(upload_dict)
+    return uploads_data
+
+
+def list_document_approvals(db: Session, document_id) -> List[Dict]:
+    """
+    Approval requests for a document, newest first, with approver info
+
+    Args:
+        db: Database session
+        document_id: ProjectDocument ID
+
+    Returns:
+        List of approval dictionaries
+    """
+    approvals = db.query(DocumentApproval).options(
+        joinedload(DocumentApproval.approver)
+    ).filter(
+        DocumentApproval.project_document_id == document_id
+    ).order_by(DocumentApproval.requested_at.desc()).all()
+
+    approval_list = []
+    for approval in approvals:
+        approval_dict = approval.to_dict()
+        if approval.approver:
+            approval_dict['approver'] = _user_summary(approval.approver, 'id', 'name', 'email')
+        approval_list.append(approval_dict)
+    return approval_list
+
+
+def list_pending_approvals(db: Session, approver_id) -> List[Dict]:
+    """
+    Pending approvals assigned to a user, newest first, with document and project info
+
+    Args:
+        db: Database session
+        approver_id: Approver's user ID
+
+    Returns:
+        List of approval dictionaries
+    """
+    approvals = db.query(DocumentApproval).options(
+        joinedload(DocumentApproval.document).joinedload(ProjectDocument.project)
+    ).filter(
+        DocumentApproval.approver_id == approver_id,
+        DocumentApproval.approval_status == ApprovalStatus.PENDING
+    ).order_by(DocumentApproval.requested_at.desc()).all()
+
+    approval_list = []
+    for approval in approvals:
+        approval_dict = approval.to_dict()
+
+        document = approval.document
+        if document:
+            approval_dict['document'] = {
+                'id': str(document.id),
+                'name': document.document_name,
+                'description': document.description,
+                'status': document.status.value,
+                'category': document.category
+            }
+
+            project = document.project
+            if project:
+                approval_dict['project'] = {
+                    'id': str(project.id),
+                    'name': project.name
+                }
+
+        approval_list.append(approval_dict)
+    return approval_list
+
+
+def get_approval_audit_trail(db: Session, approval_id) -> Optional[List[Dict]]:
+    """
+    Audit log entries for an approval, newest first, with the user who acted
+
+    Args:
+        db: Database session
+        approval_id: DocumentApproval ID
+
+    Returns:
+        List of audit log dictionaries, or None if the approval doesn't exist
+    """
+    approval_exists = db.query(DocumentApproval.id).filter(DocumentApproval.id == approval_id).first()
+    if not approval_exists:
+        return None
+
+    audit_logs = db.query(ApprovalAuditLog).options(
+        joinedload(ApprovalAuditLog.performer)
+    ).filter(
+        ApprovalAuditLog.approval_id == approval_id
+    ).order_by(ApprovalAuditLog.timestamp.desc()).all()
+
+    audit_trail = []
+    for log in audit_logs:
+        log_dict = log.to_dict()
+        if log.performer:
+            log_dict['performed_by_user'] = _user_summary(log.performer, 'id', 'name', 'email', 'role')
+        audit_trail.append(log_dict)
+    return audit_trail
+
+
+def get_document_approval_history(db: Session, document: ProjectDocument) -> List[Dict]:
+    """
+    Every approval of a document, newest first, each with its audit trail
+
+    Args:
+        db: Database session
+        document: The document
+
+    Returns:
+        List of approval dictionaries with approver, delegated_from and audit_trail
+    """
+    approvals = db.query(DocumentApproval).options(
+        joinedload(DocumentApproval.approver),
+        joinedload(DocumentApproval.delegated_from),
+        selectinload(DocumentApproval.audit_logs).joinedload(ApprovalAuditLog.performer)
+    ).filter(
+        DocumentApproval.project_document_id == document.id
+    ).order_by(DocumentApproval.requested_at.desc()).all()
+
+    history = []
+    for approval in approvals:
+        approval_dict = approval.to_dict()
+
+        if approval.approver:
+            approval_dict['approver'] = _user_summary(approval.approver, 'id', 'name', 'email', 'role')
+
+        if approval.delegated_from:
+            approval_dict['delegated_from'] = _user_summary(approval.delegated_from, 'id', 'name', 'email')
+
+        # audit_logs is ordered oldest first
+        approval_dict['audit_trail'] = []
+        for log in approval.audit_logs:
+            log_dict = log.to_dict()
+            if log.performer:
+                log_dict['performed_by_user'] = _user_summary(log.performer, 'id', 'name', 'email')
+            approval_dict['audit_trail'].append(log_dict)
+
+        history.append(approval_dict)
+    return history
+
+
+def list_project_steps(db: Session, project_id) -> List[Dict]:
+    """
+    Steps of a project in order, with assigned user info
+
+    Args:
+        db: Database session
+        project_id: ProcurementProject ID
+
+    Returns:
+        List of step dictionaries
+    """
+    steps = db.query(ProcurementStep).options(
+        joinedload(ProcurementStep.assigned_user)
+    ).filter(
+        ProcurementStep.project_id == project_id
+    ).order_by(ProcurementStep.step_order).all()
+
+    steps_data = []
+    for step in steps:
+        step_dict = step.to_dict()
+        if step.assigned_user:
+            step_dict["assigned_user"] = _user_summary(step.assigned_user, "name", "email")
+        steps_data.append(step_dict)
+    return steps_data
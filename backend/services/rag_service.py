@@ -6,15 +6,121 @@ for document upload, processing, and retrieval.
 
 This module wraps the existing Docling processor and VectorStore
 to make them available via API endpoints.
+
+Uploads are ingested by background jobs (see ingest_upload): Docling
+conversion runs on a process pool and embedding on a worker thread, so
+neither blocks the event loop. Vector store saves are coalesced, so a burst
+of uploads is persisted with one save instead of one per upload.
+
+Any API or worker process may run an ingestion job, so every write to the
+store happens inside VectorStore.exclusive_write(): the process takes the
+store's file lock, reloads it if another process saved since, applies its
+changes, saves and releases. The saved manifest tells other processes'
+registries to reload.
+
+Configuration (environment):
+- RAG_CONVERSION_WORKERS: Processes converting uploads (default 2)
+- RAG_SAVE_DELAY: Seconds a save waits for more changes to join it (default 2)
 """
 
+import asyncio
+import multiprocessing
 import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
 
+import numpy as np
+
 from backend.rag.docling_processor import DoclingProcessor
-from backend.rag.vector_store import VectorStore
+from backend.rag.ingestion import convert_file, init_conversion_worker
+from backend.rag.vector_store_registry import get_vector_store_registry
+
+
+RAG_CONVERSION_WORKERS = int(os.getenv("RAG_CONVERSION_WORKERS", 2))
+RAG_SAVE_DELAY = float(os.getenv("RAG_SAVE_DELAY", 2.0))
+
+# Ingestion stages reported in upload job state, with the progress at which each starts
+INGESTION_STAGES = {
+    "parsing": 10,
+    "chunking": 40,
+    "embedding": 50,
+    "indexing": 85,
+}
+
+
+@dataclass
+class PendingWrite:
+    """Embedded chunks of one upload, waiting for the next coalesced save"""
+    file_path: str
+    chunks: List
+    hashes: List[str]
+    embeddings: np.ndarray
+    replace_existing: bool = False
+
+
+class CoalescedSaver:
+    """
+    Runs a save at most once per delay window for any number of requests
+
+    The first request starts a timer; requests arriving before it fires
+    share the same save. Requests made while a save is running get the next
+    one, so every caller's changes are on disk when its future resolves.
+    """
+
+    def __init__(self, save: Callable[[], None], delay: float = RAG_SAVE_DELAY):
+        """
+        Initialize saver
+
+        Args:
+            save: Function that persists the changes
+            delay: Seconds to wait for more requests before saving
+        """
+        self._save = save
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._pending: Optional[Future] = None
+        self._timer: Optional[threading.Timer] = None
+        self.saves = 0
+
+    def request(self) -> Future:
+        """
+        Ask for a save
+
+        Returns:
+            Future resolved when a save that includes the caller's changes finishes
+        """
+        with self._lock:
+            if self._pending is None:
+                self._pending = Future()
+                self._timer = threading.Timer(self.delay, self._run)
+                self._timer.daemon = True
+                self._timer.start()
+            return self._pending
+
+    def flush(self) -> None:
+        """Run a pending save now (e.g. at shutdown)"""
+        with self._lock:
+            timer = self._timer
+        if timer is not None:
+            timer.cancel()
+            self._run()
+
+    def _run(self) -> None:
+        with self._lock:
+            future, self._pending, self._timer = self._pending, None, None
+        if future is None:
+            return
+        try:
+            self._save()
+            self.saves += 1
+            future.set_result(None)
+        except Exception as e:
+            print(f"❌ Vector store save failed: {e}")
+            future.set_exception(e)
 
 
 class RAGService:
@@ -52,15 +158,173 @@ class RAGService:
             chunk_overlap=chunk_overlap
         )
 
-        # Initialize vector store (uses existing FAISS setup)
-        self.vector_store = VectorStore(
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+        # Shared vector store (loaded on first use); agents read the same instance
+        self.vector_store = get_vector_store_registry().get(
+            vector_db_path,
             api_key=api_key,
-            embedding_dimension=384,
-            index_path=vector_db_path
+            embedding_dimension=384
         )
 
-        # Load existing vector store if available
-        self.vector_store.load()
+        # Uploads embedded but not yet in the store; added by the next save
+        self._pending_writes: List[PendingWrite] = []
+        self._pending_writes_lock = threading.Lock()
+        self.saver = CoalescedSaver(self._commit_writes)
+        self._conversion_pool: Optional[ProcessPoolExecutor] = None
+        self._conversion_pool_lock = threading.Lock()
+
+    def _get_conversion_pool(self) -> ProcessPoolExecutor:
+        """Create the upload conversion pool on first use"""
+        with self._conversion_pool_lock:
+            if self._conversion_pool is None:
+                # Spawned, not forked: the API process runs threads (event loop,
+                # torch) that a forked child would inherit in an unknown state
+                self._conversion_pool = ProcessPoolExecutor(
+                    max_workers=RAG_CONVERSION_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_conversion_worker,
+                    initargs=(self.chunk_size, self.chunk_overlap)
+                )
+            return self._conversion_pool
+
+    def _commit_writes(self) -> None:
+        """
+        Add every pending upload to the store and save it under the write lock
+
+        Runs on the saver's thread. Writes taken here are dropped if the
+        save fails; the waiting jobs fail and are retried.
+        """
+        with self._pending_writes_lock:
+            writes, self._pending_writes = self._pending_writes, []
+
+        with self.vector_store.exclusive_write():
+            replaced = [w.file_path for w in writes if w.replace_existing]
+            if replaced:
+                self.vector_store.delete_by_file_paths(replaced)
+            for write in writes:
+                self.vector_store.add_embedded(write.chunks, write.hashes, write.embeddings)
+            self.vector_store.save()
+
+    def shutdown(self) -> None:
+        """Persist pending changes and stop the conversion pool"""
+        self.saver.flush()
+        if self._conversion_pool is not None:
+            self._conversion_pool.shutdown(wait=False, cancel_futures=True)
+            self._conversion_pool = None
+
+    def save_upload(self, file_content: bytes, filename: str) -> Dict:
+        """
+        Store an uploaded file in the upload directory
+
+        Args:
+            file_content: Raw file bytes
+            filename: Original filename
+
+        Returns:
+            Dict with saved_as, file_path and upload_timestamp
+        """
+        # Generate unique filename to avoid collisions
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe_filename = f"{timestamp}_{filename}"
+        file_path = self.upload_dir / safe_filename
+
+        with open(file_path, 'wb') as f:
+            f.write(file_content)
+
+        return {
+            "saved_as": safe_filename,
+            "file_path": str(file_path),
+            "upload_timestamp": timestamp
+        }
+
+    @staticmethod
+    def _tag_chunks(chunks: List, filename: str, user_id: str, timestamp: str,
+                    metadata: Optional[Dict] = None) -> None:
+        """Add upload metadata to every chunk"""
+        for chunk in chunks:
+            chunk.metadata.update({
+                "uploaded_by": user_id,
+                "upload_timestamp": timestamp,
+                "original_filename": filename
+            })
+
+            # Add any custom metadata provided
+            if metadata:
+                chunk.metadata.update(metadata)
+
+    async def ingest_upload(
+        self,
+        file_path: str,
+        filename: str,
+        user_id: str,
+        upload_timestamp: str,
+        metadata: Optional[Dict] = None,
+        on_stage: Optional[Callable[[str, int], None]] = None,
+        replace_existing: bool = False
+    ) -> Dict:
+        """
+        Convert, embed and index a stored upload without blocking the event loop
+
+        Stages (reported through on_stage): parsing, chunking, embedding,
+        indexing. Chunks are embedded outside the store's write lock, then
+        added and saved by the next coalesced save (see _commit_writes).
+        Returns once that save has completed.
+
+        Args:
+            file_path: Path returned by save_upload
+            filename: Original filename
+            user_id: ID of user uploading the document
+            upload_timestamp: Timestamp returned by save_upload
+            metadata: Optional additional metadata
+            on_stage: Called with (stage, progress) as each stage starts
+            replace_existing: Remove chunks an earlier attempt stored for this file
+
+        Returns:
+            Dict with upload results and processing info
+        """
+        def stage(name: str):
+            if on_stage:
+                on_stage(name, INGESTION_STAGES[name])
+
+        loop = asyncio.get_running_loop()
+
+        stage("parsing")
+        _, _, chunks = await loop.run_in_executor(self._get_conversion_pool(), convert_file, file_path)
+
+        stage("chunking")
+        if not chunks:
+            return {
+                "success": False,
+                "error": "Failed to extract content from document",
+                "filename": filename
+            }
+        self._tag_chunks(chunks, filename, user_id, upload_timestamp, metadata)
+
+        stage("embedding")
+        hashes, embeddings, _ = await asyncio.to_thread(self.vector_store.embed_chunks, chunks)
+
+        stage("indexing")
+        with self._pending_writes_lock:
+            self._pending_writes.append(PendingWrite(
+                file_path=file_path,
+                chunks=chunks,
+                hashes=hashes,
+                embeddings=embeddings,
+                replace_existing=replace_existing
+            ))
+        await asyncio.wrap_future(self.saver.request())
+
+        return {
+            "success": True,
+            "filename": filename,
+            "saved_as": Path(file_path).name,
+            "file_path": file_path,
+            "chunks_created": len(chunks),
+            "file_size": os.path.getsize(file_path),
+            "message": f"Successfully processed {filename} into {len(chunks)} chunks"
+        }
 
     def upload_and_process_document(
         self,
@@ -70,7 +334,9 @@ class RAGService:
         metadata: Optional[Dict] = None
     ) -> Dict:
         """
-        Upload and process a document into the RAG system
+        Upload and process a document into the RAG system synchronously
+
+        The API uses save_upload + ingest_upload in a background job instead.
 
         Args:
             file_content: Raw file bytes
@@ -81,14 +347,9 @@ class RAGService:
         Returns:
             Dict with upload results and processing info
         """
-        # Generate unique filename to avoid collisions
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_filename = f"{timestamp}_{filename}"
-        file_path = self.upload_dir / safe_filename
-
-        # Save file to disk
-        with open(file_path, 'wb') as f:
-            f.write(file_content)
+        saved = self.save_upload(file_content, filename)
+        safe_filename = saved["saved_as"]
+        file_path = Path(saved["file_path"])
 
         # Process document with Docling processor
         try:
@@ -101,23 +362,13 @@ class RAGService:
                     "filename": filename
                 }
 
-            # Add user metadata to all chunks
-            for chunk in chunks:
-                chunk.metadata.update({
-                    "uploaded_by": user_id,
-                    "upload_timestamp": timestamp,
-                    "original_filename": filename
-                })
-
-                # Add any custom metadata provided
-                if metadata:
-                    chunk.metadata.update(metadata)
-
-            # Add chunks to vector store
-            self.vector_store.add_documents(chunks)
+            self._tag_chunks(chunks, filename, user_id, saved["upload_timestamp"], metadata)
 
-            # Save updated vector store
-            self.vector_store.save()
+            # Embed, then add chunks to the vector store and save it under the write lock
+            hashes, embeddings, _ = self.vector_store.embed_chunks(chunks)
+            with self.vector_store.exclusive_write():
+                self.vector_store.add_embedded(chunks, hashes, embeddings)
+                self.vector_store.save()
 
             return {
                 "success": True,
@@ -163,7 +414,36 @@ class RAGService:
             score_threshold=score_threshold
         )
 
-        # Format results
+        return self._format_results(results)
+
+    def search_documents_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        score_threshold: Optional[float] = None
+    ) -> List[List[Dict]]:
+        """
+        Search for several queries with one batched embedding and index lookup
+
+        Args:
+            queries: Search queries
+            k: Number of results per query
+            score_threshold: Optional similarity threshold
+
+        Returns:
+            One list of relevant chunks per query, in query order
+        """
+        results = self.vector_store.search_many(
+            queries=queries,
+            k=k,
+            score_threshold=score_threshold
+        )
+
+        return [self._format_results(query_results) for query_results in results]
+
+    @staticmethod
+    def _format_results(results: List) -> List[Dict]:
+        """Convert (chunk_dict, score) tuples to API result dicts"""
         formatted_results = []
         for chunk_dict, score in results:
             formatted_results.append({
@@ -246,8 +526,11 @@ class RAGService:
         file_path = matching_files[0]
         filename = file_path.name
         
-        # Delete chunks from vector store first
-        delete_result = self.vector_store.delete_by_source(filename)
+        # Delete chunks from vector store first, saving under the write lock
+        with self.vector_store.exclusive_write():
+            delete_result = self.vector_store.delete_by_source(filename)
+            if delete_result.get("success", False):
+                self.vector_store.save()
         
         # Check if vector store deletion succeeded before deleting the file
         # This prevents orphaned chunks if metadata doesn't match
@@ -274,9 +557,6 @@ class RAGService:
                 "warning": f"Chunks deleted but file could not be removed: {e}"
             }
         
-        # Save updated vector store
-        self.vector_store.save()
-        
         return {
             "success": True,
             "deleted_file": filename,
@@ -322,3 +602,9 @@ def initialize_rag_service(api_key: str) -> RAGService:
     global _rag_service
     _rag_service = RAGService(api_key=api_key)
     return _rag_service
+
+
+def shutdown_rag_service() -> None:
+    """Persist pending vector store changes and stop the conversion pool (called at shutdown)"""
+    if _rag_service is not None:
+        _rag_service.shutdown()
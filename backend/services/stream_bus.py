@@ -0,0 +1,190 @@
+"""
+Stream Bus
+
+Carries WebSocket room messages between processes. A generation job can run
+in any process with a JobWorker (an API process or
+backend.scripts.run_job_worker), but the client's socket is held by one API
+process, so token deltas and other room messages are published to the bus
+and every process delivers them to the sockets it holds.
+
+Without a bus (WS_STREAM_BUS_URL unset), messages only reach sockets in the
+process that sent them: streaming and guided flow updates then work only
+when the API runs as a single process with its in-process job worker.
+
+RedisStreamBus uses Redis pub/sub on one channel. Messages are sent in
+batches from a background task, merging token deltas for the same document
+section the way WebSocket connections do, so a fast stream costs a few
+publishes per flush interval rather than one per token.
+
+Configuration (environment):
+- WS_STREAM_BUS_URL: Redis URL, e.g. redis://localhost:6379/0 (default: no bus)
+- WS_STREAM_BUS_CHANNEL: Pub/sub channel (default "ws-messages")
+"""
+
+import os
+import json
+import uuid
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+
+# Seconds each publish waits while token deltas are queued so they merge
+STREAM_BUS_FLUSH_INTERVAL = float(os.getenv("WS_STREAM_FLUSH_INTERVAL", 0.05))
+
+# Called with (room, message) for each message published by another process
+Deliver = Callable[[str, Dict], None]
+
+
+class StreamBus(ABC):
+    """Cross-process fan-out for WebSocket room messages"""
+
+    @abstractmethod
+    async def start(self, deliver: Deliver) -> None:
+        """Start receiving messages published by other processes"""
+
+    @abstractmethod
+    def publish(self, room: str, message: Dict) -> None:
+        """Send a room message to the other processes (call on the event loop, never blocks)"""
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Send what is queued and stop receiving"""
+
+
+class RedisStreamBus(StreamBus):
+    """StreamBus over Redis pub/sub"""
+
+    def __init__(self, url: str, channel: str = "ws-messages", client=None):
+        """
+        Initialize Redis bus
+
+        Args:
+            url: Redis URL
+            channel: Pub/sub channel shared by every process
+            client: Existing redis.asyncio client (default: connect to url)
+        """
+        if client is None:
+            if aioredis is None:
+                raise ImportError("redis is required for WS_STREAM_BUS_URL (pip install redis)")
+            client = aioredis.from_url(url)
+        self.client = client
+        self.channel = channel
+        # Tags this process's publishes so it skips them when they come back
+        self.origin = uuid.uuid4().hex
+        self.pending: List[Tuple[str, Dict]] = []
+        # (room, document, section) -> token delta message still waiting in pending
+        self._deltas: Dict[tuple, Dict] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stopped = asyncio.Event()
+
+    async def start(self, deliver: Deliver) -> None:
+        self._wakeup = asyncio.Event()
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self.channel)
+        self._tasks = [
+            asyncio.create_task(self._send()),
+            asyncio.create_task(self._receive(pubsub, deliver)),
+        ]
+
+    def publish(self, room: str, message: Dict) -> None:
+        if self._wakeup is None or self._stopped.is_set():
+            return
+
+        message_type = message.get("type")
+        key = (room, message.get("document"), message.get("section"))
+
+        waiting = self._deltas.get(key) if message_type == "token_delta" else None
+        if waiting is not None:
+            waiting["delta"] += message["delta"]
+        else:
+            queued = dict(message)
+            self.pending.append((room, queued))
+            if message_type == "token_delta":
+                self._deltas[key] = queued
+            elif message_type == "token_stream_end":
+                # Text arriving after the end must not jump ahead of it
+                self._deltas.pop(key, None)
+
+        self._wakeup.set()
+
+    async def _send(self) -> None:
+        """Publish queued messages in batches until stopped"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            if self._deltas and STREAM_BUS_FLUSH_INTERVAL > 0:
+                # Let more deltas pile up (stop() sends right away)
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), STREAM_BUS_FLUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+
+            if self.pending:
+                batch, self.pending = self.pending, []
+                self._deltas.clear()
+                payload = json.dumps({"origin": self.origin, "messages": batch})
+                try:
+                    await self.client.publish(self.channel, payload)
+                except Exception as e:
+                    # Streaming is best effort; clients still poll job status
+                    print(f"⚠️  Stream bus publish failed: {e}")
+
+            if self._stopped.is_set():
+                return
+
+    async def _receive(self, pubsub, deliver: Deliver) -> None:
+        """Deliver batches published by other processes"""
+        while True:
+            try:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Stream bus receive failed: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if not message:
+                continue
+            try:
+                batch = json.loads(message["data"])
+            except (TypeError, ValueError) as e:
+                print(f"⚠️  Ignoring malformed stream bus message: {e}")
+                continue
+            if batch.get("origin") == self.origin:
+                continue
+            for room, room_message in batch.get("messages", []):
+                deliver(room, room_message)
+
+    async def stop(self) -> None:
+        if not self._tasks:
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        sender, receiver = self._tasks
+        receiver.cancel()
+        await asyncio.gather(sender, receiver, return_exceptions=True)
+        self._tasks = []
+
+
+def get_stream_bus() -> Optional[StreamBus]:
+    """
+    Create the stream bus configured by WS_STREAM_BUS_URL
+
+    Returns:
+        RedisStreamBus, or None if no bus is configured
+    """
+    url = os.getenv("WS_STREAM_BUS_URL", "")
+    if not url:
+        return None
+    if not url.startswith(("redis://", "rediss://", "unix://")):
+        raise ValueError(f"Unsupported WS_STREAM_BUS_URL: {url} (expected a Redis URL)")
+    return RedisStreamBus(url, channel=os.getenv("WS_STREAM_BUS_CHANNEL", "ws-messages"))
@@ -1,52 +1,281 @@
 """
 WebSocket connection manager for real-time updates
+
+Connections are grouped into rooms: a project ID for /ws/{project_id}, or
+"guided-flow-{document_id}" for the guided flow editor.
+
+Every connection gets its own outbound queue drained by a sender task, so a
+slow client never holds up the others (backpressure). While messages wait in
+the queue, token deltas for the same document section are merged into one
+message (even when several documents stream into a room at once), and each
+flush waits WS_STREAM_FLUSH_INTERVAL seconds once before sending everything
+queued so small deltas go out together. A client that falls more than
+WS_MAX_PENDING_MESSAGES behind is disconnected.
+
+Messages are also sent to the other API and job worker processes through a
+StreamBus (see stream_bus.py) when one is given, so a job streaming in one
+process reaches sockets held by another. Call start() on the event loop
+before publishing from a process that holds no sockets (e.g. a job worker).
+
+Token streaming messages:
+    {"type": "token_delta", "document": ..., "section": n, "delta": "..."}
+    {"type": "token_stream_end", "document": ..., "section": n}
+    {"type": "token_stream_end", "document": ..., "section": n, "aborted": true}
+        when the LLM call failed part way; discard the section's text
 """
 from fastapi import WebSocket
-from typing import Dict, List
-import json
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import asyncio
+import os
+
+from backend.services.stream_bus import StreamBus
+
+
+# Seconds each flush waits while token deltas are queued so small deltas coalesce
+STREAM_FLUSH_INTERVAL = float(os.getenv("WS_STREAM_FLUSH_INTERVAL", 0.05))
+# Queued messages per connection before the client is considered stalled
+MAX_PENDING_MESSAGES = int(os.getenv("WS_MAX_PENDING_MESSAGES", 500))
+# Seconds a single send may take before the client is considered stalled
+SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", 10))
+
+
+class ConnectionSender:
+    """Outbound message queue for one WebSocket connection"""
+
+    def __init__(self, websocket: WebSocket, on_stalled: Optional[Callable[["ConnectionSender"], None]] = None):
+        """
+        Initialize sender and start its drain task
+
+        Args:
+            websocket: Accepted WebSocket
+            on_stalled: Called once if the client stops keeping up
+        """
+        self.websocket = websocket
+        self.on_stalled = on_stalled
+        self.pending: deque = deque()
+        # (document, section) -> token delta message still waiting in pending
+        self._deltas: Dict[tuple, dict] = {}
+        self.closed = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._drain())
+
+    def put(self, message: dict) -> bool:
+        """
+        Queue a message, merging it into a waiting token delta where possible
+
+        A token delta joins the queued delta for the same document section
+        wherever it sits in the queue, so interleaved streams still merge.
+
+        Args:
+            message: JSON-serializable message
+
+        Returns:
+            False if the connection is closed or stalled
+        """
+        if self.closed:
+            return False
+
+        message_type = message.get("type")
+        key = (message.get("document"), message.get("section"))
+
+        waiting = self._deltas.get(key) if message_type == "token_delta" else None
+        if waiting is not None:
+            waiting["delta"] += message["delta"]
+        elif len(self.pending) >= MAX_PENDING_MESSAGES:
+            self._stall("too many pending messages")
+            return False
+        else:
+            queued = dict(message)
+            self.pending.append(queued)
+            if message_type == "token_delta":
+                self._deltas[key] = queued
+            elif message_type == "token_stream_end":
+                # Text arriving after the end must not jump ahead of it
+                self._deltas.pop(key, None)
+
+        self._wakeup.set()
+        return True
+
+    async def _drain(self):
+        """Send queued messages in order until closed"""
+        while not self.closed:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            if self._deltas and STREAM_FLUSH_INTERVAL > 0:
+                # Let more deltas pile up, then send everything queued
+                await asyncio.sleep(STREAM_FLUSH_INTERVAL)
+
+            while self.pending and not self.closed:
+                message = self.pending.popleft()
+                if message.get("type") == "token_delta":
+                    key = (message.get("document"), message.get("section"))
+                    if self._deltas.get(key) is message:
+                        del self._deltas[key]
+                try:
+                    await asyncio.wait_for(self.websocket.send_json(message), timeout=SEND_TIMEOUT)
+                except asyncio.TimeoutError:
+                    self._stall("send timed out")
+                except Exception as e:
+                    print(f"Error sending message: {e}")
+                    self._stall(str(e))
+
+    def _stall(self, reason: str):
+        """Stop sending to a client that can't keep up"""
+        if self.closed:
+            return
+        print(f"⚠️  Dropping slow WebSocket client: {reason}")
+        self.close()
+        if self.on_stalled:
+            self.on_stalled(self)
+
+    def close(self):
+        """Stop the drain task and discard queued messages"""
+        self.closed = True
+        self.pending.clear()
+        self._deltas.clear()
+        self._wakeup.set()
 
 
 class WebSocketManager:
     """Manages WebSocket connections for real-time updates"""
 
-    def __init__(self):
-        # Dictionary of project_id -> list of active WebSocket connections
+    def __init__(self, bus: Optional[StreamBus] = None):
+        """
+        Initialize manager
+
+        Args:
+            bus: Carries room messages to and from other processes (default: this process only)
+        """
+        self.bus = bus
+        # Dictionary of room (project_id, guided-flow-{document_id}, ...) -> active connections
         self.active_connections: Dict[str, List[WebSocket]] = {}
+        self._senders: Dict[WebSocket, ConnectionSender] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self):
+        """Bind to the running event loop and start receiving from the bus"""
+        self._loop = asyncio.get_running_loop()
+        if self.bus:
+            await self.bus.start(self._deliver)
 
-    async def connect(self, websocket: WebSocket, project_id: str):
-        """Accept and register a new WebSocket connection"""
+    async def stop(self):
+        """Send what the bus has queued and stop receiving"""
+        if self.bus:
+            await self.bus.stop()
+
+    async def connect(self, websocket: WebSocket, project_id: str = None, room: str = None):
+        """Accept and register a new WebSocket connection in a room (default: the project)"""
+        room = room or project_id
         await websocket.accept()
+        self._loop = asyncio.get_running_loop()
 
-        if project_id not in self.active_connections:
-            self.active_connections[project_id] = []
+        if room not in self.active_connections:
+            self.active_connections[room] = []
 
-        self.active_connections[project_id].append(websocket)
-        print(f"✅ WebSocket connected for project {project_id}")
+        self.active_connections[room].append(websocket)
+        self._senders[websocket] = ConnectionSender(
+            websocket,
+            on_stalled=lambda sender: self.disconnect(websocket, room)
+        )
+        print(f"✅ WebSocket connected for {room}")
 
-    def disconnect(self, websocket: WebSocket, project_id: str):
+    def disconnect(self, websocket: WebSocket, project_id: str = None, room: str = None):
         """Remove a WebSocket connection"""
-        if project_id in self.active_connections:
-            self.active_connections[project_id].remove(websocket)
+        room = room or project_id
+        if websocket in self.active_connections.get(room, []):
+            self.active_connections[room].remove(websocket)
 
             # Clean up empty lists
-            if not self.active_connections[project_id]:
-                del self.active_connections[project_id]
+            if not self.active_connections[room]:
+                del self.active_connections[room]
 
-        print(f"❌ WebSocket disconnected for project {project_id}")
+        sender = self._senders.pop(websocket, None)
+        if sender:
+            sender.close()
 
-    async def send_message(self, project_id: str, message: dict):
-        """Send a message to all connections for a specific project"""
-        if project_id in self.active_connections:
-            for connection in self.active_connections[project_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    print(f"Error sending message: {e}")
+        print(f"❌ WebSocket disconnected for {room}")
+
+    def publish(self, room: str, message: dict, exclude: Optional[WebSocket] = None):
+        """
+        Queue a message for every connection in a room without waiting
+
+        Safe to call from any thread (e.g. agents running in worker threads).
+        With a bus, the message also reaches the room's connections in other
+        processes.
 
-    async def broadcast(self, message: dict):
-        """Broadcast a message to all connected clients"""
-        for project_id in self.active_connections:
-            await self.send_message(project_id, message)
+        Args:
+            room: Room name (project ID or other room)
+            message: JSON-serializable message
+            exclude: Optional connection to skip (e.g. the sender)
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+
+        if on_loop:
+            self._enqueue(room, message, exclude)
+        else:
+            loop.call_soon_threadsafe(self._enqueue, room, message, exclude)
+
+    def _enqueue(self, room: str, message: dict, exclude: Optional[WebSocket] = None):
+        self._deliver(room, message, exclude)
+        if self.bus:
+            self.bus.publish(room, message)
+
+    def _deliver(self, room: str, message: dict, exclude: Optional[WebSocket] = None):
+        """Queue a message for this process's connections in a room"""
+        for connection in list(self.active_connections.get(room, [])):
+            sender = self._senders.get(connection)
+            if connection is not exclude and sender:
+                sender.put(message)
+
+    async def send_message(self, project_id: str, message: dict, exclude: Optional[WebSocket] = None):
+        """Send a message to all connections for a specific project (or room)"""
+        self.publish(project_id, message, exclude=exclude)
+
+    async def broadcast(self, message: dict, room: str = None, exclude: Optional[WebSocket] = None):
+        """Broadcast a message to one room, or to all connected clients"""
+        rooms = [room] if room else list(self.active_connections)
+        for target in rooms:
+            await self.send_message(target, message, exclude=exclude)
+
+    def send_token_delta(self, rooms: List[str], document: str, section: int, delta: str):
+        """
+        Stream a generated text delta (thread-safe, coalesced per connection)
+
+        Args:
+            rooms: Rooms to send to
+            document: Document being generated
+            section: Section number (one per LLM call) within the document
+            delta: New text
+        """
+        for room in rooms:
+            self.publish(room, {
+                "type": "token_delta",
+                "document": document,
+                "section": section,
+                "delta": delta
+            })
+
+    def send_token_stream_end(self, rooms: List[str], document: str, section: int, aborted: bool = False):
+        """Mark the end of a streamed section, or that it was abandoned part way (thread-safe)"""
+        message = {
+            "type": "token_stream_end",
+            "document": document,
+            "section": section
+        }
+        if aborted:
+            message["aborted"] = True
+        for room in rooms:
+            self.publish(room, dict(message))
 
     async def send_progress_update(
         self,
@@ -94,7 +323,5 @@ class WebSocketManager:
         })
 
 
-from datetime import datetime
-
 # Global instance
 ws_manager = WebSocketManager()
@@ -0,0 +1,142 @@
+"""
+Unit tests for LLMResponseCache and BaseAgent response caching
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.agents.llm_cache import LLMResponseCache
+from backend.agents.base_agent import BaseAgent
+
+
+def _mock_response(text: str):
+    return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+class TestLLMResponseCache:
+    """Test suite for LLMResponseCache"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return LLMResponseCache(db_path=str(tmp_path / "cache.db"), max_entries=2)
+
+    def test_key_depends_on_all_parameters(self):
+        """Changing any request parameter changes the key"""
+        base = LLMResponseCache.make_key("m", "sys", "p", 0.0, 100)
+        assert base == LLMResponseCache.make_key("m", "sys", "p", 0.0, 100)
+        assert base != LLMResponseCache.make_key("m2", "sys", "p", 0.0, 100)
+        assert base != LLMResponseCache.make_key("m", None, "p", 0.0, 100)
+        assert base != LLMResponseCache.make_key("m", "sys", "p2", 0.0, 100)
+        assert base != LLMResponseCache.make_key("m", "sys", "p", 0.5, 100)
+        assert base != LLMResponseCache.make_key("m", "sys", "p", 0.0, 200)
+
+    def test_memory_lru_eviction_falls_back_to_disk(self, cache):
+        """Entries evicted from memory are still served from SQLite"""
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.set("c", "C")  # evicts "a" from memory
+
+        assert cache.get("a") == "A"
+        stats = cache.get_statistics()
+        assert stats['disk_hits'] == 1
+        assert stats['memory_entries'] == 2
+
+    def test_ttl_expiry(self, cache):
+        """Expired entries are misses in both tiers"""
+        cache.set("a", "A", ttl_seconds=0)
+        time.sleep(0.01)
+
+        assert cache.get("a") is None
+        assert cache.get_statistics()['misses'] == 1
+
+    def test_get_from_memory_never_reads_disk(self, cache):
+        """The memory-only lookup misses on entries only SQLite holds"""
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.set("c", "C")  # evicts "a" from memory
+
+        assert cache.get_from_memory("a") is None
+        assert cache.get_from_memory("c") == "C"
+        assert cache.get_statistics()['memory_hits'] == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        """The disk tier survives a new cache instance"""
+        db_path = str(tmp_path / "cache.db")
+        LLMResponseCache(db_path=db_path).set("a", "A")
+
+        assert LLMResponseCache(db_path=db_path).get("a") == "A"
+
+
+class TestBaseAgentResponseCache:
+    """Test BaseAgent cache integration"""
+
+    def _agent(self, tmp_path, temperature):
+        agent = BaseAgent(name="Test", api_key="test-key", temperature=temperature)
+        agent.client = Mock()
+        agent.client.messages.create.return_value = _mock_response("answer")
+        agent.enable_response_cache(cache=LLMResponseCache(db_path=str(tmp_path / "cache.db")))
+        return agent
+
+    def test_repeated_call_served_from_cache(self, tmp_path):
+        agent = self._agent(tmp_path, temperature=0.0)
+
+        assert agent.call_llm("prompt", max_tokens=10) == "answer"
+        assert agent.call_llm("prompt", max_tokens=10) == "answer"
+        assert agent.client.messages.create.call_count == 1
+
+    def test_nonzero_temperature_bypasses_cache_unless_forced(self, tmp_path):
+        agent = self._agent(tmp_path, temperature=0.7)
+
+        agent.call_llm("prompt", max_tokens=10)
+        agent.call_llm("prompt", max_tokens=10)
+        assert agent.client.messages.create.call_count == 2
+
+        agent.response_cache_force = True
+        agent.call_llm("prompt", max_tokens=10)
+        agent.call_llm("prompt", max_tokens=10)
+        assert agent.client.messages.create.call_count == 3
+
+    def test_async_call_keeps_sqlite_off_the_event_loop(self, tmp_path, monkeypatch):
+        agent = self._agent(tmp_path, temperature=0.0)
+        cache = agent.response_cache
+        disk_threads = []
+
+        for name in ("get", "set"):
+            original = getattr(cache, name)
+
+            def recording(*args, _original=original, **kwargs):
+                disk_threads.append(threading.current_thread())
+                return _original(*args, **kwargs)
+
+            monkeypatch.setattr(cache, name, recording)
+
+        async def create(**kwargs):
+            return _mock_response("async answer")
+
+        client = SimpleNamespace(messages=SimpleNamespace(create=Mock(side_effect=create)))
+        monkeypatch.setattr("backend.agents.base_agent.get_async_client", lambda api_key=None: client)
+
+        async def run():
+            first = await agent.call_llm_async("prompt", max_tokens=10)
+            calls_after_miss = len(disk_threads)
+            second = await agent.call_llm_async("prompt", max_tokens=10)
+            return first, second, calls_after_miss, threading.current_thread()
+
+        first, second, calls_after_miss, loop_thread = asyncio.run(run())
+
+        assert first == second == "async answer"
+        assert client.messages.create.call_count == 1
+        # Miss: SQLite lookup and write, both in threads; hit: memory only
+        assert calls_after_miss == 2
+        assert len(disk_threads) == 2
+        assert loop_thread not in disk_threads
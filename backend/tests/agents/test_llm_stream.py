@@ -0,0 +1,185 @@
+"""
+Unit tests for token streaming
+
+Tests TokenStream context propagation and BaseAgent streaming calls.
+"""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.agents.base_agent import BaseAgent
+from backend.agents.llm_stream import TokenStream, get_token_stream, stream_llm_tokens
+
+
+class FakeSyncStream:
+    """Stands in for the SDK's MessageStream context manager"""
+
+    def __init__(self, deltas):
+        self.text_stream = self._deltas(deltas)
+
+    @staticmethod
+    def _deltas(deltas):
+        for delta in deltas:
+            if isinstance(delta, Exception):
+                raise delta
+            yield delta
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeAsyncStream:
+    """Stands in for the SDK's AsyncMessageStream context manager"""
+
+    def __init__(self, deltas):
+        self._deltas = deltas
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        async def gen():
+            for delta in self._deltas:
+                yield delta
+        return gen()
+
+
+def recording_stream():
+    events = []
+    stream = TokenStream(
+        on_delta=lambda section, delta: events.append((section, delta)),
+        on_section_end=lambda section: events.append((section, None)),
+        on_section_abort=lambda section: events.append((section, "<aborted>"))
+    )
+    return stream, events
+
+
+class TestTokenStreamContext:
+    """Test the active stream context"""
+
+    def test_no_stream_by_default(self):
+        assert get_token_stream() is None
+
+    def test_stream_visible_in_worker_threads(self):
+        stream, _ = recording_stream()
+
+        async def run():
+            with stream_llm_tokens(stream):
+                return await asyncio.to_thread(get_token_stream)
+
+        assert asyncio.run(run()) is stream
+        assert get_token_stream() is None
+
+    def test_concurrent_tasks_keep_their_own_stream(self):
+        first, _ = recording_stream()
+        second, _ = recording_stream()
+
+        async def use(stream):
+            with stream_llm_tokens(stream):
+                await asyncio.sleep(0.01)
+                return get_token_stream()
+
+        async def run():
+            return await asyncio.gather(use(first), use(second))
+
+        assert asyncio.run(run()) == [first, second]
+
+    def test_callback_errors_are_swallowed(self):
+        stream = TokenStream(on_delta=Mock(side_effect=RuntimeError("socket gone")))
+        stream.write(0, "text")
+
+
+class TestBaseAgentStreaming:
+    """Test BaseAgent streaming calls"""
+
+    def _agent(self):
+        agent = BaseAgent(name="Test", api_key="test-key", temperature=0)
+        agent.client = Mock()
+        agent.client.messages.stream.return_value = FakeSyncStream(["Hel", "lo"])
+        return agent
+
+    def test_call_llm_without_stream_uses_create(self):
+        agent = self._agent()
+        agent.client.messages.create.return_value = Mock(content=[Mock(text="whole")])
+
+        assert agent.call_llm("prompt") == "whole"
+        agent.client.messages.stream.assert_not_called()
+
+    def test_call_llm_streams_deltas_as_sections(self):
+        agent = self._agent()
+        stream, events = recording_stream()
+
+        with stream_llm_tokens(stream):
+            first = agent.call_llm("prompt")
+            agent.client.messages.stream.return_value = FakeSyncStream(["again"])
+            second = agent.call_llm("prompt 2")
+
+        assert (first, second) == ("Hello", "again")
+        assert events == [(0, "Hel"), (0, "lo"), (0, None), (1, "again"), (1, None)]
+        agent.client.messages.create.assert_not_called()
+
+    def test_failed_call_aborts_its_section(self):
+        agent = self._agent()
+        agent.client.messages.stream.return_value = FakeSyncStream(["Hel", RuntimeError("rate limited")])
+        stream, events = recording_stream()
+
+        with stream_llm_tokens(stream):
+            with pytest.raises(RuntimeError):
+                agent.call_llm("prompt")
+
+        assert events == [(0, "Hel"), (0, "<aborted>")]
+
+    def test_cached_response_streamed_whole(self, tmp_path):
+        from backend.agents.llm_cache import LLMResponseCache
+
+        agent = self._agent()
+        agent.enable_response_cache(cache=LLMResponseCache(db_path=str(tmp_path / "cache.db")))
+        stream, events = recording_stream()
+
+        with stream_llm_tokens(stream):
+            agent.call_llm("prompt")
+            agent.call_llm("prompt")
+
+        assert agent.client.messages.stream.call_count == 1
+        assert events[-2:] == [(1, "Hello"), (1, None)]
+
+    def test_call_llm_async_streams(self):
+        agent = self._agent()
+        client = Mock()
+        client.messages.stream.return_value = FakeAsyncStream(["a", "b", "c"])
+        stream, events = recording_stream()
+
+        async def run():
+            with stream_llm_tokens(stream):
+                return await agent.call_llm_async("prompt")
+
+        with patch("backend.agents.base_agent.get_async_client", return_value=client):
+            text = asyncio.run(run())
+
+        assert text == "abc"
+        assert events == [(0, "a"), (0, "b"), (0, "c"), (0, None)]
+
+    def test_stream_llm_yields_deltas(self):
+        agent = self._agent()
+        client = Mock()
+        client.messages.stream.return_value = FakeAsyncStream(["x", "y"])
+
+        async def run():
+            return [delta async for delta in agent.stream_llm("prompt")]
+
+        with patch("backend.agents.base_agent.get_async_client", return_value=client):
+            assert asyncio.run(run()) == ["x", "y"]
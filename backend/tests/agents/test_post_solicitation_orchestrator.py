@@ -0,0 +1,156 @@
+"""
+Unit tests for PostSolicitationOrchestrator
+
+Tests the concurrent per-offeror fan-out and the barrier before the SSDD
+and award phases.
+"""
+
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.agents.post_solicitation_orchestrator import PostSolicitationOrchestrator
+
+
+class Tracker:
+    """Shared by every fake agent (and its forks) to record calls"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fan_out_done = 0
+        self.fan_out_done_at_ssdd = None
+        self.fail_on = None
+        self._lock = threading.Lock()
+
+    def run(self, kind: str, label: str) -> str:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if self.fail_on and self.fail_on == label:
+                raise RuntimeError(f"{label} failed")
+            return f"{kind}: {label}"
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                if kind in ('ppq', 'scorecard', 'debriefing'):
+                    self.fan_out_done += 1
+
+
+class FakeAgent:
+    """Generates '<kind>: <name>' documents"""
+
+    def __init__(self, kind: str, tracker: Tracker, name_of=None):
+        self.kind = kind
+        self.tracker = tracker
+        self.name_of = name_of or (lambda task: self.kind)
+        self.reference = None
+
+    def execute(self, task):
+        # Per-call instance state, as the real agents keep
+        self.reference = self.name_of(task)
+        if self.kind == 'ssdd':
+            self.tracker.fan_out_done_at_ssdd = self.tracker.fan_out_done
+        content = self.tracker.run(self.kind, self.reference)
+        assert self.reference == self.name_of(task)
+        return {'content': content}
+
+    def save_to_file(self, content, output_path, convert_to_pdf=True):
+        return {'markdown': output_path, 'content': content}
+
+
+class FakeScorecardAgent(FakeAgent):
+    EVALUATION_FACTORS = ['Technical Approach', 'Cost/Price']
+
+    def generate_factor_scorecard(self, solicitation_info, section_m_content, factor, config):
+        return self.tracker.run('scorecard', f"{config['offeror_name']}/{factor}")
+
+    def build_scorecard_set(self, scorecards, solicitation_info):
+        return {'status': 'success', 'scorecards': scorecards}
+
+
+def make_orchestrator(tracker: Tracker, max_workers: int) -> PostSolicitationOrchestrator:
+    """Orchestrator wired to fake agents, skipping real agent construction"""
+    orchestrator = PostSolicitationOrchestrator.__new__(PostSolicitationOrchestrator)
+    orchestrator.max_workers = max_workers
+    orchestrator.ssp_gen = FakeAgent('ssp', tracker)
+    orchestrator.ppq_gen = FakeAgent('ppq', tracker, lambda t: t['reference_info']['offeror_name'])
+    orchestrator.eval_scorecard_gen = FakeScorecardAgent('scorecard', tracker)
+    orchestrator.ssdd_gen = FakeAgent('ssdd', tracker)
+    orchestrator.sf26_gen = FakeAgent('sf26', tracker)
+    orchestrator.award_notification_gen = FakeAgent('notification', tracker)
+    orchestrator.debriefing_gen = FakeAgent('debriefing', tracker, lambda t: t['offeror_evaluation']['name'])
+    return orchestrator
+
+
+OFFERORS = [{'name': f'Offeror {i}', 'cost': f'${i}M'} for i in range(1, 6)]
+
+
+def run_workflow(orchestrator, offerors=OFFERORS):
+    return orchestrator.execute_complete_workflow(
+        solicitation_info={'solicitation_number': 'W911-25-R-0001'},
+        section_m_content='Section M',
+        offerors=offerors,
+        recommended_awardee='Offeror 2',
+        output_dir='out'
+    )
+
+
+class TestExecuteCompleteWorkflow:
+    """Test the per-offeror fan-out"""
+
+    def test_results_match_offerors(self):
+        results = run_workflow(make_orchestrator(Tracker(delay=0.01), max_workers=4))
+
+        assert results['workflow_status'] == 'completed'
+        assert results['phases_completed'] == ['ssp', 'ppq', 'evaluation', 'ssdd', 'sf26', 'notifications', 'debriefing']
+        assert [p['content'] for p in results['ppqs']] == [f"ppq: {o['name']}" for o in OFFERORS]
+        assert list(results['scorecards']) == [o['name'] for o in OFFERORS]
+        assert results['scorecards']['Offeror 3']['scorecards'] == {
+            'Technical Approach': 'scorecard: Offeror 3/Technical Approach',
+            'Cost/Price': 'scorecard: Offeror 3/Cost/Price',
+        }
+        assert [d['markdown'] for d in results['debriefings']] == [
+            f"out/debriefing/debriefing_offeror_{i}.md" for i in (1, 3, 4, 5)
+        ]
+
+    def test_runs_concurrently_up_to_cap(self):
+        tracker = Tracker(delay=0.05)
+
+        run_workflow(make_orchestrator(tracker, max_workers=3))
+
+        assert tracker.max_in_flight == 3
+
+    def test_single_worker_runs_serially(self):
+        tracker = Tracker(delay=0.01)
+
+        run_workflow(make_orchestrator(tracker, max_workers=1))
+
+        assert tracker.max_in_flight == 1
+
+    def test_ssdd_waits_for_every_offeror_document(self):
+        tracker = Tracker(delay=0.01)
+
+        run_workflow(make_orchestrator(tracker, max_workers=4))
+
+        # 5 PPQs + 5 x 2 scorecards + 4 debriefings
+        assert tracker.fan_out_done_at_ssdd == 19
+
+    def test_failure_propagates_before_award(self):
+        tracker = Tracker(delay=0.01)
+        tracker.fail_on = 'Offeror 4/Cost/Price'
+        orchestrator = make_orchestrator(tracker, max_workers=4)
+
+        with pytest.raises(RuntimeError, match='Offeror 4/Cost/Price failed'):
+            run_workflow(orchestrator)
+
+        assert tracker.fan_out_done_at_ssdd is None
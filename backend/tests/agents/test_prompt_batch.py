@@ -0,0 +1,121 @@
+"""
+Unit tests for PromptBatch
+
+Tests concurrent execution, dependency ordering, failure handling, and that
+the active token stream reaches pool threads.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.agents.llm_stream import TokenStream, get_token_stream, stream_llm_tokens
+from backend.agents.prompt_batch import PromptBatch
+
+
+class FakeAgent:
+    """Minimal agent that echoes prompts and tracks concurrency"""
+
+    def __init__(self, delay: float = 0.05, fail_on: str = None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.logs = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def log(self, message: str, level: str = "INFO"):
+        self.logs.append((level, message))
+
+    def _enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _exit(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def call_llm(self, prompt, max_tokens=4000, system_prompt=None):
+        self._enter()
+        try:
+            time.sleep(self.delay)
+            if self.fail_on and self.fail_on in prompt:
+                raise RuntimeError("boom")
+            return f"  {prompt.upper()}  "
+        finally:
+            self._exit()
+
+    async def call_llm_async(self, prompt, max_tokens=4000, system_prompt=None):
+        self._enter()
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_on and self.fail_on in prompt:
+                raise RuntimeError("boom")
+            return f"  {prompt.upper()}  "
+        finally:
+            self._exit()
+
+
+class TestPromptBatch:
+    """Test suite for PromptBatch"""
+
+    def _build(self, agent, max_concurrency=3):
+        batch = PromptBatch(agent, max_concurrency=max_concurrency)
+        for i in range(6):
+            batch.add(f"p{i}", f"prompt {i}", max_tokens=100)
+        batch.add("summary", lambda r: f"after {r.get('p0', 'none')}", depends_on=["p0"])
+        return batch
+
+    def test_run_concurrent_and_capped(self):
+        """Independent prompts overlap but never exceed the cap"""
+        agent = FakeAgent()
+        results = self._build(agent).run()
+
+        assert list(results) == [f"p{i}" for i in range(6)] + ["summary"]
+        assert results["p3"] == "PROMPT 3"
+        assert results["summary"] == "AFTER PROMPT 0"
+        assert 1 < agent.max_in_flight <= 3
+
+    def test_run_async_matches_sync(self):
+        """Async runner produces the same results"""
+        agent = FakeAgent()
+        results = asyncio.run(self._build(agent).run_async())
+
+        assert results["summary"] == "AFTER PROMPT 0"
+        assert 1 < agent.max_in_flight <= 3
+
+    def test_failure_is_logged_and_dependents_still_run(self):
+        """A failed prompt is omitted and its dependents see it missing"""
+        agent = FakeAgent(fail_on="prompt 0")
+        results = self._build(agent).run()
+
+        assert "p0" not in results
+        assert results["summary"] == "AFTER NONE"
+        assert any(level == "WARNING" and "p0" in msg for level, msg in agent.logs)
+
+    def test_unknown_dependency_rejected(self):
+        """Dependencies must be registered first"""
+        batch = PromptBatch(FakeAgent())
+        with pytest.raises(ValueError):
+            batch.add("a", "text", depends_on=["missing"])
+
+    def test_run_threads_see_active_token_stream(self):
+        """Prompts run on the pool still stream to the caller's TokenStream"""
+        agent = FakeAgent(delay=0.01)
+        seen = []
+        agent.call_llm = lambda prompt, max_tokens=4000, system_prompt=None: seen.append(get_token_stream()) or prompt
+        stream = TokenStream(on_delta=lambda section, delta: None)
+
+        with stream_llm_tokens(stream):
+            self._build(agent).run()
+
+        assert len(seen) == 7
+        assert all(s is stream for s in seen)
@@ -0,0 +1,67 @@
+"""
+Unit tests for ChunkStore
+"""
+
+import pytest
+import sys
+import numpy as np
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.rag.chunk_store import ChunkStore, StoredChunk
+
+
+def _chunk(i: int, source: str = "a.pdf") -> StoredChunk:
+    return StoredChunk(content=f"text {i}", metadata={'source': source, 'page': i}, chunk_id=f"c{i}")
+
+
+class TestChunkStore:
+    """Test suite for ChunkStore"""
+
+    def test_positions_follow_insertion_order(self):
+        store = ChunkStore()
+        store.extend([_chunk(i) for i in range(4)])
+
+        assert len(store) == 4
+        assert store[-1].chunk_id == "c3"
+        assert [c.chunk_id for c in store.get_many([2, 0])] == ["c2", "c0"]
+        assert store[1].metadata == {'source': "a.pdf", 'page': 1}
+
+    def test_keep_compacts_positions(self):
+        store = ChunkStore()
+        store.extend([_chunk(i) for i in range(4)])
+
+        store.keep(np.array([True, False, True, False]))
+
+        assert len(store) == 2
+        assert [c.chunk_id for c in store] == ["c0", "c2"]
+        assert store[1].chunk_id == "c2"
+
+    def test_save_as_then_reopen(self, tmp_path):
+        store = ChunkStore()
+        store.extend([_chunk(i) for i in range(3)])
+        store.save_as(str(tmp_path / "chunks.db"))
+        store.extend([_chunk(3)])
+        store.commit()
+
+        reopened = ChunkStore(str(tmp_path / "chunks.db"))
+        assert len(reopened) == 4
+        assert reopened[3].content == "text 3"
+
+    def test_out_of_range(self):
+        with pytest.raises(IndexError):
+            ChunkStore()[0]
+
+    def test_find_hashes_tracks_positions_after_delete(self):
+        from backend.rag.chunk_store import content_hash
+
+        store = ChunkStore()
+        store.extend([_chunk(i) for i in range(3)])
+        store.keep(np.array([False, True, True]))
+
+        found = store.find_hashes([content_hash("text 2"), content_hash("text 0")])
+
+        assert found == {content_hash("text 2"): 1}
@@ -0,0 +1,211 @@
+"""
+Unit tests for the ingestion pipeline
+
+Converts small text files (Docling falls back to the basic processor for
+them) into a VectorStore with a deterministic fake embedding model.
+"""
+
+import hashlib
+import json
+import os
+import pytest
+import sys
+import numpy as np
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+import backend.rag.vector_store as vector_store_module
+from backend.rag.docling_processor import DoclingProcessor
+from backend.rag.ingestion import IngestionManifest, IngestionPipeline
+from backend.rag.vector_store import VectorStore
+
+
+DIMENSION = 8
+
+
+class FakeEmbeddingModel:
+    """Hash-based embeddings; counts how many texts were encoded"""
+
+    def __init__(self, *args, **kwargs):
+        self.encoded = 0
+
+    def encode(self, texts, **kwargs):
+        self.encoded += len(texts)
+        rows = []
+        for text in texts:
+            digest = hashlib.sha256(text.encode("utf-8")).digest()
+            rows.append(np.frombuffer(digest[:DIMENSION], dtype=np.uint8).astype('float32'))
+        return np.array(rows, dtype='float32')
+
+
+@pytest.fixture(autouse=True)
+def fake_embeddings(monkeypatch):
+    monkeypatch.setattr(vector_store_module, "_embedding_models", {})
+    monkeypatch.setattr(vector_store_module, "SentenceTransformer", FakeEmbeddingModel)
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "vector_db" / "faiss_index")
+
+
+@pytest.fixture
+def docs(tmp_path):
+    directory = tmp_path / "documents"
+    directory.mkdir()
+    for name in ["a", "b", "c", "d"]:
+        (directory / f"{name}.txt").write_text(f"Document {name}. " + f"Requirement text for {name}. " * 5)
+    (directory / "ignored.xyz").write_text("not a document")
+    return directory
+
+
+def open_store(index_path):
+    store = VectorStore(embedding_dimension=DIMENSION, index_path=index_path)
+    store.load()
+    return store
+
+
+def stored_sources(store):
+    return sorted(metadata['source'] for _, metadata in store.chunks.iter_metadata())
+
+
+class TestIngestionPipeline:
+    """Test parallel, resumable ingestion"""
+
+    def test_ingests_supported_files(self, docs, index_path):
+        store = open_store(index_path)
+        stats = IngestionPipeline(store, workers=1).ingest(str(docs))
+
+        assert stats["files_found"] == 4
+        assert stats["processed"] == 4
+        assert stats["chunks_added"] == len(store.chunks) > 0
+        assert set(stored_sources(store)) == {"a.txt", "b.txt", "c.txt", "d.txt"}
+
+        # Saved as it went: a fresh store sees everything
+        assert len(open_store(index_path).chunks) == len(store.chunks)
+        manifest = json.loads(Path(index_path + ".ingest.json").read_text())
+        assert len(manifest["files"]) == 4
+
+    def test_unchanged_files_are_skipped(self, docs, index_path):
+        IngestionPipeline(open_store(index_path), workers=1).ingest(str(docs))
+
+        store = open_store(index_path)
+        count = len(store.chunks)
+        stats = IngestionPipeline(store, workers=1).ingest(str(docs))
+
+        assert stats["skipped"] == 4
+        assert stats["processed"] == 0
+        assert len(store.chunks) == count
+
+    def test_touched_but_identical_file_is_skipped(self, docs, index_path):
+        IngestionPipeline(open_store(index_path), workers=1).ingest(str(docs))
+        path = docs / "a.txt"
+        os.utime(path, (1, 1))
+
+        stats = IngestionPipeline(open_store(index_path), workers=1).ingest(str(docs))
+
+        assert stats["skipped"] == 4
+
+    def test_changed_file_replaces_its_chunks(self, docs, index_path):
+        IngestionPipeline(open_store(index_path), workers=1).ingest(str(docs))
+        (docs / "b.txt").write_text("Revised document b.")
+
+        store = open_store(index_path)
+        stats = IngestionPipeline(store, workers=1).ingest(str(docs))
+
+        assert stats["processed"] == 1
+        b_chunks = [store.chunks[i].content for i, m in store.chunks.iter_metadata() if m['source'] == 'b.txt']
+        assert b_chunks == ["Revised document b."]
+
+    def test_resumes_after_crash_without_duplicates(self, docs, index_path, monkeypatch):
+        original = DoclingProcessor.process_document
+        seen = []
+
+        def crash_on_third(self, file_path):
+            seen.append(file_path)
+            if len(seen) == 3:
+                raise KeyboardInterrupt
+            return original(self, file_path)
+
+        monkeypatch.setattr(DoclingProcessor, "process_document", crash_on_third)
+        with pytest.raises(KeyboardInterrupt):
+            IngestionPipeline(open_store(index_path), workers=1, flush_chunks=1).ingest(str(docs))
+        monkeypatch.setattr(DoclingProcessor, "process_document", original)
+
+        # The two files finished before the crash were saved and recorded
+        manifest = IngestionManifest(index_path + ".ingest.json")
+        assert len(manifest.files) == 2
+
+        store = open_store(index_path)
+        stats = IngestionPipeline(store, workers=1).ingest(str(docs))
+
+        assert stats["skipped"] == 2
+        assert stats["processed"] == 2
+        sources = stored_sources(store)
+        assert set(sources) == {"a.txt", "b.txt", "c.txt", "d.txt"}
+        assert len(sources) == len(set(c.content for c in store.chunks))
+
+    def test_file_without_chunks_is_failed_and_retried(self, docs, index_path, monkeypatch):
+        original = DoclingProcessor.process_document
+
+        def fail_on_b(self, file_path):
+            # As DoclingProcessor does when conversion fails
+            return [] if file_path.endswith("b.txt") else original(self, file_path)
+
+        monkeypatch.setattr(DoclingProcessor, "process_document", fail_on_b)
+        stats = IngestionPipeline(open_store(index_path), workers=1).ingest(str(docs))
+        monkeypatch.setattr(DoclingProcessor, "process_document", original)
+
+        assert stats["processed"] == 3
+        assert stats["failed"] == 1
+        assert list(stats["errors"]) == [str(docs / "b.txt")]
+        assert str(docs / "b.txt") not in IngestionManifest(index_path + ".ingest.json").files
+
+        store = open_store(index_path)
+        stats = IngestionPipeline(store, workers=1).ingest(str(docs))
+
+        assert stats["skipped"] == 3
+        assert stats["processed"] == 1
+        assert "b.txt" in stored_sources(store)
+
+    def test_saved_but_unrecorded_files_are_not_duplicated(self, docs, index_path):
+        IngestionPipeline(open_store(index_path), workers=1).ingest(str(docs))
+        count = len(open_store(index_path).chunks)
+        # Crash between saving the store and writing the manifest
+        os.remove(index_path + ".ingest.json")
+
+        store = open_store(index_path)
+        IngestionPipeline(store, workers=1).ingest(str(docs))
+
+        assert len(store.chunks) == count
+
+    def test_store_saved_every_few_batches(self, docs, index_path):
+        store = open_store(index_path)
+        saves = []
+        real_save = store.save
+
+        def counting_save():
+            # Every saved batch's files are recorded right after, never before
+            saves.append(len(IngestionManifest(index_path + ".ingest.json").files))
+            real_save()
+
+        store.save = counting_save
+        stats = IngestionPipeline(store, workers=1, flush_chunks=1, save_every=3).ingest(str(docs))
+
+        assert stats["processed"] == 4
+        assert saves == [0, 3]
+        assert len(IngestionManifest(index_path + ".ingest.json").files) == 4
+        assert len(open_store(index_path).chunks) == stats["chunks_added"]
+
+    def test_process_pool_matches_in_process(self, docs, tmp_path):
+        serial = open_store(str(tmp_path / "serial" / "faiss_index"))
+        parallel = open_store(str(tmp_path / "parallel" / "faiss_index"))
+
+        IngestionPipeline(serial, workers=1).ingest(str(docs))
+        stats = IngestionPipeline(parallel, workers=2, flush_chunks=2).ingest(str(docs))
+
+        assert stats["processed"] == 4
+        assert sorted(c.content for c in parallel.chunks) == sorted(c.content for c in serial.chunks)
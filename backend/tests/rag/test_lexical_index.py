@@ -0,0 +1,110 @@
+"""
+Unit tests for LexicalIndex and hybrid retrieval
+"""
+
+import pytest
+import sys
+import numpy as np
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.rag.lexical_index import LexicalIndex, tokenize
+from backend.rag.retriever import Retriever, reciprocal_rank_fusion
+
+
+DOCS = [
+    "Contractor shall comply with DFARS 252.204-7012 safeguarding covered defense information.",
+    "The offeror must achieve CMMC Level 2 certification prior to award.",
+    "NAICS code 541512 applies to computer systems design services.",
+    "CLIN 0001 covers base year labor; CLIN 0002 covers option year one.",
+    "General background on the acquisition strategy and market research.",
+]
+
+
+class TestTokenize:
+    """Test suite for tokenize"""
+
+    def test_keeps_citations_whole_and_indexes_parts(self):
+        terms = tokenize("Per DFARS 252.204-7012.")
+
+        assert "252.204-7012" in terms
+        assert {"dfars", "252", "204", "7012"} <= set(terms)
+        assert "per" in terms
+
+    def test_drops_stopwords(self):
+        assert tokenize("the scope of the work") == ["scope", "work"]
+
+
+class TestLexicalIndex:
+    """Test suite for LexicalIndex"""
+
+    @pytest.fixture
+    def index(self):
+        index = LexicalIndex()
+        index.add(DOCS)
+        return index
+
+    def test_exact_citation_ranks_first(self, index):
+        assert index.search("DFARS 252.204-7012", k=3)[0][0] == 0
+        assert index.search("NAICS 541512", k=1)[0][0] == 2
+        assert index.search("CLIN 0002", k=1)[0][0] == 3
+
+    def test_no_match_returns_empty(self, index):
+        assert index.search("zebra", k=3) == []
+
+    def test_keep_renumbers_positions(self, index):
+        index.keep(np.array([False, True, False, True, True]))
+
+        assert len(index) == 3
+        assert index.search("CLIN 0001", k=1)[0][0] == 1
+        assert index.search("252.204-7012", k=1) == []
+
+    def test_save_load_round_trip(self, index, tmp_path):
+        index.save(str(tmp_path / "idx.bm25"))
+
+        loaded = LexicalIndex.load(str(tmp_path / "idx.bm25"))
+
+        assert loaded.search("CMMC Level 2", k=2) == index.search("CMMC Level 2", k=2)
+
+
+class FakeStore:
+    """Vector store stub returning fixed vector and lexical rankings"""
+
+    def __init__(self, vector, lexical):
+        self.vector = vector
+        self.lexical = lexical
+
+    def search_many(self, queries, k=5):
+        return [[(doc, i) for i, doc in enumerate(self.vector[:k])] for _ in queries]
+
+    def lexical_search(self, query, k=5):
+        return [(doc, 10 - i) for i, doc in enumerate(self.lexical[:k])]
+
+
+def _doc(name):
+    return {'content': name, 'metadata': {}, 'chunk_id': name}
+
+
+class TestHybridRetrieval:
+    """Test suite for RRF fusion in Retriever"""
+
+    def test_rrf_prefers_documents_in_both_lists(self):
+        fused = reciprocal_rank_fusion(
+            [[(_doc("a"), 0), (_doc("b"), 0)], [(_doc("b"), 0), (_doc("c"), 0)]],
+            k=3
+        )
+
+        assert [d['chunk_id'] for d in fused] == ["b", "a", "c"]
+        assert fused[0]['rrf_score'] == pytest.approx(1 / 62 + 1 / 61)
+
+    def test_retrieve_fuses_lexical_hits(self):
+        store = FakeStore(vector=[_doc("v1"), _doc("v2")], lexical=[_doc("exact")])
+
+        hybrid = Retriever(store, top_k=2).retrieve("DFARS 252.204-7012")
+        vector_only = Retriever(store, top_k=2, hybrid=False).retrieve("DFARS 252.204-7012")
+
+        assert "exact" in [d['chunk_id'] for d in hybrid]
+        assert [d['chunk_id'] for d in vector_only] == ["v1", "v2"]
@@ -0,0 +1,360 @@
+"""
+Unit tests for VectorStore
+
+Uses a deterministic fake embedding model so no model download is needed.
+"""
+
+import hashlib
+import json
+import os
+import time
+import pickle
+import pytest
+import sys
+import faiss
+import numpy as np
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+import backend.rag.vector_store as vector_store_module
+from backend.rag.vector_store import VectorStore
+from backend.rag.vector_store_registry import VectorStoreRegistry
+from backend.rag.retriever import Retriever
+
+
+DIMENSION = 8
+
+
+class FakeEmbeddingModel:
+    """Hash-based embeddings; counts how many texts were encoded"""
+
+    def __init__(self, *args, **kwargs):
+        self.encoded = 0
+
+    def encode(self, texts, **kwargs):
+        self.encoded += len(texts)
+        rows = []
+        for text in texts:
+            digest = hashlib.sha256(text.encode("utf-8")).digest()
+            rows.append(np.frombuffer(digest[:DIMENSION], dtype=np.uint8).astype('float32'))
+        return np.array(rows, dtype='float32')
+
+
+@dataclass
+class Chunk:
+    content: str
+    metadata: Dict = field(default_factory=dict)
+    chunk_id: str = ""
+
+
+def _chunks(source: str, count: int):
+    return [
+        Chunk(content=f"{source} chunk {i}", metadata={'source': source}, chunk_id=f"{source}_{i}")
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def fresh_model_cache(monkeypatch):
+    """Each test gets its own shared-model cache (and so its own encode counter)"""
+    monkeypatch.setattr(vector_store_module, "_embedding_models", {})
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store_module, "SentenceTransformer", FakeEmbeddingModel)
+    return VectorStore(embedding_dimension=DIMENSION, index_path=str(tmp_path / "faiss_index"))
+
+
+class TestVectorStore:
+    """Test suite for VectorStore"""
+
+    def test_search_returns_exact_match_first(self, store):
+        store.add_documents(_chunks("a.pdf", 5))
+
+        results = store.search("a.pdf chunk 3", k=2)
+
+        assert results[0][0]['chunk_id'] == "a.pdf_3"
+        assert results[0][1] == pytest.approx(0.0)
+
+    def test_delete_does_not_reencode(self, store):
+        store.add_documents(_chunks("a.pdf", 5) + _chunks("b.pdf", 3))
+        encoded_before = store.embedding_model.encoded
+
+        result = store.delete_by_source("a.pdf")
+
+        assert result == {"success": True, "deleted_chunks": 5, "remaining_chunks": 3}
+        assert store.embedding_model.encoded == encoded_before
+        assert store.index.ntotal == 3
+        assert [c.chunk_id for c in store.chunks] == ["b.pdf_0", "b.pdf_1", "b.pdf_2"]
+        assert store.search("b.pdf chunk 1", k=1)[0][0]['chunk_id'] == "b.pdf_1"
+
+    def test_delete_unknown_source(self, store):
+        store.add_documents(_chunks("a.pdf", 2))
+
+        result = store.delete_by_source("missing.pdf")
+
+        assert result["success"] is False
+        assert store.index.ntotal == 2
+
+    def test_save_load_round_trip_then_delete(self, store, tmp_path, monkeypatch):
+        store.add_documents(_chunks("a.pdf", 2) + _chunks("b.pdf", 2))
+        store.save()
+
+        reloaded = VectorStore(embedding_dimension=DIMENSION, index_path=str(tmp_path / "faiss_index"))
+        assert reloaded.load() is True
+        assert len(reloaded.chunks) == 4
+
+        assert reloaded.embedding_model is store.embedding_model
+        encoded_before = reloaded.embedding_model.encoded
+        reloaded.delete_by_source("b.pdf")
+        assert reloaded.embedding_model.encoded == encoded_before
+        assert reloaded.search("a.pdf chunk 1", k=1)[0][0]['chunk_id'] == "a.pdf_1"
+
+    def test_save_writes_memmapped_layout(self, store, tmp_path):
+        store.add_documents(_chunks("a.pdf", 3))
+        store.save()
+
+        manifest = json.loads((tmp_path / "faiss_index.manifest.json").read_text())
+        assert manifest['embedding_dimension'] == DIMENSION
+        assert manifest['chunk_count'] == 3
+        assert (tmp_path / "faiss_index.chunks.db").exists()
+
+        reloaded = VectorStore(embedding_dimension=DIMENSION, index_path=str(tmp_path / "faiss_index"))
+        assert reloaded.load() is True
+        assert isinstance(reloaded.embeddings, np.memmap)
+        assert reloaded.chunks[2].chunk_id == "a.pdf_2"
+
+    def test_added_rows_are_appended_to_saved_embeddings(self, store, tmp_path):
+        store.add_documents(_chunks("a.pdf", 3))
+        store.save()
+        embeddings_file = tmp_path / "faiss_index.npy"
+        inode = os.stat(embeddings_file).st_ino
+
+        for source in ["b.pdf", "c.pdf"]:
+            store.add_documents(_chunks(source, 2))
+            # Still mapped from the file, not copied into memory
+            assert isinstance(store.embeddings, np.memmap)
+            store.save()
+
+        assert os.stat(embeddings_file).st_ino == inode
+        reloaded = VectorStore(embedding_dimension=DIMENSION, index_path=str(tmp_path / "faiss_index"))
+        assert reloaded.load() is True
+        assert reloaded.embeddings.shape == (7, DIMENSION)
+        np.testing.assert_array_equal(reloaded.embeddings, store.embeddings)
+        assert reloaded.search("c.pdf chunk 1", k=1)[0][0]['chunk_id'] == "c.pdf_1"
+
+    def test_load_rejects_dimension_mismatch(self, store, tmp_path):
+        store.add_documents(_chunks("a.pdf", 1))
+        store.save()
+
+        other = VectorStore(embedding_dimension=DIMENSION * 2, index_path=str(tmp_path / "faiss_index"))
+        assert other.load() is False
+
+    def test_legacy_pickle_is_migrated(self, store, tmp_path):
+        chunks = _chunks("a.pdf", 3)
+        store.add_documents(chunks)
+        faiss.write_index(store.index, str(tmp_path / "faiss_index.faiss"))
+        with open(tmp_path / "faiss_index.pkl", 'wb') as f:
+            pickle.dump({'chunks': chunks, 'metadata': [c.metadata for c in chunks]}, f)
+
+        reloaded = VectorStore(embedding_dimension=DIMENSION, index_path=str(tmp_path / "faiss_index"))
+        assert reloaded.load() is True
+        assert (tmp_path / "faiss_index.manifest.json").exists()
+        assert reloaded.search("a.pdf chunk 1", k=1)[0][0]['chunk_id'] == "a.pdf_1"
+
+    def test_ivf_promotion_persists_across_save(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(vector_store_module, "SentenceTransformer", FakeEmbeddingModel)
+        path = str(tmp_path / "ivf_index")
+        store = VectorStore(embedding_dimension=DIMENSION, index_path=path,
+                            index_type="ivf_flat", index_params={'nlist': 2, 'nprobe': 2})
+
+        store.add_documents(_chunks("a.pdf", 10))
+        assert type(store.index).__name__ == "IndexFlatL2"
+
+        store.add_documents(_chunks("b.pdf", 100))
+        assert type(store.index).__name__ == "IndexIVFFlat"
+        store.save()
+
+        reloaded = VectorStore(embedding_dimension=DIMENSION, index_path=path, index_type="ivf_flat")
+        assert reloaded.load() is True
+        assert type(reloaded.index).__name__ == "IndexIVFFlat"
+        assert reloaded.index.nprobe == 2
+
+        reloaded.delete_by_source("a.pdf")
+        assert reloaded.index.ntotal == 100
+        assert reloaded.search("b.pdf chunk 7", k=1)[0][0]['chunk_id'] == "b.pdf_7"
+
+    def test_duplicate_content_is_not_reencoded(self, store):
+        first = store.add_documents(_chunks("a.pdf", 3))
+        assert first['embedded'] == 3
+
+        duplicate = Chunk(content="a.pdf chunk 1", metadata={'source': "copy.pdf"}, chunk_id="copy_1")
+        stats = store.add_documents([duplicate, duplicate, Chunk(content="new text", chunk_id="n")])
+
+        assert stats['added'] == 3
+        assert stats['embedded'] == 1
+        assert stats['reused'] == 2
+        assert stats['chunks_per_sec'] > 0
+        assert store.embedding_model.encoded == 4
+        assert store.index.ntotal == 6
+        np.testing.assert_array_equal(store.embeddings[3], store.embeddings[1])
+
+    def test_small_batches_match_single_batch(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(vector_store_module, "SentenceTransformer", FakeEmbeddingModel)
+        store = VectorStore(embedding_dimension=DIMENSION, index_path=str(tmp_path / "idx"),
+                            embedding_batch_size=2)
+
+        vectors = store._generate_embeddings([f"text {i}" for i in range(5)])
+
+        assert vectors.dtype == np.float32 and vectors.flags['C_CONTIGUOUS']
+        np.testing.assert_array_equal(vectors, FakeEmbeddingModel().encode([f"text {i}" for i in range(5)]))
+
+    def test_search_many_matches_individual_searches(self, store):
+        store.add_documents(_chunks("a.pdf", 6))
+        queries = ["a.pdf chunk 4", "a.pdf chunk 0", "a.pdf chunk 4"]
+
+        batched = store.search_many(queries, k=3)
+
+        assert len(batched) == 3
+        for query, results in zip(queries, batched):
+            assert results == store.search(query, k=3)
+        assert batched[0][0][0]['chunk_id'] == "a.pdf_4"
+
+    def test_query_embeddings_are_cached(self, store):
+        store.add_documents(_chunks("a.pdf", 3))
+        encoded_before = store.embedding_model.encoded
+
+        store.search_many(["q1", "q2", "q1"], k=1)
+        assert store.embedding_model.encoded == encoded_before + 2
+
+        store.search("q2", k=1)
+        store.search_many(["q1", "q2"], k=1)
+        assert store.embedding_model.encoded == encoded_before + 2
+
+    def test_query_cache_is_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(vector_store_module, "SentenceTransformer", FakeEmbeddingModel)
+        store = VectorStore(embedding_dimension=DIMENSION, index_path=str(tmp_path / "idx"),
+                            query_cache_size=2)
+        store.add_documents(_chunks("a.pdf", 2))
+
+        store.search_many(["q1", "q2", "q3"], k=1)
+
+        assert list(store._query_cache) == ["q2", "q3"]
+
+    def test_lexical_index_follows_deletes_and_reload(self, store, tmp_path):
+        store.add_documents(_chunks("a.pdf", 2) + [
+            Chunk(content="Comply with DFARS 252.204-7012", metadata={'source': "b.pdf"}, chunk_id="dfars")
+        ])
+        store.delete_by_source("a.pdf")
+        store.save()
+
+        reloaded = VectorStore(embedding_dimension=DIMENSION, index_path=str(tmp_path / "faiss_index"))
+        assert reloaded.load() is True
+        results = reloaded.lexical_search("252.204-7012", k=2)
+        assert [chunk['chunk_id'] for chunk, _ in results] == ["dfars"]
+
+    def test_exclusive_write_builds_on_other_writers(self, store, tmp_path):
+        path = str(tmp_path / "faiss_index")
+        # Two processes' stores on the same files, both loaded before either writes
+        other = VectorStore(embedding_dimension=DIMENSION, index_path=path)
+
+        for writer, source in [(store, "a.pdf"), (other, "b.pdf"), (store, "c.pdf")]:
+            hashes, embeddings, _ = writer.embed_chunks(_chunks(source, 2))
+            with writer.exclusive_write():
+                writer.add_embedded(_chunks(source, 2), hashes, embeddings)
+                writer.save()
+
+        reloaded = VectorStore(embedding_dimension=DIMENSION, index_path=path)
+        assert reloaded.load() is True
+        assert sorted(chunk.chunk_id for chunk in reloaded.chunks) == [
+            "a.pdf_0", "a.pdf_1", "b.pdf_0", "b.pdf_1", "c.pdf_0", "c.pdf_1"
+        ]
+        assert reloaded.index.ntotal == 6
+
+    @pytest.mark.parametrize("crash_in", ["write_index", "dump"])
+    def test_interrupted_save_is_rolled_back_on_load(self, store, tmp_path, monkeypatch, crash_in):
+        path = str(tmp_path / "faiss_index")
+        store.add_documents(_chunks("a.pdf", 2))
+        store.save()
+
+        # Crash after the chunk rows are committed, before (or while) the manifest is written
+        def crash(*args, **kwargs):
+            raise OSError("killed")
+
+        store.add_documents(_chunks("b.pdf", 2))
+        target = vector_store_module.faiss if crash_in == "write_index" else vector_store_module.json
+        with monkeypatch.context() as patched:
+            patched.setattr(target, crash_in, crash)
+            with pytest.raises(OSError):
+                store.save()
+
+        other = VectorStore(embedding_dimension=DIMENSION, index_path=path)
+        assert other.load() is True
+        assert [c.chunk_id for c in other.chunks] == ["a.pdf_0", "a.pdf_1"]
+        assert other.index.ntotal == 2
+
+        # The store can still be written; the uncommitted rows are replaced
+        hashes, embeddings, _ = other.embed_chunks(_chunks("c.pdf", 3))
+        with other.exclusive_write():
+            other.add_embedded(_chunks("c.pdf", 3), hashes, embeddings)
+            other.save()
+
+        reloaded = VectorStore(embedding_dimension=DIMENSION, index_path=path)
+        assert reloaded.load() is True
+        assert [c.chunk_id for c in reloaded.chunks] == ["a.pdf_0", "a.pdf_1", "c.pdf_0", "c.pdf_1", "c.pdf_2"]
+        assert reloaded.search("c.pdf chunk 2", k=1)[0][0]['chunk_id'] == "c.pdf_2"
+
+
+class TestVectorStoreRegistry:
+    """Test suite for the shared vector store registry"""
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        monkeypatch.setattr(vector_store_module, "SentenceTransformer", FakeEmbeddingModel)
+        return VectorStoreRegistry(reload_interval=0)
+
+    def test_one_store_and_model_per_path(self, registry, tmp_path):
+        path = str(tmp_path / "faiss_index")
+
+        writer = registry.get(path, embedding_dimension=DIMENSION)
+        view = registry.view(path, embedding_dimension=DIMENSION)
+        other = registry.get(str(tmp_path / "other"), embedding_dimension=DIMENSION)
+
+        assert view.store is writer
+        assert other is not writer
+        assert other.embedding_model is writer.embedding_model
+
+    def test_view_sees_new_uploads_and_retriever_cache_invalidates(self, registry, tmp_path):
+        path = str(tmp_path / "faiss_index")
+        writer = registry.get(path, embedding_dimension=DIMENSION)
+        retriever = Retriever(registry.view(path), top_k=1)
+
+        assert retriever.retrieve("a.pdf chunk 0") == []
+        generation = retriever.vector_store.generation
+
+        writer.add_documents(_chunks("a.pdf", 2))
+
+        assert retriever.vector_store.generation > generation
+        assert retriever.retrieve("a.pdf chunk 0")[0]['chunk_id'] == "a.pdf_0"
+
+    def test_reloads_when_another_process_saves(self, registry, tmp_path):
+        path = str(tmp_path / "faiss_index")
+        shared = registry.get(path, embedding_dimension=DIMENSION)
+        shared.add_documents(_chunks("a.pdf", 1))
+        shared.save()
+
+        # Simulate a separate process writing the same files
+        external = VectorStore(embedding_dimension=DIMENSION, index_path=path)
+        external.load()
+        external.add_documents(_chunks("b.pdf", 2))
+        external.save()
+        os.utime(path + ".manifest.json", (time.time() + 10, time.time() + 10))
+
+        assert registry.reload_if_changed(path) is True
+        assert len(registry.get(path).chunks) == 3
@@ -14,7 +14,10 @@ from pathlib import Path
 backend_path = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(backend_path))
 
-from backend.services.agent_router import AgentRouter, get_agent_router
+import subprocess
+
+from backend.services import agent_router as agent_router_module
+from backend.services.agent_router import AgentRouter, get_agent_router, load_agent_class
 from backend.agents.section_l_generator_agent import SectionLGeneratorAgent
 from backend.agents.section_m_generator_agent import SectionMGeneratorAgent
 from backend.agents.pws_writer_agent import PWSWriterAgent
@@ -273,6 +276,48 @@ class TestAgentRouterEdgeCases:
         assert agent is not None
 
 
+class TestLazyAgentLoading:
+    """Test that agent modules are imported on first routing"""
+
+    def test_import_does_not_load_agents(self):
+        """Importing the router must not import any specialized agent module"""
+        code = (
+            "import sys, backend.services.agent_router; "
+            "print(sorted(m for m in sys.modules if m.endswith(('_generator_agent', '_writer_agent'))))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=str(backend_path.parent), capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+
+    def test_resolve_agent_path_does_not_import(self, monkeypatch):
+        """Resolving a document to an agent path is a registry lookup only"""
+        monkeypatch.setattr(agent_router_module, "_agent_classes", {})
+        router = AgentRouter(api_key="test-key", retriever=MockRetriever())
+
+        assert router.resolve_agent_path("section l - instructions to offerors") == agent_router_module.SECTION_L_AGENT
+        assert agent_router_module._agent_classes == {}
+
+    def test_load_agent_class_caches(self):
+        """An agent class is imported once and reused"""
+        first = load_agent_class(agent_router_module.PWS_AGENT)
+        assert first is PWSWriterAgent
+        assert load_agent_class(agent_router_module.PWS_AGENT) is first
+
+    def test_unknown_agent_path(self):
+        """A bad registry entry raises ImportError"""
+        with pytest.raises(ImportError):
+            load_agent_class("backend.agents.pws_writer_agent:MissingAgent")
+
+    def test_broken_registry_entry_falls_back(self, monkeypatch):
+        """A document whose agent cannot be imported falls back to generic generation"""
+        router = AgentRouter(api_key="test-key", retriever=MockRetriever())
+        monkeypatch.setitem(router._agent_registry, "Broken Doc", "backend.agents.no_such_agent:NoAgent")
+
+        assert router.get_agent_for_document("Broken Doc") is None
+
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,378 @@
+"""
+Unit tests for DocumentGenerator batch scheduling
+
+Tests dependency levels, concurrent execution and failure blocking, and
+that generate_and_save holds no database connection while agents run and
+lets transient agent errors reach the job queue for a retry.
+"""
+
+import asyncio
+import threading
+import uuid
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import anthropic
+import httpx
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+# Add backend to path
+import sys
+from pathlib import Path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.database.base import Base, build_async_engine, session_scope, to_async_url
+from backend.models import User, ProcurementProject
+from backend.models.document import DocumentStatus, GenerationStatus, ProjectDocument
+from backend.models.job import GenerationJob, JobStatus
+from backend.models.procurement import ProjectType
+from backend.models.user import UserRole
+from backend.services import job_queue as job_queue_module
+from backend.services.document_generator import DocumentGenerator, BLOCKED_PREFIX
+from backend.services.generation_coordinator import GenerationCoordinator
+from backend.services.job_queue import (
+    DatabaseJobQueue, JobFailed, JobWorker, RetryPolicy, register_job_handler
+)
+
+
+@compiles(UUID, "sqlite")
+def compile_uuid_sqlite(type_, compiler, **kw):
+    """Models use Postgres UUID columns; store them as hex strings on SQLite"""
+    return "CHAR(32)"
+
+
+def make_doc(name):
+    """Stand-in for a ProjectDocument"""
+    return SimpleNamespace(id=f"id-{name}", document_name=name)
+
+
+@pytest.fixture
+def generator():
+    """DocumentGenerator with a small dependency set and no coordinator"""
+    with patch('backend.services.document_generator.get_generation_coordinator'):
+        gen = DocumentGenerator()
+    gen.dependencies = {
+        "Acquisition Plan": ["Market Research Report"],
+        "Sources Sought Notice": ["Market Research Report"],
+        "Independent Government Cost Estimate (IGCE)": ["Performance Work Statement (PWS)"],
+    }
+    return gen
+
+
+class TestPlanGenerationLevels:
+    """Test grouping documents into concurrent levels"""
+
+    def test_dependencies_come_first(self, generator):
+        docs = [make_doc(n) for n in [
+            "Acquisition Plan",
+            "Market Research Report",
+            "Independent Government Cost Estimate (IGCE)",
+            "Performance Work Statement (PWS)",
+        ]]
+
+        levels = generator.plan_generation_levels(docs)
+        names = [[d.document_name for d in level] for level in levels]
+
+        assert len(names) == 2
+        assert set(names[0]) == {"Market Research Report", "Performance Work Statement (PWS)"}
+        assert set(names[1]) == {"Acquisition Plan", "Independent Government Cost Estimate (IGCE)"}
+
+    def test_independent_documents_share_a_level(self, generator):
+        docs = [make_doc("Request for Information (RFI)"), make_doc("Sources Sought Notice")]
+
+        levels = generator.plan_generation_levels(docs)
+
+        assert len(levels) == 1
+        assert len(levels[0]) == 2
+
+    def test_dependency_graph_edges_respected(self, generator):
+        docs = [
+            make_doc("Section B - Supplies/Services and Prices"),
+            make_doc("Section C - Performance Work Statement"),
+        ]
+
+        levels = generator.plan_generation_levels(docs)
+        names = [[d.document_name for d in level] for level in levels]
+
+        assert names == [
+            ["Section C - Performance Work Statement"],
+            ["Section B - Supplies/Services and Prices"],
+        ]
+
+
+class TestRunInDependencyOrder:
+    """Test concurrent execution and failure handling"""
+
+    def test_runs_level_concurrently_under_limit(self, generator):
+        docs = [make_doc(f"Independent Doc {i}") for i in range(6)]
+        running = {"now": 0, "peak": 0}
+
+        async def generate(doc):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return True, f"content for {doc.document_name}", None
+
+        results = asyncio.run(generator.run_in_dependency_order(docs, generate, concurrency=3))
+
+        assert len(results) == 6
+        assert all(success for success, _, _ in results.values())
+        assert running["peak"] == 3
+
+    def test_failure_blocks_only_dependents(self, generator):
+        docs = [make_doc(n) for n in [
+            "Market Research Report",
+            "Acquisition Plan",
+            "Sources Sought Notice",
+            "Performance Work Statement (PWS)",
+            "Independent Government Cost Estimate (IGCE)",
+        ]]
+        generated = []
+        blocked = []
+
+        async def generate(doc):
+            generated.append(doc.document_name)
+            if doc.document_name == "Market Research Report":
+                raise RuntimeError("agent error")
+            return True, "ok", None
+
+        results = asyncio.run(generator.run_in_dependency_order(
+            docs, generate, on_blocked=lambda doc, deps: blocked.append((doc.document_name, deps))
+        ))
+
+        assert results["id-Market Research Report"] == (False, "agent error", None)
+        assert results["id-Acquisition Plan"][1].startswith(BLOCKED_PREFIX)
+        assert results["id-Sources Sought Notice"][1].startswith(BLOCKED_PREFIX)
+        assert results["id-Independent Government Cost Estimate (IGCE)"][0] is True
+        assert "Acquisition Plan" not in generated
+        assert ("Acquisition Plan", ["Market Research Report"]) in blocked
+
+    def test_async_on_blocked_is_awaited(self, generator):
+        docs = [make_doc("Market Research Report"), make_doc("Acquisition Plan")]
+        blocked = []
+
+        async def generate(doc):
+            return False, "agent error", None
+
+        async def on_blocked(doc, deps):
+            await asyncio.sleep(0)
+            blocked.append(doc.document_name)
+
+        asyncio.run(generator.run_in_dependency_order(docs, generate, on_blocked=on_blocked))
+
+        assert blocked == ["Acquisition Plan"]
+
+
+class FakeCoordinator:
+    """Records pooled connections in use while 'generating'"""
+
+    def __init__(self, engine, fail_with=None):
+        self.engine = engine
+        self.fail_with = fail_with
+        self.checked_out = []
+
+    async def generate_documents(self, task, progress_callback=None):
+        self.checked_out.append(self.engine.pool.checkedout())
+        await asyncio.sleep(0)
+        if self.fail_with:
+            raise RuntimeError(self.fail_with)
+        name = task.document_names[0]
+        return SimpleNamespace(
+            status="completed",
+            sections={name: f"# {name}"},
+            quality_analysis={name: {"score": 87.5}},
+            agent_metadata={},
+            citations=[],
+            phase_info=None,
+            errors=[]
+        )
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def documents(session_factory):
+    """IDs of a generated Market Research Report and a pending Acquisition Plan"""
+    with session_scope(session_factory) as db:
+        officer = User(email="co@example.mil", name="Officer", hashed_password="x", role=UserRole.CONTRACTING_OFFICER)
+        db.add(officer)
+        db.flush()
+        project = ProcurementProject(
+            name="ALMS", project_type=ProjectType.RFP,
+            contracting_officer_id=officer.id, created_by=officer.id
+        )
+        db.add(project)
+        db.flush()
+        market_research = ProjectDocument(
+            project_id=project.id, document_name="Market Research Report",
+            generated_content="# Market Research", status=DocumentStatus.PENDING
+        )
+        plan = ProjectDocument(project_id=project.id, document_name="Acquisition Plan", status=DocumentStatus.PENDING)
+        db.add_all([market_research, plan])
+        db.flush()
+        return {"Market Research Report": market_research.id, "Acquisition Plan": plan.id}
+
+
+def load(session_factory, document_id):
+    with session_scope(session_factory) as db:
+        document = db.get(ProjectDocument, document_id)
+        db.expunge(document)
+        return document
+
+
+class TestGenerateAndSave:
+    """Test generation with short-lived sessions"""
+
+    def run(self, generator, session_factory, document_id):
+        return asyncio.run(generator.generate_and_save(
+            document_id=document_id, assumptions=[], session_factory=session_factory
+        ))
+
+    def test_no_connection_held_during_generation(self, generator, engine, session_factory, documents):
+        generator.coordinator = FakeCoordinator(engine)
+
+        success, content, metadata = self.run(generator, session_factory, documents["Acquisition Plan"])
+
+        assert success is True
+        assert content == "# Acquisition Plan"
+        assert generator.coordinator.checked_out == [0]
+        assert engine.pool.checkedout() == 0
+
+    def test_sessions_run_off_the_event_loop(self, generator, engine, session_factory, documents):
+        generator.coordinator = FakeCoordinator(engine)
+        session_threads = []
+
+        def recording_factory():
+            session_threads.append(threading.current_thread())
+            return session_factory()
+
+        async def run():
+            await generator.generate_and_save(
+                document_id=documents["Acquisition Plan"], assumptions=[], session_factory=recording_factory
+            )
+            return threading.current_thread()
+
+        loop_thread = asyncio.run(run())
+
+        assert len(session_threads) == 2
+        assert loop_thread not in session_threads
+
+    def test_result_saved(self, generator, engine, session_factory, documents):
+        generator.coordinator = FakeCoordinator(engine)
+
+        self.run(generator, session_factory, documents["Acquisition Plan"])
+
+        document = load(session_factory, documents["Acquisition Plan"])
+        assert document.generation_status == GenerationStatus.GENERATED
+        assert document.generated_content == "# Acquisition Plan"
+        assert document.status == DocumentStatus.UPLOADED
+        assert document.ai_quality_score == 87
+        assert document.generation_task_id.startswith("doc_")
+
+    def test_agent_error_propagates_while_generating(self, generator, engine, session_factory, documents):
+        generator.coordinator = FakeCoordinator(engine, fail_with="agent error")
+
+        with pytest.raises(RuntimeError, match="agent error"):
+            self.run(generator, session_factory, documents["Acquisition Plan"])
+        # Left for the job's retry, or its on_exhausted hook, to settle
+        assert load(session_factory, documents["Acquisition Plan"]).generation_status == GenerationStatus.GENERATING
+        assert engine.pool.checkedout() == 0
+
+    def test_transient_agent_error_requeues_job(self, generator, engine, session_factory, documents, tmp_path, monkeypatch):
+        with patch('backend.services.generation_coordinator.get_rag_service'):
+            coordinator = GenerationCoordinator(api_key="test", use_specialized_agents=False)
+        coordinator._retrieve_rag_context = AsyncMock(return_value=[])
+        coordinator._generate_generic = AsyncMock(side_effect=anthropic.APIConnectionError(
+            request=httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        ))
+        generator.coordinator = coordinator
+
+        async def generate(job):
+            # As run_single_doc_generation does
+            success, content_or_error, _ = await generator.generate_and_save(
+                document_id=documents["Acquisition Plan"], assumptions=[], session_factory=session_factory
+            )
+            if not success:
+                raise JobFailed(content_or_error)
+
+        jobs_engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+        GenerationJob.__table__.create(jobs_engine)
+        queue = DatabaseJobQueue(sessionmaker(bind=jobs_engine))
+        monkeypatch.setattr(job_queue_module, "_job_handlers", {})
+        register_job_handler("generate", generate, retry=RetryPolicy(max_attempts=2, backoff_seconds=60))
+        queue.enqueue("generate", {}, job_id="task-1")
+
+        async def run():
+            job = queue.claim("worker-1", ["generate"], lease_seconds=5)
+            await JobWorker(queue).run_job(job)
+
+        asyncio.run(run())
+
+        job = queue.get_job("task-1")
+        assert job["status"] == JobStatus.QUEUED
+        assert job["attempts"] == 1
+        assert queue.get_state("task-1")["status"] == "retrying"
+        assert load(session_factory, documents["Acquisition Plan"]).generation_status == GenerationStatus.GENERATING
+
+    def test_missing_dependency_marks_failed_without_generating(self, generator, engine, session_factory, documents):
+        generator.coordinator = FakeCoordinator(engine)
+        generator.dependencies["Acquisition Plan"] = ["Market Research Report", "Acquisition Strategy"]
+
+        success, error, _ = self.run(generator, session_factory, documents["Acquisition Plan"])
+
+        assert success is False
+        assert error == "Missing dependencies: Acquisition Strategy"
+        assert generator.coordinator.checked_out == []
+        assert load(session_factory, documents["Acquisition Plan"]).generation_status == GenerationStatus.FAILED
+
+    def test_missing_document(self, generator, engine, session_factory, documents):
+        generator.coordinator = FakeCoordinator(engine)
+
+        assert self.run(generator, session_factory, uuid.uuid4()) == (False, "Document not found", None)
+
+
+class TestDatabaseHelpers:
+    """Test session_scope and async URL derivation"""
+
+    def test_session_scope_rolls_back_on_error(self, session_factory, documents):
+        with pytest.raises(RuntimeError):
+            with session_scope(session_factory) as db:
+                db.get(ProjectDocument, documents["Acquisition Plan"]).notes = "draft"
+                db.flush()
+                raise RuntimeError("boom")
+
+        assert load(session_factory, documents["Acquisition Plan"]).notes is None
+
+    def test_async_url(self):
+        assert to_async_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+        assert to_async_url("postgresql+psycopg2://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+        assert to_async_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+        assert to_async_url("postgresql+asyncpg://db/app") == "postgresql+asyncpg://db/app"
+
+    def test_async_engine_for_sqlite(self, tmp_path):
+        engine = build_async_engine(to_async_url(f"sqlite:///{tmp_path / 'app.db'}"))
+
+        async def run():
+            try:
+                async with engine.connect() as conn:
+                    return (await conn.execute(text("SELECT 1"))).scalar()
+            finally:
+                await engine.dispose()
+
+        assert asyncio.run(run()) == 1
@@ -0,0 +1,193 @@
+"""
+Unit tests for ExportService rendering
+
+Tests the rendered-file cache, shared in-flight renders and the streamed
+batch ZIP.
+"""
+
+import asyncio
+import io
+import threading
+import zipfile
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add backend to path
+import sys
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.services import export_service as export_service_module
+from backend.services.export_service import ExportService, render_cache_key
+
+SAMPLE = "# Performance Work Statement\n\nThe contractor shall deliver **monthly** reports.\n"
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Count conversions, optionally holding them until released"""
+    calls = []
+    release = threading.Event()
+    release.set()
+    real_render = export_service_module.render_markdown
+
+    def counting_render(content, fmt, output_path, program_name=None):
+        calls.append((fmt, program_name))
+        release.wait(timeout=5)
+        real_render(content, fmt, output_path, program_name)
+
+    monkeypatch.setattr(export_service_module, "render_markdown", counting_render)
+    return calls, release
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch, renders):
+    service = ExportService(exports_dir=str(tmp_path / "exports"), cache_dir=str(tmp_path / "cache"))
+
+    # Render on threads instead of spawning processes
+    pool = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(service, "_get_render_pool", lambda: pool)
+    yield service
+    pool.shutdown()
+
+
+class TestRenderCache:
+    """Test cached rendering"""
+
+    def test_second_render_is_cached(self, service, renders):
+        calls, _ = renders
+
+        first = service.render(SAMPLE, 'pdf')
+        second = service.render(SAMPLE, 'pdf')
+
+        assert first == second
+        assert first.read_bytes().startswith(b'%PDF')
+        assert len(calls) == 1
+        assert (service.cache_hits, service.cache_misses) == (1, 1)
+
+    def test_key_covers_format_and_docx_options(self):
+        assert render_cache_key(SAMPLE, 'pdf') != render_cache_key(SAMPLE, 'docx')
+        assert render_cache_key(SAMPLE, 'docx', 'ALMS') != render_cache_key(SAMPLE, 'docx', 'Other')
+        assert render_cache_key(SAMPLE, 'pdf', 'ALMS') == render_cache_key(SAMPLE, 'pdf')
+
+    def test_concurrent_requests_share_one_render(self, service, renders):
+        calls, release = renders
+        release.clear()
+
+        futures = [service._submit_render(SAMPLE, 'docx', 'ALMS') for _ in range(5)]
+        release.set()
+
+        paths = {future.result(timeout=10) for future in futures}
+        assert len(paths) == 1
+        assert len(calls) == 1
+
+    def test_failed_render_is_not_cached(self, service, monkeypatch):
+        def failing_render(*args):
+            raise RuntimeError("conversion failed")
+
+        monkeypatch.setattr(export_service_module, "render_markdown", failing_render)
+        with pytest.raises(RuntimeError):
+            service.render(SAMPLE, 'pdf')
+
+        assert service._renders_in_flight == {}
+        assert list(service.cache_dir.iterdir()) == []
+
+    def test_unsupported_format(self, service):
+        with pytest.raises(ValueError):
+            service.render(SAMPLE, 'html')
+
+    def test_prunes_least_recently_used(self, service):
+        service.cache_max_files = 2
+
+        first = service.render("# One", 'pdf')
+        service.render("# Two", 'pdf')
+        service.render("# One", 'pdf')  # touch: now more recent than "Two"
+        service.render("# Three", 'pdf')
+
+        assert first.exists()
+        assert len(list(service.cache_dir.glob('*.pdf'))) == 2
+
+    def test_generate_pdf_reuses_rendering(self, service, renders):
+        calls, _ = renders
+        export_id, _ = service.prepare_export({'Scope': SAMPLE}, metadata={'project_name': 'ALMS'})
+
+        pdf_file = service.generate_pdf(export_id)
+        service.generate_pdf(export_id)
+
+        assert pdf_file == service.exports_dir / export_id / "document.pdf"
+        assert pdf_file.read_bytes().startswith(b'%PDF')
+        assert len(calls) == 1
+
+
+class TestBatchZip:
+    """Test the streamed batch ZIP"""
+
+    def collect(self, service, documents, fmt):
+        async def run():
+            return [chunk async for chunk in service.iter_batch_zip(documents, fmt)]
+        return asyncio.run(run())
+
+    def test_pdf_entries(self, service):
+        documents = [(f"doc_{i}", f"# Document {i}\n\nText {i}.", f"Document {i}") for i in range(3)]
+
+        chunks = self.collect(service, documents, 'pdf')
+
+        with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as archive:
+            assert sorted(archive.namelist()) == ['doc_0.pdf', 'doc_1.pdf', 'doc_2.pdf']
+            assert archive.read('doc_1.pdf').startswith(b'%PDF')
+            assert archive.testzip() is None
+        assert len([c for c in chunks if c]) > 1
+
+    def test_markdown_entries(self, service, renders):
+        calls, _ = renders
+        documents = [("scope", "# Scope", "Scope"), ("pws", "# PWS", "PWS")]
+
+        chunks = self.collect(service, documents, 'markdown')
+
+        with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as archive:
+            assert archive.namelist() == ['scope.md', 'pws.md']
+            assert archive.read('pws.md') == b'# PWS'
+        assert calls == []
+
+    def test_failed_render_is_listed_in_errors(self, service, monkeypatch, renders):
+        real_render = export_service_module.render_markdown
+
+        def render_or_fail(content, fmt, output_path, program_name=None):
+            if program_name == "Broken":
+                raise RuntimeError("conversion failed")
+            real_render(content, fmt, output_path, program_name)
+
+        monkeypatch.setattr(export_service_module, "render_markdown", render_or_fail)
+        documents = [("good", "# Good", "Good"), ("broken", "# Broken", "Broken"), ("other", "# Other", "Other")]
+
+        chunks = self.collect(service, documents, 'pdf')
+
+        with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as archive:
+            assert sorted(archive.namelist()) == ['_errors.txt', 'good.pdf', 'other.pdf']
+            assert archive.testzip() is None
+            report = archive.read('_errors.txt').decode()
+        assert "broken.pdf: RuntimeError: conversion failed" in report
+        assert "good.pdf" not in report
+
+    def test_repeat_batch_uses_cache(self, service, renders):
+        calls, _ = renders
+        documents = [("a", "# A", "A"), ("b", "# B", "B")]
+
+        self.collect(service, documents, 'docx')
+        self.collect(service, documents, 'docx')
+
+        assert len(calls) == 2
+
+
+class TestRenderPool:
+    """Test rendering in a spawned worker process"""
+
+    def test_process_pool_render(self, tmp_path):
+        service = ExportService(exports_dir=str(tmp_path / "exports"), cache_dir=str(tmp_path / "cache"))
+        try:
+            path = service.render(SAMPLE, 'docx', 'ALMS')
+        finally:
+            service.shutdown()
+
+        assert zipfile.is_zipfile(path)
@@ -0,0 +1,379 @@
+"""
+Unit tests for the durable job queue
+
+Tests enqueueing, lease claiming, heartbeats, retries and the worker loop
+against a SQLite database.
+"""
+
+import asyncio
+import threading
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add backend to path
+import sys
+from pathlib import Path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.models.job import GenerationJob, JobStatus
+from backend.services import job_queue as job_queue_module
+from backend.services.job_queue import (
+    DatabaseJobQueue, JobFailed, JobQueue, JobWorker, RetryPolicy, get_job_queue, register_job_handler
+)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Job queue on a fresh SQLite file"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    GenerationJob.__table__.create(engine)
+    return DatabaseJobQueue(sessionmaker(bind=engine))
+
+
+@pytest.fixture(autouse=True)
+def isolated_handlers(monkeypatch):
+    """Each test registers its own handlers"""
+    monkeypatch.setattr(job_queue_module, "_job_handlers", {})
+
+
+def run_worker_until(queue, job_id, status, polls=300):
+    """Run a worker until the job reaches a queue status"""
+    async def run():
+        worker = JobWorker(queue, poll_interval=0.01, lease_seconds=5)
+        worker.start()
+        for _ in range(polls):
+            if queue.get_job(job_id)["status"] == status:
+                break
+            await asyncio.sleep(0.01)
+        await worker.stop()
+
+    asyncio.run(run())
+
+
+def expire_lease(queue, job_id):
+    db = queue.session_factory()
+    db.query(GenerationJob).filter(GenerationJob.id == job_id).update(
+        {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+    db.close()
+
+
+class TestDatabaseJobQueue:
+    """Test queue operations"""
+
+    def test_enqueue_and_get_state(self, queue):
+        job_id = queue.enqueue("demo", {"x": 1}, job_id="task-1", state={"status": "pending", "progress": 0})
+
+        assert job_id == "task-1"
+        assert queue.get_state("task-1") == {"status": "pending", "progress": 0}
+        assert queue.get_job("task-1")["status"] == JobStatus.QUEUED
+        assert queue.get_state("missing") is None
+
+    def test_only_one_worker_claims_a_job(self, queue):
+        queue.enqueue("demo", {}, job_id="task-1")
+
+        first = queue.claim("worker-a", ["demo"])
+        second = queue.claim("worker-b", ["demo"])
+
+        assert first.id == "task-1"
+        assert first.attempt == 1
+        assert second is None
+
+    def test_claim_filters_job_types(self, queue):
+        queue.enqueue("demo", {}, job_id="task-1")
+
+        assert queue.claim("worker-a", ["other"]) is None
+
+    def test_expired_lease_is_reclaimed(self, queue):
+        queue.enqueue("demo", {}, job_id="task-1")
+        stale = queue.claim("worker-a", ["demo"])
+        expire_lease(queue, "task-1")
+
+        job = queue.claim("worker-b", ["demo"])
+
+        assert job.owner == "worker-b"
+        assert job.attempt == 2
+        # The old owner can no longer write progress
+        assert stale.update(progress=50) is False
+        assert queue.heartbeat("task-1", "worker-a") is False
+        assert queue.heartbeat("task-1", "worker-b") is True
+
+    def test_progress_persists(self, queue):
+        queue.enqueue("demo", {}, job_id="task-1", state={"status": "pending"})
+        job = queue.claim("worker-a", ["demo"])
+
+        job.update(status="in_progress", progress=40, generated_at=datetime(2024, 1, 1))
+
+        state = queue.get_state("task-1")
+        assert state["progress"] == 40
+        assert state["generated_at"] == "2024-01-01 00:00:00"
+
+    def test_fail_requeues_until_attempts_exhausted(self, queue):
+        retry = RetryPolicy(max_attempts=2, backoff_seconds=0)
+        queue.enqueue("demo", {}, job_id="task-1", max_attempts=2)
+
+        job = queue.claim("worker-a", ["demo"])
+        assert queue.fail(job.id, job.owner, job.state, "boom", retry) is True
+        assert queue.get_job("task-1")["status"] == JobStatus.QUEUED
+
+        job = queue.claim("worker-a", ["demo"])
+        assert queue.fail(job.id, job.owner, job.state, "boom again", retry) is False
+
+        assert queue.get_job("task-1")["status"] == JobStatus.FAILED
+        assert queue.get_state("task-1")["status"] == "failed"
+        assert queue.get_state("task-1")["error"] == "boom again"
+
+    def test_non_retryable_failure_is_terminal(self, queue):
+        retry = RetryPolicy(max_attempts=3, backoff_seconds=0)
+        queue.enqueue("demo", {}, job_id="task-1")
+        job = queue.claim("worker-a", ["demo"])
+        job.state.update(status="failed", message="Document not found")
+
+        assert queue.fail(job.id, job.owner, job.state, "Document not found", retry, retryable=False) is False
+
+        assert queue.get_job("task-1")["status"] == JobStatus.FAILED
+        assert queue.get_state("task-1")["message"] == "Document not found"
+
+    def test_retry_backoff_delays_claim(self, queue):
+        retry = RetryPolicy(max_attempts=3, backoff_seconds=60)
+        queue.enqueue("demo", {}, job_id="task-1")
+
+        job = queue.claim("worker-a", ["demo"])
+        queue.fail(job.id, job.owner, job.state, "boom", retry)
+
+        assert queue.claim("worker-a", ["demo"]) is None
+
+    def test_lost_lease_past_max_attempts_fails_job(self, queue):
+        queue.enqueue("demo", {}, job_id="task-1", max_attempts=1)
+        queue.claim("worker-a", ["demo"])
+        expire_lease(queue, "task-1")
+
+        assert queue.claim("worker-b", ["demo"]) is None
+        assert queue.get_job("task-1")["status"] == JobStatus.FAILED
+        assert queue.get_state("task-1")["status"] == "failed"
+
+    def test_exhausted_hook_runs_once_job_gives_up(self, queue):
+        exhausted = []
+        register_job_handler("demo", None, on_exhausted=lambda payload, error: exhausted.append((payload, error)))
+        retry = RetryPolicy(max_attempts=2, backoff_seconds=0)
+        queue.enqueue("demo", {"document_id": "doc-1"}, job_id="task-1", max_attempts=2)
+
+        job = queue.claim("worker-a", ["demo"])
+        assert not job.final_attempt
+        queue.fail(job.id, job.owner, job.state, "boom", retry)
+        assert queue.get_state("task-1")["status"] == "retrying"
+        assert exhausted == []
+
+        job = queue.claim("worker-a", ["demo"])
+        assert job.final_attempt
+        queue.fail(job.id, job.owner, job.state, "boom again", retry)
+        assert exhausted == [({"document_id": "doc-1"}, "boom again")]
+
+    def test_exhausted_hook_runs_for_lost_lease(self, queue):
+        exhausted = []
+        register_job_handler("demo", None, on_exhausted=lambda payload, error: exhausted.append(error))
+        queue.enqueue("demo", {}, job_id="task-1", max_attempts=1)
+        queue.claim("worker-a", ["demo"])
+        expire_lease(queue, "task-1")
+
+        assert queue.claim("worker-b", ["demo"]) is None
+        assert exhausted == ["Worker lost the job"]
+
+    def test_exhausted_hook_errors_do_not_escape(self, queue):
+        def broken_hook(payload, error):
+            raise RuntimeError("database down")
+
+        register_job_handler("demo", None, on_exhausted=broken_hook)
+        queue.enqueue("demo", {}, job_id="task-1", max_attempts=1)
+        job = queue.claim("worker-a", ["demo"])
+
+        assert queue.fail(job.id, job.owner, job.state, "boom", RetryPolicy(max_attempts=1)) is False
+        assert queue.get_job("task-1")["status"] == JobStatus.FAILED
+
+
+class TestBackends:
+    """Test backend selection"""
+
+    def test_incomplete_backend_fails_on_construction(self):
+        class PartialQueue(JobQueue):
+            def enqueue(self, job_type, payload, job_id=None, state=None, max_attempts=None):
+                return "job"
+
+        with pytest.raises(TypeError):
+            PartialQueue()
+
+    def test_unknown_backend_names_supported(self, monkeypatch):
+        monkeypatch.setattr(job_queue_module, "_job_queue", None)
+        monkeypatch.setenv("JOB_QUEUE_BACKEND", "redis")
+
+        with pytest.raises(ValueError, match="supported: database"):
+            get_job_queue()
+
+
+class TestPublish:
+    """Test background, coalesced progress writes"""
+
+    def test_publish_coalesces_writes_off_the_loop(self, queue, monkeypatch):
+        queue.enqueue("demo", {}, job_id="task-1", state={"status": "pending"})
+        job = queue.claim("worker-a", ["demo"])
+        job.progress_interval = 0.05
+        writes = []
+        real_update_state = queue.update_state
+
+        def recording_update_state(job_id, state, owner=None):
+            writes.append((threading.current_thread(), state["progress"]))
+            return real_update_state(job_id, state, owner=owner)
+
+        monkeypatch.setattr(queue, "update_state", recording_update_state)
+
+        async def run():
+            for progress in range(50):
+                job.publish(status="in_progress", progress=progress)
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.2)
+            return threading.current_thread()
+
+        loop_thread = asyncio.run(run())
+
+        assert 1 <= len(writes) <= 3
+        assert all(thread is not loop_thread for thread, _ in writes)
+        assert writes[-1][1] == 49
+        assert queue.get_state("task-1")["progress"] == 49
+
+    def test_final_state_written_after_pending_publish(self, queue):
+        async def handler(job):
+            job.progress_interval = 10
+            job.publish(progress=10)
+            await asyncio.sleep(0)
+            job.publish(progress=90)  # scheduled 10s out; superseded by completion
+            job.state.update(status="completed", progress=100)
+
+        register_job_handler("demo", handler)
+        queue.enqueue("demo", {}, job_id="task-1")
+
+        run_worker_until(queue, "task-1", JobStatus.COMPLETED)
+
+        assert queue.get_state("task-1")["progress"] == 100
+
+
+class TestJobWorker:
+    """Test the worker loop"""
+
+    def test_worker_runs_job_to_completion(self, queue):
+        async def handler(job):
+            job.update(status="completed", progress=100, result=job.payload["value"] * 2)
+
+        register_job_handler("double", handler)
+        queue.enqueue("double", {"value": 21}, job_id="task-1")
+
+        async def run():
+            worker = JobWorker(queue, poll_interval=0.01, lease_seconds=5)
+            worker.start()
+            for _ in range(200):
+                if queue.get_job("task-1")["status"] == JobStatus.COMPLETED:
+                    break
+                await asyncio.sleep(0.01)
+            await worker.stop()
+
+        asyncio.run(run())
+
+        assert queue.get_job("task-1")["status"] == JobStatus.COMPLETED
+        assert queue.get_state("task-1")["result"] == 42
+
+    def test_worker_retries_failed_job(self, queue):
+        calls = []
+
+        async def flaky(job):
+            calls.append(job.attempt)
+            if job.attempt == 1:
+                raise RuntimeError("transient")
+            job.update(status="completed")
+
+        register_job_handler("flaky", flaky, retry=RetryPolicy(max_attempts=3, backoff_seconds=0))
+        queue.enqueue("flaky", {}, job_id="task-1")
+
+        async def run():
+            worker = JobWorker(queue, poll_interval=0.01, lease_seconds=5)
+            worker.start()
+            for _ in range(300):
+                if queue.get_job("task-1")["status"] == JobStatus.COMPLETED:
+                    break
+                await asyncio.sleep(0.01)
+            await worker.stop()
+
+        asyncio.run(run())
+
+        assert calls == [1, 2]
+        assert queue.get_state("task-1")["status"] == "completed"
+
+    def test_raising_generation_handler_is_retried_then_fails(self, queue):
+        calls = []
+
+        async def generate(job):
+            # As the generation handlers do: record the failure, then re-raise
+            calls.append(job.attempt)
+            try:
+                raise RuntimeError("agent timeout")
+            except Exception as e:
+                job.update(status="failed", error=str(e), message=f"Error: {e}")
+                raise
+
+        register_job_handler("generate", generate, retry=RetryPolicy(max_attempts=2, backoff_seconds=0))
+        queue.enqueue("generate", {}, job_id="task-1")
+
+        run_worker_until(queue, "task-1", JobStatus.FAILED)
+
+        assert calls == [1, 2]
+        assert queue.get_job("task-1")["status"] == JobStatus.FAILED
+        state = queue.get_state("task-1")
+        assert state["status"] == "failed"
+        assert state["error"] == "agent timeout"
+
+    def test_job_failed_is_not_retried(self, queue):
+        calls = []
+
+        async def generate(job):
+            calls.append(job.attempt)
+            job.update(status="failed", error="Document not found")
+            raise JobFailed("Document not found")
+
+        register_job_handler("generate", generate, retry=RetryPolicy(max_attempts=3, backoff_seconds=0))
+        queue.enqueue("generate", {}, job_id="task-1")
+
+        run_worker_until(queue, "task-1", JobStatus.FAILED)
+
+        assert calls == [1]
+        assert queue.get_job("task-1")["status"] == JobStatus.FAILED
+        assert queue.get_state("task-1")["error"] == "Document not found"
+
+    def test_lost_lease_cancels_running_job(self, queue):
+        cancelled = []
+
+        async def slow(job):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(job.id)
+                raise
+
+        register_job_handler("slow", slow)
+        queue.enqueue("slow", {}, job_id="task-1")
+
+        async def run():
+            worker = JobWorker(queue, poll_interval=0.01, lease_seconds=0.3)
+            job = queue.claim(worker.worker_id, ["slow"], lease_seconds=0.3)
+            runner = asyncio.create_task(worker.run_job(job))
+            await asyncio.sleep(0.05)
+            # Another worker takes the job over
+            expire_lease(queue, "task-1")
+            queue.claim("worker-b", ["slow"])
+            await asyncio.wait_for(runner, timeout=2)
+
+        asyncio.run(run())
+
+        assert cancelled == ["task-1"]
+        assert queue.get_job("task-1")["lease_owner"] == "worker-b"
@@ -0,0 +1,236 @@
+"""
+Unit tests for project read queries
+
+Regression tests for N+1 queries: the document, approval and step queries
+and the phase gate document check must issue the same number of SQL
+statements however many rows they return.
+"""
+
+import uuid
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+# Add backend to path
+import sys
+from pathlib import Path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.database.base import Base
+from backend.models import User, ProcurementProject, ProcurementPhase, ProcurementStep
+from backend.models.document import (
+    ApprovalAuditLog, ApprovalStatus, DocumentApproval, DocumentStatus, DocumentUpload, ProjectDocument
+)
+from backend.models.procurement import PhaseName, ProjectType
+from backend.models.user import UserRole
+from backend.services import project_queries
+from backend.services.phase_gate_service import PhaseGateService
+from backend.scripts.migrate_add_indexes import migrate_add_indexes
+
+
+@compiles(UUID, "sqlite")
+def compile_uuid_sqlite(type_, compiler, **kw):
+    """Models use Postgres UUID columns; store them as hex strings on SQLite"""
+    return "CHAR(32)"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@contextmanager
+def count_queries(engine):
+    """Count SQL statements executed inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def make_user(db, name):
+    user = User(
+        email=f"{name.lower()}-{uuid.uuid4().hex[:6]}@example.mil",
+        name=name,
+        hashed_password="x",
+        role=UserRole.APPROVER
+    )
+    db.add(user)
+    return user
+
+
+def seed(db, rows: int):
+    """A project with `rows` steps, uploads, approvals and audit entries, each by a different user"""
+    officer = make_user(db, "Officer")
+    db.flush()
+    project = ProcurementProject(
+        name="ALMS", project_type=ProjectType.RFP,
+        contracting_officer_id=officer.id, created_by=officer.id
+    )
+    db.add(project)
+    db.flush()
+    phase = ProcurementPhase(project_id=project.id, phase_name=PhaseName.PRE_SOLICITATION, phase_order=1)
+    document = ProjectDocument(project_id=project.id, document_name="Market Research Report", status=DocumentStatus.APPROVED)
+    db.add_all([phase, document])
+    db.flush()
+
+    approver = make_user(db, "Approver")
+    db.flush()
+    start = datetime(2025, 1, 1)
+    for i in range(rows):
+        user = make_user(db, f"User{i}")
+        db.flush()
+        db.add(ProcurementStep(
+            phase_id=phase.id, project_id=project.id, step_name=f"Step {i}",
+            step_order=i, assigned_user_id=user.id
+        ))
+        db.add(DocumentUpload(
+            project_document_id=document.id, file_name=f"v{i}.docx", file_path=f"/tmp/v{i}.docx",
+            file_size=100, file_type="docx", version_number=i + 1, uploaded_by=user.id
+        ))
+        approval = DocumentApproval(
+            project_document_id=document.id, approver_id=approver.id, delegated_from_id=user.id,
+            approval_status=ApprovalStatus.PENDING, requested_at=start + timedelta(hours=i)
+        )
+        db.add(approval)
+        db.flush()
+        for j in range(2):
+            db.add(ApprovalAuditLog(
+                approval_id=approval.id, action="requested", performed_by=user.id,
+                timestamp=start + timedelta(hours=i, minutes=j)
+            ))
+    db.commit()
+    return project, document, approver
+
+
+def query_counts(engine, db, project, document, approver):
+    """Statements issued by each query function, starting from an empty identity map"""
+    project_id, document_id, approver_id = project.id, document.id, approver.id
+    approval_id = db.query(DocumentApproval.id).first()[0]
+    calls = {
+        "uploads": lambda: project_queries.list_document_uploads(db, document_id),
+        "document_approvals": lambda: project_queries.list_document_approvals(db, document_id),
+        "pending": lambda: project_queries.list_pending_approvals(db, approver_id),
+        "audit_trail": lambda: project_queries.get_approval_audit_trail(db, approval_id),
+        "history": lambda: project_queries.get_document_approval_history(db, db.get(ProjectDocument, document_id)),
+        "steps": lambda: project_queries.list_project_steps(db, project_id),
+        "phase_gate": lambda: PhaseGateService().check_document_approvals(db, project_id, "pre_solicitation"),
+    }
+    counts = {}
+    for name, call in calls.items():
+        db.expunge_all()
+        with count_queries(engine) as statements:
+            call()
+        counts[name] = len(statements)
+    return counts
+
+
+class TestQueryCounts:
+    """Query counts must not grow with the number of rows"""
+
+    EXPECTED = {
+        "uploads": 1,
+        "document_approvals": 1,
+        "pending": 1,
+        "audit_trail": 2,
+        "history": 3,  # document, approvals with users, audit logs with users
+        "steps": 1,
+        "phase_gate": 1,
+    }
+
+    @pytest.mark.parametrize("rows", [1, 8])
+    def test_constant_query_counts(self, engine, db, rows):
+        project, document, approver = seed(db, rows)
+
+        assert query_counts(engine, db, project, document, approver) == self.EXPECTED
+
+
+class TestResults:
+    """The eager-loaded results match what the endpoints returned before"""
+
+    def test_uploads_newest_first_with_uploader(self, db):
+        _, document, _ = seed(db, 3)
+
+        uploads = project_queries.list_document_uploads(db, document.id)
+
+        assert [u["version_number"] for u in uploads] == [3, 2, 1]
+        assert uploads[0]["uploader"]["name"] == "User2"
+
+    def test_pending_approvals_include_document_and_project(self, db):
+        _, document, approver = seed(db, 2)
+
+        approvals = project_queries.list_pending_approvals(db, approver.id)
+
+        assert len(approvals) == 2
+        assert approvals[0]["document"]["name"] == "Market Research Report"
+        assert approvals[0]["project"]["name"] == "ALMS"
+
+    def test_history_orders_audit_trail_oldest_first(self, db):
+        _, document, _ = seed(db, 2)
+
+        history = project_queries.get_document_approval_history(db, document)
+
+        assert history[0]["delegated_from"]["name"] == "User1"
+        assert history[0]["approver"]["name"] == "Approver"
+        timestamps = [log["timestamp"] for log in history[0]["audit_trail"]]
+        assert timestamps == sorted(timestamps) and len(timestamps) == 2
+        assert history[0]["audit_trail"][0]["performed_by_user"]["name"] == "User1"
+
+    def test_audit_trail_missing_approval(self, db):
+        seed(db, 1)
+
+        assert project_queries.get_approval_audit_trail(db, uuid.uuid4()) is None
+
+    def test_steps_in_order_with_assigned_user(self, db):
+        project, _, _ = seed(db, 3)
+
+        steps = project_queries.list_project_steps(db, project.id)
+
+        assert [s["step_name"] for s in steps] == ["Step 0", "Step 1", "Step 2"]
+        assert steps[2]["assigned_user"]["name"] == "User2"
+
+    def test_phase_gate_matches_case_insensitive_substring(self, db):
+        project, document, _ = seed(db, 1)
+        db.add(ProjectDocument(project_id=project.id, document_name="Draft performance work statement (pws) v2"))
+        db.commit()
+
+        results = PhaseGateService().check_document_approvals(db, project.id, "pre_solicitation")
+
+        assert results["Market Research Report"]["approved"] is True
+        assert results["Market Research Report"]["document_id"] == str(document.id)
+        assert results["Performance Work Statement (PWS)"]["exists"] is True
+        assert results["Acquisition Plan"]["exists"] is False
+
+
+class TestMigration:
+    """Test the index migration"""
+
+    def test_adds_missing_indexes(self, engine):
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_document_approvals_approver_status")
+
+        migrate_add_indexes(bind=engine)
+        migrate_add_indexes(bind=engine)  # idempotent
+
+        names = {index["name"] for index in inspect(engine).get_indexes("document_approvals")}
+        assert {"ix_document_approvals_approver_status", "ix_document_approvals_document_requested"} <= names
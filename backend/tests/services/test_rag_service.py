@@ -0,0 +1,244 @@
+"""
+Unit tests for RAGService background ingestion
+
+Tests coalesced vector store saves, staged upload ingestion and uploads
+ingested by several processes into one store.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+import numpy as np
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add backend to path
+import sys
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+import backend.rag.vector_store as vector_store_module
+from backend.rag.ingestion import init_conversion_worker
+from backend.rag.vector_store import VectorStore
+from backend.services import rag_service as rag_service_module
+from backend.services.rag_service import CoalescedSaver, RAGService
+
+
+class FakeVectorStore:
+    """Records chunks added, deletes and saves"""
+
+    def __init__(self):
+        self.chunks = []
+        self.deleted = []
+        self.saves = 0
+        self.write_locks = 0
+        self.embedding_dimension = 8
+        self.index_path = "fake_index"
+
+    def embed_chunks(self, chunks):
+        return [c.content for c in chunks], np.zeros((len(chunks), self.embedding_dimension)), len(chunks)
+
+    def add_embedded(self, chunks, hashes, embeddings):
+        self.chunks.extend(chunks)
+
+    @contextmanager
+    def exclusive_write(self):
+        self.write_locks += 1
+        yield self
+
+    def delete_by_file_paths(self, file_paths):
+        self.deleted.extend(file_paths)
+        self.chunks = [c for c in self.chunks if c.metadata.get("file_path") not in file_paths]
+
+    def save(self):
+        self.saves += 1
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    store = FakeVectorStore()
+    monkeypatch.setattr(
+        rag_service_module, "get_vector_store_registry",
+        lambda: SimpleNamespace(get=lambda *args, **kwargs: store)
+    )
+    service = RAGService(api_key="test-key", upload_dir=str(tmp_path / "uploads"))
+    service.saver.delay = 0.05
+
+    # Convert on a thread instead of spawning processes
+    init_conversion_worker(service.chunk_size, service.chunk_overlap)
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(service, "_get_conversion_pool", lambda: pool)
+    yield service
+    pool.shutdown()
+
+
+class TestCoalescedSaver:
+    """Test save coalescing"""
+
+    def test_burst_of_requests_saves_once(self):
+        saves = []
+        saver = CoalescedSaver(lambda: saves.append(time.time()), delay=0.05)
+
+        futures = [saver.request() for _ in range(10)]
+        for future in futures:
+            future.result(timeout=2)
+
+        assert len(saves) == 1
+        assert saver.saves == 1
+
+    def test_request_during_save_gets_next_save(self):
+        started, release = threading.Event(), threading.Event()
+        saves = []
+
+        def slow_save():
+            saves.append(1)
+            started.set()
+            release.wait(timeout=2)
+
+        saver = CoalescedSaver(slow_save, delay=0.01)
+        first = saver.request()
+        started.wait(timeout=2)
+        second = saver.request()
+        release.set()
+
+        first.result(timeout=2)
+        second.result(timeout=2)
+        assert first is not second
+        assert len(saves) == 2
+
+    def test_flush_saves_immediately(self):
+        saves = []
+        saver = CoalescedSaver(lambda: saves.append(1), delay=60)
+
+        future = saver.request()
+        saver.flush()
+
+        assert future.done()
+        assert saves == [1]
+
+    def test_save_error_reaches_every_waiter(self):
+        def failing_save():
+            raise OSError("disk full")
+
+        saver = CoalescedSaver(failing_save, delay=0.01)
+        futures = [saver.request(), saver.request()]
+
+        for future in futures:
+            with pytest.raises(OSError):
+                future.result(timeout=2)
+
+
+class TestIngestUpload:
+    """Test staged background ingestion"""
+
+    def test_stages_and_result(self, service):
+        saved = service.save_upload(b"The contractor shall deliver monthly reports.", "reqs.txt")
+        stages = []
+
+        result = asyncio.run(service.ingest_upload(
+            saved["file_path"], "reqs.txt", "user-1", saved["upload_timestamp"],
+            metadata={"category": "requirements"},
+            on_stage=lambda stage, progress: stages.append(stage)
+        ))
+
+        assert result["success"]
+        assert result["chunks_created"] == len(service.vector_store.chunks) > 0
+        assert stages == ["parsing", "chunking", "embedding", "indexing"]
+        assert service.vector_store.saves == 1
+        assert service.vector_store.write_locks == 1
+        metadata = service.vector_store.chunks[0].metadata
+        assert metadata["original_filename"] == "reqs.txt"
+        assert metadata["category"] == "requirements"
+
+    def test_concurrent_uploads_share_one_save(self, service):
+        uploads = [service.save_upload(f"Document {i} text.".encode(), f"doc{i}.txt") for i in range(5)]
+
+        async def run():
+            return await asyncio.gather(*[
+                service.ingest_upload(u["file_path"], f"doc{i}.txt", "user-1", u["upload_timestamp"])
+                for i, u in enumerate(uploads)
+            ])
+
+        results = asyncio.run(run())
+
+        assert all(r["success"] for r in results)
+        assert service.vector_store.saves == 1
+
+    def test_empty_document_fails_without_saving(self, service):
+        saved = service.save_upload(b"", "empty.txt")
+
+        result = asyncio.run(service.ingest_upload(
+            saved["file_path"], "empty.txt", "user-1", saved["upload_timestamp"]
+        ))
+
+        assert result["success"] is False
+        assert service.vector_store.saves == 0
+
+    def test_retry_replaces_earlier_chunks(self, service):
+        saved = service.save_upload(b"Retry me.", "retry.txt")
+        args = (saved["file_path"], "retry.txt", "user-1", saved["upload_timestamp"])
+
+        asyncio.run(service.ingest_upload(*args))
+        asyncio.run(service.ingest_upload(*args, replace_existing=True))
+
+        assert service.vector_store.deleted == [saved["file_path"]]
+        assert len(service.vector_store.chunks) == 1
+
+
+class FakeEmbeddingModel:
+    """Hash-based embeddings"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def encode(self, texts, **kwargs):
+        return np.array([
+            np.frombuffer(hashlib.sha256(t.encode("utf-8")).digest()[:8], dtype=np.uint8).astype('float32')
+            for t in texts
+        ], dtype='float32')
+
+
+class TestMultiProcessIngestion:
+    """Test services in separate processes writing one vector store"""
+
+    def test_uploads_from_every_process_are_kept(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(vector_store_module, "_embedding_models", {})
+        monkeypatch.setattr(vector_store_module, "SentenceTransformer", FakeEmbeddingModel)
+        index_path = str(tmp_path / "vector_db" / "faiss_index")
+
+        # Each "process" has its own service and its own copy of the store
+        def open_service():
+            store = VectorStore(embedding_dimension=8, index_path=index_path)
+            store.load()
+            monkeypatch.setattr(
+                rag_service_module, "get_vector_store_registry",
+                lambda: SimpleNamespace(get=lambda *args, **kwargs: store)
+            )
+            service = RAGService(api_key="test-key", upload_dir=str(tmp_path / "uploads"))
+            service.saver.delay = 0.01
+            monkeypatch.setattr(service, "_get_conversion_pool", lambda: pool)
+            return service
+
+        init_conversion_worker(1000, 200)
+        pool = ThreadPoolExecutor(max_workers=2)
+        services = [open_service(), open_service()]
+
+        async def ingest(service, i):
+            upload = service.save_upload(f"Process upload {i} text.".encode(), f"doc{i}.txt")
+            return await service.ingest_upload(upload["file_path"], f"doc{i}.txt", "user-1", upload["upload_timestamp"])
+
+        async def run():
+            return await asyncio.gather(*[ingest(services[i % 2], i) for i in range(6)])
+
+        results = asyncio.run(run())
+        pool.shutdown()
+
+        assert all(r["success"] for r in results)
+        reloaded = VectorStore(embedding_dimension=8, index_path=index_path)
+        assert reloaded.load() is True
+        filenames = sorted(chunk.metadata["original_filename"] for chunk in reloaded.chunks)
+        assert filenames == [f"doc{i}.txt" for i in range(6)]
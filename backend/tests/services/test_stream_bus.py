@@ -0,0 +1,142 @@
+"""
+Unit tests for the WebSocket stream bus
+
+Runs two WebSocketManagers (an API process holding a socket and a job
+worker process) over RedisStreamBus with an in-memory stand-in for Redis
+pub/sub.
+"""
+
+import asyncio
+
+# Add backend to path
+import sys
+from pathlib import Path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.services import stream_bus as stream_bus_module
+from backend.services.stream_bus import RedisStreamBus
+from backend.services.websocket_manager import WebSocketManager
+
+
+class FakeWebSocket:
+    """Records sent messages"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+
+async def settle(seconds=0.1):
+    await asyncio.sleep(seconds)
+
+
+class FakeRedis:
+    """Pub/sub shared by every bus in the test, like one Redis server"""
+
+    def __init__(self):
+        self.published = []
+        self.subscribers = []
+
+    async def publish(self, channel, data):
+        self.published.append(data)
+        for channels, queue in self.subscribers:
+            if channel in channels:
+                queue.put_nowait({"type": "message", "channel": channel, "data": data.encode()})
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.channels = set()
+        self.queue = asyncio.Queue()
+        redis.subscribers.append((self.channels, self.queue))
+
+    async def subscribe(self, channel):
+        self.channels.add(channel)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+async def start_processes(redis):
+    """An API process holding one project socket, and a job worker process"""
+    api = WebSocketManager(bus=RedisStreamBus("redis://test", client=redis))
+    worker = WebSocketManager(bus=RedisStreamBus("redis://test", client=redis))
+    await api.start()
+    await worker.start()
+    ws = FakeWebSocket()
+    await api.connect(ws, "project-1")
+    return api, worker, ws
+
+
+class TestStreamBus:
+    """Test room messages crossing processes"""
+
+    def test_job_in_other_process_streams_to_socket(self, monkeypatch):
+        monkeypatch.setattr(stream_bus_module, "STREAM_BUS_FLUSH_INTERVAL", 0.05)
+        redis = FakeRedis()
+
+        async def run():
+            api, worker, ws = await start_processes(redis)
+
+            for i in range(100):
+                worker.send_token_delta(["project-1"], "PWS", 0, f"t{i} ")
+                if i % 10 == 0:
+                    await asyncio.sleep(0.01)
+            worker.send_token_stream_end(["project-1"], "PWS", 0)
+            await settle(0.3)
+
+            await worker.stop()
+            await api.stop()
+            return ws
+
+        ws = asyncio.run(run())
+
+        assert "".join(m.get("delta", "") for m in ws.sent) == "".join(f"t{i} " for i in range(100))
+        assert ws.sent[-1] == {"type": "token_stream_end", "document": "PWS", "section": 0}
+        # Deltas were merged before publishing, not sent one per token
+        assert len(redis.published) < 20
+
+    def test_process_does_not_receive_its_own_messages(self):
+        redis = FakeRedis()
+
+        async def run():
+            api, worker, ws = await start_processes(redis)
+
+            await api.send_message("project-1", {"type": "progress", "percentage": 50})
+            await settle(0.2)
+
+            await worker.stop()
+            await api.stop()
+            return ws
+
+        ws = asyncio.run(run())
+
+        assert ws.sent == [{"type": "progress", "percentage": 50}]
+        assert len(redis.published) == 1
+
+    def test_stop_sends_queued_messages(self, monkeypatch):
+        monkeypatch.setattr(stream_bus_module, "STREAM_BUS_FLUSH_INTERVAL", 10)
+        redis = FakeRedis()
+
+        async def run():
+            bus = RedisStreamBus("redis://test", client=redis)
+            await bus.start(lambda room, message: None)
+            bus.publish("project-1", {"type": "token_delta", "document": "PWS", "section": 0, "delta": "a"})
+            await asyncio.sleep(0)
+            await asyncio.wait_for(bus.stop(), timeout=1)
+
+        asyncio.run(run())
+
+        assert len(redis.published) == 1
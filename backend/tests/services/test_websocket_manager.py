@@ -0,0 +1,169 @@
+"""
+Unit tests for WebSocketManager
+
+Tests rooms, token delta coalescing (including interleaved streams) and
+slow-client backpressure.
+"""
+
+import asyncio
+import threading
+
+# Add backend to path
+import sys
+from pathlib import Path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.services import websocket_manager as websocket_manager_module
+from backend.services.websocket_manager import WebSocketManager
+
+
+class FakeWebSocket:
+    """Records sent messages; sends can be paused to simulate a slow client"""
+
+    def __init__(self):
+        self.sent = []
+        self.accepted = False
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_json(self, message):
+        await self.gate.wait()
+        self.sent.append(message)
+
+
+async def settle(seconds=0.1):
+    await asyncio.sleep(seconds)
+
+
+class TestWebSocketManager:
+    """Test message delivery"""
+
+    def test_send_message_reaches_room_only(self):
+        async def run():
+            manager = WebSocketManager()
+            project_ws, other_ws = FakeWebSocket(), FakeWebSocket()
+            await manager.connect(project_ws, "project-1")
+            await manager.connect(other_ws, room="guided-flow-doc-1")
+
+            await manager.send_message("project-1", {"type": "progress"})
+            await settle()
+            return project_ws, other_ws
+
+        project_ws, other_ws = asyncio.run(run())
+
+        assert project_ws.accepted
+        assert project_ws.sent == [{"type": "progress"}]
+        assert other_ws.sent == []
+
+    def test_broadcast_excludes_sender(self):
+        async def run():
+            manager = WebSocketManager()
+            a, b = FakeWebSocket(), FakeWebSocket()
+            await manager.connect(a, room="guided-flow-doc-1")
+            await manager.connect(b, room="guided-flow-doc-1")
+
+            await manager.broadcast({"event": "field_update"}, room="guided-flow-doc-1", exclude=a)
+            await settle()
+            return a, b
+
+        a, b = asyncio.run(run())
+
+        assert a.sent == []
+        assert b.sent == [{"event": "field_update"}]
+
+    def test_token_deltas_coalesce(self, monkeypatch):
+        monkeypatch.setattr(websocket_manager_module, "STREAM_FLUSH_INTERVAL", 0.05)
+
+        async def run():
+            manager = WebSocketManager()
+            ws = FakeWebSocket()
+            await manager.connect(ws, "project-1")
+
+            for delta in ["The ", "contractor ", "shall"]:
+                manager.send_token_delta(["project-1"], "PWS", 0, delta)
+            manager.send_token_delta(["project-1"], "PWS", 1, "Next")
+            manager.send_token_stream_end(["project-1"], "PWS", 1)
+            await settle(0.3)
+            return ws
+
+        ws = asyncio.run(run())
+
+        assert ws.sent == [
+            {"type": "token_delta", "document": "PWS", "section": 0, "delta": "The contractor shall"},
+            {"type": "token_delta", "document": "PWS", "section": 1, "delta": "Next"},
+            {"type": "token_stream_end", "document": "PWS", "section": 1},
+        ]
+
+    def test_interleaved_streams_coalesce_per_section(self, monkeypatch):
+        monkeypatch.setattr(websocket_manager_module, "STREAM_FLUSH_INTERVAL", 0.05)
+        monkeypatch.setattr(websocket_manager_module, "MAX_PENDING_MESSAGES", 5)
+
+        async def run():
+            manager = WebSocketManager()
+            ws = FakeWebSocket()
+            await manager.connect(ws, "project-1")
+
+            # Two documents generating concurrently into one project room
+            for i in range(200):
+                manager.send_token_delta(["project-1"], "PWS", 0, f"p{i} ")
+                manager.send_token_delta(["project-1"], "IGCE", 0, f"i{i} ")
+                if i % 20 == 0:
+                    await asyncio.sleep(0.01)
+            manager.send_token_stream_end(["project-1"], "PWS", 0)
+            manager.send_token_stream_end(["project-1"], "IGCE", 0)
+            await settle(0.3)
+            return manager, ws
+
+        manager, ws = asyncio.run(run())
+
+        # Not dropped as stalled, and far fewer messages than deltas
+        assert manager.active_connections["project-1"] == [ws]
+        assert len(ws.sent) < 40
+        for document, prefix in [("PWS", "p"), ("IGCE", "i")]:
+            messages = [m for m in ws.sent if m["document"] == document]
+            assert "".join(m.get("delta", "") for m in messages) == "".join(f"{prefix}{i} " for i in range(200))
+            assert messages[-1] == {"type": "token_stream_end", "document": document, "section": 0}
+
+    def test_publish_from_worker_thread(self):
+        async def run():
+            manager = WebSocketManager()
+            ws = FakeWebSocket()
+            await manager.connect(ws, "project-1")
+
+            thread = threading.Thread(
+                target=manager.send_token_delta, args=(["project-1"], "IGCE", 0, "cost")
+            )
+            thread.start()
+            thread.join()
+            await settle(0.2)
+            return ws
+
+        ws = asyncio.run(run())
+
+        assert ws.sent[0]["delta"] == "cost"
+
+    def test_slow_client_does_not_block_others(self, monkeypatch):
+        monkeypatch.setattr(websocket_manager_module, "MAX_PENDING_MESSAGES", 3)
+
+        async def run():
+            manager = WebSocketManager()
+            slow, fast = FakeWebSocket(), FakeWebSocket()
+            slow.gate.clear()
+            await manager.connect(slow, "project-1")
+            await manager.connect(fast, "project-1")
+
+            for i in range(10):
+                await manager.send_message("project-1", {"type": "progress", "percentage": i})
+                await asyncio.sleep(0.01)
+            await settle()
+            return manager, slow, fast
+
+        manager, slow, fast = asyncio.run(run())
+
+        assert len(fast.sent) == 10
+        # The stalled client was dropped instead of buffering without bound
+        assert manager.active_connections["project-1"] == [fast]
@@ -0,0 +1,137 @@
+"""
+Unit tests for the consistency validator
+
+Tests bounded edit distance, cached field extraction and the package-level
+consistency matrix.
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.utils.consistency_validator import FuzzyMatcher, create_standard_validator
+
+
+def reference_distance(s1, s2):
+    """Unbounded textbook Levenshtein distance"""
+    previous = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current = [i + 1]
+        for j, c2 in enumerate(s2):
+            current.append(min(previous[j + 1] + 1, current[j] + 1, previous[j] + (c1 != c2)))
+        previous = current
+    return previous[-1]
+
+
+def document(program="Advanced Logistics Management System", budget="$45M", period="36 months"):
+    return (
+        f"**Program Name:** {program}\n"
+        f"**Organization:** Army Contracting Command\n"
+        f"Total Budget: {budget}\n"
+        f"Period of Performance: {period}\n"
+    )
+
+
+class TestFuzzyMatcher:
+    """Test edit distance and similarity"""
+
+    def test_distance_matches_reference(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            s1 = "".join(rng.choice("abc") for _ in range(rng.randint(0, 10)))
+            s2 = "".join(rng.choice("abc") for _ in range(rng.randint(0, 10)))
+            expected = reference_distance(s1, s2)
+            bound = rng.randint(0, 6)
+
+            assert FuzzyMatcher.levenshtein_distance(s1, s2) == expected
+            assert FuzzyMatcher.levenshtein_distance(s1, s2, bound) == min(expected, bound + 1)
+
+    def test_bounded_stops_on_length_difference(self):
+        assert FuzzyMatcher.levenshtein_distance("a" * 1000, "a", max_distance=3) == 4
+
+    @pytest.mark.parametrize("s1,s2,tolerance", [
+        ("kitten", "sitting", 0.5),
+        ("advanced logistics", "advanced logistic", 0.9),
+        ("abcdefghij", "abcdefghiz", 0.9),
+        ("alms", "xyzw", 0.85),
+    ])
+    def test_threshold_decision_unchanged(self, s1, s2, tolerance):
+        exact = FuzzyMatcher.similarity_ratio(s1, s2)
+        bounded = FuzzyMatcher.similarity_ratio(s1, s2, min_ratio=tolerance)
+
+        assert (bounded >= tolerance) == (exact >= tolerance)
+        if exact >= tolerance:
+            assert bounded == exact
+
+
+class TestDocumentConsistencyValidator:
+    """Test two-document and package validation"""
+
+    def test_validate_pair(self):
+        validator = create_standard_validator()
+
+        report = validator.validate(document(), document(budget="$46M"), "IGCE", "PWS")
+
+        assert report["fields"]["program_name"].status == "PASS"
+        assert report["fields"]["budget"].status == "PASS"
+        assert report["fields"]["contract_type"].status == "NOT_FOUND"
+        assert report["doc1_name"] == "IGCE"
+
+    def test_fields_extracted_once_per_document(self, monkeypatch):
+        validator = create_standard_validator()
+        calls = []
+        original = validator.extractor.extract_value
+        monkeypatch.setattr(validator.extractor, "extract_value",
+                            lambda content, patterns: calls.append(1) or original(content, patterns))
+        igce, pws, qasp = document(), document(period="3 years"), document(budget="$60M")
+
+        validator.validate(igce, pws)
+        validator.validate(igce, qasp)
+        validator.validate_package({"IGCE": igce, "PWS": pws, "QASP": qasp})
+
+        assert len(calls) == 3 * len(validator.fields)
+
+    def test_add_field_invalidates_extractions(self):
+        validator = create_standard_validator()
+        validator.validate(document(), document())
+
+        validator.add_field("agency", validator.fields["organization"].field_type, [r"Agency:\s*(.+)"])
+
+        assert "agency" in validator.extract_fields(document())
+
+    def test_package_matrix(self):
+        validator = create_standard_validator()
+        documents = {
+            "IGCE": document(),
+            "PWS": document(period="3 years"),
+            "Section B": document(budget="$60M"),
+            "QASP": "No fields here",
+        }
+
+        report = validator.validate_package(documents)
+
+        matrix = report["matrix"]
+        assert matrix["IGCE"]["IGCE"] == 1.0
+        assert matrix["IGCE"]["PWS"] == matrix["PWS"]["IGCE"] == 1.0
+        assert matrix["IGCE"]["Section B"] == pytest.approx(3 / 4)
+        assert matrix["IGCE"]["QASP"] is None
+        assert len(report["pairs"]) == 6
+        assert report["fields"]["budget"]["conflicts"] == [["IGCE", "Section B"], ["PWS", "Section B"]]
+        assert report["fields"]["program_name"]["consistent"]
+        assert report["fields"]["budget"]["values"]["QASP"] is None
+
+    def test_package_pairs_match_pairwise_validation(self):
+        validator = create_standard_validator()
+        documents = {"IGCE": document(), "AP": document(program="Advanced Logistic Management System")}
+
+        package_pair = validator.validate_package(documents)["pairs"][0]
+        pairwise = validator.validate(documents["IGCE"], documents["AP"], "IGCE", "AP")
+
+        assert package_pair["overall_score"] == pairwise["overall_score"]
+        assert {k: r.status for k, r in package_pair["fields"].items()} == \
+            {k: r.status for k, r in pairwise["fields"].items()}
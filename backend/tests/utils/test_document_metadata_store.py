@@ -0,0 +1,140 @@
+"""
+Unit tests for DocumentMetadataStore
+
+Tests the SQLite-backed store, its legacy JSON migration and concurrent writes.
+"""
+
+import json
+import pytest
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.utils.document_metadata_store import DocumentMetadataStore
+
+
+@pytest.fixture
+def metadata_file(tmp_path):
+    return str(tmp_path / "data" / "document_metadata.json")
+
+
+@pytest.fixture
+def store(metadata_file):
+    return DocumentMetadataStore(metadata_file)
+
+
+def save(store, doc_type="igce", program="ALMS", **extracted):
+    return store.save_document(doc_type, program, "one two three", f"output/{doc_type}.md", extracted)
+
+
+class TestSaveAndFind:
+    """Test saving and finding documents"""
+
+    def test_save_and_find_latest(self, store):
+        first = save(store, total_cost=1)
+        second = save(store, total_cost=2)
+
+        latest = store.find_latest_document("igce", "ALMS")
+
+        assert second == f"{first}_001"
+        assert latest["id"] == second
+        assert latest["extracted_data"] == {"total_cost": 2}
+        assert latest["word_count"] == 3
+
+    def test_find_latest_before_date(self, store):
+        first = save(store)
+        second = save(store)
+        cutoff = store.find_document_by_id(second)["generated_date"]
+
+        assert store.find_latest_document("igce", "ALMS", before_date=cutoff)["id"] == first
+
+    def test_find_missing_returns_none(self, store):
+        assert store.find_latest_document("pws", "ALMS") is None
+        assert store.find_document_by_id("nope") is None
+
+    def test_list_filters_newest_first(self, store):
+        igce = save(store)
+        pws = save(store, doc_type="pws")
+        save(store, program="OTHER")
+
+        assert [d["id"] for d in store.list_documents(program="ALMS")] == [pws, igce]
+        assert [d["id"] for d in store.list_documents(doc_type="pws", program="ALMS")] == [pws]
+        assert len(store.list_documents()) == 3
+
+
+class TestReferences:
+    """Test cross-reference lookups"""
+
+    def test_cross_and_referring_documents(self, store):
+        igce = save(store)
+        pws = store.save_document("pws", "ALMS", "text", "pws.md", {}, references={"igce": igce})
+
+        assert store.get_cross_references(pws)["igce"]["id"] == igce
+        assert [d["id"] for d in store.get_referring_documents(igce)] == [pws]
+
+    def test_delete_removes_reference_rows(self, store):
+        igce = save(store)
+        pws = store.save_document("pws", "ALMS", "text", "pws.md", {}, references={"igce": igce})
+
+        assert store.delete_document(pws) is True
+        assert store.delete_document(pws) is False
+        assert store.get_referring_documents(igce) == []
+
+    def test_statistics(self, store):
+        save(store)
+        save(store, doc_type="pws")
+        save(store, program="OTHER")
+
+        stats = store.get_statistics()
+
+        assert stats["total_documents"] == 3
+        assert stats["by_type"] == {"igce": 2, "pws": 1}
+        assert stats["by_program"] == {"ALMS": 2, "OTHER": 1}
+        assert stats["total_words"] == 9
+
+
+class TestMigration:
+    """Test the one-shot import of the legacy JSON file"""
+
+    def write_legacy(self, metadata_file, documents):
+        Path(metadata_file).parent.mkdir(parents=True, exist_ok=True)
+        Path(metadata_file).write_text(json.dumps({"documents": documents, "version": "1.0"}))
+
+    def test_imports_json_once(self, metadata_file):
+        self.write_legacy(metadata_file, {
+            "igce_ALMS_2025-10-16": {
+                "id": "igce_ALMS_2025-10-16", "type": "igce", "program": "ALMS",
+                "generated_date": "2025-10-16T10:00:00", "file_path": "igce.md",
+                "word_count": 10, "extracted_data": {"total_cost": 5}, "references": {}
+            },
+            "broken": {"id": "broken"}
+        })
+
+        store = DocumentMetadataStore(metadata_file)
+        assert store.find_latest_document("igce", "ALMS")["extracted_data"] == {"total_cost": 5}
+
+        # Later edits to the JSON backup are not imported again
+        store.delete_document("igce_ALMS_2025-10-16")
+        DocumentMetadataStore(metadata_file)
+        assert store.list_documents() == []
+        assert Path(metadata_file).exists()
+
+
+class TestConcurrency:
+    """Test concurrent writers"""
+
+    def test_concurrent_saves_get_unique_ids(self, store):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ids = list(executor.map(lambda i: save(store, index=i), range(40)))
+
+        assert len(set(ids)) == 40
+        assert store.get_statistics()["total_documents"] == 40
+
+    def test_instances_share_database(self, metadata_file):
+        doc_id = save(DocumentMetadataStore(metadata_file))
+
+        assert DocumentMetadataStore(metadata_file).find_document_by_id(doc_id) is not None
@@ -0,0 +1,44 @@
+"""
+Unit tests for lazy package exports
+
+Tests that exports import on first access and are cached afterwards.
+"""
+
+import sys
+import types
+import pytest
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.utils.lazy_exports import install_lazy_exports
+
+
+@pytest.fixture
+def package(monkeypatch):
+    """A throwaway package exporting OrderedDict from collections"""
+    module = types.ModuleType("fake_package")
+    monkeypatch.setitem(sys.modules, "fake_package", module)
+    module.__all__ = install_lazy_exports(vars(module), {"OrderedDict": "collections"})
+    return module
+
+
+class TestInstallLazyExports:
+    """Test PEP 562 module attributes"""
+
+    def test_export_resolved_and_cached(self, package):
+        from collections import OrderedDict
+
+        assert "OrderedDict" not in vars(package)
+        assert package.OrderedDict is OrderedDict
+        assert vars(package)["OrderedDict"] is OrderedDict
+
+    def test_unknown_name_raises_attribute_error(self, package):
+        with pytest.raises(AttributeError, match="fake_package"):
+            package.Missing
+
+    def test_dir_lists_exports(self, package):
+        assert package.__all__ == ["OrderedDict"]
+        assert "OrderedDict" in dir(package)
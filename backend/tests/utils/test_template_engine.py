@@ -0,0 +1,127 @@
+"""
+Unit tests for the compiled template engine
+
+Tests single-pass rendering, fallback resolution and the template cache.
+"""
+
+import os
+import pytest
+from pathlib import Path
+
+# Add backend to path
+import sys
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.utils.template_engine import CompiledTemplate, load_template
+
+TEMPLATES_DIR = backend_path / "templates"
+
+
+class TestCompiledTemplate:
+    """Test parsing and rendering"""
+
+    def test_placeholders_in_first_appearance_order(self):
+        template = CompiledTemplate("{{b}} {{a}} {{b}} {{c}}")
+
+        assert template.placeholders == ["b", "a", "c"]
+
+    def test_render_fills_every_occurrence(self):
+        template = CompiledTemplate("# {{title}}\n\n{{title}} by {{author}}.")
+
+        result = template.render({"title": "PWS", "author": "COR"})
+
+        assert result.content == "# PWS\n\nPWS by COR."
+        assert result.unfilled == []
+
+    def test_values_are_not_substituted_again(self):
+        template = CompiledTemplate("{{a}} / {{b}}")
+
+        result = template.render({"a": "{{b}}", "b": "two"})
+
+        assert result.content == "{{b}} / two"
+
+    def test_values_converted_with_str(self):
+        template = CompiledTemplate("{{count}} items at ${{cost}}")
+
+        assert template.render({"count": 3, "cost": 1.5}).content == "3 items at $1.5"
+
+    def test_fallbacks_consulted_in_order(self):
+        template = CompiledTemplate("{{a}} {{b}} {{c}} {{d}}")
+
+        result = template.render(
+            {"a": "calc"},
+            {"a": "rag", "b": "rag"},
+            {"b": "default", "c": "default"},
+        )
+
+        assert result.content == "calc rag default TBD"
+        assert result.sources == {"a": "values", "b": "fallback_1", "c": "fallback_2", "d": "missing"}
+        assert result.unfilled == ["d"]
+
+    def test_none_treated_as_absent(self):
+        template = CompiledTemplate("{{a}}")
+
+        result = template.render({"a": None}, {"a": "fallback"})
+
+        assert result.content == "fallback"
+
+    def test_empty_string_is_a_value(self):
+        template = CompiledTemplate("[{{a}}]")
+
+        assert template.render({"a": ""}, {"a": "fallback"}).content == "[]"
+
+    def test_missing_string(self):
+        template = CompiledTemplate("{{a}}")
+
+        assert template.render({}, missing="[TO BE DETERMINED]").content == "[TO BE DETERMINED]"
+
+    def test_missing_callable_gets_field_name(self):
+        template = CompiledTemplate("{{ko_name}}")
+
+        result = template.render({}, missing=lambda name: f"TBD ({name})")
+
+        assert result.content == "TBD (ko_name)"
+
+    def test_missing_none_leaves_placeholder(self):
+        template = CompiledTemplate("{{a}} and {{b}}")
+
+        assert template.render({"a": "x"}, missing=None).content == "x and {{b}}"
+
+    def test_no_placeholders(self):
+        template = CompiledTemplate("Plain text")
+
+        assert template.render({"a": "x"}).content == "Plain text"
+
+
+class TestLoadTemplate:
+    """Test the per-process template cache"""
+
+    def test_same_object_until_file_changes(self, tmp_path):
+        path = tmp_path / "notice.md"
+        path.write_text("Hello {{name}}")
+
+        first = load_template(path)
+        assert load_template(str(path)) is first
+
+        path.write_text("Goodbye {{name}}")
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+        second = load_template(path)
+        assert second is not first
+        assert second.render({"name": "COR"}).content == "Goodbye COR"
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_template(tmp_path / "absent.md")
+
+    @pytest.mark.parametrize("name", ["section_k_template.md", "igce_template.md", "sf26_template.md"])
+    def test_repository_templates_render_completely(self, name):
+        template = load_template(TEMPLATES_DIR / name)
+
+        result = template.render({}, missing="TBD")
+
+        assert template.placeholders
+        assert "{{" not in result.content
+        assert set(result.unfilled) == set(template.placeholders)
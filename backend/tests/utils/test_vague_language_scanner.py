@@ -0,0 +1,81 @@
+"""
+Unit tests for VagueLanguageScanner
+
+Tests single-pass matching against the per-term regex scan it replaces.
+"""
+
+import re
+import pytest
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+from backend.utils.vague_language_fixer import VagueLanguageFixer
+from backend.utils.vague_language_scanner import VagueLanguageScanner
+from backend.scripts.benchmark_vague_scanner import build_document, legacy_scan
+
+
+class TestVagueLanguageScanner:
+    """Test single-pass term and pattern matching"""
+
+    def test_terms_match_whole_words_case_insensitively(self):
+        scanner = VagueLanguageScanner(terms=["may", "many", "some"])
+
+        matches = scanner.scan("Many tasks MAY be handsome; maybe some.")
+
+        assert [(m.key, m.text) for m in matches] == [("many", "Many"), ("may", "MAY"), ("some", "some")]
+        assert matches[0].start == 0 and matches[0].end == 4
+
+    def test_longest_term_wins_at_same_position(self):
+        scanner = VagueLanguageScanner(terms=["high", "high quality"])
+
+        assert [m.key for m in scanner.scan("high quality and high")] == ["high quality", "high"]
+
+    def test_patterns_report_their_key(self):
+        pattern = r"\bas\s+needed\b"
+        scanner = VagueLanguageScanner(terms=["several"], patterns=[pattern])
+
+        matches = scanner.scan("Several reviews, as\n  needed.")
+
+        assert [m.key for m in matches] == ["several", pattern]
+        assert matches[1].text == "as\n  needed"
+
+    def test_line_numbers(self):
+        scanner = VagueLanguageScanner(terms=["some"])
+
+        assert [m.line for m in scanner.scan("some\n\nnone\nsome some\n")] == [1, 4, 4]
+
+    def test_empty_scanner_and_count(self):
+        assert VagueLanguageScanner().scan("anything") == []
+        assert VagueLanguageScanner(terms=["a few"]).count("A few, a few, afew") == 2
+
+    @pytest.mark.parametrize("text", [
+        build_document(3),
+        "Approximately several multiple-use items; improved/enhanced. If possible, as required.",
+    ])
+    def test_fixer_matches_per_term_scan(self, text):
+        findings = VagueLanguageFixer().detect_vague_language(text)
+
+        assert [(f["position"], f["line"], f["matched_text"]) for f in findings] == legacy_scan(text)
+
+
+class TestVagueLanguageFixer:
+    """Test findings built from the shared scanner"""
+
+    def test_finding_fields(self):
+        fixer = VagueLanguageFixer()
+
+        term, pattern = fixer.detect_vague_language("Deliver Timely reports\nas  needed.")
+
+        assert term["term"] == "timely"
+        assert term["replacement"] == VagueLanguageFixer.VAGUE_TERMS["timely"]
+        assert term["line"] == 1
+        assert pattern["term"] == "as  needed"
+        assert pattern["line"] == 2
+        assert "reports as  needed" in pattern["context"]
+
+    def test_scanner_compiled_once(self):
+        assert VagueLanguageFixer.get_scanner() is VagueLanguageFixer().get_scanner()
@@ -9,18 +9,22 @@ Features:
 - Field-type-aware normalization
 - Fuzzy string matching with confidence scores
 - Tolerance-based comparison
+- Package-wide consistency matrix across N documents
 - Detailed validation reporting
 
 Usage:
     validator = DocumentConsistencyValidator()
     validator.add_field('program_name', FieldType.TEXT, patterns=[...])
     report = validator.validate(doc1_content, doc2_content)
+    package_report = validator.validate_package({'IGCE': igce, 'PWS': pws, ...})
 """
 
+from collections import OrderedDict
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
+import hashlib
 import re
 
 
@@ -214,42 +218,99 @@ class FuzzyMatcher:
     """Provides fuzzy string matching capabilities"""
 
     @staticmethod
-    def levenshtein_distance(s1: str, s2: str) -> int:
+    def levenshtein_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
         """
         Calculate Levenshtein distance between two strings
         (minimum number of edits to transform s1 into s2)
+
+        Shared prefixes and suffixes are skipped, and with max_distance only
+        the diagonal band of the edit matrix that can stay within the bound
+        is computed, stopping as soon as a whole row exceeds it.
+
+        Args:
+            s1: First string
+            s2: Second string
+            max_distance: Optional bound; distances above it are returned as max_distance + 1
+
+        Returns:
+            Edit distance (capped at max_distance + 1 when bounded)
         """
+        if s1 == s2:
+            return 0
+
+        # A common prefix or suffix never changes the distance
+        start = 0
+        shortest = min(len(s1), len(s2))
+        while start < shortest and s1[start] == s2[start]:
+            start += 1
+        end1, end2 = len(s1), len(s2)
+        while end1 > start and end2 > start and s1[end1 - 1] == s2[end2 - 1]:
+            end1 -= 1
+            end2 -= 1
+        s1, s2 = s1[start:end1], s2[start:end2]
+
         if len(s1) < len(s2):
-            return FuzzyMatcher.levenshtein_distance(s2, s1)
+            s1, s2 = s2, s1
+
+        bound = len(s1) if max_distance is None else max_distance
+        # The length difference alone needs that many insertions
+        if len(s1) - len(s2) > bound:
+            return bound + 1
 
         if len(s2) == 0:
             return len(s1)
 
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
+        # Cells further than `bound` from the diagonal can't lead to a
+        # distance within the bound, so they stay at `outside`
+        outside = bound + 1
+        previous_row = [j if j <= bound else outside for j in range(len(s2) + 1)]
+        for i, c1 in enumerate(s1, 1):
+            current_row = [outside] * (len(s2) + 1)
+            current_row[0] = i if i <= bound else outside
+            row_min = current_row[0]
+            for j in range(max(1, i - bound), min(len(s2), i + bound) + 1):
                 # Cost of insertions, deletions, or substitutions
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
+                insertions = previous_row[j] + 1
+                deletions = current_row[j - 1] + 1
+                substitutions = previous_row[j - 1] + (c1 != s2[j - 1])
+                cell = min(insertions, deletions, substitutions)
+                current_row[j] = cell
+                if cell < row_min:
+                    row_min = cell
+            if row_min > bound:
+                return bound + 1
             previous_row = current_row
 
-        return previous_row[-1]
+        return min(previous_row[-1], bound + 1)
 
     @staticmethod
-    def similarity_ratio(s1: str, s2: str) -> float:
+    def similarity_ratio(s1: str, s2: str, min_ratio: Optional[float] = None) -> float:
         """
         Calculate similarity ratio (0.0 to 1.0)
         1.0 = identical, 0.0 = completely different
+
+        Args:
+            s1: First string
+            s2: Second string
+            min_ratio: Optional threshold; ratios at or above it are exact, ratios
+                below it may be reported higher than exact (but still below it),
+                which lets the distance computation stop early
+
+        Returns:
+            Similarity ratio
         """
-        distance = FuzzyMatcher.levenshtein_distance(s1, s2)
         max_len = max(len(s1), len(s2))
 
         if max_len == 0:
             return 1.0
 
+        max_distance = None
+        if min_ratio is not None:
+            # One edit of slack so float rounding can't move the threshold
+            max_distance = int((1.0 - min_ratio) * max_len) + 1
+
+        distance = FuzzyMatcher.levenshtein_distance(s1, s2, max_distance)
+
         return 1.0 - (distance / max_len)
 
 
@@ -280,7 +341,7 @@ class ValueExtractor:
                 context = content[start:end].strip()
 
                 # Calculate line number
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = content.count('\n', 0, match.start()) + 1
 
                 return (value, context, line_num)
 
@@ -326,7 +387,7 @@ class ValueComparer:
         norm1 = self.normalizer.normalize_text(value1)
         norm2 = self.normalizer.normalize_text(value2)
 
-        similarity = self.fuzzy_matcher.similarity_ratio(norm1, norm2)
+        similarity = self.fuzzy_matcher.similarity_ratio(norm1, norm2, min_ratio=tolerance)
 
         return {
             'match': similarity >= tolerance,
@@ -473,18 +534,29 @@ class DocumentConsistencyValidator:
     """
     Main validator class for cross-document consistency checking
 
+    Field values are extracted once per document (cached by content hash),
+    so validating a document against several others, or a whole package
+    with validate_package(), runs each field's patterns over each document
+    only once.
+
     Usage:
         validator = DocumentConsistencyValidator()
         validator.add_field('program_name', FieldType.TEXT, [...patterns...])
         report = validator.validate(doc1_content, doc2_content)
+        package_report = validator.validate_package({'IGCE': igce, 'PWS': pws, 'Section B': section_b})
     """
 
+    # Documents whose extracted fields are kept
+    EXTRACTION_CACHE_SIZE = 128
+
     def __init__(self):
         self.fields: Dict[str, FieldDefinition] = {}
         self.normalizer = ValueNormalizer()
         self.fuzzy_matcher = FuzzyMatcher()
         self.extractor = ValueExtractor()
         self.comparer = ValueComparer(self.normalizer, self.fuzzy_matcher)
+        # Content hash -> {field_name: extraction}, least recently used first
+        self._extractions: "OrderedDict[str, Dict[str, Optional[Tuple[str, str, int]]]]" = OrderedDict()
 
     def add_field(
         self,
@@ -504,6 +576,33 @@ class DocumentConsistencyValidator:
             tolerance=tolerance,
             description=description
         )
+        # Cached extractions don't cover the new definition
+        self._extractions.clear()
+
+    def extract_fields(self, content: str) -> Dict[str, Optional[Tuple[str, str, int]]]:
+        """
+        Extract every field from a document, reusing earlier extractions
+
+        Args:
+            content: Document content
+
+        Returns:
+            Dict of {field_name: (value, context, line_number) or None}
+        """
+        key = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        extracted = self._extractions.get(key)
+        if extracted is not None:
+            self._extractions.move_to_end(key)
+            return extracted
+
+        extracted = {
+            field_name: self.extractor.extract_value(content, field_def.patterns)
+            for field_name, field_def in self.fields.items()
+        }
+        self._extractions[key] = extracted
+        if len(self._extractions) > self.EXTRACTION_CACHE_SIZE:
+            self._extractions.popitem(last=False)
+        return extracted
 
     def validate(self, doc1_content: str, doc2_content: str, doc1_name: str = "Document 1", doc2_name: str = "Document 2") -> Dict[str, Any]:
         """
@@ -515,21 +614,94 @@ class DocumentConsistencyValidator:
             - grade: str
             - fields: dict of ValidationResults
         """
-        results = {}
-        passed = 0
-        failed = 0
-        not_found = 0
-
-        for field_name, field_def in self.fields.items():
-            result = self._validate_field(doc1_content, doc2_content, field_def, doc1_name, doc2_name)
-            results[field_name] = result
-
-            if result.status == 'PASS':
-                passed += 1
-            elif result.status == 'FAIL':
-                failed += 1
-            else:
-                not_found += 1
+        extracted1 = self.extract_fields(doc1_content)
+        extracted2 = self.extract_fields(doc2_content)
+
+        results = {
+            field_name: self._validate_field(
+                extracted1[field_name], extracted2[field_name], field_def, doc1_name, doc2_name
+            )
+            for field_name, field_def in self.fields.items()
+        }
+        return self._build_report(results, doc1_name, doc2_name)
+
+    def validate_package(self, documents: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Validate consistency across every pair of documents in a package
+
+        Each document's fields are extracted once, and each distinct pair of
+        values of a field is compared once, however many documents share them.
+
+        Args:
+            documents: Dict of {document_name: content}, e.g. IGCE, AP, PWS, Sections B/L/M, QASP
+
+        Returns:
+            Dictionary with:
+                - matrix: {name: {other_name: overall_score}} (None where no field could be compared)
+                - pairs: validate()-style report for each pair of documents
+                - fields: per field, each document's value and the pairs that conflict
+                - overall_score, passed, failed, not_found, grade: totals over all pairs
+        """
+        names = list(documents)
+        extracted = {name: self.extract_fields(content) for name, content in documents.items()}
+        comparisons: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+        matrix: Dict[str, Dict[str, Optional[float]]] = {name: {other: None for other in names} for name in names}
+        pairs = []
+        conflicts: Dict[str, List[List[str]]] = {field_name: [] for field_name in self.fields}
+
+        for i, name1 in enumerate(names):
+            matrix[name1][name1] = 1.0
+            for name2 in names[i + 1:]:
+                results = {
+                    field_name: self._validate_field(
+                        extracted[name1][field_name], extracted[name2][field_name],
+                        field_def, name1, name2, comparisons
+                    )
+                    for field_name, field_def in self.fields.items()
+                }
+                report = self._build_report(results, name1, name2)
+                pairs.append(report)
+
+                score = report['overall_score'] if report['passed'] + report['failed'] else None
+                matrix[name1][name2] = matrix[name2][name1] = score
+                for field_name, result in results.items():
+                    if result.status == 'FAIL':
+                        conflicts[field_name].append([name1, name2])
+
+        fields = {
+            field_name: {
+                'values': {
+                    name: extracted[name][field_name][0] if extracted[name][field_name] else None
+                    for name in names
+                },
+                'conflicts': conflicts[field_name],
+                'consistent': not conflicts[field_name]
+            }
+            for field_name in self.fields
+        }
+
+        passed = sum(report['passed'] for report in pairs)
+        failed = sum(report['failed'] for report in pairs)
+        overall_score = passed / (passed + failed) if passed + failed > 0 else 0.0
+
+        return {
+            'documents': names,
+            'matrix': matrix,
+            'pairs': pairs,
+            'fields': fields,
+            'overall_score': overall_score,
+            'passed': passed,
+            'failed': failed,
+            'not_found': sum(report['not_found'] for report in pairs),
+            'grade': self._calculate_grade(overall_score)
+        }
+
+    def _build_report(self, results: Dict[str, ValidationResult], doc1_name: str, doc2_name: str) -> Dict[str, Any]:
+        """Summarize field results for one pair of documents"""
+        passed = sum(1 for result in results.values() if result.status == 'PASS')
+        failed = sum(1 for result in results.values() if result.status == 'FAIL')
+        not_found = len(results) - passed - failed
 
         total_checks = passed + failed
         overall_score = passed / total_checks if total_checks > 0 else 0.0
@@ -551,17 +723,27 @@ class DocumentConsistencyValidator:
 
     def _validate_field(
         self,
-        doc1_content: str,
-        doc2_content: str,
+        extract1: Optional[Tuple[str, str, int]],
+        extract2: Optional[Tuple[str, str, int]],
         field_def: FieldDefinition,
         doc1_name: str,
-        doc2_name: str
+        doc2_name: str,
+        comparisons: Optional[Dict[Tuple[str, str, str], Dict[str, Any]]] = None
     ) -> ValidationResult:
-        """Validate a single field across two documents"""
+        """
+        Validate a single field across two documents
+
+        Args:
+            extract1: Extraction from the first document (see extract_fields)
+            extract2: Extraction from the second document
+            field_def: Field definition
+            doc1_name: First document name
+            doc2_name: Second document name
+            comparisons: Optional memo of comparisons keyed by (field, value1, value2)
 
-        # Extract values from both documents
-        extract1 = self.extractor.extract_value(doc1_content, field_def.patterns)
-        extract2 = self.extractor.extract_value(doc2_content, field_def.patterns)
+        Returns:
+            ValidationResult
+        """
 
         # Handle not found cases
         if extract1 is None and extract2 is None:
@@ -601,7 +783,12 @@ class DocumentConsistencyValidator:
         value2, context2, line2 = extract2
 
         # Compare values
-        comparison = self.comparer.compare(value1, value2, field_def.field_type, field_def.tolerance)
+        key = (field_def.name, value1, value2)
+        comparison = comparisons.get(key) if comparisons is not None else None
+        if comparison is None:
+            comparison = self.comparer.compare(value1, value2, field_def.field_type, field_def.tolerance)
+            if comparisons is not None:
+                comparisons[key] = comparison
 
         # Build result
         status = 'PASS' if comparison['match'] else 'FAIL'
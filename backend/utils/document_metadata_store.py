@@ -2,15 +2,162 @@
 Document Metadata Store
 
 Tracks generated documents and their extracted data for cross-referencing.
+
+Metadata is kept in an embedded SQLite database next to the legacy JSON
+file (data/document_metadata.json -> data/document_metadata.db):
+
+- Lookups by program, type and date use indexes instead of scanning every
+  document, and constructing a store no longer re-reads a whole file
+- Each write is one transaction, so concurrent generations (threads or
+  processes) never lose each other's documents
+- Document IDs are allocated inside the inserting transaction, so two
+  writers can't pick the same ID
+
+The first time a database is opened, documents from the legacy JSON file
+are imported once; the JSON file is left in place as a backup.
 """
 
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    program TEXT NOT NULL,
+    generated_date TEXT NOT NULL,
+    file_path TEXT,
+    word_count INTEGER NOT NULL DEFAULT 0,
+    extracted_data TEXT NOT NULL DEFAULT '{}',
+    refs TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS ix_documents_program_type_date ON documents (program, type, generated_date);
+CREATE INDEX IF NOT EXISTS ix_documents_type_date ON documents (type, generated_date);
+CREATE TABLE IF NOT EXISTS document_references (
+    doc_id TEXT NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    ref_type TEXT NOT NULL,
+    ref_doc_id TEXT NOT NULL,
+    PRIMARY KEY (doc_id, ref_type)
+);
+CREATE INDEX IF NOT EXISTS ix_document_references_target ON document_references (ref_doc_id);
+CREATE TABLE IF NOT EXISTS store_info (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+COLUMNS = "id, type, program, generated_date, file_path, word_count, extracted_data, refs"
+
+# One connection per database per process, shared by every store instance
+# (agents construct a store per execute()). Connections are serialized by
+# their lock; other processes are kept consistent by SQLite's own locking.
+_connections: Dict[Tuple[int, str], Tuple[sqlite3.Connection, threading.RLock]] = {}
+_connections_lock = threading.Lock()
+
+
+def _get_connection(db_path: str, legacy_json: Optional[str]) -> Tuple[sqlite3.Connection, threading.RLock]:
+    """
+    Get this process's connection to a metadata database, creating and
+    migrating the database on first use
+
+    Args:
+        db_path: SQLite database path
+        legacy_json: JSON metadata file to import once
+
+    Returns:
+        (connection, lock)
+    """
+    key = (os.getpid(), os.path.abspath(db_path))
+    with _connections_lock:
+        if key not in _connections:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            _connections[key] = (conn, threading.RLock())
+            if legacy_json:
+                _migrate_json(conn, legacy_json)
+        return _connections[key]
+
+
+def _migrate_json(conn: sqlite3.Connection, json_path: str) -> None:
+    """Import documents from a legacy JSON metadata file (once per database)"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        done = conn.execute("SELECT value FROM store_info WHERE key = 'json_migrated'").fetchone()
+        if done or not os.path.exists(json_path):
+            conn.execute("COMMIT")
+            return
+
+        try:
+            with open(json_path, 'r') as f:
+                documents = json.load(f).get('documents', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Warning: Could not parse {json_path}, skipping migration: {e}")
+            documents = {}
+
+        for doc_id, doc in documents.items():
+            try:
+                _insert(conn, {**doc, 'id': doc.get('id', doc_id)}, replace=False)
+            except (KeyError, TypeError) as e:
+                print(f"⚠️  Skipping malformed document metadata {doc_id}: {e}")
+
+        conn.execute(
+            "INSERT OR REPLACE INTO store_info (key, value) VALUES ('json_migrated', ?)",
+            (json.dumps({'source': json_path, 'documents': len(documents),
+                         'migrated_at': datetime.now().isoformat()}),)
+        )
+        conn.execute("COMMIT")
+        if documents:
+            print(f"✅ Migrated {len(documents)} documents from {json_path}")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _insert(conn: sqlite3.Connection, doc: Dict, replace: bool = True) -> None:
+    """Insert one document row and its reference rows (inside a transaction)"""
+    references = doc.get('references') or {}
+    verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+    cursor = conn.execute(
+        f"{verb} INTO documents ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            doc['id'], doc['type'], doc['program'], doc['generated_date'],
+            doc.get('file_path'), doc.get('word_count', 0),
+            json.dumps(doc.get('extracted_data') or {}, default=str),
+            json.dumps(references, default=str)
+        )
+    )
+    if cursor.rowcount:
+        conn.execute("DELETE FROM document_references WHERE doc_id = ?", (doc['id'],))
+        conn.executemany(
+            "INSERT INTO document_references (doc_id, ref_type, ref_doc_id) VALUES (?, ?, ?)",
+            [(doc['id'], ref_type, str(ref_id)) for ref_type, ref_id in references.items()]
+        )
+
+
+def _row_to_doc(row: sqlite3.Row) -> Dict:
+    """Convert a documents row to the metadata dict callers expect"""
+    return {
+        'id': row['id'],
+        'type': row['type'],
+        'program': row['program'],
+        'generated_date': row['generated_date'],
+        'file_path': row['file_path'],
+        'word_count': row['word_count'],
+        'extracted_data': json.loads(row['extracted_data']),
+        'references': json.loads(row['refs'])
+    }
+
+
 class DocumentMetadataStore:
     """
     Store and retrieve metadata about generated documents
@@ -26,29 +173,28 @@ class DocumentMetadataStore:
         Initialize metadata store
 
         Args:
-            metadata_file: Path to JSON file storing metadata
+            metadata_file: Legacy JSON metadata path; the SQLite database is
+                the same path with a .db suffix, and the JSON file is imported
+                into it the first time it is opened
         """
         self.metadata_file = metadata_file
-        self.metadata = self._load_metadata()
+        self.db_path = str(Path(metadata_file).with_suffix('.db'))
+        self._conn, self._lock = _get_connection(self.db_path, metadata_file)
 
-    def _load_metadata(self) -> Dict:
-        """Load metadata from file, create empty if doesn't exist"""
-        if os.path.exists(self.metadata_file):
-            try:
-                with open(self.metadata_file, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                print(f"⚠️  Warning: Could not parse {self.metadata_file}, starting fresh")
-                return {'documents': {}, 'version': '1.0'}
-        else:
-            # Create parent directory if needed
-            Path(self.metadata_file).parent.mkdir(parents=True, exist_ok=True)
-            return {'documents': {}, 'version': '1.0'}
-
-    def _save_metadata(self):
-        """Save metadata to file"""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.metadata, f, indent=2)
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @property
+    def metadata(self) -> Dict:
+        """
+        Snapshot of all documents in the legacy {'documents': {...}} layout
+
+        Loads every document; prefer list_documents() and the find_* methods.
+        Changes to the snapshot are not saved.
+        """
+        docs = self._query(f"SELECT {COLUMNS} FROM documents ORDER BY rowid")
+        return {'documents': {row['id']: _row_to_doc(row) for row in docs}, 'version': '2.0'}
 
     def save_document(
         self,
@@ -77,30 +223,32 @@ class DocumentMetadataStore:
         date_str = datetime.now().strftime('%Y-%m-%d')
         base_id = f"{doc_type}_{program}_{date_str}"
 
-        # Check if document with this ID already exists, add counter if needed
-        counter = 1
-        doc_id = base_id
-        while doc_id in self.metadata['documents']:
-            doc_id = f"{base_id}_{counter:03d}"
-            counter += 1
-
-        # Calculate word count
-        word_count = len(content.split())
-
-        # Create metadata entry
-        self.metadata['documents'][doc_id] = {
-            'id': doc_id,
-            'type': doc_type,
-            'program': program,
-            'generated_date': datetime.now().isoformat(),
-            'file_path': file_path,
-            'word_count': word_count,
-            'extracted_data': extracted_data,
-            'references': references or {}
-        }
-
-        # Save to file
-        self._save_metadata()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so no other process
+            # can claim the same ID between the check and the insert
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Check if document with this ID already exists, add counter if needed
+                counter = 1
+                doc_id = base_id
+                while self._conn.execute("SELECT 1 FROM documents WHERE id = ?", (doc_id,)).fetchone():
+                    doc_id = f"{base_id}_{counter:03d}"
+                    counter += 1
+
+                _insert(self._conn, {
+                    'id': doc_id,
+                    'type': doc_type,
+                    'program': program,
+                    'generated_date': datetime.now().isoformat(),
+                    'file_path': file_path,
+                    'word_count': len(content.split()),
+                    'extracted_data': extracted_data,
+                    'references': references or {}
+                })
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
 
         print(f"✅ Saved document metadata: {doc_id}")
         return doc_id
@@ -122,31 +270,20 @@ class DocumentMetadataStore:
         Returns:
             Document metadata dict or None if not found
         """
-        matching_docs = [
-            doc for doc_id, doc in self.metadata['documents'].items()
-            if doc['type'] == doc_type and doc['program'] == program
-        ]
-
-        # Filter by date if specified
+        sql = f"SELECT {COLUMNS} FROM documents WHERE program = ? AND type = ?"
+        params = [program, doc_type]
         if before_date:
-            matching_docs = [
-                doc for doc in matching_docs
-                if doc['generated_date'] < before_date
-            ]
-
-        if not matching_docs:
-            return None
+            sql += " AND generated_date < ?"
+            params.append(before_date)
+        sql += " ORDER BY generated_date DESC, rowid LIMIT 1"
 
-        # Return most recent
-        return sorted(
-            matching_docs,
-            key=lambda d: d['generated_date'],
-            reverse=True
-        )[0]
+        rows = self._query(sql, tuple(params))
+        return _row_to_doc(rows[0]) if rows else None
 
     def find_document_by_id(self, doc_id: str) -> Optional[Dict]:
         """Find document by exact ID"""
-        return self.metadata['documents'].get(doc_id)
+        rows = self._query(f"SELECT {COLUMNS} FROM documents WHERE id = ?", (doc_id,))
+        return _row_to_doc(rows[0]) if rows else None
 
     def list_documents(
         self,
@@ -163,16 +300,21 @@ class DocumentMetadataStore:
         Returns:
             List of document metadata dicts
         """
-        docs = list(self.metadata['documents'].values())
-
-        if doc_type:
-            docs = [doc for doc in docs if doc['type'] == doc_type]
-
+        conditions, params = [], []
         if program:
-            docs = [doc for doc in docs if doc['program'] == program]
+            conditions.append("program = ?")
+            params.append(program)
+        if doc_type:
+            conditions.append("type = ?")
+            params.append(doc_type)
 
+        sql = f"SELECT {COLUMNS} FROM documents"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
         # Sort by date (most recent first)
-        return sorted(docs, key=lambda d: d['generated_date'], reverse=True)
+        sql += " ORDER BY generated_date DESC, rowid"
+
+        return [_row_to_doc(row) for row in self._query(sql, tuple(params))]
 
     def get_cross_references(self, doc_id: str) -> Dict[str, Dict]:
         """
@@ -184,19 +326,13 @@ class DocumentMetadataStore:
         Returns:
             Dict of {ref_type: referenced_document_metadata}
         """
-        doc = self.find_document_by_id(doc_id)
-        if not doc:
-            return {}
-
-        references = doc.get('references', {})
-        resolved_refs = {}
-
-        for ref_type, ref_doc_id in references.items():
-            ref_doc = self.find_document_by_id(ref_doc_id)
-            if ref_doc:
-                resolved_refs[ref_type] = ref_doc
-
-        return resolved_refs
+        rows = self._query(
+            f"SELECT r.ref_type, {', '.join('d.' + c.strip() for c in COLUMNS.split(','))} "
+            "FROM document_references r JOIN documents d ON d.id = r.ref_doc_id "
+            "WHERE r.doc_id = ?",
+            (doc_id,)
+        )
+        return {row['ref_type']: _row_to_doc(row) for row in rows}
 
     def get_referring_documents(self, doc_id: str) -> List[Dict]:
         """
@@ -208,13 +344,12 @@ class DocumentMetadataStore:
         Returns:
             List of documents that reference this one
         """
-        referring_docs = []
-
-        for other_doc in self.metadata['documents'].values():
-            if doc_id in other_doc.get('references', {}).values():
-                referring_docs.append(other_doc)
-
-        return referring_docs
+        rows = self._query(
+            f"SELECT {COLUMNS} FROM documents WHERE id IN "
+            "(SELECT doc_id FROM document_references WHERE ref_doc_id = ?) ORDER BY rowid",
+            (doc_id,)
+        )
+        return [_row_to_doc(row) for row in rows]
 
     def delete_document(self, doc_id: str) -> bool:
         """
@@ -226,40 +361,24 @@ class DocumentMetadataStore:
         Returns:
             True if deleted, False if not found
         """
-        if doc_id in self.metadata['documents']:
-            del self.metadata['documents'][doc_id]
-            self._save_metadata()
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,)).rowcount
+        if deleted:
             print(f"✅ Deleted document metadata: {doc_id}")
             return True
         return False
 
     def get_statistics(self) -> Dict:
         """Get statistics about stored documents"""
-        total_docs = len(self.metadata['documents'])
-
-        # Count by type
-        by_type = {}
-        for doc in self.metadata['documents'].values():
-            doc_type = doc['type']
-            by_type[doc_type] = by_type.get(doc_type, 0) + 1
-
-        # Count by program
-        by_program = {}
-        for doc in self.metadata['documents'].values():
-            program = doc['program']
-            by_program[program] = by_program.get(program, 0) + 1
-
-        # Total word count
-        total_words = sum(
-            doc.get('word_count', 0)
-            for doc in self.metadata['documents'].values()
-        )
+        totals = self._query("SELECT COUNT(*) AS docs, COALESCE(SUM(word_count), 0) AS words FROM documents")[0]
+        by_type = {row[0]: row[1] for row in self._query("SELECT type, COUNT(*) FROM documents GROUP BY type")}
+        by_program = {row[0]: row[1] for row in self._query("SELECT program, COUNT(*) FROM documents GROUP BY program")}
 
         return {
-            'total_documents': total_docs,
+            'total_documents': totals['docs'],
             'by_type': by_type,
             'by_program': by_program,
-            'total_words': total_words
+            'total_words': totals['words']
         }
 
     def print_summary(self):
@@ -0,0 +1,50 @@
+"""
+Lazy Exports: Package attributes imported on first access (PEP 562)
+
+Package __init__ modules list their exported names and the modules that
+define them, so importing one submodule (e.g. backend.agents.base_agent)
+does not pull in every sibling the package re-exports.
+
+Usage:
+    _EXPORTS = {
+        'VectorStore': 'backend.rag.vector_store',
+    }
+
+    __all__ = install_lazy_exports(globals(), _EXPORTS)
+"""
+
+import importlib
+from typing import Any, Dict, List
+
+
+def install_lazy_exports(namespace: Dict[str, Any], exports: Dict[str, str]) -> List[str]:
+    """
+    Add module-level __getattr__ and __dir__ that import exports on demand
+
+    The first access imports the defining module and caches the value in
+    the package namespace, so later lookups are plain attribute reads.
+
+    Args:
+        namespace: The package's globals()
+        exports: Exported name -> module that defines it
+
+    Returns:
+        Exported names, for __all__
+    """
+    package = namespace['__name__']
+    names = list(exports)
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(names))
+
+    namespace['__getattr__'] = __getattr__
+    namespace['__dir__'] = __dir__
+    return names
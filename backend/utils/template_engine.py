@@ -0,0 +1,161 @@
+"""
+Template Engine: Compiled markdown templates with single-pass substitution
+
+Templates in backend/templates/ use {{placeholder}} fields. Each template
+file is parsed once per process into a list of literal segments and field
+names; rendering looks every field up once and joins the pieces, instead
+of copying the whole document for every str.replace() call.
+
+Field values are resolved through fallback rules, in order:
+1. values (calculated by the agent)
+2. any fallback mappings (e.g. RAG-extracted values, then smart defaults)
+3. the `missing` value (default 'TBD')
+
+Usage:
+    template = load_template(Path('backend/templates/igce_template.md'))
+    result = template.render(
+        {'program_name': 'ALMS'},          # calculated
+        rag_values,                         # RAG
+        {'classification': 'UNCLASSIFIED'}  # defaults
+    )
+    content = result.content
+    print(result.unfilled)                  # fields that fell through to 'TBD'
+"""
+
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Tuple, Union
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+
+# Value used for fields no mapping fills: a string, a function of the
+# field name, or None to leave the {{placeholder}} in the output
+Missing = Union[str, Callable[[str], str], None]
+
+
+@dataclass
+class RenderResult:
+    """Rendered template plus where each field's value came from"""
+    content: str
+    # Field name -> 'values', 'fallback_1', 'fallback_2', ... or 'missing'
+    sources: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def unfilled(self) -> List[str]:
+        """Fields that no mapping provided a value for"""
+        return [name for name, source in self.sources.items() if source == 'missing']
+
+
+class CompiledTemplate:
+    """
+    A template parsed into literal segments and placeholder names
+
+    Rendering is a single pass over the segment list, so a value that
+    itself contains {{...}} is inserted as-is rather than substituted again.
+    """
+
+    def __init__(self, source: str, name: str = '<string>'):
+        """
+        Parse a template
+
+        Args:
+            source: Template text
+            name: Template name for messages (usually the file name)
+        """
+        self.source = source
+        self.name = name
+
+        # split() alternates literal text and captured field names
+        parts = PLACEHOLDER_PATTERN.split(source)
+        self._literals: List[str] = parts[0::2]
+        self._fields: List[str] = parts[1::2]
+
+        # Distinct field names in order of first appearance
+        self.placeholders: List[str] = list(dict.fromkeys(self._fields))
+
+    def render(self, values: Mapping[str, object], *fallbacks: Mapping[str, object], missing: Missing = 'TBD') -> RenderResult:
+        """
+        Fill every placeholder in one pass
+
+        A mapping provides a field if it has the key with a value other than
+        None; values are converted with str().
+
+        Args:
+            values: Calculated values (highest priority)
+            *fallbacks: Further mappings consulted in order (e.g. RAG values, then defaults)
+            missing: Value for fields no mapping provides: a string, a function
+                of the field name, or None to leave the placeholder in place
+
+        Returns:
+            RenderResult with the content and each field's source
+        """
+        sources = (('values', values),) + tuple(
+            (f'fallback_{i}', mapping) for i, mapping in enumerate(fallbacks, 1)
+        )
+
+        resolved: Dict[str, str] = {}
+        resolved_from: Dict[str, str] = {}
+        for name in self.placeholders:
+            for source_name, mapping in sources:
+                value = mapping.get(name)
+                if value is not None:
+                    resolved[name] = str(value)
+                    resolved_from[name] = source_name
+                    break
+            else:
+                if missing is None:
+                    resolved[name] = '{{' + name + '}}'
+                else:
+                    resolved[name] = missing(name) if callable(missing) else missing
+                resolved_from[name] = 'missing'
+
+        pieces = [self._literals[0]]
+        for name, literal in zip(self._fields, self._literals[1:]):
+            pieces.append(resolved[name])
+            pieces.append(literal)
+
+        return RenderResult(content=''.join(pieces), sources=resolved_from)
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.name!r}, {len(self.placeholders)} placeholders)"
+
+
+# Compiled templates by resolved path, with the mtime they were read at
+_templates: Dict[str, Tuple[float, CompiledTemplate]] = {}
+_templates_lock = threading.Lock()
+
+
+def load_template(path: Union[str, Path]) -> CompiledTemplate:
+    """
+    Get a compiled template file, parsing it only the first time it is used
+    in this process (or after the file changes)
+
+    Args:
+        path: Template file path
+
+    Returns:
+        CompiledTemplate
+
+    Raises:
+        FileNotFoundError: If the template file does not exist
+    """
+    key = os.path.realpath(path)
+    mtime = os.stat(key).st_mtime
+
+    with _templates_lock:
+        cached = _templates.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    with open(key, 'r') as f:
+        template = CompiledTemplate(f.read(), name=Path(path).name)
+
+    with _templates_lock:
+        _templates[key] = (mtime, template)
+    return template
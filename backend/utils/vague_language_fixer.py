@@ -3,8 +3,9 @@ Vague Language Fixer: Automatically detects and reports vague terms
 Helps improve quality scores by identifying imprecise language
 """
 
-import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from backend.utils.vague_language_scanner import ScanMatch, VagueLanguageScanner
 
 
 class VagueLanguageFixer:
@@ -90,55 +91,37 @@ class VagueLanguageFixer:
         Returns:
             List of findings with term, replacement, position, context
         """
-        findings = []
-
-        # Check for vague terms
-        for vague_term, replacement in self.VAGUE_TERMS.items():
-            pattern = rf'\b{re.escape(vague_term)}\b'
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-
-            for match in matches:
-                finding = self._create_finding(
-                    content, match, vague_term, replacement
-                )
-                findings.append(finding)
-
-        # Check for vague patterns
-        for pattern, replacement in self.VAGUE_PATTERNS.items():
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-
-            for match in matches:
-                finding = self._create_finding(
-                    content, match, match.group(0), replacement
-                )
-                findings.append(finding)
-
-        # Sort by position
-        findings.sort(key=lambda x: x['position'])
-
-        return findings
-
-    def _create_finding(
-        self,
-        content: str,
-        match: re.Match,
-        term: str,
-        replacement: str
-    ) -> Dict:
-        """Create a finding dictionary from a match"""
-        context_start = max(0, match.start() - 60)
-        context_end = min(len(content), match.end() + 60)
+        # One pass over the content for all terms and patterns, already in position order
+        return [self._create_finding(content, match) for match in self.get_scanner().iter_matches(content)]
+
+    @classmethod
+    def get_scanner(cls) -> VagueLanguageScanner:
+        """Get the scanner for VAGUE_TERMS and VAGUE_PATTERNS (compiled once per class)"""
+        scanner = cls.__dict__.get('_scanner')
+        if scanner is None:
+            scanner = VagueLanguageScanner(terms=cls.VAGUE_TERMS, patterns=cls.VAGUE_PATTERNS)
+            cls._scanner = scanner
+        return scanner
+
+    def _create_finding(self, content: str, match: ScanMatch) -> Dict:
+        """Create a finding dictionary from a scan match"""
+        context_start = max(0, match.start - 60)
+        context_end = min(len(content), match.end + 60)
         context = content[context_start:context_end].replace('\n', ' ')
 
-        line_num = content[:match.start()].count('\n') + 1
+        # Patterns report the text they matched, terms the term itself
+        if match.key in self.VAGUE_TERMS:
+            term, replacement = match.key, self.VAGUE_TERMS[match.key]
+        else:
+            term, replacement = match.text, self.VAGUE_PATTERNS[match.key]
 
         return {
             'term': term,
             'replacement': replacement,
-            'position': match.start(),
-            'line': line_num,
+            'position': match.start,
+            'line': match.line,
             'context': f"...{context}...",
-            'matched_text': match.group(0)
+            'matched_text': match.text
         }
 
     def generate_report(self, findings: List[Dict]) -> str:
@@ -176,17 +159,19 @@ class VagueLanguageFixer:
 
         return "\n".join(report)
 
-    def calculate_vague_score(self, content: str) -> Tuple[int, int]:
+    def calculate_vague_score(self, content: str, findings: Optional[List[Dict]] = None) -> Tuple[int, int]:
         """
         Calculate vague language score
 
         Args:
             content: Text to analyze
+            findings: Findings from detect_vague_language, if already computed
 
         Returns:
             Tuple of (score, vague_term_count)
         """
-        findings = self.detect_vague_language(content)
+        if findings is None:
+            findings = self.detect_vague_language(content)
         word_count = len(content.split())
 
         # Score based on density of vague terms
@@ -240,7 +225,7 @@ def analyze_vague_language(content: str) -> Dict:
     """
     fixer = VagueLanguageFixer()
     findings = fixer.detect_vague_language(content)
-    score, count = fixer.calculate_vague_score(content)
+    score, count = fixer.calculate_vague_score(content, findings)
     report = fixer.generate_report(findings)
 
     return {
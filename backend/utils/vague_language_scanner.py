@@ -0,0 +1,139 @@
+"""
+Vague Language Scanner: Single-pass multi-term matching
+
+Finds every occurrence of a set of terms and regex patterns in one pass
+over the text. The terms are compiled once into a single trie-shaped
+alternation (so each position is tested against shared prefixes instead of
+every term in turn), and the patterns are appended to the same regex as
+named groups. Scanning a document therefore costs one regex pass no matter
+how many terms are checked, rather than one pass per term.
+
+Usage:
+    scanner = VagueLanguageScanner(terms=['several', 'many'], patterns=[r'\\bas\\s+needed\\b'])
+    for match in scanner.scan(content):
+        print(match.line, match.key, match.start, match.end)
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List
+
+
+@dataclass(frozen=True)
+class ScanMatch:
+    """One term or pattern occurrence"""
+    key: str    # Term or pattern that matched, as passed to the scanner
+    start: int
+    end: int
+    line: int   # 1-based line number of start
+    text: str   # Matched text as it appears in the document
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation shaped like a prefix trie
+
+    ['may', 'many', 'might'] -> 'm(?:a(?:ny?|y)|ight)', roughly: shared
+    prefixes are matched once, and longer words are preferred over their
+    prefixes.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        optional = '' in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if optional else group
+
+    return build(trie)
+
+
+class VagueLanguageScanner:
+    """
+    Precompiled single-pass scanner for terms and patterns
+
+    Terms match as whole words (case-insensitive by default); patterns are
+    regular expressions used as given. Occurrences are reported in document
+    order. Where two entries match at the same position only one is
+    reported: the longest term, or a pattern if no term matches there.
+    """
+
+    def __init__(self, terms: Iterable[str] = (), patterns: Iterable[str] = (), flags: int = re.IGNORECASE):
+        """
+        Compile the scanner
+
+        Args:
+            terms: Literal words or phrases, matched on word boundaries
+            patterns: Regular expressions
+            flags: re flags for the combined expression
+        """
+        self.terms = list(terms)
+        self.patterns = list(patterns)
+
+        # Matched text (lowercased) -> term as given
+        self._term_keys: Dict[str, str] = {}
+        for term in self.terms:
+            self._term_keys.setdefault(term.lower(), term)
+
+        alternatives = []
+        if self._term_keys:
+            alternatives.append(rf'(?P<term>\b{_trie_pattern(self._term_keys)}\b)')
+        for i, pattern in enumerate(self.patterns):
+            alternatives.append(f'(?P<p{i}>{pattern})')
+
+        self._regex = re.compile('|'.join(alternatives), flags) if alternatives else None
+
+    def iter_matches(self, text: str) -> Iterator[ScanMatch]:
+        """
+        Scan text, yielding matches as they are found
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            ScanMatch for each occurrence, in document order
+        """
+        if self._regex is None:
+            return
+
+        line = 1
+        counted_to = 0
+        for match in self._regex.finditer(text):
+            start = match.start()
+            # Line numbers are counted incrementally, so the whole scan stays one pass
+            line += text.count('\n', counted_to, start)
+            counted_to = start
+
+            group = match.lastgroup
+            matched = match.group()
+            if group == 'term':
+                key = self._term_keys[matched.lower()]
+            else:
+                key = self.patterns[int(group[1:])]
+
+            yield ScanMatch(key=key, start=start, end=match.end(), line=line, text=matched)
+
+    def scan(self, text: str) -> List[ScanMatch]:
+        """
+        Scan text for every term and pattern
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List of ScanMatch in document order
+        """
+        return list(self.iter_matches(text))
+
+    def count(self, text: str) -> int:
+        """Count occurrences of every term and pattern in text"""
+        return sum(1 for _ in self.iter_matches(text))
@@ -948,6 +948,27 @@ export interface RAGUploadResponse {
   file_size: number;
 }
 
+export type RAGIngestionStage =
+  | 'queued'
+  | 'parsing'
+  | 'chunking'
+  | 'embedding'
+  | 'indexing'
+  | 'completed'
+  | 'failed';
+
+export interface RAGUploadJobStatus {
+  job_id: string;
+  status: 'pending' | 'in_progress' | 'completed' | 'failed';
+  stage: RAGIngestionStage;
+  progress: number;
+  message?: string;
+  filename: string;
+  file_size: number;
+  chunks_created?: number;
+  error?: string;
+}
+
 export interface RAGStats {
   total_chunks: number;
   embedding_dimension: number;
@@ -977,9 +998,15 @@ export interface ExtractAssumptionsResponse {
 
 export const ragApi = {
   /**
-   * Upload a document to the RAG system for document generation
+   * Upload a document to the RAG system for document generation.
+   * The server ingests uploads in the background; this waits for the
+   * ingestion job to finish, reporting each stage through onProgress.
    */
-  uploadDocument: async (file: File, category?: string): Promise<RAGUploadResponse> => {
+  uploadDocument: async (
+    file: File,
+    category?: string,
+    onProgress?: (status: RAGUploadJobStatus) => void
+  ): Promise<RAGUploadResponse> => {
     const formData = new FormData();
     formData.append('file', file);
 
@@ -1007,7 +1034,33 @@ export const ragApi = {
       throw new Error(`Upload failed: ${error}`);
     }
 
-    return response.json();
+    const { job_id } = await response.json();
+
+    // Poll ingestion status until the document is indexed
+    for (;;) {
+      const status = await ragApi.getUploadStatus(job_id);
+      onProgress?.(status);
+
+      if (status.status === 'completed') {
+        return {
+          message: status.message ?? `Processed ${status.filename}`,
+          filename: status.filename,
+          chunks_created: status.chunks_created ?? 0,
+          file_size: status.file_size,
+        };
+      }
+      if (status.status === 'failed') {
+        throw new Error(`Upload failed: ${status.error ?? status.message ?? 'ingestion failed'}`);
+      }
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+    }
+  },
+
+  /**
+   * Get the ingestion status of an uploaded RAG document
+   */
+  getUploadStatus: async (jobId: string): Promise<RAGUploadJobStatus> => {
+    return apiRequest(`/api/rag/upload/${encodeURIComponent(jobId)}`);
   },
 
   /**